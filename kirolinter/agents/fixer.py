@@ -7,13 +7,14 @@ validation, backup management, and outcome learning using Redis-based PatternMem
 
 import os
 import shutil
-import ast
 import tempfile
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
 from .llm_config import get_chat_model, get_model_info
+from ..core.fix_transaction import FixTransaction, LineEdit
+from ..core.fix_validator import FixCheck, FixValidator, check_syntax
 from .reviewer import ReviewerAgent
 from ..memory.pattern_memory import create_pattern_memory
 from ..models.suggestion import Suggestion
@@ -30,7 +31,8 @@ class FixerAgent:
     - Risk assessment integration with ReviewerAgent
     """
     
-    def __init__(self, model_provider: Optional[str] = None, memory=None, verbose: bool = False):
+    def __init__(self, model_provider: Optional[str] = None, memory=None, verbose: bool = False,
+                 validation_workers: int = 0, rescan_fixes: bool = False):
         """
         Initialize the Fixer Agent with Phase 4 enhancements.
         
@@ -38,6 +40,8 @@ class FixerAgent:
             model_provider: LLM provider (xai, ollama, openai) - auto-selects if None
             memory: PatternMemory instance (Redis-based)
             verbose: Enable verbose logging
+            validation_workers: Processes validating fixes (1 = serial, 0 = one per CPU)
+            rescan_fixes: Re-scan each patched region to confirm its issue is gone
         """
         self.verbose = verbose
         self.model_provider = model_provider
@@ -60,6 +64,9 @@ class FixerAgent:
         # Initialize adaptive confidence threshold
         self.confidence_threshold = 0.9
         self.repo_path = None  # Set during fix application
+        self._transaction: Optional[FixTransaction] = None  # Batch being staged by apply_fixes
+        self.fix_validator = FixValidator(workers=validation_workers, rescan=rescan_fixes, verbose=verbose)
+        self._fix_checks: Dict[int, FixCheck] = {}  # Validation results of the running apply_fixes
     
     # Phase 4 Enhanced Methods
     
@@ -89,37 +96,64 @@ class FixerAgent:
         # Initialize reviewer for risk assessment
         reviewer = ReviewerAgent(memory=self.memory, verbose=self.verbose)
         
-        for suggestion in suggestions:
+        # Stage every approved fix, then write each file once with one backup
+        staged = []
+        with FixTransaction(backup=self._backup_file) as transaction:
+            self._transaction = transaction
             try:
-                # Only auto-apply high-confidence, validated, low-risk fixes
-                if auto_apply and self._should_auto_apply(suggestion, reviewer):
-                    if self._apply_single_fix(suggestion):
-                        applied.append(suggestion.issue_id)
-                        
-                        # Store successful fix pattern
-                        self.memory.store_pattern(
-                            self.repo_path,
-                            "fix_success",
-                            {
-                                "issue_id": suggestion.issue_id,
-                                "file": suggestion.file_path,
-                                "fix_type": suggestion.fix_type,
-                                "confidence": suggestion.confidence
-                            },
-                            0.95
-                        )
-                        
-                        if self.verbose:
-                            print(f"✅ Applied fix for {suggestion.issue_id}")
-                    else:
+                # Validate every candidate up front, in parallel; _validate_fix reads the results
+                if auto_apply:
+                    candidates = [s for s in suggestions if s.confidence >= self.confidence_threshold]
+                    checks = self.fix_validator.validate(candidates)
+                    self._fix_checks = {id(s): check for s, check in zip(candidates, checks)}
+                
+                for suggestion in suggestions:
+                    try:
+                        # Only auto-apply high-confidence, validated, low-risk fixes
+                        if auto_apply and self._should_auto_apply(suggestion, reviewer):
+                            if self._apply_single_fix(suggestion):
+                                staged.append(suggestion)
+                            elif self.verbose:
+                                print(f"❌ Failed to apply fix for {suggestion.issue_id}")
+                        elif self.verbose:
+                            print(f"⏭️  Skipped fix for {suggestion.issue_id} (safety/confidence)")
+                            
+                    except Exception as e:
                         if self.verbose:
-                            print(f"❌ Failed to apply fix for {suggestion.issue_id}")
-                elif self.verbose:
-                    print(f"⏭️  Skipped fix for {suggestion.issue_id} (safety/confidence)")
-                    
-            except Exception as e:
+                            print(f"⚠️ Error applying fix {suggestion.issue_id}: {e}")
+            finally:
+                self._transaction = None
+                self._fix_checks = {}
+        
+        rejected = set()
+        for file_path, result in transaction.results.items():
+            rejected.update(id(tag) for tag in result.rejected)
+            if result.error and self.verbose:
+                print(f"❌ Fixes for {file_path} not written: {result.error}")
+        
+        for suggestion in staged:
+            if id(suggestion) in rejected:
                 if self.verbose:
-                    print(f"⚠️ Error applying fix {suggestion.issue_id}: {e}")
+                    print(f"❌ Failed to apply fix for {suggestion.issue_id}")
+                continue
+            
+            applied.append(suggestion.issue_id)
+            
+            # Store successful fix pattern
+            self.memory.store_pattern(
+                self.repo_path,
+                "fix_success",
+                {
+                    "issue_id": suggestion.issue_id,
+                    "file": suggestion.file_path,
+                    "fix_type": suggestion.fix_type,
+                    "confidence": suggestion.confidence
+                },
+                0.95
+            )
+            
+            if self.verbose:
+                print(f"✅ Applied fix for {suggestion.issue_id}")
         
         if self.verbose:
             print(f"🎯 Successfully applied {len(applied)}/{len(suggestions)} fixes")
@@ -165,6 +199,9 @@ class FixerAgent:
         """
         Comprehensive fix safety validation using multiple criteria.
         
+        Inside ``apply_fixes`` the result of the batch validation is used;
+        otherwise the suggestion is validated on its own.
+        
         Args:
             suggestion: Suggestion to validate
             
@@ -172,31 +209,12 @@ class FixerAgent:
             True if fix is safe to apply
         """
         try:
-            # Check fix type is safe for automation
-            safe_fix_types = ['replace', 'delete', 'insert', 'format']
-            if suggestion.fix_type not in safe_fix_types:
-                return False
-            
-            # Check suggested code size (avoid large changes)
-            if len(suggestion.suggested_code) > 1000:
-                return False
-            
-            # Check syntax if it's Python code
-            if suggestion.file_path.endswith('.py'):
-                if not self._check_syntax(suggestion.suggested_code):
-                    return False
-            
-            # Check for dangerous patterns
-            dangerous_patterns = [
-                'exec(', 'eval(', '__import__', 'subprocess.call',
-                'os.system', 'shell=True', 'rm -rf', 'DROP TABLE'
-            ]
-            
-            for pattern in dangerous_patterns:
-                if pattern in suggestion.suggested_code:
-                    return False
-            
-            return True
+            check = self._fix_checks.get(id(suggestion))
+            if check is None:
+                check = self.fix_validator.validate_one(suggestion)
+            if not check.valid and self.verbose:
+                print(f"⚠️ Fix for {suggestion.issue_id} rejected: {check.reason}")
+            return check.valid
             
         except Exception as e:
             if self.verbose:
@@ -213,27 +231,24 @@ class FixerAgent:
         Returns:
             True if syntax is valid
         """
-        try:
-            ast.parse(code)
-            return True
-        except SyntaxError:
-            return False
-        except Exception:
-            return False
+        return check_syntax(code)
     
     def _apply_single_fix(self, suggestion: Suggestion) -> bool:
         """
         Apply a single fix with backup creation.
         
+        Inside ``apply_fixes`` the fix is only staged; the batch backs up and
+        writes its file once, after all fixes have been staged.
+        
         Args:
             suggestion: Suggestion to apply
             
         Returns:
-            True if fix was applied successfully
+            True if fix was applied (or staged) successfully
         """
         try:
             # Create backup before applying fix
-            if not self._backup_file(suggestion.file_path):
+            if self._transaction is None and not self._backup_file(suggestion.file_path):
                 return False
             
             # Apply the fix based on type
@@ -253,7 +268,8 @@ class FixerAgent:
                 print(f"⚠️ Failed to apply fix: {e}")
             
             # Attempt rollback on failure
-            self.rollback_fix(suggestion.issue_id, suggestion.file_path)
+            if self._transaction is None:
+                self.rollback_fix(suggestion.issue_id, suggestion.file_path)
             return False
     
     def _backup_file(self, file_path: str) -> bool:
@@ -288,69 +304,33 @@ class FixerAgent:
     
     def _apply_replace_fix(self, suggestion: Suggestion) -> bool:
         """Apply a replace-type fix."""
-        try:
-            with open(suggestion.file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Replace the line (1-indexed to 0-indexed)
-            if 1 <= suggestion.line_number <= len(lines):
-                lines[suggestion.line_number - 1] = suggestion.suggested_code + '\n'
-                
-                with open(suggestion.file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                
-                return True
-            
-            return False
-            
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠️ Replace fix failed: {e}")
-            return False
+        edit = LineEdit.replace(suggestion.line_number, suggestion.suggested_code, suggestion)
+        return self._apply_edit(suggestion.file_path, edit, "Replace")
     
     def _apply_delete_fix(self, suggestion: Suggestion) -> bool:
         """Apply a delete-type fix."""
-        try:
-            with open(suggestion.file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Delete the line (1-indexed to 0-indexed)
-            if 1 <= suggestion.line_number <= len(lines):
-                del lines[suggestion.line_number - 1]
-                
-                with open(suggestion.file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                
-                return True
-            
-            return False
-            
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠️ Delete fix failed: {e}")
-            return False
+        edit = LineEdit.delete(suggestion.line_number, suggestion)
+        return self._apply_edit(suggestion.file_path, edit, "Delete")
     
     def _apply_insert_fix(self, suggestion: Suggestion) -> bool:
         """Apply an insert-type fix."""
-        try:
-            with open(suggestion.file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Insert the line (1-indexed to 0-indexed)
-            if 0 <= suggestion.line_number <= len(lines):
-                lines.insert(suggestion.line_number, suggestion.suggested_code + '\n')
-                
-                with open(suggestion.file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                
-                return True
-            
-            return False
-            
-        except Exception as e:
+        edit = LineEdit.insert(suggestion.line_number, suggestion.suggested_code, suggestion)
+        return self._apply_edit(suggestion.file_path, edit, "Insert")
+    
+    def _apply_edit(self, file_path: str, edit: LineEdit, label: str) -> bool:
+        """Stage ``edit`` in the running batch, or write it right away outside one."""
+        if self._transaction is not None:
+            return self._transaction.stage(file_path, edit)
+        
+        # The caller has already taken the backup
+        with FixTransaction(backup=None) as transaction:
+            staged = transaction.stage(file_path, edit)
+        result = transaction.results.get(file_path)
+        if result is not None and result.error:
             if self.verbose:
-                print(f"⚠️ Insert fix failed: {e}")
+                print(f"⚠️ {label} fix failed: {result.error}")
             return False
+        return staged
     
     def rollback_fix(self, issue_id: str, file_path: str):
         """
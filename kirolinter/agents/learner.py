@@ -890,13 +890,12 @@ class LearnerAgent:
             
             # Learn from issue patterns
             if 'issues_by_type' in analysis_result:
-                for issue_type, count in analysis_result['issues_by_type'].items():
-                    if count > 0:
-                        # Track issue pattern
-                        self.pattern_memory.track_issue_pattern(
-                            repo_path, issue_type, 'general', 'medium'
-                        )
-                        patterns_learned += 1
+                # Track issue patterns in one batch
+                patterns = [(issue_type, 'general', 'medium')
+                            for issue_type, count in analysis_result['issues_by_type'].items()
+                            if count > 0]
+                self.pattern_memory.track_issue_patterns(repo_path, patterns)
+                patterns_learned += len(patterns)
             
             # Learn from severity distribution
             if 'issues_by_severity' in analysis_result:
@@ -38,6 +38,8 @@ class LiteLLMProvider(LLM):
     api_base: Optional[str] = Field(default=None, description="API base URL for custom endpoints")
     api_key: Optional[str] = Field(default=None, description="API key for the model")
     verbose: bool = Field(default=False, description="Enable verbose/debug mode")
+    response_cache: Optional[Any] = Field(default=None, exclude=True,
+                                          description="LLMResponseCache serving repeated prompts")
     
     def __init__(self, **kwargs):
         """Initialize LiteLLM provider with environment variables."""
@@ -112,11 +114,19 @@ class LiteLLMProvider(LLM):
             # Add any additional kwargs
             call_kwargs.update(kwargs)
             
-            # Make the API call
-            response = litellm.completion(**call_kwargs)
+            # Make the API call, serving repeated prompts from the response cache
+            def complete() -> str:
+                response = litellm.completion(**call_kwargs)
+                return response.choices[0].message.content
             
-            # Extract the response text
-            return response.choices[0].message.content
+            if self.response_cache is None:
+                return complete()
+            
+            params = {k: v for k, v in call_kwargs.items()
+                      if k not in ('model', 'messages', 'temperature', 'api_key')}
+            return self.response_cache.get_or_complete(
+                self.model, self.temperature, prompt, complete, params
+            )
             
         except Exception as e:
             # Provide helpful error messages for common issues
@@ -224,7 +234,8 @@ def create_llm_provider(
         temperature: Temperature for generation
         max_tokens: Maximum tokens to generate
         verbose: Enable verbose/debug mode
-        **kwargs: Additional arguments for LiteLLMProvider
+        **kwargs: Additional arguments for LiteLLMProvider; ``response_cache``
+            defaults to the cache configured by ``KIROLINTER_LLM_CACHE``
     
     Returns:
         Configured LiteLLMProvider instance
@@ -232,6 +243,10 @@ def create_llm_provider(
     # Load environment variables
     load_dotenv()
     
+    if 'response_cache' not in kwargs:
+        from kirolinter.core.llm_cache import create_llm_cache
+        kwargs['response_cache'] = create_llm_cache()
+    
     # Create provider
     if provider:
         # When provider is specified, let create_for_provider handle model selection
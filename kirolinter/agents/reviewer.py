@@ -449,14 +449,11 @@ class ReviewerAgent:
             # Apply pattern context to issues
             contextualized_issues = self._apply_context(issues, patterns)
             
-            # Track issue patterns for learning
-            for issue in contextualized_issues:
-                self.memory.track_issue_pattern(
-                    repo_path, 
-                    issue.type, 
-                    issue.rule_id, 
-                    issue.severity.value
-                )
+            # Track issue patterns for learning, in one batch
+            self.memory.track_issue_patterns(
+                repo_path,
+                ((issue.type, issue.rule_id, issue.severity.value) for issue in contextualized_issues)
+            )
             
             return contextualized_issues
             
@@ -3,7 +3,6 @@
 KiroLinter CLI - AI-driven code review tool
 """
 
-import asyncio
 import click
 import json
 import os
@@ -11,12 +10,14 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from kirolinter.core.engine import AnalysisEngine
 from kirolinter.models.config import Config
 from kirolinter.utils.performance_tracker import PerformanceTracker
 
+if TYPE_CHECKING:
+    from kirolinter.core.engine import AnalysisEngine
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -29,7 +30,7 @@ def cli(ctx):
 @cli.command()
 @click.argument('target', type=str)
 @click.option('--format', '-f', 
-              type=click.Choice(['json', 'summary', 'detailed', 'html']), 
+              type=click.Choice(['json', 'summary', 'detailed', 'html', 'ndjson', 'sarif']), 
               default='json',
               help='Output format for the analysis report')
 @click.option('--output', '-o', 
@@ -41,6 +42,9 @@ def cli(ctx):
 @click.option('--changed-only', 
               is_flag=True, 
               help='Analyze only files changed in the last commit')
+@click.option('--base', 'base_ref', 
+              metavar='REF', 
+              help='Analyze only code changed since REF (e.g. origin/main for PR checks)')
 @click.option('--severity', 
               type=click.Choice(['low', 'medium', 'high', 'critical']), 
               help='Minimum severity level to report')
@@ -50,6 +54,15 @@ def cli(ctx):
 @click.option('--verbose', '-v', 
               is_flag=True, 
               help='Enable verbose output')
+@click.option('--jobs', '-j', 
+              type=click.IntRange(min=0), 
+              help='Number of worker processes for scanning (0 = one per CPU)')
+@click.option('--no-cache', 
+              is_flag=True, 
+              help='Ignore and do not update the persistent scan result cache')
+@click.option('--stream', 
+              is_flag=True, 
+              help='Write the report incrementally while analyzing (json, ndjson, sarif and html only)')
 @click.option('--github-pr', 
               type=int, 
               help='Post results as comments on GitHub PR number')
@@ -64,8 +77,8 @@ def cli(ctx):
               is_flag=True, 
               help='Show what fixes would be applied without making changes')
 def analyze(target: str, format: str, output: Optional[str], config: Optional[str], 
-           changed_only: bool, severity: Optional[str], exclude: tuple, verbose: bool,
-           github_pr: Optional[int], github_token: Optional[str], github_repo: Optional[str],
+           changed_only: bool, base_ref: Optional[str], severity: Optional[str], exclude: tuple, verbose: bool,
+           jobs: Optional[int], no_cache: bool, stream: bool, github_pr: Optional[int], github_token: Optional[str], github_repo: Optional[str],
            interactive_fixes: bool, dry_run: bool):
     """
     Analyze a Git repository, local codebase, or individual Python file for code quality issues.
@@ -76,6 +89,8 @@ def analyze(target: str, format: str, output: Optional[str], config: Optional[st
     - A single Python file (path/to/file.py)
     - Current directory (.)
     """
+    from kirolinter.core.engine import AnalysisEngine
+
     try:
         # Initialize performance tracker
         tracker = PerformanceTracker()
@@ -89,6 +104,10 @@ def analyze(target: str, format: str, output: Optional[str], config: Optional[st
             config_obj.min_severity = severity
         if exclude:
             config_obj.exclude_patterns.extend(exclude)
+        if jobs is not None:
+            config_obj.workers = jobs
+        if no_cache:
+            config_obj.cache_enabled = False
         
         # Initialize analysis engine
         engine = AnalysisEngine(config_obj, verbose=verbose)
@@ -98,14 +117,32 @@ def analyze(target: str, format: str, output: Optional[str], config: Optional[st
             click.echo(f"Error: Invalid target '{target}'", err=True)
             sys.exit(1)
         
+        # NDJSON and SARIF are always written incrementally
+        if stream or format in ('ndjson', 'sarif'):
+            if format not in ('json', 'ndjson', 'sarif', 'html'):
+                click.echo(f"Error: --stream supports json, ndjson, sarif and html, not '{format}'", err=True)
+                sys.exit(1)
+            if github_pr or interactive_fixes or dry_run:
+                click.echo("Error: streaming output cannot be combined with --github-pr or fixes", err=True)
+                sys.exit(1)
+            summary = _stream_analysis(engine, target, format, output, changed_only, base_ref)
+            
+            elapsed = tracker.stop()
+            if verbose:
+                click.echo(f"\n⏱️  Analysis completed in {elapsed:.2f} seconds", err=True)
+            if summary['has_critical_issues']:
+                sys.exit(1)
+            return
+        
         # Run analysis
-        click.echo(f"🔍 Analyzing {'changed files in' if changed_only else ''} {target}...")
+        click.echo(f"🔍 Analyzing {_scope_label(changed_only, base_ref)} {target}...")
         
         with click.progressbar(length=100, label='Analyzing code') as bar:
             results = engine.analyze_codebase(
                 target=target,
                 changed_only=changed_only,
-                progress_callback=lambda p: bar.update(p - bar.pos)
+                progress_callback=lambda p: bar.update(p - bar.pos),
+                base_ref=base_ref
             )
         
         # Generate and output report
@@ -167,6 +204,35 @@ def analyze(target: str, format: str, output: Optional[str], config: Optional[st
         sys.exit(1)
 
 
+def _scope_label(changed_only: bool, base_ref: Optional[str]) -> str:
+    """Describe which part of the target is analyzed, for status messages."""
+    if base_ref:
+        return f"changes since {base_ref} in"
+    return 'changed files in' if changed_only else ''
+
+
+def _stream_analysis(engine: 'AnalysisEngine', target: str, format: str,
+                     output: Optional[str], changed_only: bool,
+                     base_ref: Optional[str] = None) -> Dict[str, Any]:
+    """Analyze ``target`` and stream the report to ``output`` or stdout."""
+    click.echo(f"🔍 Analyzing {_scope_label(changed_only, base_ref)} {target}...", err=True)
+    
+    if not output:
+        # Status output goes to stderr so stdout holds only the report
+        return engine.stream_report(target, sys.stdout, format=format, changed_only=changed_only,
+                                    base_ref=base_ref)
+    
+    with open(output, 'w', encoding='utf-8') as f:
+        with click.progressbar(length=100, label='Analyzing code', file=sys.stderr) as bar:
+            summary = engine.stream_report(
+                target, f, format=format, changed_only=changed_only,
+                progress_callback=lambda p: bar.update(p - bar.pos),
+                base_ref=base_ref
+            )
+    click.echo(f"✅ Report saved to {output}", err=True)
+    return summary
+
+
 @cli.group()
 def config():
     """Configuration management commands."""
@@ -209,6 +275,34 @@ def config_validate(config_file: str):
         sys.exit(1)
 
 
+@cli.group()
+def cve():
+    """Offline CVE index commands."""
+    pass
+
+
+@cve.command('import')
+@click.argument('feeds', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--index', 'index_path', default='.kiro/cve_index.db', show_default=True,
+              help='Path of the offline CVE index database')
+def cve_import(feeds, index_path: str):
+    """Import NVD JSON feed files (.json or .json.gz) into an offline CVE index."""
+    from kirolinter.integrations.cve_index import OfflineCVEIndex
+
+    index = OfflineCVEIndex(index_path)
+    try:
+        imported = index.import_feeds(feeds)
+        stats = index.stats()
+    except (OSError, ValueError) as e:
+        click.echo(f"❌ CVE import failed: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        index.close()
+
+    click.echo(f"✅ Imported {imported} CVEs into {index_path} ({stats['cves']} total)")
+    click.echo("Set cve_index_path and enable_cve_integration in your configuration to use it")
+
+
 @cli.group()
 def github():
     """GitHub integration commands."""
@@ -258,7 +352,8 @@ def devops():
 @click.option('--check-all', is_flag=True, help='Check Redis connectivity (Redis-only mode)')
 def health(check_redis: bool, check_all: bool):
     """Check DevOps infrastructure health (Redis-only mode)"""
-    
+    import asyncio
+
     async def run_health_checks():
         results = {}
         
@@ -310,7 +405,8 @@ def health(check_redis: bool, check_all: bool):
 @devops.command()
 def init():
     """Initialize DevOps infrastructure (Redis-only mode)"""
-    
+    import asyncio
+
     async def initialize():
         click.echo("🚀 Initializing DevOps infrastructure (Redis-only mode)...")
         
@@ -400,6 +496,8 @@ def git_monitor():
 @click.option('--interval', default=30, help='Monitoring interval in seconds')
 def start(repo: str, events: str, interval: int):
     """Start Git repository monitoring"""
+    import asyncio
+
     async def run_monitor():
         try:
             from kirolinter.devops.integrations.git_events import GitEventDetector
@@ -643,6 +741,8 @@ def gate(gate_type: str, output_format: str, severity_threshold: str,
 @click.option('--port', default=8000, help='Dashboard port')
 def dashboard(host: str, port: int):
     """Launch monitoring dashboard"""
+    import asyncio
+
     async def run_dashboard():
         try:
             from kirolinter.devops.analytics.dashboard import DashboardMetricsCollector, GitOpsDashboard
@@ -3,23 +3,53 @@ Analysis engine that orchestrates the code analysis pipeline.
 """
 
 import os
+import sqlite3
 import tempfile
 import shutil
+import sys
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator, TextIO, TYPE_CHECKING
+from dataclasses import dataclass, field
 import subprocess
 import time
 
 from kirolinter.core.scanner import CodeScanner, ScanResult
+from kirolinter.core.result_cache import ResultCache
 from kirolinter.core.suggester import SuggestionEngine
 from kirolinter.models.config import Config
 from kirolinter.utils.performance_tracker import PerformanceTracker
+from kirolinter.utils.process_pool import chunk_size, start_pool
+from kirolinter.utils.file_discovery import FileDiscovery, DEFAULT_EXCLUSIONS
+from kirolinter.utils.git_diff import ChangedLines, GitDiffError, changed_python_lines, git_toplevel
 from kirolinter.integrations.repository_handler import RepositoryHandler
-from kirolinter.integrations.github_client import GitHubClient
-from kirolinter.integrations.cve_database import CVEDatabase
-from kirolinter.reporting.json_reporter import JSONReporter
-from kirolinter.reporting.web_reporter import WebReporter
+
+# Integrations, reporters and the process pool are imported where they are
+# used, so the CLI starts quickly when they are not needed (see test_import_time)
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+# Scanner owned by a worker process, built once by _init_scan_worker
+_worker_scanner: Optional[CodeScanner] = None
+
+
+def _init_scan_worker(config: Dict[str, Any]):
+    """Process pool initializer: build the worker's CodeScanner once."""
+    global _worker_scanner
+    _worker_scanner = CodeScanner(config)
+
+
+def _scan_chunk(items: List[Tuple[Path, Optional[ChangedLines]]]
+                ) -> List[Tuple[Optional[ScanResult], Optional[str]]]:
+    """Scan a chunk of (file, changed lines) in a worker process, returning (result, error) pairs."""
+    outcomes = []
+    for file_path, changed_lines in items:
+        try:
+            outcomes.append((_worker_scanner.scan_file(file_path, changed_lines), None))
+        except Exception as e:
+            outcomes.append((None, f"Error analyzing {file_path}: {str(e)}"))
+    return outcomes
 
 
 @dataclass
@@ -31,6 +61,9 @@ class AnalysisResults:
     total_issues: int
     analysis_time: float
     errors: List[str]
+    cache_stats: Dict[str, int] = field(default_factory=dict)
+    # Directory the analyzed file paths live in, for reports that need relative paths
+    source_root: str = ''
     
     def has_critical_issues(self) -> bool:
         """Check if any scan result has critical issues."""
@@ -56,15 +89,26 @@ class AnalysisEngine:
         self.repo_handler = RepositoryHandler()
         self.performance_tracker = PerformanceTracker()
         
+        self.file_discovery = FileDiscovery(
+            DEFAULT_EXCLUSIONS + list(config.exclude_patterns),
+            use_git=config.git_file_discovery
+        )
+        
+        # Worker processes for file scanning (0 means one per CPU)
+        self.workers = (os.cpu_count() or 1) if config.workers == 0 else max(1, config.workers)
+        
         # Initialize CVE database if enabled
         self.cve_database = None
         if config.to_dict().get('enable_cve_integration', False):
+            from kirolinter.integrations.cve_database import CVEDatabase
             self.cve_database = CVEDatabase(
-                api_key=config.to_dict().get('nvd_api_key', None)
+                api_key=config.to_dict().get('nvd_api_key', None),
+                offline_index=config.to_dict().get('cve_index_path') or None
             )
     
     def analyze_codebase(self, target: str, changed_only: bool = False, 
-                        progress_callback: Optional[Callable[[int], None]] = None) -> AnalysisResults:
+                        progress_callback: Optional[Callable[[int], None]] = None,
+                        base_ref: Optional[str] = None) -> AnalysisResults:
         """
         Analyze a codebase (Git repository or local directory).
         
@@ -72,6 +116,7 @@ class AnalysisEngine:
             target: Git repository URL or local directory path
             changed_only: Only analyze files changed in the last commit
             progress_callback: Optional callback for progress updates (0-100)
+            base_ref: Only analyze code changed since this git ref (e.g. a PR's base branch)
         
         Returns:
             AnalysisResults containing all scan results and metadata
@@ -83,7 +128,7 @@ class AnalysisEngine:
             analysis_path = self._prepare_codebase(target)
             
             # Get list of Python files to analyze
-            python_files = self._get_python_files(analysis_path, changed_only)
+            python_files, changed_lines = self._select_files(analysis_path, changed_only, base_ref)
             
             if not python_files:
                 return AnalysisResults(
@@ -95,35 +140,15 @@ class AnalysisEngine:
                     errors=["No Python files found to analyze"]
                 )
             
-            # Analyze files with progress tracking
-            scan_results = []
-            errors = []
-            all_issues = []
-            
-            for i, file_path in enumerate(python_files):
-                try:
-                    if self.verbose:
-                        print(f"Analyzing {file_path}...")
-                    
-                    result = self.process_file(file_path)
-                    scan_results.append(result)
-                    all_issues.extend(result.issues)
-                    
-                    # Update progress
-                    if progress_callback:
-                        progress = int((i + 1) / len(python_files) * 100)
-                        progress_callback(progress)
-                        
-                except Exception as e:
-                    error_msg = f"Error analyzing {file_path}: {str(e)}"
-                    errors.append(error_msg)
-                    if self.verbose:
-                        print(f"⚠️  {error_msg}")
+            # Analyze files with progress tracking, reusing cached results
+            scan_results, errors, cache_stats = self._scan_files_cached(
+                python_files, progress_callback, changed_lines, self._cache_root(target, analysis_path))
+            all_issues = [issue for result in scan_results for issue in result.issues]
             
             # Enhance security issues with CVE database
             if self.cve_database and all_issues:
                 if self.verbose:
-                    print("Enhancing security issues with CVE database...")
+                    print("Enhancing security issues with CVE database...", file=sys.stderr)
                 
                 enhanced_issues = self.cve_database.enhance_security_issues(all_issues)
                 
@@ -138,9 +163,12 @@ class AnalysisEngine:
             
             # Generate suggestions for all issues
             if all_issues and self.verbose:
-                print("Generating suggestions...")
+                print("Generating suggestions...", file=sys.stderr)
             
             suggestions = self.suggester.generate_suggestions(all_issues, analysis_path)
+            llm_cache = self.suggester.llm_cache
+            if self.verbose and llm_cache and llm_cache.stats['hits'] + llm_cache.stats['misses']:
+                print(f"AI response cache: {llm_cache.summary()}", file=sys.stderr)
             
             # Add suggestions to scan results
             for scan_result in scan_results:
@@ -163,7 +191,9 @@ class AnalysisEngine:
                 total_files=len(python_files),
                 total_issues=total_issues,
                 analysis_time=analysis_time,
-                errors=errors
+                errors=errors,
+                cache_stats=cache_stats,
+                source_root=self._source_root(target, analysis_path)
             )
             
         except Exception as e:
@@ -176,17 +206,326 @@ class AnalysisEngine:
                 errors=[f"Analysis failed: {str(e)}"]
             )
     
-    def process_file(self, file_path: Path) -> ScanResult:
+    def iter_analysis(self, target: str, changed_only: bool = False,
+                      progress_callback: Optional[Callable[[int], None]] = None,
+                      run_info: Optional[Dict[str, Any]] = None,
+                      base_ref: Optional[str] = None) -> Iterator[ScanResult]:
+        """
+        Analyze a codebase, yielding one fully processed ScanResult per file.
+        
+        Each file goes through scanning, CVE enrichment and suggestion
+        generation before it is yielded, and nothing is retained afterwards,
+        so memory stays proportional to a single file. Suggestion
+        prioritization only sees the issues of one file at a time.
+        
+        Args:
+            target: Git repository URL or local directory path
+            changed_only: Only analyze files changed in the last commit
+            progress_callback: Optional callback for progress updates (0-100)
+            run_info: Optional dict filled in once the generator is exhausted
+                with target, total_files, analysis_time, errors and cache_stats
+            base_ref: Only analyze code changed since this git ref
+        """
+        if run_info is None:
+            run_info = {}
+        run_info.update(target=target, total_files=0, analysis_time=0.0, errors=[], cache_stats={})
+        self.performance_tracker.start()
+        
+        analysis_path = target
+        try:
+            analysis_path = self._prepare_codebase(target)
+            run_info['source_root'] = self._source_root(target, analysis_path)
+            python_files, changed_lines = self._select_files(analysis_path, changed_only, base_ref)
+            run_info['total_files'] = len(python_files)
+            
+            if not python_files:
+                run_info['errors'].append("No Python files found to analyze")
+                return
+            
+            for _, result, error in self._iter_scan(python_files, progress_callback,
+                                                    run_info['cache_stats'], changed_lines,
+                                                    self._cache_root(target, analysis_path)):
+                if error:
+                    run_info['errors'].append(error)
+                    continue
+                yield self._enrich_result(result, analysis_path)
+        except Exception as e:
+            run_info['errors'].append(f"Analysis failed: {str(e)}")
+        finally:
+            run_info['analysis_time'] = self.performance_tracker.stop()
+            if target.startswith(('http://', 'https://', 'git@')) and analysis_path != target:
+                shutil.rmtree(analysis_path, ignore_errors=True)
+    
+    def stream_report(self, target: str, out: TextIO, format: str = 'json',
+                      changed_only: bool = False,
+                      progress_callback: Optional[Callable[[int], None]] = None,
+                      base_ref: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyze a codebase and write the report to ``out`` as results arrive.
+        
+        Args:
+            target: Git repository URL or local directory path
+            out: Text stream to write the report to
+            format: Report format ('json', 'ndjson', 'sarif' or 'html')
+            changed_only: Only analyze files changed in the last commit
+            progress_callback: Optional callback for progress updates (0-100)
+            base_ref: Only analyze code changed since this git ref
+        
+        Returns:
+            Summary statistics of the run
+        """
+        run_info: Dict[str, Any] = {}
+        results = self.iter_analysis(target, changed_only, progress_callback, run_info, base_ref)
+        
+        if format == 'json':
+            from kirolinter.reporting.json_reporter import JSONReporter
+            summary = JSONReporter().write_report(out, target, results, run_info)
+        elif format == 'ndjson':
+            from kirolinter.reporting.json_reporter import JSONReporter
+            summary = JSONReporter().write_ndjson(out, target, results, run_info)
+        elif format == 'sarif':
+            from kirolinter.reporting.sarif_reporter import SARIFReporter
+            summary = SARIFReporter().write_report(out, target, results, run_info)
+        elif format == 'html':
+            from kirolinter.reporting.web_reporter import WebReporter
+            summary = WebReporter(include_source_code=True, theme='light').write_report(
+                out, target, results, run_info)
+        else:
+            raise ValueError(f"Unsupported streaming format: {format}")
+        
+        summary['errors'] = run_info['errors']
+        return summary
+    
+    def _enrich_result(self, scan_result: ScanResult, analysis_path: str) -> ScanResult:
+        """Apply CVE enrichment and attach suggestions to a single file's issues."""
+        if not scan_result.issues:
+            return scan_result
+        
+        if self.cve_database:
+            scan_result.issues = self.cve_database.enhance_security_issues(scan_result.issues)
+        
+        suggestions = self.suggester.generate_suggestions(scan_result.issues, analysis_path)
+        for issue in scan_result.issues:
+            if issue.id in suggestions:
+                issue.suggestion = suggestions[issue.id]
+        return scan_result
+    
+    @staticmethod
+    def _analysis_dir(analysis_path: str) -> Path:
+        """The analyzed directory, or the directory of a single analyzed file."""
+        path = Path(analysis_path)
+        return path if path.is_dir() else path.parent
+    
+    def _source_root(self, target: str, analysis_path: str) -> str:
+        """Root that report paths are relative to: the enclosing git checkout, else the analyzed directory."""
+        directory = self._analysis_dir(analysis_path)
+        if target.startswith(('http://', 'https://', 'git@')):
+            # A fresh clone is its own checkout root
+            return str(directory)
+        return str(git_toplevel(directory) or directory)
+    
+    def _cache_root(self, target: str, analysis_path: str) -> Optional[Path]:
+        """Directory whose .kiro/ holds the default result cache: the analyzed project, if local."""
+        if target.startswith(('http://', 'https://', 'git@')):
+            # A clone is deleted after the run, so its cache would never be reused
+            return None
+        return self._analysis_dir(analysis_path)
+    
+    def _open_result_cache(self, root: Optional[Path] = None) -> Optional[ResultCache]:
+        """
+        Open the persistent result cache, or return None if it is disabled or unusable.
+        
+        Args:
+            root: Project directory for the default cache location; the working
+                directory when None. Ignored if ``cache_dir`` is configured.
+        """
+        if not self.config.cache_enabled:
+            return None
+        
+        if self.config.cache_dir:
+            cache_dir = Path(self.config.cache_dir)
+        else:
+            cache_dir = (root or Path.cwd()) / '.kiro' / 'scan_cache'
+        try:
+            fingerprint = ResultCache.compute_fingerprint(self.config.to_dict(), self.scanner.scanners)
+            return ResultCache(cache_dir, fingerprint,
+                               max_size_bytes=self.config.cache_max_size_mb * 1024 * 1024)
+        except (OSError, sqlite3.Error) as e:
+            if self.verbose:
+                print(f"⚠️  Result cache unavailable ({e}), scanning without cache", file=sys.stderr)
+            return None
+    
+    def _scan_files_cached(self, python_files: List[Path],
+                           progress_callback: Optional[Callable[[int], None]] = None,
+                           changed_lines: Optional[Dict[Path, Optional[ChangedLines]]] = None,
+                           cache_root: Optional[Path] = None
+                           ) -> Tuple[List[ScanResult], List[str], Dict[str, int]]:
+        """
+        Scan files, serving unchanged ones from the result cache.
+        
+        Returns:
+            Scan results in the order of ``python_files``, errors, and cache hit/miss counters
+        """
+        scan_results = []
+        errors = []
+        cache_stats: Dict[str, int] = {}
+        
+        for _, result, error in self._iter_scan(python_files, progress_callback, cache_stats,
+                                                changed_lines, cache_root):
+            if error:
+                errors.append(error)
+            else:
+                scan_results.append(result)
+        
+        return scan_results, errors, cache_stats
+    
+    def _iter_scan(self, python_files: List[Path],
+                   progress_callback: Optional[Callable[[int], None]] = None,
+                   cache_stats: Optional[Dict[str, int]] = None,
+                   changed_lines: Optional[Dict[Path, Optional[ChangedLines]]] = None,
+                   cache_root: Optional[Path] = None
+                   ) -> Iterator[Tuple[Path, Optional[ScanResult], Optional[str]]]:
+        """
+        Yield ``(file_path, result, error)`` for every file, in the order of ``python_files``.
+        
+        Cache hits are served directly and misses are scanned serially or in
+        chunks across a process pool, depending on ``self.workers``. Only a
+        couple of chunks per worker are in flight at any time, so memory stays
+        bounded however slowly the caller consumes results.
+        
+        Args:
+            python_files: Files to scan
+            progress_callback: Optional callback for progress updates (0-100)
+            cache_stats: Optional dict updated with cache hit/miss counters when done
+            changed_lines: Optional per-file changed lines for a diff-scoped scan;
+                files mapped to None are scanned in full
+            cache_root: Project directory for the default result cache location
+        """
+        total = len(python_files)
+        cache = self._open_result_cache(cache_root)
+        executor = self._start_scan_pool(total)
+        size = chunk_size(total, self.workers) if executor else 1
+        max_in_flight = self.workers * 2 if executor else 1
+        pending = deque()
+        done = 0
+        
+        try:
+            chunks = [python_files[i:i + size] for i in range(0, total, size)]
+            for index, chunk in enumerate(chunks):
+                pending.append(self._start_chunk(chunk, cache, executor, changed_lines))
+                if len(pending) < max_in_flight and index < len(chunks) - 1:
+                    continue
+                
+                while pending and (len(pending) >= max_in_flight or index == len(chunks) - 1):
+                    for outcome in self._finish_chunk(pending.popleft(), cache):
+                        done += 1
+                        if progress_callback:
+                            progress_callback(int(done / total * 100))
+                        yield outcome
+        finally:
+            if executor:
+                for unfinished in pending:
+                    if unfinished['future'] is not None:
+                        unfinished['future'].cancel()
+                executor.shutdown()
+            if cache:
+                if self.verbose and cache.stats['hits']:
+                    print(f"Reused cached results for {cache.stats['hits']} of {total} files", file=sys.stderr)
+                if cache_stats is not None:
+                    cache_stats.update(cache.stats)
+                cache.close()
+    
+    def _start_scan_pool(self, total_files: int) -> Optional['ProcessPoolExecutor']:
+        """Create the scanning process pool, or return None for serial scanning."""
+        executor = start_pool(self.workers, total_files, _init_scan_worker, (self.config.to_dict(),),
+                              label='analysis', verbose=self.verbose)
+        if executor is None:
+            return None
+        
+        if self.verbose:
+            print(f"Analyzing {total_files} files with {self.workers} workers...", file=sys.stderr)
+        return executor
+    
+    def _start_chunk(self, chunk: List[Path], cache: Optional[ResultCache],
+                     executor: Optional['ProcessPoolExecutor'],
+                     changed_lines: Optional[Dict[Path, Optional[ChangedLines]]] = None) -> Dict[str, Any]:
+        """Look a chunk up in the cache and submit its misses to the pool, if any."""
+        hits: Dict[int, ScanResult] = {}
+        keys: Dict[int, Optional[str]] = {}
+        scopes = [changed_lines.get(file_path) if changed_lines else None for file_path in chunk]
+        misses = []
+        for i, file_path in enumerate(chunk):
+            if cache:
+                result, key = cache.get(file_path, scopes[i].key() if scopes[i] else '')
+                if result is not None:
+                    hits[i] = result
+                    continue
+                keys[i] = key
+            misses.append(i)
+        
+        future = None
+        if executor and misses:
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                future = executor.submit(_scan_chunk, [(chunk[i], scopes[i]) for i in misses])
+            except (OSError, BrokenProcessPool, RuntimeError) as e:
+                if self.verbose:
+                    print(f"⚠️  Parallel analysis unavailable ({e}), scanning serially", file=sys.stderr)
+        
+        return {'chunk': chunk, 'scopes': scopes, 'hits': hits, 'keys': keys,
+                'misses': misses, 'future': future}
+    
+    def _finish_chunk(self, pending: Dict[str, Any],
+                      cache: Optional[ResultCache]) -> List[Tuple[Path, Optional[ScanResult], Optional[str]]]:
+        """Collect a chunk's scan outcomes, store misses in the cache and merge in order."""
+        chunk = pending['chunk']
+        misses = pending['misses']
+        
+        outcomes = None
+        if pending['future'] is not None:
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                outcomes = pending['future'].result()
+            except BrokenProcessPool as e:
+                if self.verbose:
+                    print(f"⚠️  Worker process failed ({e}), rescanning chunk serially", file=sys.stderr)
+        if outcomes is None:
+            outcomes = [self._scan_one(chunk[i], pending['scopes'][i]) for i in misses]
+        
+        merged: Dict[int, Tuple[Optional[ScanResult], Optional[str]]] = dict(zip(misses, outcomes))
+        for i, (result, error) in merged.items():
+            if error:
+                if self.verbose:
+                    print(f"⚠️  {error}", file=sys.stderr)
+            elif cache and pending['keys'].get(i):
+                cache.put(pending['keys'][i], result)
+        for i, result in pending['hits'].items():
+            merged[i] = (result, None)
+        
+        return [(file_path,) + merged[i] for i, file_path in enumerate(chunk)]
+    
+    def _scan_one(self, file_path: Path, changed_lines: Optional[ChangedLines] = None
+                  ) -> Tuple[Optional[ScanResult], Optional[str]]:
+        """Scan a single file in this process, returning a (result, error) pair."""
+        try:
+            if self.verbose:
+                print(f"Analyzing {file_path}...", file=sys.stderr)
+            return self.process_file(file_path, changed_lines), None
+        except Exception as e:
+            return None, f"Error analyzing {file_path}: {str(e)}"
+    
+    def process_file(self, file_path: Path, changed_lines: Optional[ChangedLines] = None) -> ScanResult:
         """
         Process a single Python file.
         
         Args:
             file_path: Path to the Python file to analyze
+            changed_lines: Only analyze the code touching these lines (whole-file rules excepted)
         
         Returns:
             ScanResult containing issues found in the file
         """
-        return self.scanner.scan_file(file_path)
+        return self.scanner.scan_file(file_path, changed_lines)
     
     def generate_report(self, results: AnalysisResults, format: str = 'json') -> str:
         """
@@ -194,7 +533,7 @@ class AnalysisEngine:
         
         Args:
             results: Analysis results to format
-            format: Output format ('json', 'summary', 'detailed')
+            format: Output format ('json', 'summary', 'detailed', 'html', 'sarif')
         
         Returns:
             Formatted report as string
@@ -207,6 +546,8 @@ class AnalysisEngine:
             return self._generate_detailed_report(results)
         elif format == 'html':
             return self._generate_html_report(results)
+        elif format == 'sarif':
+            return self._generate_sarif_report(results)
         else:
             raise ValueError(f"Unsupported report format: {format}")
     
@@ -225,7 +566,7 @@ class AnalysisEngine:
             temp_dir = tempfile.mkdtemp(prefix='kirolinter_')
             try:
                 if self.verbose:
-                    print(f"Cloning repository {target}...")
+                    print(f"Cloning repository {target}...", file=sys.stderr)
                 
                 result = subprocess.run([
                     'git', 'clone', '--depth', '1', target, temp_dir
@@ -262,6 +603,47 @@ class AnalysisEngine:
             
             return str(path.resolve())
     
+    def _select_files(self, target_path: str, changed_only: bool = False,
+                      base_ref: Optional[str] = None
+                      ) -> Tuple[List[Path], Optional[Dict[Path, Optional[ChangedLines]]]]:
+        """
+        Choose the files to analyze and, for a diff-scoped run, their changed lines.
+        
+        Falls back to the regular file selection if the diff cannot be computed.
+        """
+        if base_ref:
+            try:
+                changed_lines = self._get_diff_scope(target_path, base_ref)
+                return sorted(changed_lines), changed_lines
+            except GitDiffError as e:
+                if self.verbose:
+                    print(f"⚠️  Cannot diff against {base_ref} ({e}), analyzing all files", file=sys.stderr)
+        
+        return self._get_python_files(target_path, changed_only), None
+    
+    def _get_diff_scope(self, target_path: str, base_ref: str) -> Dict[Path, Optional[ChangedLines]]:
+        """
+        Map the non-excluded Python files changed since ``base_ref`` to their changed lines.
+        
+        Raises:
+            GitDiffError: If the target is not a git checkout or the ref is unknown
+        """
+        path = Path(target_path)
+        directory = path.parent if path.is_file() else path
+        resolved = directory.resolve()
+        
+        scope = {}
+        for file_path, lines in changed_python_lines(directory, base_ref).items():
+            try:
+                file_path = directory / file_path.resolve().relative_to(resolved)
+            except ValueError:
+                continue
+            if path.is_file() and file_path.resolve() != path.resolve():
+                continue
+            if file_path.is_file() and not self._should_exclude_file(file_path, directory):
+                scope[file_path] = lines
+        return scope
+    
     def _get_python_files(self, target_path: str, changed_only: bool = False) -> List[Path]:
         """
         Get list of Python files to analyze.
@@ -271,13 +653,13 @@ class AnalysisEngine:
             changed_only: Only include files changed in the last commit
         
         Returns:
-            List of Python file paths
+            List of Python file paths, sorted by path
         """
         path = Path(target_path)
         
         # Handle individual file
         if path.is_file() and path.suffix == '.py':
-            if not self._should_exclude_file(path):
+            if not self._should_exclude_file(path, path.parent):
                 return [path]
             else:
                 return []
@@ -286,17 +668,7 @@ class AnalysisEngine:
         if changed_only:
             return self._get_changed_python_files(target_path)
         
-        python_files = []
-        
-        # Recursively find Python files
-        for file_path in path.rglob('*.py'):
-            # Skip files matching exclude patterns
-            if self._should_exclude_file(file_path):
-                continue
-            
-            python_files.append(file_path)
-        
-        return python_files
+        return self.file_discovery.discover(path)
     
     def _get_changed_python_files(self, directory: str) -> List[Path]:
         """Get Python files changed in the last commit."""
@@ -314,7 +686,7 @@ class AnalysisEngine:
             for file_name in result.stdout.strip().split('\n'):
                 if file_name.endswith('.py'):
                     file_path = Path(directory) / file_name
-                    if file_path.exists() and not self._should_exclude_file(file_path):
+                    if file_path.exists() and not self._should_exclude_file(file_path, Path(directory)):
                         changed_files.append(file_path)
             
             return changed_files
@@ -323,43 +695,33 @@ class AnalysisEngine:
             # Fallback to all files if git operations fail
             return self._get_python_files(directory, changed_only=False)
     
-    def _should_exclude_file(self, file_path: Path) -> bool:
-        """Check if a file should be excluded from analysis."""
-        file_str = str(file_path)
-        
-        # Check exclude patterns from config
-        for pattern in self.config.exclude_patterns:
-            if pattern in file_str:
-                return True
-        
-        # Default exclusions
-        default_exclusions = [
-            '__pycache__',
-            '.git',
-            '.venv',
-            'venv',
-            'env',
-            '.tox',
-            'build',
-            'dist',
-            '.pytest_cache'
-        ]
-        
-        for exclusion in default_exclusions:
-            if exclusion in file_str:
-                return True
-        
-        return False
+    def _should_exclude_file(self, file_path: Path, root: Optional[Path] = None) -> bool:
+        """Check if a file should be excluded from analysis, relative to ``root`` if given."""
+        return self.file_discovery.is_excluded(file_path, root)
     
     def _generate_json_report(self, results: AnalysisResults) -> str:
         """Generate JSON format report using JSONReporter."""
+        from kirolinter.reporting.json_reporter import JSONReporter
         json_reporter = JSONReporter(include_diffs=True)
         return json_reporter.generate_report(
             target=results.target,
             scan_results=results.scan_results,
             total_files=results.total_files,
             analysis_time=results.analysis_time,
-            errors=results.errors
+            errors=results.errors,
+            cache_stats=results.cache_stats
+        )
+    
+    def _generate_sarif_report(self, results: AnalysisResults) -> str:
+        """Generate SARIF 2.1.0 format report using SARIFReporter."""
+        from kirolinter.reporting.sarif_reporter import SARIFReporter
+        return SARIFReporter(source_root=results.source_root or None).generate_report(
+            target=results.target,
+            scan_results=results.scan_results,
+            total_files=results.total_files,
+            analysis_time=results.analysis_time,
+            errors=results.errors,
+            cache_stats=results.cache_stats
         )
     
     def _generate_summary_report(self, results: AnalysisResults) -> str:
@@ -368,6 +730,8 @@ class AnalysisEngine:
         lines.append("📊 KiroLinter Analysis Summary")
         lines.append(f"Files analyzed: {results.total_files}")
         lines.append(f"Issues found: {results.total_issues}")
+        if results.cache_stats:
+            lines.append(f"Cache: {results.cache_stats['hits']} hits, {results.cache_stats['misses']} misses")
         lines.append("")
         
         severity_counts = results.get_issues_by_severity()
@@ -405,6 +769,8 @@ class AnalysisEngine:
         lines.append(f"Files analyzed: {results.total_files}")
         lines.append(f"Total issues: {results.total_issues}")
         lines.append(f"Analysis time: {results.analysis_time:.2f}s")
+        if results.cache_stats:
+            lines.append(f"Cache: {results.cache_stats['hits']} hits, {results.cache_stats['misses']} misses")
         lines.append("")
         
         for scan_result in results.scan_results:
@@ -429,8 +795,9 @@ class AnalysisEngine:
                         
                         lines.append(f"  {severity_icon} Line {issue.line_number}: {issue.message}")
                         lines.append(f"    Rule: {issue.rule_id}")
-                        if issue.cve_id:
-                            lines.append(f"    CVE: {issue.cve_id}")
+                        cve_info = getattr(issue, 'cve_info', None)
+                        if cve_info:
+                            lines.append(f"    CVE: {cve_info['cve_id']}")
                 
                 lines.append("")
         
@@ -451,6 +818,7 @@ class AnalysisEngine:
     
     def _generate_html_report(self, results: AnalysisResults) -> str:
         """Generate HTML format report using WebReporter."""
+        from kirolinter.reporting.web_reporter import WebReporter
         web_reporter = WebReporter(include_source_code=True, theme='light')
         return web_reporter.generate_report(
             target=results.target,
@@ -475,10 +843,11 @@ class AnalysisEngine:
             True if successful, False otherwise
         """
         if not github_token or not github_repo:
-            print("GitHub token and repository are required for PR integration")
+            print("GitHub token and repository are required for PR integration", file=sys.stderr)
             return False
         
         try:
+            from kirolinter.integrations.github_client import GitHubClient
             client = GitHubClient(github_token, github_repo)
             
             # Generate summary for PR
@@ -498,5 +867,5 @@ class AnalysisEngine:
             return summary_success and comments_success
             
         except Exception as e:
-            print(f"Error posting to GitHub PR: {e}")
+            print(f"Error posting to GitHub PR: {e}", file=sys.stderr)
             return False
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Batched, transactional application of line-level fixes.
+
+Fixes are staged as line edits against the file as it is on disk. On commit
+every file is read once, its edits are applied bottom-up in memory so the
+line numbers of edits still waiting never shift, the result is checked once
+with ``ast.parse``, and the file is backed up once and replaced atomically.
+A file whose patched text would not parse is left untouched.
+"""
+
+import ast
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from kirolinter.utils.source_cache import source_cache
+
+
+# Backup hook: called with the file path before the file is first written
+BackupFunc = Callable[[str], bool]
+
+
+class LineEdit:
+    """One edit of a single line, addressed by its 1-based line number in the original file."""
+
+    __slots__ = ('kind', 'line_number', 'text', 'tag')
+
+    REPLACE = 'replace'
+    DELETE = 'delete'
+    INSERT = 'insert'
+
+    def __init__(self, kind: str, line_number: int, text: str = '', tag: Any = None):
+        """
+        Args:
+            kind: 'replace', 'delete' or 'insert'
+            line_number: Line to replace or delete, or the line to insert after (0 for the top)
+            text: New line content without its line ending
+            tag: Caller's handle for the edit (an issue or suggestion), reported back on commit
+        """
+        if kind not in (self.REPLACE, self.DELETE, self.INSERT):
+            raise ValueError(f"Unsupported edit kind: {kind}")
+        self.kind = kind
+        self.line_number = line_number
+        self.text = text
+        self.tag = tag
+
+    @classmethod
+    def replace(cls, line_number: int, text: str, tag: Any = None) -> 'LineEdit':
+        return cls(cls.REPLACE, line_number, text, tag)
+
+    @classmethod
+    def delete(cls, line_number: int, tag: Any = None) -> 'LineEdit':
+        return cls(cls.DELETE, line_number, '', tag)
+
+    @classmethod
+    def insert(cls, line_number: int, text: str, tag: Any = None) -> 'LineEdit':
+        return cls(cls.INSERT, line_number, text, tag)
+
+    def in_range(self, line_count: int) -> bool:
+        """Check the edit addresses an existing line (or gap, for inserts)."""
+        if self.kind == self.INSERT:
+            return 0 <= self.line_number <= line_count
+        return 1 <= self.line_number <= line_count
+
+    def __repr__(self) -> str:
+        return f"LineEdit({self.kind!r}, {self.line_number}, {self.text!r})"
+
+
+@dataclass
+class FixResult:
+    """Outcome of committing the edits staged for one file."""
+    file_path: str
+    applied: List[Any] = field(default_factory=list)
+    rejected: List[Any] = field(default_factory=list)
+    written: bool = False
+    error: Optional[str] = None
+
+
+class _FileEdits:
+    """Original text of one file and the edits staged against it."""
+
+    __slots__ = ('path', 'text', 'lines', 'edits', 'touched')
+
+    def __init__(self, path: str):
+        # newline='' keeps CRLF endings intact through the rewrite
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            self.text = f.read()
+        self.path = path
+        self.lines = self.text.splitlines(keepends=True)
+        self.edits: List[LineEdit] = []
+        # Lines already replaced or deleted by an earlier edit
+        self.touched = set()
+
+
+def apply_edits(text: str, edits: List[LineEdit]) -> str:
+    """
+    Apply ``edits`` to ``text`` bottom-up, so each edit's line number refers
+    to the original text. Edits must be in range and not overlap (see
+    ``FixTransaction.stage``).
+    """
+    lines = text.splitlines(keepends=True)
+    newline = '\r\n' if lines and lines[0].endswith('\r\n') else '\n'
+    if lines and not lines[-1].endswith('\n') and any(
+            edit.kind == LineEdit.INSERT and edit.line_number == len(lines) for edit in edits):
+        # Inserting after an unterminated last line needs that line terminated first
+        lines[-1] += newline
+
+    # An insert after line n sits between n and n + 1; later inserts at one
+    # position go first so the given order is kept in the output
+    def position(indexed):
+        seq, edit = indexed
+        return (edit.line_number + (0.5 if edit.kind == LineEdit.INSERT else 0), seq)
+
+    for _, edit in sorted(enumerate(edits), key=position, reverse=True):
+        index = edit.line_number - 1
+        if edit.kind == LineEdit.REPLACE:
+            old = lines[index]
+            ending = old[len(old.rstrip('\r\n')):]
+            lines[index] = edit.text + ending
+        elif edit.kind == LineEdit.DELETE:
+            del lines[index]
+        else:
+            lines.insert(edit.line_number, edit.text + newline)
+    return ''.join(lines)
+
+
+def sibling_backup(file_path: str) -> bool:
+    """Copy ``file_path`` to ``<file_path>.kirolinter-backup`` next to it."""
+    try:
+        shutil.copy2(file_path, file_path + '.kirolinter-backup')
+        return True
+    except OSError:
+        return False
+
+
+class FixTransaction:
+    """
+    Collect line edits across files and write each file once on commit.
+
+    Used as a context manager, the transaction commits when the block exits
+    normally and discards the staged edits if it raises.
+    """
+
+    def __init__(self, backup: Optional[BackupFunc] = sibling_backup, validate: bool = True):
+        """
+        Args:
+            backup: Called once per file before it is written; a False return
+                aborts that file. None disables backups.
+            validate: Reject a Python file whose patched text does not parse
+                (only when the original parsed)
+        """
+        self.backup = backup
+        self.validate = validate
+        self.results: Dict[str, FixResult] = {}
+        self._files: Dict[str, _FileEdits] = {}
+        self._errors: Dict[str, str] = {}
+
+    def __enter__(self) -> 'FixTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def line_count(self, file_path: str) -> int:
+        """Number of lines in the original file, or -1 if it cannot be read."""
+        entry = self._load(str(file_path))
+        return len(entry.lines) if entry else -1
+
+    def line(self, file_path: str, line_number: int) -> str:
+        """Return a 1-based line of the original file without its line ending."""
+        entry = self._load(str(file_path))
+        if entry and 1 <= line_number <= len(entry.lines):
+            return entry.lines[line_number - 1].rstrip('\r\n')
+        return ''
+
+    def stage(self, file_path: str, edit: LineEdit) -> bool:
+        """
+        Queue ``edit`` for ``file_path``.
+
+        Returns:
+            False if the file cannot be read, the line is out of range, or the
+            line was already replaced or deleted by an earlier edit
+        """
+        key = str(file_path)
+        entry = self._load(key)
+        if entry is None or not edit.in_range(len(entry.lines)):
+            return False
+        if edit.kind != LineEdit.INSERT:
+            if edit.line_number in entry.touched:
+                return False
+            entry.touched.add(edit.line_number)
+        entry.edits.append(edit)
+        return True
+
+    def commit(self) -> Dict[str, FixResult]:
+        """Apply, validate and write every file with staged edits; return the outcome per file."""
+        for key, entry in self._files.items():
+            if entry.edits:
+                self.results[key] = self._commit_file(entry)
+        self._files.clear()
+        return self.results
+
+    def discard(self):
+        """Drop every staged edit without touching any file."""
+        self._files.clear()
+
+    def _load(self, key: str) -> Optional[_FileEdits]:
+        entry = self._files.get(key)
+        if entry is None and key not in self._errors:
+            try:
+                entry = self._files[key] = _FileEdits(key)
+            except (OSError, UnicodeDecodeError) as e:
+                self._errors[key] = str(e)
+        return entry
+
+    def _commit_file(self, entry: _FileEdits) -> FixResult:
+        result = FixResult(entry.path)
+        tags = [edit.tag for edit in entry.edits]
+
+        new_text = apply_edits(entry.text, entry.edits)
+        if new_text == entry.text:
+            result.applied = tags
+            return result
+
+        error = self._check(entry, new_text)
+        if error is None and self.backup is not None and not self.backup(entry.path):
+            error = "backup failed"
+        if error is None:
+            try:
+                _atomic_write(entry.path, new_text)
+            except OSError as e:
+                error = str(e)
+
+        if error is not None:
+            result.rejected = tags
+            result.error = error
+            return result
+
+        source_cache.invalidate(entry.path)
+        result.applied = tags
+        result.written = True
+        return result
+
+    def _check(self, entry: _FileEdits, new_text: str) -> Optional[str]:
+        """Return why the patched text must not be written, or None."""
+        if not self.validate or not entry.path.endswith('.py'):
+            return None
+        try:
+            ast.parse(entry.text)
+        except (SyntaxError, ValueError):
+            # Fixes cannot make an unparsable file worse in a way we can check
+            return None
+        try:
+            ast.parse(new_text)
+        except (SyntaxError, ValueError) as e:
+            return f"fixes would introduce a syntax error: {e}"
+        return None
+
+
+def _atomic_write(path: str, text: str):
+    """Replace ``path`` with ``text`` through a temporary file in the same directory."""
+    target = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), prefix=f'.{target.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
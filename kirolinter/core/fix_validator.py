@@ -0,0 +1,256 @@
+"""
+Validation of candidate fixes before they are applied.
+
+Cheap checks (fix type, size, dangerous patterns) run inline. The parsing
+work - the suggested snippet, the file with the fix applied and, optionally,
+a rescan of the patched region to confirm the issue is gone - is grouped by
+file and spread over a process pool, so each file is read once per batch
+however many fixes target it.
+"""
+
+import ast
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from kirolinter.core.fix_transaction import LineEdit, apply_edits
+from kirolinter.models.suggestion import Suggestion
+from kirolinter.utils.git_diff import ChangedLines
+from kirolinter.utils.process_pool import chunk_size, start_pool
+
+if TYPE_CHECKING:
+    from kirolinter.core.scanner import CodeScanner
+
+
+# Fix types that may be applied without a human looking at them
+SAFE_FIX_TYPES = ('replace', 'delete', 'insert', 'format')
+
+# Larger suggested changes are left for review
+MAX_FIX_SIZE = 1000
+
+# Smaller batches are validated in-process; starting workers would cost more
+MIN_PARALLEL_FIXES = 32
+
+# Code that is never introduced automatically
+DANGEROUS_PATTERNS = (
+    'exec(', 'eval(', '__import__', 'subprocess.call',
+    'os.system', 'shell=True', 'rm -rf', 'DROP TABLE'
+)
+
+
+@dataclass
+class FixCheck:
+    """Validation outcome of one candidate fix."""
+    valid: bool
+    reason: Optional[str] = None
+    # Whether a rescan of the patched region no longer reports the issue; None if not rescanned
+    issue_resolved: Optional[bool] = None
+
+
+# Candidate sent to a worker: (position in the batch, suggestion, edit or None, rule ids to look for)
+_Candidate = Tuple[int, Suggestion, Optional[LineEdit], Tuple[str, ...]]
+
+# Scanner owned by a worker process, built once by _init_validation_worker
+_worker_scanner: Optional['CodeScanner'] = None
+
+
+def _build_scanner(scanner_config: Optional[Dict[str, Any]]) -> Optional['CodeScanner']:
+    """Scanner for rescanning patched regions, or None when not rescanning."""
+    if scanner_config is None:
+        return None
+    from kirolinter.core.scanner import CodeScanner
+    return CodeScanner(scanner_config)
+
+
+def _init_validation_worker(scanner_config: Optional[Dict[str, Any]]):
+    """Process pool initializer: build the worker's CodeScanner once, if rescanning."""
+    global _worker_scanner
+    _worker_scanner = _build_scanner(scanner_config)
+
+
+def check_syntax(code: str) -> bool:
+    """Check if Python code has valid syntax."""
+    try:
+        ast.parse(code)
+        return True
+    except Exception:
+        return False
+
+
+def precheck(suggestion: Suggestion) -> Optional[str]:
+    """Run the checks that need no parsing; return why the fix is unsafe, or None."""
+    if suggestion.fix_type not in SAFE_FIX_TYPES:
+        return f"fix type {suggestion.fix_type!r} is not automated"
+    if len(suggestion.suggested_code) > MAX_FIX_SIZE:
+        return "suggested change is too large"
+    for pattern in DANGEROUS_PATTERNS:
+        if pattern in suggestion.suggested_code:
+            return f"suggested code contains {pattern!r}"
+    return None
+
+
+def _edit_for(suggestion: Suggestion) -> Optional[LineEdit]:
+    """The line edit a suggestion makes, or None for fix types that are not line edits."""
+    if suggestion.fix_type == 'replace':
+        return LineEdit.replace(suggestion.line_number, suggestion.suggested_code)
+    if suggestion.fix_type == 'delete':
+        return LineEdit.delete(suggestion.line_number)
+    if suggestion.fix_type == 'insert':
+        return LineEdit.insert(suggestion.line_number, suggestion.suggested_code)
+    return None
+
+
+def _rule_ids(suggestion: Suggestion) -> Tuple[str, ...]:
+    """Rule ids whose presence in the patched region means the issue is still there."""
+    rule_id = suggestion.metadata.get('rule_id')
+    return (rule_id,) if rule_id else (suggestion.issue_id,)
+
+
+def _validate_file(file_path: str, candidates: List[_Candidate],
+                   scanner: Optional['CodeScanner'] = None) -> List[Tuple[int, FixCheck]]:
+    """Check every candidate fix for one file against a single read of it, rescanning with ``scanner``."""
+    is_python = file_path.endswith('.py')
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        # Without the file only the snippet can be checked; applying will fail cleanly later
+        text = None
+
+    original_parses = text is not None and is_python and check_syntax(text)
+    line_count = len(text.splitlines()) if text is not None else 0
+
+    checks = []
+    for position, suggestion, edit, rule_ids in candidates:
+        checks.append((position, _check_candidate(file_path, suggestion, edit, rule_ids, is_python,
+                                                  text, original_parses, line_count, scanner)))
+    return checks
+
+
+def _validate_files(tasks: List[Tuple[str, List[_Candidate]]],
+                    scanner: Optional['CodeScanner'] = None) -> List[Tuple[int, FixCheck]]:
+    """Validate a chunk of per-file tasks."""
+    checks = []
+    for file_path, candidates in tasks:
+        checks.extend(_validate_file(file_path, candidates, scanner))
+    return checks
+
+
+def _validate_files_in_worker(tasks: List[Tuple[str, List[_Candidate]]]) -> List[Tuple[int, FixCheck]]:
+    """Validate a chunk of per-file tasks in a worker process, with the worker's scanner."""
+    return _validate_files(tasks, _worker_scanner)
+
+
+def _check_candidate(file_path: str, suggestion: Suggestion, edit: Optional[LineEdit],
+                     rule_ids: Tuple[str, ...], is_python: bool, text: Optional[str],
+                     original_parses: bool, line_count: int,
+                     scanner: Optional['CodeScanner']) -> FixCheck:
+    if is_python and not check_syntax(suggestion.suggested_code):
+        return FixCheck(False, "suggested code is not valid Python")
+    if edit is None or text is None:
+        return FixCheck(True)
+    if not edit.in_range(line_count):
+        return FixCheck(False, f"line {edit.line_number} is out of range")
+    if not original_parses:
+        return FixCheck(True)
+
+    patched = apply_edits(text, [edit])
+    try:
+        ast.parse(patched)
+    except (SyntaxError, ValueError) as e:
+        return FixCheck(False, f"patched file does not parse: {e}")
+
+    if scanner is None:
+        return FixCheck(True)
+
+    # Rescan only the code around the edit
+    line = edit.line_number + 1 if edit.kind == LineEdit.INSERT else edit.line_number
+    start, end = max(1, line - 1), line + 1
+    result = scanner.scan_source(Path(file_path), patched, ChangedLines([(start, end)]))
+    remaining = any(
+        start <= issue.line_number <= end and (
+            issue.rule_id in rule_ids or any(rule_id.startswith(f"{issue.rule_id}_") for rule_id in rule_ids))
+        for issue in result.issues
+    )
+    if remaining:
+        return FixCheck(False, "issue is still reported after the fix", issue_resolved=False)
+    return FixCheck(True, issue_resolved=True)
+
+
+class FixValidator:
+    """Validate batches of candidate fixes, in parallel where it pays off."""
+
+    def __init__(self, workers: int = 0, rescan: bool = False,
+                 scanner_config: Optional[Dict[str, Any]] = None, verbose: bool = False):
+        """
+        Args:
+            workers: Worker processes (1 = serial, 0 = one per CPU)
+            rescan: Re-run the scanner on each patched region to confirm the issue is gone
+            scanner_config: Scanner configuration used for the rescan
+            verbose: Print progress and fallbacks
+        """
+        self.workers = (os.cpu_count() or 1) if workers == 0 else max(1, workers)
+        self.rescan = rescan
+        self.scanner_config = scanner_config or {}
+        self.verbose = verbose
+        # Rescanning scanner for in-process validation, built on first use
+        self._scanner: Optional['CodeScanner'] = None
+
+    def validate(self, suggestions: List[Suggestion]) -> List[FixCheck]:
+        """Return a FixCheck for every suggestion, in order."""
+        checks: List[Optional[FixCheck]] = [None] * len(suggestions)
+        by_file: Dict[str, List[_Candidate]] = defaultdict(list)
+        for position, suggestion in enumerate(suggestions):
+            reason = precheck(suggestion)
+            if reason:
+                checks[position] = FixCheck(False, reason)
+            else:
+                by_file[suggestion.file_path].append(
+                    (position, suggestion, _edit_for(suggestion), _rule_ids(suggestion)))
+
+        for position, check in self._run(list(by_file.items())):
+            checks[position] = check
+        return checks
+
+    def validate_one(self, suggestion: Suggestion) -> FixCheck:
+        """Validate a single suggestion in this process."""
+        reason = precheck(suggestion)
+        if reason:
+            return FixCheck(False, reason)
+        candidate = (0, suggestion, _edit_for(suggestion), _rule_ids(suggestion))
+        return self._run_serial([(suggestion.file_path, [candidate])])[0][1]
+
+    def _run(self, tasks: List[Tuple[str, List[_Candidate]]]) -> List[Tuple[int, FixCheck]]:
+        """Validate the per-file tasks, across a process pool when there are several files."""
+        total_fixes = sum(len(candidates) for _, candidates in tasks)
+        executor = None
+        if total_fixes >= MIN_PARALLEL_FIXES:
+            executor = start_pool(self.workers, len(tasks), _init_validation_worker,
+                                  (self.scanner_config if self.rescan else None,),
+                                  label='fix validation', verbose=self.verbose)
+        if executor is None:
+            return self._run_serial(tasks)
+
+        size = chunk_size(len(tasks), self.workers)
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            futures = [executor.submit(_validate_files_in_worker, tasks[i:i + size])
+                       for i in range(0, len(tasks), size)]
+            checks = []
+            for future in futures:
+                checks.extend(future.result())
+            return checks
+        except (OSError, BrokenProcessPool, RuntimeError) as e:
+            if self.verbose:
+                print(f"⚠️  Parallel fix validation failed ({e}), validating serially", file=sys.stderr)
+            return self._run_serial(tasks)
+        finally:
+            executor.shutdown()
+
+    def _run_serial(self, tasks: List[Tuple[str, List[_Candidate]]]) -> List[Tuple[int, FixCheck]]:
+        if self.rescan and self._scanner is None:
+            self._scanner = _build_scanner(self.scanner_config)
+        return _validate_files(tasks, self._scanner if self.rescan else None)
@@ -5,12 +5,13 @@ Interactive fixer for applying batch fixes with user authorization.
 import re
 import ast
 from pathlib import Path
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional
 from collections import defaultdict
 
 import click
 
 from kirolinter.core.engine import AnalysisResults
+from kirolinter.core.fix_transaction import FixTransaction, LineEdit, sibling_backup
 from kirolinter.models.issue import Issue, IssueType
 
 
@@ -59,14 +60,20 @@ class InteractiveFixer:
         click.echo("\n💡 Run without --dry-run to apply fixes interactively")
     
     def apply_interactive_fixes(self, results: AnalysisResults) -> int:
-        """Apply fixes interactively with user authorization."""
+        """
+        Apply fixes interactively with user authorization.
+        
+        Fixes approved for every rule are collected first and then written
+        together, so each file is rewritten and backed up at most once.
+        """
         fixable_issues = self._group_fixable_issues(results)
         
         if not fixable_issues:
             click.echo("ℹ️  No automatically fixable issues found")
             return 0
         
-        total_applied = 0
+        transaction = FixTransaction(backup=sibling_backup)
+        approved = []
         
         for rule_id, issues in fixable_issues.items():
             rule_name = rule_id.replace('_', ' ').title()
@@ -93,13 +100,17 @@ class InteractiveFixer:
             
             # Ask for confirmation
             if click.confirm(f"\n❓ Apply fixes for all {len(issues)} {rule_name} issues?"):
-                applied = self._apply_fixes_for_rule(rule_id, issues)
-                total_applied += applied
-                click.echo(f"✅ Applied {applied} {rule_name} fixes")
+                self._stage_fixes_for_rule(transaction, rule_id, issues)
+                approved.append(rule_id)
             else:
                 click.echo(f"⏭️  Skipped {rule_name} fixes")
         
-        return total_applied
+        applied_by_rule = self._commit_fixes(transaction)
+        for rule_id in approved:
+            rule_name = rule_id.replace('_', ' ').title()
+            click.echo(f"✅ Applied {applied_by_rule.get(rule_id, 0)} {rule_name} fixes")
+        
+        return sum(applied_by_rule.values())
     
     def _group_fixable_issues(self, results: AnalysisResults) -> Dict[str, List[Issue]]:
         """Group fixable issues by rule type."""
@@ -112,141 +123,83 @@ class InteractiveFixer:
         
         return dict(fixable_issues)
     
-    def _apply_fixes_for_rule(self, rule_id: str, issues: List[Issue]) -> int:
-        """Apply fixes for a specific rule type."""
+    def _stage_fixes_for_rule(self, transaction: FixTransaction, rule_id: str,
+                              issues: List[Issue]) -> int:
+        """Stage the line edits fixing ``issues``; return how many were staged."""
         if rule_id not in self.fixable_rules:
             return 0
         
         fixer_func = self.fixable_rules[rule_id]
-        applied_count = 0
+        staged = 0
         
-        # Group by file to process efficiently
-        by_file = defaultdict(list)
         for issue in issues:
-            by_file[issue.file_path].append(issue)
+            line = transaction.line(issue.file_path, issue.line_number)
+            new_line = fixer_func(line, issue) if line else None
+            if new_line is not None and new_line != line:
+                if transaction.stage(issue.file_path, LineEdit.replace(issue.line_number, new_line, issue)):
+                    staged += 1
         
-        for file_path, file_issues in by_file.items():
-            try:
-                if self._apply_fixes_to_file(file_path, file_issues, fixer_func):
-                    applied_count += len(file_issues)
-                    if self.verbose:
-                        click.echo(f"   ✅ Fixed {len(file_issues)} issues in {file_path}")
-            except Exception as e:
+        return staged
+    
+    def _commit_fixes(self, transaction: FixTransaction) -> Dict[str, int]:
+        """Write every staged fix, one write per file; return applied fixes per rule."""
+        applied_by_rule = defaultdict(int)
+        
+        for file_path, result in transaction.commit().items():
+            if result.error:
                 if self.verbose:
-                    click.echo(f"   ❌ Failed to fix issues in {file_path}: {e}")
+                    click.echo(f"   ❌ Failed to fix issues in {file_path}: {result.error}")
+                continue
+            for issue in result.applied:
+                applied_by_rule[issue.rule_id] += 1
+            if self.verbose:
+                click.echo(f"   ✅ Fixed {len(result.applied)} issues in {file_path}")
         
-        return applied_count
+        return dict(applied_by_rule)
     
-    def _apply_fixes_to_file(self, file_path: str, issues: List[Issue], fixer_func) -> bool:
-        """Apply fixes to a single file."""
-        try:
-            path = Path(file_path)
-            if not path.exists():
-                return False
-            
-            # Read original content
-            original_content = path.read_text(encoding='utf-8')
+    def _fix_unused_variable(self, line: str, issue: Issue) -> Optional[str]:
+        """Fix an unused variable by commenting out its assignment."""
+        # Extract variable name from message
+        var_match = re.search(r"Unused variable '([^']+)'", issue.message)
+        if var_match:
+            var_name = var_match.group(1)
             
-            # Create backup
-            backup_path = path.with_suffix(path.suffix + '.kirolinter-backup')
-            backup_path.write_text(original_content, encoding='utf-8')
-            
-            # Apply fixes
-            modified_content = fixer_func(original_content, issues)
-            
-            if modified_content != original_content:
-                path.write_text(modified_content, encoding='utf-8')
-                return True
-            else:
-                # Remove backup if no changes
-                backup_path.unlink()
-                return False
-                
-        except Exception as e:
-            if self.verbose:
-                click.echo(f"Error fixing {file_path}: {e}")
-            return False
+            # Simple removal for assignment statements
+            if f"{var_name} =" in line and not line.strip().startswith('#'):
+                # Check if it's a simple assignment we can remove
+                if re.match(rf'^\s*{re.escape(var_name)}\s*=', line.strip()):
+                    return f"# {line}  # Removed unused variable"
+        return None
     
-    def _fix_unused_variable(self, content: str, issues: List[Issue]) -> str:
-        """Fix unused variable issues."""
-        lines = content.split('\n')
-        
-        # Sort issues by line number in reverse order to avoid line number shifts
-        sorted_issues = sorted(issues, key=lambda x: x.line_number, reverse=True)
-        
-        for issue in sorted_issues:
-            line_idx = issue.line_number - 1
-            if 0 <= line_idx < len(lines):
-                line = lines[line_idx]
-                
-                # Extract variable name from message
-                var_match = re.search(r"Unused variable '([^']+)'", issue.message)
-                if var_match:
-                    var_name = var_match.group(1)
-                    
-                    # Simple removal for assignment statements
-                    if f"{var_name} =" in line and not line.strip().startswith('#'):
-                        # Check if it's a simple assignment we can remove
-                        if re.match(rf'^\s*{re.escape(var_name)}\s*=', line.strip()):
-                            lines[line_idx] = f"# {line}  # Removed unused variable"
-        
-        return '\n'.join(lines)
-    
-    def _fix_unused_import(self, content: str, issues: List[Issue]) -> str:
-        """Fix unused import issues."""
-        lines = content.split('\n')
-        
-        # Sort issues by line number in reverse order
-        sorted_issues = sorted(issues, key=lambda x: x.line_number, reverse=True)
-        
-        for issue in sorted_issues:
-            line_idx = issue.line_number - 1
-            if 0 <= line_idx < len(lines):
-                line = lines[line_idx]
-                
-                # Only remove if it's clearly an import line
-                if line.strip().startswith(('import ', 'from ')) and not line.strip().startswith('#'):
-                    lines[line_idx] = f"# {line}  # Removed unused import"
-        
-        return '\n'.join(lines)
+    def _fix_unused_import(self, line: str, issue: Issue) -> Optional[str]:
+        """Fix an unused import by commenting it out."""
+        # Only remove if it's clearly an import line
+        if line.strip().startswith(('import ', 'from ')) and not line.strip().startswith('#'):
+            return f"# {line}  # Removed unused import"
+        return None
     
-    def _fix_inefficient_concat(self, content: str, issues: List[Issue]) -> str:
-        """Fix inefficient list concatenation issues."""
-        lines = content.split('\n')
-        
-        for issue in issues:
-            line_idx = issue.line_number - 1
-            if 0 <= line_idx < len(lines):
-                line = lines[line_idx]
-                
-                # Look for pattern: result = result + [item]
-                concat_pattern = r'(\w+)\s*=\s*\1\s*\+\s*\[([^\]]+)\]'
-                match = re.search(concat_pattern, line)
-                
-                if match:
-                    var_name = match.group(1)
-                    item = match.group(2)
-                    
-                    # Replace with append
-                    new_line = re.sub(concat_pattern, rf'{var_name}.append({item})', line)
-                    lines[line_idx] = new_line + "  # Fixed inefficient concatenation"
-        
-        return '\n'.join(lines)
+    def _fix_inefficient_concat(self, line: str, issue: Issue) -> Optional[str]:
+        """Fix inefficient list concatenation."""
+        # Look for pattern: result = result + [item]
+        concat_pattern = r'(\w+)\s*=\s*\1\s*\+\s*\[([^\]]+)\]'
+        match = re.search(concat_pattern, line)
+        
+        if match:
+            var_name = match.group(1)
+            item = match.group(2)
+            
+            # Replace with append
+            new_line = re.sub(concat_pattern, rf'{var_name}.append({item})', line)
+            return new_line + "  # Fixed inefficient concatenation"
+        return None
     
-    def _fix_redundant_len(self, content: str, issues: List[Issue]) -> str:
+    def _fix_redundant_len(self, line: str, issue: Issue) -> Optional[str]:
         """Fix redundant len() calls in loops."""
         # This is more complex and would require AST manipulation
         # For now, just add comments
-        lines = content.split('\n')
-        
-        for issue in issues:
-            line_idx = issue.line_number - 1
-            if 0 <= line_idx < len(lines):
-                line = lines[line_idx]
-                if not line.strip().endswith('# TODO: Cache len() result'):
-                    lines[line_idx] = line + "  # TODO: Cache len() result"
-        
-        return '\n'.join(lines)
+        if not line.strip().endswith('# TODO: Cache len() result'):
+            return line + "  # TODO: Cache len() result"
+        return None
 
 
 class BatchFixSummary:
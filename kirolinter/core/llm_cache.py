@@ -0,0 +1,321 @@
+"""
+Persistent cache of LLM completions.
+
+Responses are keyed by model, temperature, request parameters and a hash of
+the normalized prompt, so a rule firing on identical code in many files, or
+on every nightly run, is answered without calling the provider again.
+Entries live in SQLite (default) or Redis, expire after a TTL and are
+evicted least-recently-used beyond a maximum entry count.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Prompt lines that only locate an issue; masked so identical code in different files shares an entry
+_LOCATION_LINE = re.compile(r'^([ \t]*-[ \t]*(?:File|Line)[ \t]*:).*$', re.MULTILINE)
+_TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+_BLANK_RUNS = re.compile(r'\n{3,}')
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt for cache keying.
+
+    Line endings, trailing whitespace and runs of blank lines are unified,
+    and ``- File:``/``- Line:`` location lines are masked. Indentation is
+    kept because it is significant in Python code.
+    """
+    text = prompt.replace('\r\n', '\n').replace('\r', '\n')
+    text = _TRAILING_SPACE.sub('', text)
+    text = _LOCATION_LINE.sub(r'\1 *', text)
+    return _BLANK_RUNS.sub('\n\n', text).strip()
+
+
+def make_cache_key(model: str, temperature: float, prompt: str,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """Compute the cache key of a completion request."""
+    header = json.dumps({'model': model, 'temperature': round(float(temperature), 4),
+                         'params': params or {}}, sort_keys=True, default=str)
+    digest = hashlib.sha256(header.encode())
+    digest.update(b'\0')
+    digest.update(normalize_prompt(prompt).encode())
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """Base class of LLM response caches; subclasses implement ``_get`` and ``_put``."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache in this session."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def get(self, model: str, temperature: float, prompt: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached response for a request, or None."""
+        key = make_cache_key(model, temperature, prompt, params)
+        try:
+            response = self._get(key)
+        except Exception:
+            self._count('errors')
+            response = None
+        self._count('hits' if response is not None else 'misses')
+        return response
+
+    def put(self, model: str, temperature: float, prompt: str, response: str,
+            params: Optional[Dict[str, Any]] = None):
+        """Store the response to a request."""
+        if not response:
+            return
+        try:
+            self._put(make_cache_key(model, temperature, prompt, params), response)
+        except Exception:
+            self._count('errors')
+
+    def get_or_complete(self, model: str, temperature: float, prompt: str,
+                        complete: Callable[[], str],
+                        params: Optional[Dict[str, Any]] = None) -> str:
+        """Return the cached response, or call ``complete`` and cache its result."""
+        response = self.get(model, temperature, prompt, params)
+        if response is None:
+            response = complete()
+            self.put(model, temperature, prompt, response, params)
+        return response
+
+    def summary(self) -> str:
+        """One-line description of this session's cache use."""
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses "
+                f"({self.hit_rate:.0%} hit rate)")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _put(self, key: str, response: str):
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every cached response."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the underlying storage."""
+
+
+class SQLiteLLMCache(LLMResponseCache):
+    """LLM response cache in a local SQLite database, safe to share between threads."""
+
+    def __init__(self, cache_dir: Path, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl_seconds: Age after which a response is no longer served
+            max_entries: Number of stored responses before eviction kicks in
+        """
+        super().__init__(ttl_seconds, max_entries)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'responses.db'
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)'
+        )
+        self.conn.commit()
+        self.entries = self.conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT response, created FROM llm_responses WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self.conn.execute('DELETE FROM llm_responses WHERE cache_key = ?', (key,))
+                self.conn.commit()
+                self.entries -= 1
+                self._count('expired')
+                return None
+            self.conn.execute(
+                'UPDATE llm_responses SET last_used = ? WHERE cache_key = ?', (now, key)
+            )
+            self.conn.commit()
+        return row[0]
+
+    def _put(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            exists = self.conn.execute(
+                'SELECT 1 FROM llm_responses WHERE cache_key = ?', (key,)
+            ).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO llm_responses (cache_key, response, created, last_used) '
+                'VALUES (?, ?, ?, ?)', (key, response, now, now)
+            )
+            if not exists:
+                self.entries += 1
+            if self.max_entries and self.entries > self.max_entries:
+                self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones down to 90% of the limit."""
+        if self.ttl_seconds:
+            expired = self.conn.execute(
+                'DELETE FROM llm_responses WHERE created < ?', (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self.entries -= expired
+            self._count('evictions', expired)
+
+        overflow = self.entries - int(self.max_entries * 0.9)
+        if overflow > 0:
+            self.conn.execute(
+                'DELETE FROM llm_responses WHERE cache_key IN '
+                '(SELECT cache_key FROM llm_responses ORDER BY last_used LIMIT ?)', (overflow,)
+            )
+            self.entries -= overflow
+            self._count('evictions', overflow)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute('DELETE FROM llm_responses')
+            self.conn.commit()
+            self.entries = 0
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
+
+
+class RedisLLMCache(LLMResponseCache):
+    """LLM response cache in Redis, shared by every process using the same server."""
+
+    def __init__(self, client, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, prefix: str = 'kirolinter:llm:'):
+        """
+        Args:
+            client: Synchronous Redis client
+            ttl_seconds: Redis expiry of each response
+            max_entries: Number of stored responses before eviction kicks in
+            prefix: Key prefix of cached responses
+        """
+        super().__init__(ttl_seconds, max_entries)
+        self.redis = client
+        self.prefix = prefix
+        self.lru_key = f"{prefix}lru"
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs) -> 'RedisLLMCache':
+        """Connect to Redis, raising if the server is unreachable."""
+        if not REDIS_AVAILABLE:
+            raise ImportError("Redis library not available. Install with: pip install redis")
+        client = redis.Redis.from_url(redis_url, decode_responses=True)
+        client.ping()
+        return cls(client, **kwargs)
+
+    def _get(self, key: str) -> Optional[str]:
+        response = self.redis.get(self.prefix + key)
+        if response is None:
+            # Expired by Redis; drop it from the LRU index as well
+            if self.redis.zrem(self.lru_key, key):
+                self._count('expired')
+            return None
+        self.redis.zadd(self.lru_key, {key: time.time()})
+        return response
+
+    def _put(self, key: str, response: str):
+        pipe = self.redis.pipeline()
+        pipe.set(self.prefix + key, response, ex=self.ttl_seconds or None)
+        pipe.zadd(self.lru_key, {key: time.time()})
+        pipe.zcard(self.lru_key)
+        entries = pipe.execute()[-1]
+
+        if self.max_entries and entries > self.max_entries:
+            victims = [member for member, _ in
+                       self.redis.zpopmin(self.lru_key, entries - int(self.max_entries * 0.9))]
+            if victims:
+                self.redis.delete(*[self.prefix + member for member in victims])
+                self._count('evictions', len(victims))
+
+    def clear(self):
+        members = self.redis.zrange(self.lru_key, 0, -1)
+        if members:
+            self.redis.delete(*[self.prefix + member for member in members])
+        self.redis.delete(self.lru_key)
+
+
+def create_llm_cache(backend: Optional[str] = None, cache_dir: Optional[str] = None,
+                     redis_url: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                     max_entries: int = DEFAULT_MAX_ENTRIES) -> Optional[LLMResponseCache]:
+    """
+    Create an LLM response cache.
+
+    Unset arguments are read from ``KIROLINTER_LLM_CACHE`` (sqlite, redis or
+    none), ``KIROLINTER_LLM_CACHE_DIR`` and ``REDIS_URL``. A Redis backend
+    that cannot be reached falls back to SQLite.
+
+    Returns:
+        The cache, or None if caching is disabled or no storage is usable
+    """
+    backend = (backend or os.getenv('KIROLINTER_LLM_CACHE', 'sqlite')).lower()
+    if backend in ('none', 'off', 'false', '0', ''):
+        return None
+
+    if backend == 'redis':
+        try:
+            return RedisLLMCache.from_url(redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379'),
+                                          ttl_seconds=ttl_seconds, max_entries=max_entries)
+        except Exception:
+            pass
+
+    cache_dir = cache_dir or os.getenv('KIROLINTER_LLM_CACHE_DIR') or str(Path.cwd() / '.kiro' / 'llm_cache')
+    try:
+        return SQLiteLLMCache(Path(cache_dir), ttl_seconds=ttl_seconds, max_entries=max_entries)
+    except (OSError, sqlite3.Error):
+        return None
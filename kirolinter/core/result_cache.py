@@ -0,0 +1,165 @@
+"""
+Persistent scan result cache for incremental re-analysis.
+
+Results are stored in SQLite keyed by the SHA-256 of a file's content plus a
+fingerprint of the scanner configuration and rule set, so unchanged files
+are never re-parsed and any change to the rules invalidates every entry.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+from kirolinter.core import scanner as scanner_module
+from kirolinter.core.scanner import ScanResult, BaseScanner
+
+
+# Config keys the scanners read; nothing else may invalidate the cache
+SCAN_CONFIG_KEYS = ('max_complexity', 'enabled_rules')
+
+# Version of the stored ScanResult layout; bump when Issue or ScanResult
+# serialization changes so stale rows are never deserialized
+RESULT_FORMAT_VERSION = 1
+
+
+class ResultCache:
+    """On-disk cache of ScanResults with size-based LRU eviction."""
+
+    def __init__(self, cache_dir: Path, fingerprint: str,
+                 max_size_bytes: int = 256 * 1024 * 1024):
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            fingerprint: Hash of the configuration and rule set, see ``compute_fingerprint``
+            max_size_bytes: Total size of stored results before eviction kicks in
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'results.db'
+        self.fingerprint = fingerprint
+        self.max_size_bytes = max_size_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS scan_results (
+                cache_key TEXT PRIMARY KEY,
+                result BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_scan_results_last_used ON scan_results(last_used)'
+        )
+        self.total_size = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM scan_results'
+        ).fetchone()[0]
+
+    @staticmethod
+    def compute_fingerprint(config: Dict[str, Any], scanners: Sequence[BaseScanner]) -> str:
+        """Hash the result format, the scanner configuration, the active rules and the rule code."""
+        digest = hashlib.sha256(f"format:{RESULT_FORMAT_VERSION};".encode())
+        scan_config = {key: config.get(key) for key in SCAN_CONFIG_KEYS}
+        digest.update(json.dumps(scan_config, sort_keys=True, default=str).encode())
+        for scanner in scanners:
+            for rule_cls in scanner.rules:
+                digest.update(f"{type(scanner).__name__}.{rule_cls.__name__};".encode())
+        digest.update(Path(scanner_module.__file__).read_bytes())
+        return digest.hexdigest()
+
+    def key_for(self, file_path: Path, scope: str = '') -> str:
+        """Compute the cache key for the current content of ``file_path``."""
+        digest = hashlib.sha256(Path(file_path).read_bytes())
+        digest.update(self.fingerprint.encode())
+        if scope:
+            digest.update(b'\0scope:' + scope.encode())
+        return digest.hexdigest()
+
+    def get(self, file_path: Path, scope: str = '') -> Tuple[Optional[ScanResult], Optional[str]]:
+        """
+        Look up the cached result for a file.
+
+        Args:
+            file_path: File whose current content is looked up
+            scope: Changed line ranges of a diff-scoped scan, empty for a full scan
+
+        Returns:
+            (result, key) - result is None on a miss; key is None if the file
+            could not be read, in which case the result must not be stored.
+        """
+        try:
+            key = self.key_for(file_path, scope)
+        except OSError:
+            self.stats['misses'] += 1
+            return None, None
+
+        row = self.conn.execute(
+            'SELECT result FROM scan_results WHERE cache_key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None, key
+
+        self.conn.execute(
+            'UPDATE scan_results SET last_used = ? WHERE cache_key = ?', (time.time(), key)
+        )
+        self.stats['hits'] += 1
+
+        # Identical content may live at another path; results are stored path-free
+        data = json.loads(zlib.decompress(row[0]))
+        path = str(file_path)
+        data['file_path'] = path
+        for issue in data['issues']:
+            issue['file_path'] = path
+        return ScanResult.from_dict(data), key
+
+    def put(self, key: str, result: ScanResult):
+        """Store a scan result under ``key``."""
+        blob = zlib.compress(json.dumps(result.to_dict()).encode())
+        previous = self.conn.execute(
+            'SELECT size FROM scan_results WHERE cache_key = ?', (key,)
+        ).fetchone()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO scan_results (cache_key, result, size, last_used) VALUES (?, ?, ?, ?)',
+            (key, blob, len(blob), time.time())
+        )
+        self.total_size += len(blob) - (previous[0] if previous else 0)
+        if self.total_size > self.max_size_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is at 80% of its limit."""
+        target = int(self.max_size_bytes * 0.8)
+        rows = self.conn.execute(
+            'SELECT cache_key, size FROM scan_results ORDER BY last_used'
+        )
+        victims = []
+        for cache_key, size in rows:
+            if self.total_size <= target:
+                break
+            victims.append((cache_key,))
+            self.total_size -= size
+        self.conn.executemany('DELETE FROM scan_results WHERE cache_key = ?', victims)
+        self.stats['evictions'] += len(victims)
+
+    def clear(self):
+        """Remove every cached result."""
+        self.conn.execute('DELETE FROM scan_results')
+        self.conn.commit()
+        self.total_size = 0
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
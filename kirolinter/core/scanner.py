@@ -1,15 +1,22 @@
 """
 Code scanner module for detecting issues in Python code using AST analysis.
+
+Each file is read and parsed once. Rules are small visitor classes that
+declare ``visit_<NodeType>`` (and optionally ``leave_<NodeType>``) methods;
+a single depth-first walk over the tree dispatches every node only to the
+rules that registered interest in its type.
 """
 
 import ast
 import re
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Any
-from dataclasses import dataclass
+from typing import List, Dict, Set, Optional, Any, Sequence, Tuple, Type, Iterator
+from dataclasses import dataclass, field
 
 from kirolinter.models.issue import Issue, IssueType, IssueSeverity
 from kirolinter.utils.ast_helpers import ASTHelper
+from kirolinter.utils.source_cache import source_cache
+from kirolinter.utils.git_diff import ChangedLines
 
 
 @dataclass
@@ -19,488 +26,803 @@ class ScanResult:
     issues: List[Issue]
     parse_errors: List[str]
     metrics: Dict[str, Any]
-    
+
     def has_critical_issues(self) -> bool:
         """Check if any issue has critical severity."""
         return any(issue.severity == IssueSeverity.CRITICAL for issue in self.issues)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert scan result to dictionary representation."""
+        return {
+            "file_path": self.file_path,
+            "issues": [issue.to_dict() for issue in self.issues],
+            "parse_errors": self.parse_errors,
+            "metrics": self.metrics
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScanResult':
+        """Create ScanResult from dictionary representation."""
+        return cls(
+            file_path=data["file_path"],
+            issues=[Issue.from_dict(issue) for issue in data.get("issues", [])],
+            parse_errors=data.get("parse_errors", []),
+            metrics=data.get("metrics", {})
+        )
+
+
+_LOOP_TYPES = frozenset((ast.For, ast.AsyncFor, ast.While))
+_FUNCTION_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda))
+
+
+class ASTIndex:
+    """
+    Structural index of one file's AST, filled in during the shared walk.
+
+    For every node it records the parent, the innermost enclosing loop and
+    function, and the loop whose header (``for`` iterable or ``while`` test)
+    contains the node. Loop context stops at function boundaries: a function
+    defined inside a loop is not itself in that loop. Ancestor information
+    for a node is complete by the time its ``visit_`` handlers run; the
+    per-type node lists are complete once the walk has finished.
+    """
+
+    __slots__ = ('_info', '_by_type')
+
+    def __init__(self):
+        # node -> (parent, enclosing loop, header loop, enclosing function)
+        self._info: Dict[ast.AST, tuple] = {}
+        self._by_type: Dict[type, List[ast.AST]] = {}
+
+    @classmethod
+    def build(cls, tree: ast.AST) -> 'ASTIndex':
+        """Index a whole tree in one pass, outside of a rule walk."""
+        index = cls()
+        stack: List[Tuple[ast.AST, Optional[ast.AST]]] = [(tree, None)]
+        while stack:
+            node, parent = stack.pop()
+            index.add(node, parent)
+            stack.extend((child, node) for child in reversed(list(ast.iter_child_nodes(node))))
+        return index
+
+    def add(self, node: ast.AST, parent: Optional[ast.AST]):
+        """Record ``node``; its parent must already have been added."""
+        if parent is None:
+            info = (None, None, None, None)
+        else:
+            parent_type = type(parent)
+            if parent_type in _LOOP_TYPES:
+                in_header = node is (parent.test if parent_type is ast.While else parent.iter)
+                info = (parent, parent, parent if in_header else self._info[parent][2],
+                        self._info[parent][3])
+            elif parent_type in _FUNCTION_TYPES:
+                info = (parent, None, None, parent)
+            else:
+                _, loop, header, function = self._info[parent]
+                info = (parent, loop, header, function)
+        self._info[node] = info
+
+        nodes = self._by_type.get(type(node))
+        if nodes is None:
+            self._by_type[type(node)] = [node]
+        else:
+            nodes.append(node)
+
+    def parent(self, node: ast.AST) -> Optional[ast.AST]:
+        """Return the parent of ``node``, or None for the module."""
+        return self._info[node][0]
+
+    def enclosing_loop(self, node: ast.AST) -> Optional[ast.AST]:
+        """Return the innermost loop containing ``node`` in the same function."""
+        return self._info[node][1]
+
+    def loop_header(self, node: ast.AST) -> Optional[ast.AST]:
+        """Return the loop whose ``for`` iterable or ``while`` test contains ``node``."""
+        return self._info[node][2]
+
+    def enclosing_function(self, node: ast.AST) -> Optional[ast.AST]:
+        """Return the innermost function or lambda containing ``node``."""
+        return self._info[node][3]
+
+    def ancestors(self, node: ast.AST) -> Iterator[ast.AST]:
+        """Yield the ancestors of ``node``, innermost first."""
+        parent = self._info[node][0]
+        while parent is not None:
+            yield parent
+            parent = self._info[parent][0]
+
+    def nodes_of_type(self, *node_types: type) -> List[ast.AST]:
+        """Return all nodes of the given exact types, in walk order per type."""
+        if len(node_types) == 1:
+            return list(self._by_type.get(node_types[0], ()))
+        return [node for node_type in node_types for node in self._by_type.get(node_type, ())]
+
+
+# Scope status of a node during a diff-scoped walk
+_SCOPE_OUT, _SCOPE_PARTIAL, _SCOPE_FULL = 0, 1, 2
+
+
+class ScanScope:
+    """
+    Restrict line-scoped rules to the parts of a file touched by a diff.
+
+    Functions and module- or class-level statements that overlap a changed
+    line are analysed in full. A class containing changes is entered, but
+    only its affected members are analysed. Rules marked ``whole_file``
+    still see every node.
+    """
+
+    def __init__(self, changed: ChangedLines):
+        self.changed = changed
+        self.spans: List[Tuple[int, int]] = []  # fully analysed line spans
+
+    def child_status(self, node: ast.AST) -> int:
+        """Classify a child of a partially analysed node (the module or a class)."""
+        start = getattr(node, 'lineno', None)
+        if start is None:
+            return _SCOPE_FULL
+        end = getattr(node, 'end_lineno', None) or start
+        for decorator in getattr(node, 'decorator_list', ()):
+            start = min(start, decorator.lineno)
+
+        if not self.changed.overlaps(start, end):
+            return _SCOPE_OUT
+        if isinstance(node, ast.ClassDef):
+            return _SCOPE_PARTIAL
+        self.spans.append((start, end))
+        return _SCOPE_FULL
+
+    def contains(self, line_number: int) -> bool:
+        """Check whether a line lies in a fully analysed span."""
+        return any(start <= line_number <= end for start, end in self.spans)
+
+
+@dataclass
+class ParsedFile:
+    """Source text, AST and structural index of a file, shared by all rules."""
+    file_path: str
+    content: str
+    tree: ast.AST
+    index: ASTIndex = field(default_factory=ASTIndex)
+    scope: Optional[ScanScope] = None
+
+    @classmethod
+    def from_path(cls, file_path: Path) -> 'ParsedFile':
+        """Read and parse a Python file. Raises SyntaxError on invalid code."""
+        return cls.from_source(file_path, source_cache.load(file_path).text)
+
+    @classmethod
+    def from_source(cls, file_path: Path, content: str) -> 'ParsedFile':
+        """Parse ``content`` as the text of ``file_path``. Raises SyntaxError on invalid code."""
+        tree = ast.parse(content, filename=str(file_path))
+        return cls(file_path=str(file_path), content=content, tree=tree)
+
+
+class Rule:
+    """
+    Base class for a single analysis rule.
+
+    A fresh rule instance is created per file. Subclasses define
+    ``visit_<NodeType>(node)`` / ``leave_<NodeType>(node)`` methods for the
+    node types they care about, collect issues in ``self.issues`` and may
+    override ``finish`` for whole-file checks that run after the walk.
+
+    In a diff-scoped scan only rules with ``whole_file = True`` see nodes
+    outside the changed code; line-based checks in ``finish`` should consult
+    ``in_scope``.
+    """
+
+    # Needs every node of the file even when only part of it changed
+    whole_file = False
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        self.scanner = scanner
+        self.config = scanner.config
+        self.parsed = parsed
+        self.index = parsed.index
+        self.file_path = parsed.file_path
+        self.issues: List[Issue] = []
+
+    def finish(self) -> List[Issue]:
+        """Return the issues found once the walk is complete."""
+        return self.issues
+
+    def in_scope(self, line_number: int) -> bool:
+        """Check whether a line is part of the code being analysed."""
+        scope = self.parsed.scope
+        return scope is None or scope.contains(line_number)
+
+
+class MetricsCollector(Rule):
+    """Collect basic code metrics during the shared walk."""
+
+    whole_file = True
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        super().__init__(scanner, parsed)
+        self.functions = 0
+        self.classes = 0
+        self.imports = 0
+
+    def visit_FunctionDef(self, node):
+        self.functions += 1
+
+    def visit_ClassDef(self, node):
+        self.classes += 1
+
+    def visit_Import(self, node):
+        self.imports += 1
+
+    visit_ImportFrom = visit_Import
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the collected metrics."""
+        return {
+            'lines_of_code': len(self.parsed.content.splitlines()),
+            'functions': self.functions,
+            'classes': self.classes,
+            'imports': self.imports
+        }
+
+
+def walk_rules(tree: ast.AST, rules: Sequence[Rule],
+               index: Optional[ASTIndex] = None,
+               scope: Optional[ScanScope] = None) -> Dict[Rule, Exception]:
+    """
+    Walk ``tree`` once in depth-first pre-order, dispatching each node to the
+    ``visit_``/``leave_`` handlers of every rule registered for its type.
+
+    If ``index`` is given it is filled in during the same pass, each node
+    being added before its handlers run. With a ``scope``, nodes outside the
+    changed code are only dispatched to ``whole_file`` rules. A rule that
+    raises is dropped from the rest of the walk; the failures are returned
+    so the owning scanner can decide how to report them.
+    """
+    dispatch: Dict[type, Tuple[tuple, tuple]] = {}
+    limited_dispatch: Dict[type, Tuple[tuple, tuple]] = {}
+    failed: Dict[Rule, Exception] = {}
+    active = list(rules)
+    add_to_index = index.add if index is not None else None
+
+    def handlers_for(node_type: type, limited: bool) -> Tuple[tuple, tuple]:
+        name = node_type.__name__
+        candidates = [r for r in active if r.whole_file] if limited else active
+        enter = tuple(h for h in (getattr(r, 'visit_' + name, None) for r in candidates) if h)
+        leave = tuple(h for h in (getattr(r, 'leave_' + name, None) for r in candidates) if h)
+        (limited_dispatch if limited else dispatch)[node_type] = (enter, leave)
+        return enter, leave
+
+    # Entries are (node, parent, leaving, scope status)
+    root_status = _SCOPE_PARTIAL if scope is not None else _SCOPE_FULL
+    stack: List[Tuple[ast.AST, Optional[ast.AST], bool, int]] = [(tree, None, False, root_status)]
+    while stack:
+        node, parent, leaving, status = stack.pop()
+        if not leaving and add_to_index:
+            add_to_index(node, parent)
+        node_type = type(node)
+        if status == _SCOPE_OUT:
+            enter, leave = limited_dispatch.get(node_type) or handlers_for(node_type, True)
+        else:
+            enter, leave = dispatch.get(node_type) or handlers_for(node_type, False)
+        callbacks = leave if leaving else enter
+        for callback in callbacks:
+            try:
+                callback(node)
+            except Exception as e:
+                rule = callback.__self__
+                failed[rule] = e
+                active.remove(rule)
+                dispatch.clear()
+                limited_dispatch.clear()
+        if leaving:
+            continue
+        if leave:
+            stack.append((node, parent, True, status))
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        if status == _SCOPE_PARTIAL:
+            stack.extend((child, node, False, scope.child_status(child)) for child in children)
+        else:
+            stack.extend((child, node, False, status) for child in children)
+
+    return failed
+
 
 class BaseScanner:
     """Base class for all code scanners."""
-    
+
+    # Rule classes run by this scanner, in the order their issues are reported
+    rules: Tuple[Type[Rule], ...] = ()
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.ast_helper = ASTHelper()
-    
-    def scan_file(self, file_path: Path) -> ScanResult:
-        """Scan a single Python file for issues."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse AST
-            tree = ast.parse(content, filename=str(file_path))
-            
-            # Run analysis
-            issues = self._analyze_ast(tree, str(file_path), content)
-            metrics = self._calculate_metrics(tree, content)
-            
-            return ScanResult(
-                file_path=str(file_path),
-                issues=issues,
-                parse_errors=[],
-                metrics=metrics
-            )
-            
-        except SyntaxError as e:
-            return ScanResult(
-                file_path=str(file_path),
-                issues=[],
-                parse_errors=[f"Syntax error: {str(e)}"],
-                metrics={}
-            )
-        except Exception as e:
-            return ScanResult(
-                file_path=str(file_path),
-                issues=[],
-                parse_errors=[f"Analysis error: {str(e)}"],
-                metrics={}
-            )
-    
-    def _analyze_ast(self, tree: ast.AST, file_path: str, content: str) -> List[Issue]:
-        """Override in subclasses to implement specific analysis."""
-        raise NotImplementedError
-    
-    def _calculate_metrics(self, tree: ast.AST, content: str) -> Dict[str, Any]:
-        """Calculate basic code metrics."""
-        return {
-            'lines_of_code': len(content.splitlines()),
-            'functions': len([n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]),
-            'classes': len([n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]),
-            'imports': len([n for n in ast.walk(tree) if isinstance(n, (ast.Import, ast.ImportFrom))])
-        }
 
+    def scan_file(self, file_path: Path, changed_lines: Optional[ChangedLines] = None) -> ScanResult:
+        """Scan a single Python file for issues, optionally only its changed code."""
+        return scan_with(file_path, [self], changed_lines)
+
+    def create_rules(self, parsed: ParsedFile) -> List[Rule]:
+        """Instantiate this scanner's rules for one file."""
+        return [rule_cls(self, parsed) for rule_cls in self.rules]
+
+    def collect_issues(self, rules: List[Rule], failed: Dict[Rule, Exception],
+                       errors: List[str]) -> List[Issue]:
+        """
+        Gather issues from this scanner's rules after the walk.
+
+        By default a failing rule invalidates the whole scanner's output and
+        is reported as an analysis error.
+        """
+        for rule in rules:
+            if rule in failed:
+                errors.append(f"Analysis error: {str(failed[rule])}")
+                return []
 
-class CodeSmellScanner(BaseScanner):
-    """Scanner for detecting code smells like unused variables."""
-    
-    def _analyze_ast(self, tree: ast.AST, file_path: str, content: str) -> List[Issue]:
-        """Analyze AST for code smell issues."""
         issues = []
-        
-        # Find unused variables
-        issues.extend(self._find_unused_variables(tree, file_path))
-        
-        # Find dead code
-        issues.extend(self._find_dead_code(tree, file_path))
-        
-        # Find complex functions
-        issues.extend(self._find_complex_functions(tree, file_path))
-        
+        for rule in rules:
+            try:
+                issues.extend(rule.finish())
+            except Exception as e:
+                errors.append(f"Analysis error: {str(e)}")
+                return []
         return issues
-    
-    def _find_unused_variables(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find unused variables in the AST."""
-        issues = []
-        
-        # Track variable assignments and usage
-        assigned_vars = {}  # name -> (line_number, node)
-        used_vars = set()
-        
-        class VariableVisitor(ast.NodeVisitor):
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Store):
-                    # Variable assignment
-                    assigned_vars[node.id] = (node.lineno, node)
-                elif isinstance(node.ctx, ast.Load):
-                    # Variable usage
-                    used_vars.add(node.id)
-                self.generic_visit(node)
-            
-            def visit_FunctionDef(self, node):
-                # Function parameters are considered used
-                for arg in node.args.args:
-                    used_vars.add(arg.arg)
-                self.generic_visit(node)
-            
-            def visit_For(self, node):
-                # For loop variables are considered used
-                if isinstance(node.target, ast.Name):
-                    used_vars.add(node.target.id)
-                elif isinstance(node.target, ast.Tuple):
-                    for elt in node.target.elts:
-                        if isinstance(elt, ast.Name):
-                            used_vars.add(elt.id)
-                self.generic_visit(node)
-        
-        visitor = VariableVisitor()
-        visitor.visit(tree)
-        
-        # Find unused variables
-        for var_name, (line_no, node) in assigned_vars.items():
-            if var_name not in used_vars and not var_name.startswith('_'):
-                issues.append(Issue(
-                    file_path=file_path,
+
+    def _analyze_ast(self, tree: ast.AST, file_path: str, content: str) -> List[Issue]:
+        """Run this scanner's rules over an already parsed tree."""
+        parsed = ParsedFile(file_path=file_path, content=content, tree=tree)
+        rules = self.create_rules(parsed)
+        failed = walk_rules(tree, rules, parsed.index)
+        errors: List[str] = []
+        return self.collect_issues(rules, failed, errors)
+
+
+def scan_with(file_path: Path, scanners: Sequence[BaseScanner],
+              changed_lines: Optional[ChangedLines] = None,
+              content: Optional[str] = None) -> ScanResult:
+    """
+    Read, parse and walk a file once, running every rule of ``scanners``.
+
+    With ``changed_lines`` only the affected functions and statements are
+    analysed by line-scoped rules; see ``ScanScope``. With ``content`` that
+    text is scanned in place of the file on disk.
+    """
+    try:
+        if content is None:
+            parsed = ParsedFile.from_path(file_path)
+        else:
+            parsed = ParsedFile.from_source(file_path, content)
+    except SyntaxError as e:
+        return ScanResult(
+            file_path=str(file_path),
+            issues=[],
+            parse_errors=[f"Syntax error: {str(e)}"],
+            metrics={}
+        )
+    except Exception as e:
+        return ScanResult(
+            file_path=str(file_path),
+            issues=[],
+            parse_errors=[f"Analysis error: {str(e)}"],
+            metrics={}
+        )
+
+    metrics_rule = MetricsCollector(scanners[0], parsed) if scanners else None
+    rules_by_scanner = [(scanner, scanner.create_rules(parsed)) for scanner in scanners]
+    all_rules: List[Rule] = [metrics_rule] if metrics_rule else []
+    for _, rules in rules_by_scanner:
+        all_rules.extend(rules)
+
+    if changed_lines is not None:
+        parsed.scope = ScanScope(changed_lines)
+    failed = walk_rules(parsed.tree, all_rules, parsed.index, parsed.scope)
+
+    issues: List[Issue] = []
+    errors: List[str] = []
+    for scanner, rules in rules_by_scanner:
+        issues.extend(scanner.collect_issues(rules, failed, errors))
+
+    return ScanResult(
+        file_path=parsed.file_path,
+        issues=issues,
+        parse_errors=errors,
+        metrics=metrics_rule.metrics() if metrics_rule and metrics_rule not in failed else {}
+    )
+
+
+# --- Code smell rules -------------------------------------------------------
+
+class UnusedVariableRule(Rule):
+    """Find variables that are assigned but never read."""
+
+    whole_file = True
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        super().__init__(scanner, parsed)
+        self.assigned_vars: Dict[str, int] = {}  # name -> line_number
+        self.used_vars: Set[str] = set()
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            # Variable assignment
+            self.assigned_vars[node.id] = node.lineno
+        elif isinstance(node.ctx, ast.Load):
+            # Variable usage
+            self.used_vars.add(node.id)
+
+    def visit_FunctionDef(self, node):
+        # Function parameters are considered used
+        for arg in node.args.args:
+            self.used_vars.add(arg.arg)
+
+    def visit_For(self, node):
+        # For loop variables are considered used
+        if isinstance(node.target, ast.Name):
+            self.used_vars.add(node.target.id)
+        elif isinstance(node.target, ast.Tuple):
+            for elt in node.target.elts:
+                if isinstance(elt, ast.Name):
+                    self.used_vars.add(elt.id)
+
+    def finish(self) -> List[Issue]:
+        for var_name, line_no in self.assigned_vars.items():
+            if var_name not in self.used_vars and not var_name.startswith('_'):
+                self.issues.append(Issue(
+                    file_path=self.file_path,
                     line_number=line_no,
                     rule_id="unused_variable",
                     message=f"Unused variable '{var_name}'",
                     severity=IssueSeverity.LOW,
                     issue_type="code_quality"
                 ))
-        
-        # Find unused imports
-        issues.extend(self._find_unused_imports(tree, file_path))
-        
-        return issues
-    
-    def _find_unused_imports(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find unused imports in the AST."""
-        issues = []
-        
-        # Get all imports
-        imports = self.ast_helper.get_imports(tree)
-        imported_names = set()
-        import_nodes = {}
-        
-        # Track import statements and their names
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    name = alias.asname if alias.asname else alias.name.split('.')[0]
-                    imported_names.add(name)
-                    import_nodes[name] = (node.lineno, node.col_offset)
-            elif isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    name = alias.asname if alias.asname else alias.name
-                    imported_names.add(name)
-                    import_nodes[name] = (node.lineno, node.col_offset)
-        
-        # Find used names
-        used_names = set()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                used_names.add(node.id)
-        
-        # Find unused imports
-        for import_name in imported_names:
-            if import_name not in used_names and import_name != '*':
-                line_no, col_offset = import_nodes[import_name]
-                issues.append(Issue(
-                    file_path=file_path,
+        return self.issues
+
+
+class UnusedImportRule(Rule):
+    """Find imported names that are never read."""
+
+    whole_file = True
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        super().__init__(scanner, parsed)
+        self.import_nodes: Dict[str, int] = {}  # name -> line_number
+        self.used_names: Set[str] = set()
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            name = alias.asname if alias.asname else alias.name.split('.')[0]
+            self.import_nodes[name] = node.lineno
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            name = alias.asname if alias.asname else alias.name
+            self.import_nodes[name] = node.lineno
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.used_names.add(node.id)
+
+    def finish(self) -> List[Issue]:
+        for import_name, line_no in self.import_nodes.items():
+            if import_name not in self.used_names and import_name != '*':
+                self.issues.append(Issue(
+                    file_path=self.file_path,
                     line_number=line_no,
                     rule_id="unused_import",
                     message=f"Unused import '{import_name}'",
                     severity=IssueSeverity.LOW,
                     issue_type="code_quality"
                 ))
-        
-        return issues
-    
-    def _find_dead_code(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find unreachable code (dead code)."""
-        issues = []
-        
-        class DeadCodeVisitor(ast.NodeVisitor):
-            def visit_FunctionDef(self, node):
-                # Check for code after return statements
-                for i, stmt in enumerate(node.body):
-                    if isinstance(stmt, ast.Return):
-                        # Check if there are statements after this return
-                        if i < len(node.body) - 1:
-                            next_stmt = node.body[i + 1]
-                            issues.append(Issue(
-                                file_path=file_path,
-                                line_number=next_stmt.lineno,
-                                rule_id="dead_code",
-                                message="Unreachable code after return statement",
-                                severity=IssueSeverity.MEDIUM,
-                                issue_type="code_quality"
-                            ))
-                            break
-                self.generic_visit(node)
-        
-        visitor = DeadCodeVisitor()
-        visitor.visit(tree)
-        
-        return issues
-    
-    def _find_complex_functions(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find overly complex functions."""
-        issues = []
-        max_complexity = self.config.get('max_complexity', 10)
-        
-        class ComplexityVisitor(ast.NodeVisitor):
-            def visit_FunctionDef(self, node):
-                complexity = self._calculate_cyclomatic_complexity(node)
-                if complexity > max_complexity:
-                    issues.append(Issue(
-                        file_path=file_path,
-                        line_number=node.lineno,
-                        rule_id="complex_function",
-                        message=f"Function '{node.name}' has high cyclomatic complexity ({complexity})",
-                        severity=IssueSeverity.MEDIUM if complexity <= 15 else IssueSeverity.HIGH,
+        return self.issues
+
+
+class DeadCodeRule(Rule):
+    """Find unreachable code after a return statement."""
+
+    def visit_FunctionDef(self, node):
+        # Check for code after return statements
+        for i, stmt in enumerate(node.body):
+            if isinstance(stmt, ast.Return):
+                # Check if there are statements after this return
+                if i < len(node.body) - 1:
+                    next_stmt = node.body[i + 1]
+                    self.issues.append(Issue(
+                        file_path=self.file_path,
+                        line_number=next_stmt.lineno,
+                        rule_id="dead_code",
+                        message="Unreachable code after return statement",
+                        severity=IssueSeverity.MEDIUM,
                         issue_type="code_quality"
                     ))
-                self.generic_visit(node)
-            
-            def _calculate_cyclomatic_complexity(self, node):
-                """Calculate cyclomatic complexity for a function."""
-                complexity = 1  # Base complexity
-                
-                for child in ast.walk(node):
-                    if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                        complexity += 1
-                    elif isinstance(child, ast.ExceptHandler):
-                        complexity += 1
-                    elif isinstance(child, ast.BoolOp):
-                        complexity += len(child.values) - 1
-                
-                return complexity
-        
-        visitor = ComplexityVisitor()
-        visitor.visit(tree)
-        
-        return issues
+                    break
 
 
-class SecurityScanner(BaseScanner):
-    """Scanner for detecting security vulnerabilities."""
-    
-    def _analyze_ast(self, tree: ast.AST, file_path: str, content: str) -> List[Issue]:
-        """Analyze AST for security issues."""
-        issues = []
-        
-        # Find SQL injection risks
-        issues.extend(self._find_sql_injection_risks(tree, file_path))
-        
-        # Find hardcoded secrets
-        issues.extend(self._find_hardcoded_secrets(tree, file_path, content))
-        
-        # Find unsafe imports and eval usage
-        issues.extend(self._find_unsafe_operations(tree, file_path))
-        
-        return issues
-    
-    def _find_sql_injection_risks(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find potential SQL injection vulnerabilities."""
-        issues = []
-        
-        class SQLInjectionVisitor(ast.NodeVisitor):
-            def visit_Call(self, node):
-                # Check for string formatting in SQL-like contexts
-                if (isinstance(node.func, ast.Attribute) and 
-                    hasattr(node.func, 'attr') and 
-                    node.func.attr in ['execute', 'executemany']):
-                    
-                    if node.args:
-                        arg = node.args[0]
-                        if isinstance(arg, ast.BinOp) and isinstance(arg.op, ast.Mod):
-                            # String formatting with % operator
-                            issues.append(Issue(
-                                file_path=file_path,
+class ComplexityRule(Rule):
+    """
+    Find overly complex functions.
+
+    Cyclomatic complexity is accumulated on the way down and folded into the
+    enclosing function on the way back up, so nested functions are counted
+    towards their parents without re-walking any subtree.
+    """
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        super().__init__(scanner, parsed)
+        self.max_complexity = self.config.get('max_complexity', 10)
+        self.functions: List[list] = []  # [node, complexity] in visit order
+        self.stack: List[list] = []
+
+    def visit_FunctionDef(self, node):
+        entry = [node, 1]  # Base complexity
+        self.functions.append(entry)
+        self.stack.append(entry)
+
+    def leave_FunctionDef(self, node):
+        entry = self.stack.pop()
+        if self.stack:
+            self.stack[-1][1] += entry[1] - 1
+
+    def _add(self, amount: int):
+        if self.stack:
+            self.stack[-1][1] += amount
+
+    def visit_If(self, node):
+        self._add(1)
+
+    visit_While = visit_For = visit_AsyncFor = visit_ExceptHandler = visit_If
+
+    def visit_BoolOp(self, node):
+        self._add(len(node.values) - 1)
+
+    def finish(self) -> List[Issue]:
+        for node, complexity in self.functions:
+            if complexity > self.max_complexity:
+                self.issues.append(Issue(
+                    file_path=self.file_path,
+                    line_number=node.lineno,
+                    rule_id="complex_function",
+                    message=f"Function '{node.name}' has high cyclomatic complexity ({complexity})",
+                    severity=IssueSeverity.MEDIUM if complexity <= 15 else IssueSeverity.HIGH,
+                    issue_type="code_quality"
+                ))
+        return self.issues
+
+
+class CodeSmellScanner(BaseScanner):
+    """Scanner for detecting code smells like unused variables."""
+
+    rules = (UnusedVariableRule, UnusedImportRule, DeadCodeRule, ComplexityRule)
+
+
+# --- Security rules ---------------------------------------------------------
+
+class SQLInjectionRule(Rule):
+    """Find potential SQL injection vulnerabilities."""
+
+    def visit_Call(self, node):
+        # Check for string formatting in SQL-like contexts
+        if (isinstance(node.func, ast.Attribute) and
+            node.func.attr in ['execute', 'executemany'] and
+            node.args):
+            arg = node.args[0]
+            if isinstance(arg, ast.BinOp) and isinstance(arg.op, ast.Mod):
+                # String formatting with % operator
+                self.issues.append(Issue(
+                    file_path=self.file_path,
+                    line_number=node.lineno,
+                    rule_id="sql_injection",
+                    message="Potential SQL injection: use parameterized queries instead of string formatting",
+                    severity=IssueSeverity.HIGH,
+                    issue_type="security"
+                ))
+
+
+# Line-level fallback patterns for hardcoded secrets, as (rule_id, pattern).
+# They are combined into one regex of zero-width lookaheads with a named
+# group per rule, so overlapping matches on a line are still all found.
+SECRET_PATTERNS = (
+    ('hardcoded_password', r'password\s*=\s*["\'][^"\']{8,}["\']'),
+    ('hardcoded_api_key', r'api_key\s*=\s*["\'][A-Za-z0-9]{20,}["\']'),
+    ('hardcoded_secret', r'secret\s*=\s*["\'][A-Za-z0-9]{16,}["\']'),
+    ('hardcoded_token', r'token\s*=\s*["\'][A-Za-z0-9]{20,}["\']'),
+)
+
+# Every pattern starts with one of these literals; lines without any are skipped
+_SECRET_PREFILTER = re.compile('password|api_key|secret|token', re.IGNORECASE)
+_SECRET_REGEX = re.compile(
+    '|'.join(f'(?=(?P<{rule_id}>{pattern}))' for rule_id, pattern in SECRET_PATTERNS),
+    re.IGNORECASE
+)
+_SECRET_RULE_ORDER = {rule_id: i for i, (rule_id, _) in enumerate(SECRET_PATTERNS)}
+
+
+class HardcodedSecretRule(Rule):
+    """Find hardcoded secrets in assignments, with a regex fallback over lines."""
+
+    # Patterns for secret detection in variable names and string values
+    secret_keywords = ['password', 'api_key', 'secret', 'token', 'private_key', 'access_key']
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                var_name = target.id.lower()
+                if any(keyword in var_name for keyword in self.secret_keywords):
+                    if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                        # Skip obvious placeholders
+                        value = node.value.value
+                        if not any(placeholder in value.lower() for placeholder in ['placeholder', 'your_', 'example', 'test']):
+                            self.issues.append(Issue(
+                                file_path=self.file_path,
                                 line_number=node.lineno,
-                                rule_id="sql_injection",
-                                message="Potential SQL injection: use parameterized queries instead of string formatting",
+                                rule_id="hardcoded_secret",
+                                message=f"Potential hardcoded secret in variable '{target.id}'",
                                 severity=IssueSeverity.HIGH,
                                 issue_type="security"
                             ))
-                
-                self.generic_visit(node)
-        
-        visitor = SQLInjectionVisitor()
-        visitor.visit(tree)
-        
-        return issues
-    
-    def _find_hardcoded_secrets(self, tree: ast.AST, file_path: str, content: str) -> List[Issue]:
-        """Find hardcoded secrets in the code."""
-        issues = []
-        
-        # AST-based detection using string literals
-        string_literals = self.ast_helper.find_string_literals(tree)
-        
-        # Patterns for secret detection in variable names and string values
-        secret_keywords = ['password', 'api_key', 'secret', 'token', 'private_key', 'access_key']
-        
-        # Check AST assignments for hardcoded secrets
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        var_name = target.id.lower()
-                        if any(keyword in var_name for keyword in secret_keywords):
-                            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
-                                # Skip obvious placeholders
-                                value = node.value.value
-                                if not any(placeholder in value.lower() for placeholder in ['placeholder', 'your_', 'example', 'test']):
-                                    issues.append(Issue(
-                                        file_path=file_path,
-                                        line_number=node.lineno,
-                                        rule_id="hardcoded_secret",
-                                        message=f"Potential hardcoded secret in variable '{target.id}'",
-                                        severity=IssueSeverity.HIGH,
-                                        issue_type="security"
-                                    ))
-        
+
+    def finish(self) -> List[Issue]:
+        issues = self.issues
+        content = self.parsed.content
+
         # Fallback: regex patterns for edge cases
-        secret_patterns = [
-            (r'password\s*=\s*["\'][^"\']{8,}["\']', 'hardcoded_password'),
-            (r'api_key\s*=\s*["\'][A-Za-z0-9]{20,}["\']', 'hardcoded_api_key'),
-            (r'secret\s*=\s*["\'][A-Za-z0-9]{16,}["\']', 'hardcoded_secret'),
-            (r'token\s*=\s*["\'][A-Za-z0-9]{20,}["\']', 'hardcoded_token'),
-        ]
-        
-        lines = content.splitlines()
-        for line_no, line in enumerate(lines, 1):
-            for pattern, rule_id in secret_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Avoid duplicates from AST detection
-                    existing_issues = {(issue.rule_id, issue.line_number) for issue in issues}
-                    new_issue_key = (rule_id, line_no)
-                    if new_issue_key not in existing_issues:
-                        issues.append(Issue(
-                            file_path=file_path,
-                            line_number=line_no,
-                            rule_id=rule_id,
-                            message=f"Potential hardcoded secret detected (regex fallback)",
-                            severity=IssueSeverity.HIGH,
-                            issue_type="security"
-                        ))
-        
-        return issues
-    
-    def _find_unsafe_operations(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find unsafe operations like eval() usage."""
-        issues = []
-        
-        class UnsafeOperationVisitor(ast.NodeVisitor):
-            def visit_Call(self, node):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in ['eval', 'exec']:
-                        issues.append(Issue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            rule_id=f"unsafe_{node.func.id}",
-                            message=f"Unsafe use of {node.func.id}() function",
-                            severity=IssueSeverity.CRITICAL,
-                            issue_type="security"
-                        ))
-                
-                self.generic_visit(node)
-        
-        visitor = UnsafeOperationVisitor()
-        visitor.visit(tree)
-        
+        if not _SECRET_PREFILTER.search(content):
+            return issues
+
+        # Avoid duplicates from AST detection
+        seen = {(issue.rule_id, issue.line_number) for issue in issues}
+        prefilter = _SECRET_PREFILTER.search
+        finditer = _SECRET_REGEX.finditer
+
+        for line_no, line in enumerate(content.splitlines(), 1):
+            if not prefilter(line) or not self.in_scope(line_no):
+                continue
+            rule_ids = {match.lastgroup for match in finditer(line)}
+            for rule_id in sorted(rule_ids, key=_SECRET_RULE_ORDER.__getitem__):
+                if (rule_id, line_no) not in seen:
+                    seen.add((rule_id, line_no))
+                    issues.append(Issue(
+                        file_path=self.file_path,
+                        line_number=line_no,
+                        rule_id=rule_id,
+                        message=f"Potential hardcoded secret detected (regex fallback)",
+                        severity=IssueSeverity.HIGH,
+                        issue_type="security"
+                    ))
+
         return issues
 
 
+class UnsafeOperationRule(Rule):
+    """Find unsafe operations like eval() usage."""
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in ['eval', 'exec']:
+            self.issues.append(Issue(
+                file_path=self.file_path,
+                line_number=node.lineno,
+                rule_id=f"unsafe_{node.func.id}",
+                message=f"Unsafe use of {node.func.id}() function",
+                severity=IssueSeverity.CRITICAL,
+                issue_type="security"
+            ))
+
+
+class SecurityScanner(BaseScanner):
+    """Scanner for detecting security vulnerabilities."""
+
+    rules = (SQLInjectionRule, HardcodedSecretRule, UnsafeOperationRule)
+
+
+# --- Performance rules ------------------------------------------------------
+
+class InefficientLoopRule(Rule):
+    """
+    Find inefficient loop patterns.
+
+    Every ``+=`` on a name is reported once for each enclosing ``for`` loop;
+    counts are folded into the outer loop on exit instead of re-walking bodies.
+    """
+
+    def __init__(self, scanner: 'BaseScanner', parsed: ParsedFile):
+        super().__init__(scanner, parsed)
+        self.loops: List[list] = []  # [node, concat_count] in visit order
+        self.stack: List[list] = []
+
+    def visit_For(self, node):
+        entry = [node, 0]
+        self.loops.append(entry)
+        self.stack.append(entry)
+
+    def leave_For(self, node):
+        entry = self.stack.pop()
+        if self.stack:
+            self.stack[-1][1] += entry[1]
+
+    def visit_AugAssign(self, node):
+        # Check for list concatenation in loops
+        if (self.stack and
+            isinstance(node.op, ast.Add) and
+            isinstance(node.target, ast.Name)):
+            self.stack[-1][1] += 1
+
+    def finish(self) -> List[Issue]:
+        for node, count in self.loops:
+            for _ in range(count):
+                self.issues.append(Issue(
+                    file_path=self.file_path,
+                    line_number=node.lineno,
+                    rule_id="inefficient_loop_concat",
+                    message="Inefficient list concatenation in loop - consider using list comprehension or join()",
+                    severity=IssueSeverity.MEDIUM,
+                    issue_type="performance"
+                ))
+        return self.issues
+
+
+class RedundantOperationRule(Rule):
+    """Find redundant operations that could be optimized."""
+
+    # This is a simplified example - real implementation would be more sophisticated
+    def visit_Call(self, node):
+        # Check for len() in loops (could be cached)
+        if (isinstance(node.func, ast.Name) and
+            node.func.id == 'len' and
+            self._is_in_loop_condition(node)):
+
+            self.issues.append(Issue(
+                file_path=self.file_path,
+                line_number=node.lineno,
+                rule_id="redundant_len_in_loop",
+                message="Consider caching len() result outside loop",
+                severity=IssueSeverity.LOW,
+                issue_type="performance"
+            ))
+
+    def _is_in_loop_condition(self, node):
+        """Check if a node is in a loop's iterable or condition."""
+        return self.index.loop_header(node) is not None
+
+
 class PerformanceScanner(BaseScanner):
     """Scanner for detecting performance bottlenecks."""
-    
-    def _analyze_ast(self, tree: ast.AST, file_path: str, content: str, config: Dict[str, Any] = None) -> List[Issue]:
-        """Analyze AST for performance issues with graceful error handling."""
+
+    rules = (InefficientLoopRule, RedundantOperationRule)
+
+    def collect_issues(self, rules: List[Rule], failed: Dict[Rule, Exception],
+                       errors: List[str]) -> List[Issue]:
+        """Collect performance issues with graceful error handling."""
         issues = []
-        config = config or {}
-        
-        try:
-            # Find inefficient loops
-            issues.extend(self._find_inefficient_loops(tree, file_path))
-            
-            # Find redundant operations
-            issues.extend(self._find_redundant_operations(tree, file_path))
-            
-        except Exception as e:
+        error = None
+        for rule in rules:
+            if rule in failed:
+                error = failed[rule]
+                continue
+            try:
+                issues.extend(rule.finish())
+            except Exception as e:
+                error = e
+
+        if error is not None:
             # Graceful fallback for intentional parse errors or analysis issues
-            if config.get('verbose', False):
-                print(f"Warning: Performance analysis encountered an issue in {file_path}: {e}")
-            
+            if self.config.get('verbose', False):
+                print(f"Warning: Performance analysis encountered an issue in {rules[0].file_path}: {error}")
+
             # Create a fallback issue to indicate analysis limitation
             issues.append(Issue(
-                file_path=file_path,
+                file_path=rules[0].file_path,
                 line_number=1,
                 rule_id="analysis_fallback",
                 message="Performance analysis encountered limitations - manual review recommended",
                 severity=IssueSeverity.LOW,
                 issue_type="performance"
             ))
-        
-        return issues
-    
-    def _find_inefficient_loops(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find inefficient loop patterns."""
-        issues = []
-        
-        class LoopVisitor(ast.NodeVisitor):
-            def visit_For(self, node):
-                # Check for list concatenation in loops
-                for stmt in ast.walk(node):
-                    if (isinstance(stmt, ast.AugAssign) and 
-                        isinstance(stmt.op, ast.Add) and
-                        isinstance(stmt.target, ast.Name)):
-                        
-                        issues.append(Issue(
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            rule_id="inefficient_loop_concat",
-                            message="Inefficient list concatenation in loop - consider using list comprehension or join()",
-                            severity=IssueSeverity.MEDIUM,
-                            issue_type="performance"
-                        ))
-                
-                self.generic_visit(node)
-        
-        visitor = LoopVisitor()
-        visitor.visit(tree)
-        
-        return issues
-    
-    def _find_redundant_operations(self, tree: ast.AST, file_path: str) -> List[Issue]:
-        """Find redundant operations that could be optimized."""
-        issues = []
-        
-        # This is a simplified example - real implementation would be more sophisticated
-        class RedundantOpVisitor(ast.NodeVisitor):
-            def visit_Call(self, node):
-                # Check for len() in loops (could be cached)
-                if (isinstance(node.func, ast.Name) and 
-                    node.func.id == 'len' and
-                    self._is_in_loop_condition(node)):
-                    
-                    issues.append(Issue(
-                        file_path=file_path,
-                        line_number=node.lineno,
-                        rule_id="redundant_len_in_loop",
-                        message="Consider caching len() result outside loop",
-                        severity=IssueSeverity.LOW,
-                        issue_type="performance"
-                    ))
-                
-                self.generic_visit(node)
-            
-            def _is_in_loop_condition(self, node):
-                """Check if a node is in a loop condition by traversing parent nodes."""
-                # This is a simplified implementation - in a real scenario,
-                # you'd need to track parent nodes during AST traversal
-                current = node
-                while hasattr(current, 'parent'):
-                    parent = current.parent
-                    if isinstance(parent, (ast.For, ast.While)):
-                        # Check if the node is in the condition/iterator part
-                        if (isinstance(parent, ast.For) and current in ast.walk(parent.iter)) or \
-                           (isinstance(parent, ast.While) and current in ast.walk(parent.test)):
-                            return True
-                    current = parent
-                return False
-        
-        visitor = RedundantOpVisitor()
-        visitor.visit(tree)
-        
+
         return issues
 
 
 class CodeScanner:
     """Main scanner that orchestrates all individual scanners."""
-    
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.scanners = [
@@ -508,22 +830,12 @@ class CodeScanner:
             SecurityScanner(config),
             PerformanceScanner(config)
         ]
-    
-    def scan_file(self, file_path: Path) -> ScanResult:
-        """Scan a file using all enabled scanners."""
-        all_issues = []
-        all_errors = []
-        combined_metrics = {}
-        
-        for scanner in self.scanners:
-            result = scanner.scan_file(file_path)
-            all_issues.extend(result.issues)
-            all_errors.extend(result.parse_errors)
-            combined_metrics.update(result.metrics)
-        
-        return ScanResult(
-            file_path=str(file_path),
-            issues=all_issues,
-            parse_errors=all_errors,
-            metrics=combined_metrics
-        )
\ No newline at end of file
+
+    def scan_file(self, file_path: Path, changed_lines: Optional[ChangedLines] = None) -> ScanResult:
+        """Scan a file once, running the rules of all enabled scanners in a single pass."""
+        return scan_with(file_path, self.scanners, changed_lines)
+
+    def scan_source(self, file_path: Path, content: str,
+                    changed_lines: Optional[ChangedLines] = None) -> ScanResult:
+        """Like ``scan_file``, but scan ``content`` (e.g. a patched version) instead of the file on disk."""
+        return scan_with(file_path, self.scanners, changed_lines, content)
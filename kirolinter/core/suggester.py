@@ -4,11 +4,117 @@ AI-powered suggestion engine with rule-based fallback system.
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from kirolinter.models.issue import Issue
 from kirolinter.models.suggestion import Suggestion, FixType
+from kirolinter.utils.source_cache import source_cache
+
+
+_BATCH_SECTION = re.compile(r'^[ \t]*\**ISSUE\s+(\d+)\**[ \t]*:?\**', re.MULTILINE)
+
+
+def _constant_code(code: str):
+    """Code generator whose suggestion does not depend on the issue."""
+    return lambda suggester, issue: code
+
+
+def _env_var_code(code_template: str):
+    """Code generator reading the hardcoded value from an environment variable."""
+    return lambda suggester, issue: code_template.format(env_var=suggester._generate_env_var_name(issue))
+
+
+def _sql_injection_code(fallback: str):
+    """Code generator picking the parameter style of the database library on the line."""
+    def generate(suggester, issue):
+        original_code = suggester._get_original_code(issue)
+        if "sqlite3" in original_code or "cursor.execute" in original_code:
+            return "cursor.execute(\"SELECT * FROM table WHERE column = ?\", (value,))"
+        if "psycopg2" in original_code:
+            return "cursor.execute(\"SELECT * FROM table WHERE column = %s\", (value,))"
+        return fallback
+    return generate
+
+
+def _remove_line(template: Dict[str, Any]):
+    return _constant_code("")
+
+
+def _env_var_from_template(template: Dict[str, Any]):
+    return _env_var_code(template.get("code_template", 'os.environ.get("{env_var}", "default")'))
+
+
+# Rule id -> factory building the rule's code generator from its template
+_CODE_GENERATORS: Dict[str, Callable[[Dict[str, Any]], Callable]] = {
+    "unused_variable": _remove_line,
+    "unused_import": _remove_line,
+    "dead_code": _remove_line,
+    "hardcoded_secret": _env_var_from_template,
+    "hardcoded_password": _env_var_from_template,
+    "hardcoded_api_key": _env_var_from_template,
+    "sql_injection": lambda template: _sql_injection_code(
+        template.get("code_template", "cursor.execute('SELECT * FROM table WHERE column = ?', (value,))")),
+    "unsafe_eval": lambda template: _constant_code(
+        "json.loads(user_input)  # or ast.literal_eval(user_input) for literals"),
+    "unsafe_exec": lambda template: _constant_code(
+        "# Consider safer alternatives: subprocess.run() for commands, importlib for modules"),
+}
+
+
+class _CompiledTemplate:
+    """A suggestion template with its fix type resolved and its code generator bound."""
+    
+    __slots__ = ('fix_type', 'confidence', 'explanation', 'generate_code')
+    
+    def __init__(self, rule_id: str, template: Dict[str, Any]):
+        self.fix_type = FixType(template["fix_type"].lower())
+        self.confidence = template["confidence"]
+        self.explanation = template.get("explanation", "Fix suggestion")
+        factory = _CODE_GENERATORS.get(rule_id)
+        if factory is not None:
+            self.generate_code = factory(template)
+        else:
+            self.generate_code = _constant_code(
+                template.get("code_template", "# See suggestion explanation for details"))
+
+
+def _compile_templates(templates: Dict[str, Dict[str, Any]]) -> Dict[str, _CompiledTemplate]:
+    """Compile every well-formed template; malformed external templates are skipped."""
+    compiled = {}
+    for rule_id, template in templates.items():
+        try:
+            compiled[rule_id] = _CompiledTemplate(rule_id, template)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+    return compiled
+
+
+# Templates directory -> (signature of its JSON files, raw templates, compiled table)
+_template_cache: Dict[str, Tuple[Tuple, Dict[str, Dict[str, Any]], Dict[str, _CompiledTemplate]]] = {}
+
+
+def _templates_signature(templates_path: str) -> Tuple:
+    """Names and modification times of the external template files."""
+    try:
+        return tuple(sorted((f.name, f.stat().st_mtime_ns) for f in Path(templates_path).glob("*.json")))
+    except OSError:
+        return ()
+
+
+def _compiled_templates(templates_path: str, load: Callable[[], Dict[str, Dict[str, Any]]]):
+    """Return the raw and compiled templates for a directory, loading them once per change."""
+    signature = _templates_signature(templates_path)
+    cached = _template_cache.get(templates_path)
+    if cached is None or cached[0] != signature:
+        templates = load()
+        cached = _template_cache[templates_path] = (signature, templates, _compile_templates(templates))
+    # The raw table is copied so callers may edit it; the compiled table is shared read-only
+    return dict(cached[1]), cached[2]
 
 
 class RuleBasedSuggester:
@@ -16,7 +122,7 @@ class RuleBasedSuggester:
     
     def __init__(self, templates_path: Optional[str] = None):
         self.templates_path = templates_path or self._get_default_templates_path()
-        self.templates = self._load_templates()
+        self.templates, self.compiled = _compiled_templates(self.templates_path, self._load_templates)
     
     def _get_default_templates_path(self) -> str:
         """Get the default path for suggestion templates."""
@@ -132,32 +238,18 @@ class RuleBasedSuggester:
         Returns:
             Suggestion object or None if no template available
         """
-        template = self.templates.get(issue.rule_id)
-        if not template:
+        rule = self.compiled.get(issue.rule_id)
+        if rule is None:
             return None
         
-        # Generate suggestion based on template
-        fix_type = FixType(template["fix_type"].lower())
-        confidence = template["confidence"]
-        
-        # Format template with issue-specific data
-        suggestion_text = template["template"].format(
-            line_number=issue.line_number,
-            env_var=self._generate_env_var_name(issue),
-            file_path=issue.file_path
-        )
-        
-        # Generate code suggestion based on issue type
-        suggested_code = self._generate_code_suggestion(issue, template)
-        
         return Suggestion(
             issue_id=issue.id,
             file_path=issue.file_path,
             line_number=issue.line_number,
-            fix_type=fix_type,
-            suggested_code=suggested_code,
-            confidence=confidence,
-            explanation=template.get("explanation", "Fix suggestion")
+            fix_type=rule.fix_type,
+            suggested_code=rule.generate_code(self, issue),
+            confidence=rule.confidence,
+            explanation=rule.explanation
         )
     
     def _generate_env_var_name(self, issue: Issue) -> str:
@@ -168,53 +260,39 @@ class RuleBasedSuggester:
             return var_name.upper().replace(' ', '_')
         return "SECRET_KEY"
     
-    def _generate_code_suggestion(self, issue: Issue, template: Dict[str, Any]) -> str:
-        """Generate specific code suggestion based on issue and template."""
-        if issue.rule_id == "unused_variable":
-            return ""  # Remove the line
-        elif issue.rule_id == "unused_import":
-            return ""  # Remove the line
-        elif issue.rule_id in ["hardcoded_secret", "hardcoded_password", "hardcoded_api_key"]:
-            env_var = self._generate_env_var_name(issue)
-            code_template = template.get("code_template", 'os.environ.get("{env_var}", "default")')
-            return code_template.format(env_var=env_var)
-        elif issue.rule_id == "sql_injection":
-            # Try to detect the database library and suggest appropriate parameterization
-            original_code = self._get_original_code(issue)
-            if "sqlite3" in original_code or "cursor.execute" in original_code:
-                return "cursor.execute(\"SELECT * FROM table WHERE column = ?\", (value,))"
-            elif "psycopg2" in original_code:
-                return "cursor.execute(\"SELECT * FROM table WHERE column = %s\", (value,))"
-            else:
-                return template.get("code_template", "cursor.execute('SELECT * FROM table WHERE column = ?', (value,))")
-        elif issue.rule_id == "unsafe_eval":
-            return "json.loads(user_input)  # or ast.literal_eval(user_input) for literals"
-        elif issue.rule_id == "unsafe_exec":
-            return "# Consider safer alternatives: subprocess.run() for commands, importlib for modules"
-        elif issue.rule_id == "dead_code":
-            return ""  # Remove the dead code
-        else:
-            return template.get("code_template", "# See suggestion explanation for details")
-    
     def _get_original_code(self, issue: Issue) -> str:
         """Get the original code line for the issue."""
-        try:
-            with open(issue.file_path, 'r') as f:
-                lines = f.readlines()
-                if 0 <= issue.line_number - 1 < len(lines):
-                    return lines[issue.line_number - 1].strip()
-        except Exception:
-            pass
-        return ""
+        return source_cache.line(issue.file_path, issue.line_number).strip()
 
 
 class OpenAISuggester:
     """AI-powered suggestion engine using OpenAI API."""
     
-    def __init__(self, api_key: str):
+    SYSTEM_PROMPT = "You are a code review assistant that provides specific, actionable suggestions for fixing code issues."
+    
+    MODEL = "gpt-3.5-turbo"
+    TEMPERATURE = 0.3
+    
+    def __init__(self, api_key: str, llm=None, api_base: Optional[str] = None, cache=None):
+        """
+        Args:
+            api_key: OpenAI API key
+            llm: Optional LangChain LLM (e.g. ``LiteLLMProvider``) used instead of the OpenAI client
+            api_base: Optional base URL of an OpenAI-compatible endpoint
+            cache: Optional ``LLMResponseCache`` serving repeated prompts
+        """
         self.api_key = api_key
+        self.api_base = api_base
+        self.llm = llm
+        self.cache = cache
         self.client = None
-        self._initialize_client()
+        if llm is None:
+            self._initialize_client()
+    
+    @property
+    def available(self) -> bool:
+        """Whether a completion backend is configured."""
+        return self.client is not None or self.llm is not None
     
     def _initialize_client(self):
         """Initialize OpenAI client if API key is available."""
@@ -223,11 +301,14 @@ class OpenAISuggester:
         
         try:
             import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
+            if self.api_base:
+                self.client = openai.OpenAI(api_key=self.api_key, base_url=self.api_base)
+            else:
+                self.client = openai.OpenAI(api_key=self.api_key)
         except ImportError:
-            print("Warning: OpenAI library not installed. Install with: pip install openai")
+            print("Warning: OpenAI library not installed. Install with: pip install openai", file=sys.stderr)
         except Exception as e:
-            print(f"Warning: Failed to initialize OpenAI client: {e}")
+            print(f"Warning: Failed to initialize OpenAI client: {e}", file=sys.stderr)
     
     def generate_suggestion(self, issue: Issue, context: str = "") -> Optional[Suggestion]:
         """
@@ -240,32 +321,100 @@ class OpenAISuggester:
         Returns:
             Suggestion object or None if generation fails
         """
-        if not self.client:
+        if not self.available:
             return None
         
         try:
             # Prepare prompt for OpenAI
             prompt = self._create_prompt(issue, context)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a code review assistant that provides specific, actionable suggestions for fixing code issues."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            suggestion_text = response.choices[0].message.content.strip()
+            suggestion_text = self.complete(prompt)
             
             # Parse the response and create suggestion
             return self._parse_ai_response(issue, suggestion_text)
             
         except Exception as e:
-            print(f"Warning: OpenAI suggestion generation failed: {e}")
+            print(f"Warning: OpenAI suggestion generation failed: {e}", file=sys.stderr)
             return None
     
+    def complete(self, prompt: str, max_tokens: int = 200) -> str:
+        """
+        Send a prompt to the configured backend and return the response text.
+        
+        Errors from the backend are raised so callers can retry rate limits.
+        """
+        if self.cache is None:
+            return self._complete(prompt, max_tokens)
+        
+        if self.llm is not None:
+            model = getattr(self.llm, 'model', type(self.llm).__name__)
+            temperature = getattr(self.llm, 'temperature', 0.0)
+        else:
+            model, temperature = self.MODEL, self.TEMPERATURE
+        return self.cache.get_or_complete(
+            model, temperature, prompt, lambda: self._complete(prompt, max_tokens),
+            {'max_tokens': max_tokens, 'api_base': self.api_base}
+        )
+    
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Call the backend without caching."""
+        if self.llm is not None:
+            return (self.llm.invoke(prompt, max_tokens=max_tokens) or "").strip()
+        
+        response = self.client.chat.completions.create(
+            model=self.MODEL,
+            messages=[
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=self.TEMPERATURE
+        )
+        return (response.choices[0].message.content or "").strip()
+    
+    def create_batch_prompt(self, issues: List[Issue]) -> str:
+        """Create one prompt covering several issues, answered section by section."""
+        if len(issues) == 1:
+            return self._create_prompt(issues[0], "")
+        
+        sections = []
+        for number, issue in enumerate(issues, 1):
+            sections.append(f"""ISSUE {number}:
+- File: {issue.file_path}
+- Line: {issue.line_number}
+- Issue Type: {issue.issue_type}
+- Rule: {issue.rule_id}
+- Message: {issue.message}
+Original Code:
+{self._get_original_code(issue)}
+""")
+        
+        return f"""
+Code Issue Analysis for {len(issues)} issues:
+
+{chr(10).join(sections)}
+For each issue provide a specific code suggestion, a brief explanation and a
+confidence level (0.0-1.0). Answer every issue in order, formatted as:
+ISSUE <number>:
+SUGGESTED_CODE: [your code here]
+EXPLANATION: [brief explanation]
+CONFIDENCE: [0.0-1.0]
+"""
+    
+    def parse_batch_response(self, issues: List[Issue], response: str) -> Dict[str, Suggestion]:
+        """Split a batched response into suggestions keyed by issue ID."""
+        if len(issues) == 1:
+            return {issues[0].id: self._parse_ai_response(issues[0], response)}
+        
+        suggestions = {}
+        parts = _BATCH_SECTION.split(response)
+        # parts = [preamble, number, body, number, body, ...]
+        for number, body in zip(parts[1::2], parts[2::2]):
+            index = int(number) - 1
+            if 0 <= index < len(issues) and "SUGGESTED_CODE:" in body:
+                issue = issues[index]
+                suggestions[issue.id] = self._parse_ai_response(issue, body.strip())
+        return suggestions
+    
     def _create_prompt(self, issue: Issue, context: str) -> str:
         """Create a prompt for OpenAI based on the issue."""
         original_code = self._get_original_code(issue)
@@ -327,23 +476,74 @@ CONFIDENCE: [0.0-1.0]
     
     def _get_original_code(self, issue: Issue) -> str:
         """Get the original code line for the issue."""
-        try:
-            with open(issue.file_path, 'r') as f:
-                lines = f.readlines()
-                if 0 <= issue.line_number - 1 < len(lines):
-                    return lines[issue.line_number - 1].strip()
-        except Exception:
-            pass
-        return ""
+        return source_cache.line(issue.file_path, issue.line_number).strip()
+
+
+def _history_signature(repo_path: str) -> Tuple:
+    """
+    Cheap fingerprint of a repository's commit history: the modification time
+    of the git HEAD reflog, which changes on every commit and checkout.
+    Empty outside a git checkout.
+    """
+    path = Path(repo_path).resolve()
+    for directory in (path, *path.parents):
+        git_dir = directory / ".git"
+        if git_dir.exists():
+            for marker in (git_dir / "logs" / "HEAD", git_dir / "HEAD"):
+                try:
+                    return (str(marker), marker.stat().st_mtime_ns)
+                except OSError:
+                    continue
+            return ()
+    return ()
 
 
 class TeamStyleAnalyzer:
     """Analyze team coding style for personalized suggestions."""
     
+    # Repositories whose analyzers are kept, least recently used dropped first
+    CACHE_SIZE = 32
+    
+    # Repository path -> (history signature, analyzer); a repository is analyzed
+    # again once its history moves on
+    _by_repo: 'OrderedDict[str, Tuple[Tuple, TeamStyleAnalyzer]]' = OrderedDict()
+    _by_repo_lock = threading.Lock()
+    
     def __init__(self, repo_path: str):
         self.repo_path = repo_path
         self.style_patterns = {}
         self.team_preferences = self.analyze_team_style()
+        
+        # Customizations derived from the preferences once, not per suggestion
+        self._priority_rules = self.team_preferences["priority_rules"]
+        self._delete_boost = 1.1 if self.team_preferences["code_structure"]["prefer_early_returns"] else 1.0
+        env_prefix = self.team_preferences["security_preferences"]["env_var_prefix"]
+        self._env_prefix_call = f'os.environ.get("{env_prefix}'
+        self._env_prefix_note = f" (Team prefers {env_prefix} prefix for environment variables)"
+    
+    @classmethod
+    def for_repo(cls, repo_path: str) -> 'TeamStyleAnalyzer':
+        """Return the cached analyzer for ``repo_path``, analyzing it on first use or after new commits."""
+        signature = _history_signature(repo_path)
+        with cls._by_repo_lock:
+            cached = cls._by_repo.get(repo_path)
+            if cached is not None and cached[0] == signature:
+                cls._by_repo.move_to_end(repo_path)
+                return cached[1]
+        
+        analyzer = cls(repo_path)
+        with cls._by_repo_lock:
+            cls._by_repo[repo_path] = (signature, analyzer)
+            cls._by_repo.move_to_end(repo_path)
+            while len(cls._by_repo) > cls.CACHE_SIZE:
+                cls._by_repo.popitem(last=False)
+        return analyzer
+    
+    @classmethod
+    def clear_cache(cls):
+        """Forget every cached analyzer, so each repository is analyzed again."""
+        with cls._by_repo_lock:
+            cls._by_repo.clear()
     
     def analyze_team_style(self) -> Dict[str, Any]:
         """
@@ -406,11 +606,11 @@ class TeamStyleAnalyzer:
                 issue_type = "performance"
             
             # Apply team priority multiplier
-            priority_multiplier = self.team_preferences["priority_rules"].get(issue_type, 0.5)
+            priority_multiplier = self._priority_rules.get(issue_type, 0.5)
             
             # Boost priority for certain patterns team prefers
-            if suggestion.fix_type == FixType.DELETE and self.team_preferences["code_structure"]["prefer_early_returns"]:
-                priority_multiplier *= 1.1
+            if suggestion.fix_type == FixType.DELETE:
+                priority_multiplier *= self._delete_boost
             
             return base_confidence * priority_multiplier
         
@@ -429,10 +629,9 @@ class TeamStyleAnalyzer:
         """
         # Customize environment variable names based on team prefix
         if "os.environ.get" in suggestion.suggested_code:
-            env_prefix = self.team_preferences["security_preferences"]["env_var_prefix"]
             # Simple customization - in real implementation would be more sophisticated
-            if not suggestion.suggested_code.startswith(f'os.environ.get("{env_prefix}'):
-                suggestion.explanation += f" (Team prefers {env_prefix} prefix for environment variables)"
+            if not suggestion.suggested_code.startswith(self._env_prefix_call):
+                suggestion.explanation += self._env_prefix_note
         
         return suggestion
 
@@ -444,9 +643,18 @@ class SuggestionEngine:
         self.config = config
         self.rule_based = RuleBasedSuggester()
         
-        # Initialize OpenAI suggester if API key is available
+        # Initialize AI suggester: a LiteLLM model if configured, else OpenAI if an API key is available
         openai_key = config.get('openai_api_key', '')
-        self.openai_suggester = OpenAISuggester(openai_key) if openai_key else None
+        ai_model = config.get('ai_model', '')
+        self.openai_suggester = None
+        self.llm_cache = None
+        if ai_model:
+            self.openai_suggester = self._create_litellm_suggester(ai_model, openai_key)
+        elif openai_key:
+            self.openai_suggester = OpenAISuggester(openai_key)
+        if self.openai_suggester and config.get('use_ai_suggestions', True):
+            self.llm_cache = self._create_llm_cache()
+            self.openai_suggester.cache = self.llm_cache
         
         # Initialize team style analyzer
         self.team_analyzer = None  # Will be set when analyzing a repository
@@ -464,14 +672,17 @@ class SuggestionEngine:
         """
         suggestions = {}
         
-        # Initialize team analyzer if repo path is provided
-        if repo_path and not self.team_analyzer:
-            self.team_analyzer = TeamStyleAnalyzer(repo_path)
+        # Use the (cached) team analyzer of the repository if a path is provided
+        if repo_path:
+            self.team_analyzer = TeamStyleAnalyzer.for_repo(repo_path)
+        
+        # Request AI suggestions for all eligible issues up front, concurrently and in batches
+        ai_suggestions = self._generate_ai_suggestions(issues)
         
         # Generate suggestions for each issue
         suggestion_list = []
         for issue in issues:
-            suggestion = self._generate_single_suggestion(issue)
+            suggestion = self._generate_single_suggestion(issue, ai_suggestions)
             if suggestion:
                 # Customize suggestion based on team style
                 if self.team_analyzer:
@@ -490,16 +701,63 @@ class SuggestionEngine:
         
         return suggestions
     
-    def _generate_single_suggestion(self, issue: Issue) -> Optional[Suggestion]:
+    def _create_litellm_suggester(self, model: str, api_key: str) -> Optional[OpenAISuggester]:
+        """Create an AI suggester backed by a LiteLLM model, if LiteLLM is installed."""
+        try:
+            from kirolinter.agents.llm_provider import create_llm_provider
+            # Responses are cached by OpenAISuggester, not again by the provider
+            llm = create_llm_provider(model=model, temperature=0.3, max_tokens=200, response_cache=None)
+        except ImportError:
+            print("Warning: LiteLLM not installed. Install with: pip install litellm", file=sys.stderr)
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to initialize LiteLLM model {model}: {e}", file=sys.stderr)
+            return None
+        return OpenAISuggester(api_key, llm=llm)
+    
+    def _create_llm_cache(self):
+        """Open the persistent AI response cache configured by ``llm_cache_*`` settings."""
+        from kirolinter.core.llm_cache import create_llm_cache
+        return create_llm_cache(
+            backend=self.config.get('llm_cache_backend', 'sqlite'),
+            cache_dir=self.config.get('llm_cache_dir') or None,
+            redis_url=self.config.get('llm_cache_redis_url') or None,
+            ttl_seconds=self.config.get('llm_cache_ttl_hours', 720) * 3600,
+            max_entries=self.config.get('llm_cache_max_entries', 10000)
+        )
+    
+    def _wants_ai_suggestion(self, issue: Issue) -> bool:
+        """Check whether an issue should get an AI suggestion."""
+        return (self.config.get('use_ai_suggestions', True) and
+                self.openai_suggester is not None and
+                issue.severity.value in ['high', 'critical'])
+    
+    def _generate_ai_suggestions(self, issues: List[Issue]) -> Dict[str, Suggestion]:
+        """Generate AI suggestions for eligible issues with a rate-limited scheduler."""
+        eligible = [issue for issue in issues if self._wants_ai_suggestion(issue)]
+        if not eligible or not self.openai_suggester.available:
+            return {}
+        
+        from kirolinter.core.suggestion_scheduler import SuggestionScheduler
+        scheduler = SuggestionScheduler(
+            self.openai_suggester,
+            max_concurrency=self.config.get('ai_max_concurrency', 4),
+            requests_per_minute=self.config.get('ai_requests_per_minute', 60),
+            batch_size=self.config.get('ai_batch_size', 5)
+        )
+        return scheduler.run(eligible)
+    
+    def _generate_single_suggestion(self, issue: Issue,
+                                    ai_suggestions: Optional[Dict[str, Suggestion]] = None) -> Optional[Suggestion]:
         """Generate a suggestion for a single issue."""
         suggestion = None
         
         # Try OpenAI first if available and enabled
-        if (self.config.get('use_ai_suggestions', True) and 
-            self.openai_suggester and 
-            issue.severity.value in ['high', 'critical']):
-            
-            suggestion = self.openai_suggester.generate_suggestion(issue)
+        if self._wants_ai_suggestion(issue):
+            if ai_suggestions is not None:
+                suggestion = ai_suggestions.get(issue.id)
+            else:
+                suggestion = self.openai_suggester.generate_suggestion(issue)
         
         # Fallback to rule-based suggestions
         if not suggestion and self.config.get('fallback_to_rules', True):
@@ -0,0 +1,153 @@
+"""
+Concurrent, rate-limited scheduling of AI suggestion requests.
+
+Issues are grouped per file into small batches so that one prompt covers
+several issues. Batches are sent from a bounded thread pool, a token bucket
+keeps the request rate under the provider's limit, and rate-limit errors
+are retried with exponential backoff.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from kirolinter.models.issue import Issue
+from kirolinter.models.suggestion import Suggestion
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second on average."""
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+            clock: Monotonic time source, replaceable in tests
+            sleep: Sleep function, replaceable in tests
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check whether a provider error is a rate-limit (HTTP 429) response."""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    message = str(error).lower()
+    return '429' in message or 'rate limit' in message or 'ratelimit' in message
+
+
+class SuggestionScheduler:
+    """
+    Generate AI suggestions for many issues with bounded concurrency.
+
+    The suggester must provide ``complete(prompt, max_tokens)``, ``create_batch_prompt(issues)``
+    and ``parse_batch_response(issues, text)``, as ``OpenAISuggester`` does for
+    both the OpenAI client and LangChain LLMs such as ``LiteLLMProvider``.
+    """
+
+    def __init__(self, suggester, max_concurrency: int = 4, requests_per_minute: int = 60,
+                 batch_size: int = 5, max_retries: int = 3, tokens_per_issue: int = 200,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            suggester: Backend building prompts, completing them and parsing responses
+            max_concurrency: Maximum number of requests in flight
+            requests_per_minute: Average request rate limit (0 disables rate limiting)
+            batch_size: Maximum number of issues from one file per prompt
+            max_retries: Retries of a batch after rate-limit errors
+            tokens_per_issue: Response token budget per issue in a batch
+            sleep: Sleep function used for backoff, replaceable in tests
+        """
+        self.suggester = suggester
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.tokens_per_issue = tokens_per_issue
+        self._sleep = sleep
+        self.bucket = (TokenBucket(requests_per_minute / 60.0, capacity=self.max_concurrency, sleep=sleep)
+                       if requests_per_minute > 0 else None)
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+        self._stats_lock = threading.Lock()
+
+    def make_batches(self, issues: List[Issue]) -> List[List[Issue]]:
+        """Group issues by file, in first-seen order, into batches of at most ``batch_size``."""
+        by_file: Dict[str, List[Issue]] = {}
+        for issue in issues:
+            by_file.setdefault(issue.file_path, []).append(issue)
+
+        batches = []
+        for file_issues in by_file.values():
+            for i in range(0, len(file_issues), self.batch_size):
+                batches.append(file_issues[i:i + self.batch_size])
+        return batches
+
+    def run(self, issues: List[Issue]) -> Dict[str, Suggestion]:
+        """
+        Generate suggestions for ``issues``.
+
+        Returns:
+            Dictionary mapping issue IDs to suggestions; issues whose request
+            failed or whose answer could not be parsed are absent
+        """
+        batches = self.make_batches(issues)
+        if not batches:
+            return {}
+
+        suggestions: Dict[str, Suggestion] = {}
+        if len(batches) == 1 or self.max_concurrency == 1:
+            for batch in batches:
+                suggestions.update(self._run_batch(batch))
+            return suggestions
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            for result in executor.map(self._run_batch, batches):
+                suggestions.update(result)
+        return suggestions
+
+    def _run_batch(self, batch: List[Issue]) -> Dict[str, Suggestion]:
+        """Send one batch, retrying rate-limit errors with exponential backoff."""
+        prompt = self.suggester.create_batch_prompt(batch)
+
+        for attempt in range(self.max_retries + 1):
+            if self.bucket:
+                self.bucket.acquire()
+            self._count('requests')
+            try:
+                text = self.suggester.complete(prompt, max_tokens=self.tokens_per_issue * len(batch))
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < self.max_retries:
+                    self._count('retries')
+                    self._sleep(2 ** attempt)
+                    continue
+                self._count('failures')
+                return {}
+            return self.suggester.parse_batch_response(batch, text)
+
+        return {}
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
@@ -28,16 +28,75 @@ class CVEInfo:
     affected_products: List[str]
 
 
+def parse_nvd_cve(cve_data: Dict[str, Any]) -> CVEInfo:
+    """Parse one ``cve`` object of the NVD CVE API 2.0 format."""
+    # Extract basic information
+    cve_id = cve_data.get('id', '')
+    descriptions = cve_data.get('descriptions', [])
+    description = descriptions[0].get('value', '') if descriptions else ''
+    
+    # Extract severity information
+    metrics = cve_data.get('metrics', {})
+    severity = 'UNKNOWN'
+    score = 0.0
+    
+    # Try CVSS v3.1 first, then v3.0, then v2.0
+    for version in ['cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2']:
+        if version in metrics and metrics[version]:
+            metric = metrics[version][0]
+            if version.startswith('cvssMetricV3'):
+                cvss_data = metric.get('cvssData', {})
+                severity = cvss_data.get('baseSeverity', 'UNKNOWN')
+                score = cvss_data.get('baseScore', 0.0)
+            else:  # v2
+                cvss_data = metric.get('cvssData', {})
+                severity = metric.get('baseSeverity', 'UNKNOWN')
+                score = cvss_data.get('baseScore', 0.0)
+            break
+    
+    # Extract dates
+    published = cve_data.get('published', '')
+    modified = cve_data.get('lastModified', '')
+    
+    # Extract references
+    references = []
+    for ref in cve_data.get('references', []):
+        references.append(ref.get('url', ''))
+    
+    # Extract affected products (simplified)
+    affected_products = []
+    configurations = cve_data.get('configurations', [])
+    for config in configurations:
+        for node in config.get('nodes', []):
+            for cpe_match in node.get('cpeMatch', []):
+                cpe = cpe_match.get('criteria', '')
+                if 'python' in cpe.lower():
+                    affected_products.append(cpe)
+    
+    return CVEInfo(
+        cve_id=cve_id,
+        description=description,
+        severity=severity,
+        score=score,
+        published_date=published,
+        modified_date=modified,
+        references=references[:3],  # Limit references
+        affected_products=affected_products[:3]  # Limit products
+    )
+
+
 class CVEDatabase:
     """CVE database client for vulnerability lookups."""
     
-    def __init__(self, cache_dir: str = None, api_key: str = None):
+    def __init__(self, cache_dir: str = None, api_key: str = None, offline_index: str = None):
         """
         Initialize CVE database client.
         
         Args:
             cache_dir: Directory for caching CVE data
             api_key: Optional API key for enhanced rate limits
+            offline_index: Optional path of an ``OfflineCVEIndex``; when set, CVEs
+                are looked up locally and the NVD API is never contacted
         """
         self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.kirolinter' / 'cve_cache'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -49,6 +108,14 @@ class CVEDatabase:
         self.cache_db = self.cache_dir / 'cve_cache.db'
         self._init_cache_db()
         
+        self.offline_index = None
+        if offline_index:
+            from kirolinter.integrations.cve_index import OfflineCVEIndex
+            self.offline_index = OfflineCVEIndex(offline_index)
+        
+        # Results of each distinct search query, shared by every issue with that pattern
+        self._search_results: Dict[str, List[CVEInfo]] = {}
+        
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 6.0 if not api_key else 0.6  # 10 requests/min without key, 100/min with key
@@ -112,23 +179,37 @@ class CVEDatabase:
         """
         Enhance security issues with CVE database information.
         
+        Issues are grouped by vulnerability pattern and each distinct pattern
+        is looked up once; its CVEs are then matched to every issue in the group.
+        
         Args:
             issues: List of detected security issues
         
         Returns:
             Enhanced issues with CVE information
         """
-        enhanced_issues = []
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, issue in enumerate(issues):
+            if not self._is_security_issue(issue):
+                continue
+            pattern_info = self._identify_vulnerability_pattern(issue)
+            if pattern_info:
+                groups.setdefault(pattern_info['cve_search'], []).append((index, pattern_info))
         
-        for issue in issues:
-            if issue.type == IssueType.SECURITY:
-                enhanced_issue = self._enhance_single_issue(issue)
-                enhanced_issues.append(enhanced_issue)
-            else:
-                enhanced_issues.append(issue)
+        enhanced_issues = list(issues)
+        for search_query, members in groups.items():
+            cves = self._search_cves(search_query)
+            if not cves:
+                continue
+            for index, pattern_info in members:
+                enhanced_issues[index] = self._enhance_with_cves(issues[index], cves, pattern_info)
         
         return enhanced_issues
     
+    def _is_security_issue(self, issue: Issue) -> bool:
+        """Check whether an issue is a security issue."""
+        return issue.type in (IssueType.SECURITY, IssueType.SECURITY.value)
+    
     def _enhance_single_issue(self, issue: Issue) -> Issue:
         """Enhance a single security issue with CVE data."""
         try:
@@ -140,13 +221,7 @@ class CVEDatabase:
                 cves = self._search_cves(pattern_info['cve_search'])
                 
                 if cves:
-                    # Select most relevant CVE
-                    relevant_cve = self._select_most_relevant_cve(cves, issue)
-                    
-                    if relevant_cve:
-                        # Enhance issue with CVE information
-                        enhanced_issue = self._apply_cve_enhancement(issue, relevant_cve, pattern_info)
-                        return enhanced_issue
+                    return self._enhance_with_cves(issue, cves, pattern_info)
             
             return issue
             
@@ -154,6 +229,17 @@ class CVEDatabase:
             print(f"Warning: CVE enhancement failed for issue {issue.id}: {e}")
             return issue
     
+    def _enhance_with_cves(self, issue: Issue, cves: List[CVEInfo], pattern_info: Dict[str, Any]) -> Issue:
+        """Enhance an issue with the most relevant of the CVEs found for its pattern."""
+        try:
+            relevant_cve = self._select_most_relevant_cve(cves, issue)
+            if relevant_cve:
+                return self._apply_cve_enhancement(issue, relevant_cve, pattern_info)
+            return issue
+        except Exception as e:
+            print(f"Warning: CVE enhancement failed for issue {issue.id}: {e}")
+            return issue
+    
     def _identify_vulnerability_pattern(self, issue: Issue) -> Optional[Dict[str, Any]]:
         """Identify the vulnerability pattern from the issue."""
         issue_text = f"{issue.message} {issue.rule_id}".lower()
@@ -170,7 +256,16 @@ class CVEDatabase:
         return None
     
     def _search_cves(self, search_query: str) -> List[CVEInfo]:
-        """Search for CVEs matching the query."""
+        """Search for CVEs matching the query, once per query for the lifetime of this client."""
+        if search_query not in self._search_results:
+            if self.offline_index is not None:
+                self._search_results[search_query] = self.offline_index.search(search_query)
+            else:
+                self._search_results[search_query] = self._search_cves_online(search_query)
+        return self._search_results[search_query]
+    
+    def _search_cves_online(self, search_query: str) -> List[CVEInfo]:
+        """Search the NVD API for CVEs matching the query, using the local cache."""
         try:
             # Check cache first
             pattern_hash = hashlib.md5(search_query.encode()).hexdigest()
@@ -210,68 +305,7 @@ class CVEDatabase:
     
     def _parse_cve_response(self, data: Dict[str, Any]) -> List[CVEInfo]:
         """Parse CVE API response into CVEInfo objects."""
-        cves = []
-        
-        for vuln in data.get('vulnerabilities', []):
-            cve_data = vuln.get('cve', {})
-            
-            # Extract basic information
-            cve_id = cve_data.get('id', '')
-            descriptions = cve_data.get('descriptions', [])
-            description = descriptions[0].get('value', '') if descriptions else ''
-            
-            # Extract severity information
-            metrics = cve_data.get('metrics', {})
-            severity = 'UNKNOWN'
-            score = 0.0
-            
-            # Try CVSS v3.1 first, then v3.0, then v2.0
-            for version in ['cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2']:
-                if version in metrics and metrics[version]:
-                    metric = metrics[version][0]
-                    if version.startswith('cvssMetricV3'):
-                        cvss_data = metric.get('cvssData', {})
-                        severity = cvss_data.get('baseSeverity', 'UNKNOWN')
-                        score = cvss_data.get('baseScore', 0.0)
-                    else:  # v2
-                        cvss_data = metric.get('cvssData', {})
-                        severity = metric.get('baseSeverity', 'UNKNOWN')
-                        score = cvss_data.get('baseScore', 0.0)
-                    break
-            
-            # Extract dates
-            published = cve_data.get('published', '')
-            modified = cve_data.get('lastModified', '')
-            
-            # Extract references
-            references = []
-            for ref in cve_data.get('references', []):
-                references.append(ref.get('url', ''))
-            
-            # Extract affected products (simplified)
-            affected_products = []
-            configurations = cve_data.get('configurations', [])
-            for config in configurations:
-                for node in config.get('nodes', []):
-                    for cpe_match in node.get('cpeMatch', []):
-                        cpe = cpe_match.get('criteria', '')
-                        if 'python' in cpe.lower():
-                            affected_products.append(cpe)
-            
-            cve_info = CVEInfo(
-                cve_id=cve_id,
-                description=description,
-                severity=severity,
-                score=score,
-                published_date=published,
-                modified_date=modified,
-                references=references[:3],  # Limit references
-                affected_products=affected_products[:3]  # Limit products
-            )
-            
-            cves.append(cve_info)
-        
-        return cves
+        return [parse_nvd_cve(vuln.get('cve', {})) for vuln in data.get('vulnerabilities', [])]
     
     def _select_most_relevant_cve(self, cves: List[CVEInfo], issue: Issue) -> Optional[CVEInfo]:
         """Select the most relevant CVE for the issue."""
@@ -316,16 +350,19 @@ class CVEDatabase:
         """Apply CVE enhancement to an issue."""
         # Create enhanced issue
         enhanced_issue = Issue(
-            id=issue.id,
-            type=issue.type,
-            severity=self._calculate_enhanced_severity(issue.severity, cve, pattern_info),
             file_path=issue.file_path,
             line_number=issue.line_number,
-            column=issue.column,
-            message=f"{issue.message} (Related: {cve.cve_id})",
             rule_id=issue.rule_id,
-            cve_id=cve.cve_id
+            message=f"{issue.message} (Related: {cve.cve_id})",
+            severity=self._calculate_enhanced_severity(issue.severity, cve, pattern_info),
+            issue_type=issue.issue_type,
+            context=dict(issue.context),
+            priority_score=issue.priority_score,
+            priority_rank=issue.priority_rank
         )
+        suggestion = getattr(issue, 'suggestion', None)
+        if suggestion is not None:
+            enhanced_issue.suggestion = suggestion
         
         # Add CVE information as metadata
         enhanced_issue.cve_info = {
@@ -0,0 +1,210 @@
+"""
+Offline CVE index built from NVD JSON feed dumps.
+
+The index is a single SQLite database with an FTS5 full-text table over CVE
+descriptions, so security issues can be enriched without network access,
+e.g. on air-gapped CI runners. Both the NVD CVE API 2.0 feed format
+(``{"vulnerabilities": [...]}``) and the legacy 1.1 feeds
+(``{"CVE_Items": [...]}``) are accepted, plain or gzip-compressed.
+"""
+
+import gzip
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from kirolinter.integrations.cve_database import CVEInfo, parse_nvd_cve
+
+
+_QUERY_TERM = re.compile(r'\w+')
+
+
+def _load_feed(path: Path) -> Dict[str, Any]:
+    """Read a JSON feed file, decompressing ``.gz`` files."""
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_legacy_item(item: Dict[str, Any]) -> CVEInfo:
+    """Parse one ``CVE_Items`` entry of a legacy NVD 1.1 JSON feed."""
+    cve = item.get('cve', {})
+    descriptions = cve.get('description', {}).get('description_data', [])
+
+    impact = item.get('impact', {})
+    severity, score = 'UNKNOWN', 0.0
+    if 'baseMetricV3' in impact:
+        cvss = impact['baseMetricV3'].get('cvssV3', {})
+        severity, score = cvss.get('baseSeverity', 'UNKNOWN'), cvss.get('baseScore', 0.0)
+    elif 'baseMetricV2' in impact:
+        metric = impact['baseMetricV2']
+        severity, score = metric.get('severity', 'UNKNOWN'), metric.get('cvssV2', {}).get('baseScore', 0.0)
+
+    affected_products = []
+    nodes = list(item.get('configurations', {}).get('nodes', []))
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get('children', []))
+        for cpe_match in node.get('cpe_match', []):
+            cpe = cpe_match.get('cpe23Uri', '')
+            if 'python' in cpe.lower():
+                affected_products.append(cpe)
+
+    return CVEInfo(
+        cve_id=cve.get('CVE_data_meta', {}).get('ID', ''),
+        description=descriptions[0].get('value', '') if descriptions else '',
+        severity=severity,
+        score=score,
+        published_date=item.get('publishedDate', ''),
+        modified_date=item.get('lastModifiedDate', ''),
+        references=[ref.get('url', '') for ref in cve.get('references', {}).get('reference_data', [])][:3],
+        affected_products=affected_products[:3]
+    )
+
+
+def iter_feed(data: Dict[str, Any]) -> Iterator[CVEInfo]:
+    """Yield the CVEs of a parsed feed, skipping rejected entries."""
+    if 'vulnerabilities' in data:
+        for vuln in data['vulnerabilities']:
+            cve_data = vuln.get('cve', {})
+            if cve_data.get('vulnStatus') == 'Rejected':
+                continue
+            yield parse_nvd_cve(cve_data)
+    else:
+        for item in data.get('CVE_Items', []):
+            cve = parse_legacy_item(item)
+            if cve.description.startswith('** REJECT **'):
+                continue
+            yield cve
+
+
+class OfflineCVEIndex:
+    """Local, searchable copy of the NVD CVE database."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: Path of the SQLite index database
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cves (
+                cve_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                score REAL NOT NULL,
+                data TEXT NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        self.has_fts = self._init_fts()
+        self.conn.commit()
+
+    def _init_fts(self) -> bool:
+        """Create the full-text table, or report that this SQLite lacks FTS5."""
+        try:
+            self.conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS cve_fts USING fts5(
+                    description, content='cves', content_rowid='rowid', tokenize='porter unicode61'
+                )
+            ''')
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def import_cves(self, cves: Iterable[CVEInfo]) -> int:
+        """
+        Add or replace CVEs and rebuild the full-text index.
+
+        Returns:
+            Number of CVEs imported
+        """
+        rows = ((cve.cve_id, cve.description, float(cve.score or 0.0), json.dumps(cve.__dict__))
+                for cve in cves if cve.cve_id)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO cves (cve_id, description, score, data) VALUES (?, ?, ?, ?)', rows
+            )
+            imported = self.conn.total_changes - before
+            if self.has_fts:
+                self.conn.execute("INSERT INTO cve_fts(cve_fts) VALUES('rebuild')")
+            self.conn.execute(
+                'INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)',
+                ('updated_at', datetime.now().isoformat())
+            )
+        return imported
+
+    def import_feeds(self, paths: Iterable[str]) -> int:
+        """
+        Import NVD JSON feed files (``.json`` or ``.json.gz``).
+
+        Returns:
+            Number of CVEs imported
+        """
+        def all_cves():
+            for path in paths:
+                yield from iter_feed(_load_feed(Path(path)))
+
+        return self.import_cves(all_cves())
+
+    def search(self, query: str, limit: int = 5) -> List[CVEInfo]:
+        """
+        Find CVEs whose description contains every word of ``query``.
+
+        Matches mirror the NVD ``keywordSearch`` parameter; results are
+        ordered by relevance, or by CVSS score without FTS5.
+        """
+        terms = _QUERY_TERM.findall(query.lower())
+        if not terms:
+            return []
+
+        if self.has_fts:
+            match = ' '.join(f'"{term}"' for term in terms)
+            rows = self.conn.execute(
+                'SELECT cves.data FROM cve_fts JOIN cves ON cves.rowid = cve_fts.rowid '
+                'WHERE cve_fts MATCH ? ORDER BY bm25(cve_fts), cves.score DESC LIMIT ?',
+                (match, limit)
+            ).fetchall()
+        else:
+            conditions = ' AND '.join('description LIKE ?' for _ in terms)
+            rows = self.conn.execute(
+                f'SELECT data FROM cves WHERE {conditions} ORDER BY score DESC LIMIT ?',
+                [f'%{term}%' for term in terms] + [limit]
+            ).fetchall()
+
+        return [CVEInfo(**json.loads(row[0])) for row in rows]
+
+    def search_many(self, queries: Iterable[str], limit: int = 5) -> Dict[str, List[CVEInfo]]:
+        """Run one search per distinct query."""
+        return {query: self.search(query, limit) for query in dict.fromkeys(queries)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Describe the index contents."""
+        count = self.conn.execute('SELECT COUNT(*) FROM cves').fetchone()[0]
+        updated = self.conn.execute(
+            "SELECT value FROM index_meta WHERE key = 'updated_at'"
+        ).fetchone()
+        return {
+            'cves': count,
+            'updated_at': updated[0] if updated else None,
+            'full_text_search': self.has_fts,
+            'location': str(self.db_path)
+        }
+
+    def close(self):
+        """Close the database."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
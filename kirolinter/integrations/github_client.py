@@ -2,9 +2,12 @@
 GitHub API client for posting PR comments and reviews.
 """
 
+import hashlib
 import json
+import re
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass
 import time
 
@@ -12,6 +15,11 @@ from kirolinter.core.scanner import ScanResult
 from kirolinter.models.issue import Issue
 
 
+# Hidden marker identifying KiroLinter review comments, so re-runs can skip them
+_FINGERPRINT_MARKER = re.compile(r'<!-- kirolinter:([0-9a-f]{16}) -->')
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+
 @dataclass
 class PRComment:
     """Represents a comment to be posted on a PR."""
@@ -19,23 +27,41 @@ class PRComment:
     line_number: int
     message: str
     suggestion: Optional[str] = None
+    rule_id: str = ''
+    
+    @property
+    def fingerprint(self) -> str:
+        """Stable identity of the comment across re-runs."""
+        key = f"{self.file_path}:{self.line_number}:{self.rule_id or self.message}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
 
 
 class GitHubClient:
     """GitHub API client for KiroLinter integration."""
     
-    def __init__(self, token: str, repository: str):
+    def __init__(self, token: str, repository: str, base_url: str = "https://api.github.com",
+                 max_comments_per_review: int = 50, max_retries: int = 3):
         """
         Initialize GitHub client.
         
         Args:
             token: GitHub personal access token
             repository: Repository in format 'owner/repo'
+            base_url: API root, e.g. a GitHub Enterprise or test server
+            max_comments_per_review: Line comments packed into one review request
+            max_retries: Retries of a request after rate-limit responses
         """
         self.token = token
         self.repository = repository
-        self.base_url = "https://api.github.com"
+        self.base_url = base_url.rstrip('/')
+        self.max_comments_per_review = max(1, max_comments_per_review)
+        self.max_retries = max_retries
+        
+        # One pooled, keep-alive session for every request
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json",
@@ -45,6 +71,9 @@ class GitHubClient:
         # Rate limiting
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = 0
+        # GitHub asks for at least a second between content-creating requests
+        self.min_post_interval = 1.0
+        self._last_post_time = 0.0
     
     def post_pr_review(self, pr_number: int, scan_results: List[ScanResult], 
                       summary: str) -> bool:
@@ -69,7 +98,8 @@ class GitHubClient:
             comments = self._generate_review_comments(scan_results, pr_info)
             
             # Post review with comments
-            return self._post_review(pr_number, comments, summary)
+            stats = self.post_review_comments(pr_number, comments, summary, pr_info=pr_info)
+            return stats['failed'] == 0 and stats['reviews'] > 0
             
         except Exception as e:
             print(f"Error posting PR review: {e}")
@@ -79,6 +109,9 @@ class GitHubClient:
         """
         Post line-specific comments on a pull request.
         
+        Comments are packed into as few reviews as possible; comments already
+        on the PR from an earlier run are not posted again.
+        
         Args:
             pr_number: Pull request number
             scan_results: List of scan results from analysis
@@ -95,19 +128,74 @@ class GitHubClient:
             # Generate comments
             comments = self._generate_review_comments(scan_results, pr_info)
             
-            # Post individual comments
-            success_count = 0
-            for comment in comments[:50]:  # Limit to 50 comments
-                if self._post_single_comment(pr_number, comment):
-                    success_count += 1
-                time.sleep(0.1)  # Rate limiting
-            
-            return success_count > 0
+            stats = self.post_review_comments(pr_number, comments, pr_info=pr_info)
+            return stats['failed'] == 0 and (stats['posted'] > 0 or stats['duplicates'] > 0)
             
         except Exception as e:
             print(f"Error posting line comments: {e}")
             return False
     
+    def post_review_comments(self, pr_number: int, comments: List[PRComment], summary: str = "",
+                             pr_info: Optional[Dict[str, Any]] = None,
+                             max_comments: Optional[int] = None) -> Dict[str, int]:
+        """
+        Post line comments as batched reviews.
+        
+        Comments are mapped to the PR's files, dropped if their line is not
+        part of the diff (GitHub rejects the whole review otherwise), skipped
+        if an identical KiroLinter comment already exists, and packed into
+        reviews of ``max_comments_per_review`` comments. A review rejected as
+        invalid is split in half and retried to isolate the bad comment.
+        
+        Args:
+            pr_number: Pull request number
+            comments: Comments to post
+            summary: Body of the first review, if any
+            pr_info: Pull request information, fetched if not given
+            max_comments: Optional cap on the number of new comments
+        
+        Returns:
+            Counters: posted, duplicates, outside_diff, failed and reviews
+        """
+        stats = {'posted': 0, 'duplicates': 0, 'outside_diff': 0, 'failed': 0, 'reviews': 0}
+        pr_info = pr_info or self._get_pr_info(pr_number)
+        if not pr_info:
+            stats['failed'] = len(comments)
+            return stats
+        
+        commentable = {f['filename']: self._extract_changed_lines(f.get('patch', ''))
+                       for f in self._get_pr_files(pr_number)}
+        existing = self._get_existing_fingerprints(pr_number)
+        
+        pending = []
+        for comment in comments:
+            path = self._match_pr_path(comment.file_path, commentable)
+            if path is None or comment.line_number not in commentable[path]:
+                stats['outside_diff'] += 1
+                continue
+            comment = PRComment(path, comment.line_number, comment.message,
+                                comment.suggestion, comment.rule_id)
+            if comment.fingerprint in existing:
+                stats['duplicates'] += 1
+                continue
+            existing.add(comment.fingerprint)
+            pending.append(comment)
+        
+        if max_comments is not None:
+            pending = pending[:max_comments]
+        
+        batches = [pending[i:i + self.max_comments_per_review]
+                   for i in range(0, len(pending), self.max_comments_per_review)]
+        if not batches and summary:
+            batches = [[]]
+        
+        commit_id = pr_info.get('head', {}).get('sha')
+        for index, batch in enumerate(batches):
+            body = summary if index == 0 else f"KiroLinter review (continued, part {index + 1} of {len(batches)})"
+            self._post_review_batch(pr_number, batch, body, commit_id, stats)
+        
+        return stats
+    
     def post_summary_comment(self, pr_number: int, analysis_summary: Dict[str, Any]) -> bool:
         """
         Post a summary comment with analysis overview.
@@ -122,11 +210,10 @@ class GitHubClient:
         try:
             summary_text = self._generate_summary_text(analysis_summary)
             
-            url = f"{self.base_url}/repos/{self.repository}/issues/{pr_number}/comments"
             data = {"body": summary_text}
             
-            response = self.session.post(url, json=data)
-            self._update_rate_limit(response)
+            response = self._request('POST', f"/repos/{self.repository}/issues/{pr_number}/comments",
+                                     json=data)
             
             return response.status_code == 201
             
@@ -149,7 +236,6 @@ class GitHubClient:
             True if successful, False otherwise
         """
         try:
-            url = f"{self.base_url}/repos/{self.repository}/statuses/{commit_sha}"
             data = {
                 "state": state,
                 "description": description,
@@ -159,8 +245,8 @@ class GitHubClient:
             if target_url:
                 data["target_url"] = target_url
             
-            response = self.session.post(url, json=data)
-            self._update_rate_limit(response)
+            response = self._request('POST', f"/repos/{self.repository}/statuses/{commit_sha}",
+                                     json=data)
             
             return response.status_code == 201
             
@@ -171,9 +257,7 @@ class GitHubClient:
     def _get_pr_info(self, pr_number: int) -> Optional[Dict[str, Any]]:
         """Get pull request information."""
         try:
-            url = f"{self.base_url}/repos/{self.repository}/pulls/{pr_number}"
-            response = self.session.get(url)
-            self._update_rate_limit(response)
+            response = self._request('GET', f"/repos/{self.repository}/pulls/{pr_number}")
             
             if response.status_code == 200:
                 return response.json()
@@ -197,7 +281,8 @@ class GitHubClient:
                     file_path=scan_result.file_path,
                     line_number=issue.line_number,
                     message=comment_text,
-                    suggestion=self._format_suggestion(issue) if hasattr(issue, 'suggestion') else None
+                    suggestion=self._format_suggestion(issue) if hasattr(issue, 'suggestion') else None,
+                    rule_id=issue.rule_id
                 )
                 comments.append(comment)
         
@@ -245,19 +330,36 @@ class GitHubClient:
         
         return None
     
+    def _post_review_batch(self, pr_number: int, comments: List[PRComment], body: str,
+                           commit_id: Optional[str], stats: Dict[str, int]):
+        """Post one review, bisecting it if GitHub rejects one of its comments."""
+        status = self._post_review(pr_number, comments, body, commit_id)
+        if status == 200:
+            stats['reviews'] += 1
+            stats['posted'] += len(comments)
+        elif status == 422 and len(comments) > 1:
+            middle = len(comments) // 2
+            self._post_review_batch(pr_number, comments[:middle], body, commit_id, stats)
+            self._post_review_batch(pr_number, comments[middle:], "", commit_id, stats)
+        else:
+            stats['failed'] += max(1, len(comments))
+    
     def _post_review(self, pr_number: int, comments: List[PRComment], 
-                    summary: str) -> bool:
-        """Post a review with multiple comments."""
+                    summary: str, commit_id: Optional[str] = None) -> int:
+        """
+        Post a review with multiple comments.
+        
+        Returns:
+            HTTP status code, or 0 if the request failed
+        """
         try:
-            url = f"{self.base_url}/repos/{self.repository}/pulls/{pr_number}/reviews"
-            
-            # Format comments for GitHub API
             review_comments = []
-            for comment in comments[:50]:  # Limit comments
+            for comment in comments:
                 review_comments.append({
                     "path": comment.file_path,
                     "line": comment.line_number,
-                    "body": comment.message
+                    "side": "RIGHT",
+                    "body": f"{comment.message}\n\n<!-- kirolinter:{comment.fingerprint} -->"
                 })
             
             data = {
@@ -265,40 +367,52 @@ class GitHubClient:
                 "event": "COMMENT",  # Use COMMENT instead of REQUEST_CHANGES
                 "comments": review_comments
             }
+            if commit_id:
+                data["commit_id"] = commit_id
             
-            response = self.session.post(url, json=data)
-            self._update_rate_limit(response)
-            
-            return response.status_code == 200
+            response = self._request('POST', f"/repos/{self.repository}/pulls/{pr_number}/reviews",
+                                     json=data)
+            return response.status_code
             
         except Exception as e:
             print(f"Error posting review: {e}")
-            return False
+            return 0
     
-    def _post_single_comment(self, pr_number: int, comment: PRComment) -> bool:
-        """Post a single line comment."""
-        try:
-            # Get PR info for commit SHA
-            pr_info = self._get_pr_info(pr_number)
-            if not pr_info:
-                return False
-            
-            url = f"{self.base_url}/repos/{self.repository}/pulls/{pr_number}/comments"
-            data = {
-                "body": comment.message,
-                "commit_id": pr_info["head"]["sha"],
-                "path": comment.file_path,
-                "line": comment.line_number
-            }
-            
-            response = self.session.post(url, json=data)
-            self._update_rate_limit(response)
-            
-            return response.status_code == 201
-            
-        except Exception as e:
-            print(f"Error posting single comment: {e}")
-            return False
+    def _get_pr_files(self, pr_number: int) -> List[Dict[str, Any]]:
+        """Get the files changed by a pull request."""
+        return self._get_paginated(f"/repos/{self.repository}/pulls/{pr_number}/files")
+    
+    def _get_existing_fingerprints(self, pr_number: int) -> Set[str]:
+        """Get fingerprints of KiroLinter comments already on a pull request."""
+        fingerprints = set()
+        for comment in self._get_paginated(f"/repos/{self.repository}/pulls/{pr_number}/comments"):
+            match = _FINGERPRINT_MARKER.search(comment.get('body') or '')
+            if match:
+                fingerprints.add(match.group(1))
+        return fingerprints
+    
+    def _extract_changed_lines(self, patch: str) -> Set[int]:
+        """Get the new-file line numbers shown in a patch, which review comments may target."""
+        lines = set()
+        line_number = None
+        for line in patch.splitlines():
+            match = _HUNK_HEADER.match(line)
+            if match:
+                line_number = int(match.group(1))
+            elif line_number is None or line.startswith('-') or line.startswith('\\'):
+                continue
+            else:
+                lines.add(line_number)
+                line_number += 1
+        return lines
+    
+    def _match_pr_path(self, file_path: str, pr_paths) -> Optional[str]:
+        """Map a local file path to the repository-relative path of a PR file."""
+        local = file_path.replace('\\', '/')
+        if local in pr_paths:
+            return local
+        matches = [path for path in pr_paths if local.endswith('/' + path)]
+        return max(matches, key=len) if matches else None
     
     def _generate_summary_text(self, analysis_summary: Dict[str, Any]) -> str:
         """Generate summary comment text."""
@@ -375,6 +489,65 @@ All analyzed files passed the code quality check.
         if 'X-RateLimit-Reset' in response.headers:
             self.rate_limit_reset = int(response.headers['X-RateLimit-Reset'])
     
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send an API request on the pooled session.
+        
+        Waits when the tracked rate limit is exhausted, spaces out
+        content-creating requests, and retries rate-limited responses after
+        ``Retry-After`` or the reset time.
+        """
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        kwargs.setdefault('timeout', 30)
+        
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_rate_limit()
+            if method != 'GET':
+                wait = self._last_post_time + self.min_post_interval - time.time()
+                if wait > 0:
+                    time.sleep(wait)
+                self._last_post_time = time.time()
+            
+            response = self.session.request(method, url, **kwargs)
+            self._update_rate_limit(response)
+            
+            delay = self._rate_limit_delay(response)
+            if delay is None or attempt == self.max_retries:
+                return response
+            time.sleep(delay)
+        
+        return response
+    
+    def _get_paginated(self, path: str) -> List[Dict[str, Any]]:
+        """GET every page of a list endpoint."""
+        items = []
+        url = f"{self.base_url}{path}?per_page=100"
+        while url:
+            response = self._request('GET', url)
+            if response.status_code != 200:
+                break
+            items.extend(response.json())
+            url = response.links.get('next', {}).get('url')
+        return items
+    
+    def _rate_limit_delay(self, response: requests.Response) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if not rate limited."""
+        if response.status_code not in (403, 429):
+            return None
+        if 'Retry-After' in response.headers:
+            return float(response.headers['Retry-After'])
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            return max(1.0, self.rate_limit_reset - time.time())
+        return None
+    
+    def _wait_for_rate_limit(self):
+        """Sleep until the reset time once the tracked rate limit is exhausted."""
+        if self.rate_limit_remaining <= 0:
+            sleep_time = self.rate_limit_reset - time.time()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            self.rate_limit_remaining = 1
+    
     def check_rate_limit(self) -> bool:
         """Check if we're approaching rate limits."""
         if self.rate_limit_remaining < 100:
@@ -3,17 +3,26 @@ Conversation Memory for KiroLinter AI Agents.
 
 This module provides memory capabilities for maintaining context across
 agent interactions and conversations with intelligent summarization.
+
+Memory is persisted as a JSON snapshot plus an append-only JSONL log next
+to it. Each interaction, summary and session cleanup appends one line to
+the log; the snapshot is rewritten (and the log emptied) only when the log
+has grown by ``compact_every`` entries, on ``clear_memory`` or on an
+explicit ``compact()``. Loading reads the snapshot and replays the log.
 """
 
 from typing import List, Dict, Any, Optional, Set
 from datetime import datetime, timedelta
 import json
 import os
+import tempfile
 import logging
 import hashlib
 from pathlib import Path
 from collections import defaultdict, Counter
 
+from .text_index import TextIndex
+
 
 class ConversationMemory:
     """
@@ -29,7 +38,7 @@ class ConversationMemory:
     """
     
     def __init__(self, memory_file: Optional[str] = None, max_history: int = 100, 
-                 max_session_age_hours: int = 24):
+                 max_session_age_hours: int = 24, compact_every: int = 500):
         """
         Initialize enhanced conversation memory.
         
@@ -37,15 +46,26 @@ class ConversationMemory:
             memory_file: Optional file path for persistent storage
             max_history: Maximum number of interactions to keep in memory
             max_session_age_hours: Maximum age of sessions before cleanup
+            compact_every: Log entries appended before the snapshot is rewritten
         """
         self.max_history = max_history
         self.max_session_age_hours = max_session_age_hours
+        self.compact_every = max(1, compact_every)
         self.conversation_history: List[Dict[str, Any]] = []
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self.agent_interactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         self.summaries: List[Dict[str, Any]] = []
         self.logger = logging.getLogger(__name__)
         
+        # Interactions still in history, per session
+        self._session_interactions: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # Full-text index over the interactions in history, keyed by object identity
+        self._text_index = TextIndex()
+        self._indexed: Dict[int, Dict[str, Any]] = {}
+        # Sequence number of the last log entry, and entries appended since the last snapshot
+        self._log_seq = 0
+        self._log_entries = 0
+        
         # Set up persistent storage
         if memory_file:
             self.memory_file = Path(memory_file)
@@ -54,6 +74,7 @@ class ConversationMemory:
             kiro_dir = Path.cwd() / ".kiro" / "agent_memory"
             kiro_dir.mkdir(parents=True, exist_ok=True)
             self.memory_file = kiro_dir / "conversation_memory.json"
+        self.log_file = self.memory_file.with_name(self.memory_file.name + ".log")
         
         # Load existing memory
         self._load_memory()
@@ -92,16 +113,33 @@ class ConversationMemory:
             "context_length": len(user_input) + len(agent_response)
         }
         
+        self._index_interaction(interaction)
+        
+        # Persist to disk: one appended line, not a rewrite of the whole memory
+        self._append_log("add", interaction=interaction)
+        
+        # Check if we need to summarize or trim
+        self._manage_memory_size()
+        
+        return interaction_id
+    
+    def _index_interaction(self, interaction: Dict[str, Any]) -> None:
+        """Add an interaction to the history, the agent and session indexes and its session."""
+        agent_name = interaction["agent_name"]
+        session_id = interaction["session_id"]
+        
         # Add to main history
         self.conversation_history.append(interaction)
         
-        # Track by agent
+        # Track by agent and by session, and index the text for search
         self.agent_interactions[agent_name].append(interaction)
+        self._session_interactions[session_id].append(interaction)
+        self._index_text(interaction)
         
         # Update session tracking
         if session_id not in self.sessions:
             self.sessions[session_id] = {
-                "created_at": now.isoformat(),
+                "created_at": interaction["timestamp"],
                 "agents_involved": set(),
                 "interaction_count": 0,
                 "total_context_length": 0
@@ -111,15 +149,7 @@ class ConversationMemory:
         session["agents_involved"].add(agent_name)
         session["interaction_count"] += 1
         session["total_context_length"] += interaction["context_length"]
-        session["last_activity"] = now.isoformat()
-        
-        # Check if we need to summarize or trim
-        self._manage_memory_size()
-        
-        # Persist to disk
-        self._save_memory()
-        
-        return interaction_id
+        session["last_activity"] = interaction["timestamp"]
     
     def get_conversation_history(self, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -160,12 +190,17 @@ class ConversationMemory:
                 context_parts.append("")
         
         # Get recent interactions, prioritizing those involving the requesting agent
-        agent_interactions = [i for i in self.conversation_history if i["agent_name"] == agent_name]
-        other_interactions = [i for i in self.conversation_history if i["agent_name"] != agent_name]
-        
-        # Mix agent-specific and general interactions
-        recent_agent = agent_interactions[-max(1, last_n // 2):] if agent_interactions else []
-        recent_other = other_interactions[-max(1, last_n // 2):] if other_interactions else []
+        per_side = max(1, last_n // 2)
+        recent_agent = self.agent_interactions.get(agent_name, [])[-per_side:]
+        
+        # Mix agent-specific and general interactions, walking back only as far as needed
+        recent_other = []
+        for interaction in reversed(self.conversation_history):
+            if len(recent_other) == per_side:
+                break
+            if interaction["agent_name"] != agent_name:
+                recent_other.append(interaction)
+        recent_other.reverse()
         
         # Combine and sort by timestamp
         combined_interactions = recent_agent + recent_other
@@ -199,6 +234,9 @@ class ConversationMemory:
         """
         Search conversation history for relevant interactions with enhanced filtering.
         
+        Interactions are ranked with BM25 over an inverted index kept in
+        step with the history, so a query only visits matching interactions.
+        
         Args:
             query: Search query
             limit: Maximum number of results to return
@@ -208,44 +246,30 @@ class ConversationMemory:
         Returns:
             List of matching interactions with relevance scores
         """
-        query_lower = query.lower()
-        matches = []
+        # Restrict the search to the agent's or session's interactions when filtered
+        candidates = None
+        if agent_name:
+            candidates = {id(i) for i in self.agent_interactions.get(agent_name, [])}
+        if session_id:
+            in_session = {id(i) for i in self._session_interactions.get(session_id, [])}
+            candidates = in_session if candidates is None else candidates & in_session
         
-        for interaction in self.conversation_history:
-            # Apply filters
-            if agent_name and interaction["agent_name"] != agent_name:
-                continue
-            if session_id and interaction.get("session_id") != session_id:
-                continue
-            
-            # Calculate relevance score
-            relevance_score = 0
-            user_input = interaction["user_input"].lower()
-            agent_response = interaction["agent_response"].lower()
-            
-            # Exact phrase matches get higher scores
-            if query_lower in user_input:
-                relevance_score += 2
-            if query_lower in agent_response:
-                relevance_score += 2
-            
-            # Word matches get lower scores
-            query_words = query_lower.split()
-            for word in query_words:
-                if word in user_input:
-                    relevance_score += 1
-                if word in agent_response:
-                    relevance_score += 1
-            
-            if relevance_score > 0:
-                interaction_copy = interaction.copy()
-                interaction_copy["relevance_score"] = relevance_score
-                matches.append(interaction_copy)
+        matches = []
+        for key, relevance_score in self._text_index.search(query, candidates).items():
+            interaction_copy = self._indexed[key].copy()
+            interaction_copy["relevance_score"] = relevance_score
+            matches.append(interaction_copy)
         
         # Sort by relevance score and recency
         matches.sort(key=lambda x: (x["relevance_score"], x["timestamp"]), reverse=True)
         return matches[:limit]
     
+    def _index_text(self, interaction: Dict[str, Any]) -> None:
+        """Add an interaction's input and response to the search index."""
+        key = id(interaction)
+        self._indexed[key] = interaction
+        self._text_index.add(key, f"{interaction['user_input']}\n{interaction['agent_response']}")
+    
     def create_session_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Create an intelligent summary of a conversation session.
@@ -260,7 +284,7 @@ class ConversationMemory:
             return None
         
         session = self.sessions[session_id]
-        session_interactions = [i for i in self.conversation_history if i.get("session_id") == session_id]
+        session_interactions = list(self._session_interactions.get(session_id, []))
         
         if not session_interactions:
             return None
@@ -330,34 +354,45 @@ class ConversationMemory:
         
         # Trim history if it exceeds max_history
         if len(self.conversation_history) > self.max_history:
-            # Keep the most recent interactions
-            old_interactions = self.conversation_history[:-self.max_history]
-            self.conversation_history = self.conversation_history[-self.max_history:]
-            
-            # Update agent interactions
-            for agent_name in self.agent_interactions:
-                self.agent_interactions[agent_name] = [
-                    i for i in self.agent_interactions[agent_name] 
-                    if i in self.conversation_history
-                ]
+            self._trim_history()
         
         # Clean up old sessions
         self._cleanup_old_sessions()
     
+    def _trim_history(self) -> None:
+        """Keep the most recent ``max_history`` interactions and drop the rest from the indexes."""
+        old_interactions = self.conversation_history[:-self.max_history]
+        self.conversation_history = self.conversation_history[-self.max_history:]
+        
+        # Only the agents and sessions of dropped interactions need updating
+        dropped = {id(i) for i in old_interactions}
+        for key in dropped:
+            self._text_index.remove(key)
+            self._indexed.pop(key, None)
+        for index, key in ((self.agent_interactions, "agent_name"), (self._session_interactions, "session_id")):
+            for name in {i[key] for i in old_interactions}:
+                remaining = [i for i in index.get(name, []) if id(i) not in dropped]
+                if remaining:
+                    index[name] = remaining
+                else:
+                    index.pop(name, None)
+    
     def _create_summaries_for_old_sessions(self) -> None:
         """Create summaries for sessions that are about to be trimmed."""
         cutoff_time = datetime.now() - timedelta(hours=self.max_session_age_hours)
+        summarized = {s["session_id"] for s in self.summaries}
         
         for session_id, session_data in list(self.sessions.items()):
             session_time = datetime.fromisoformat(session_data["created_at"])
             
             if session_time < cutoff_time:
                 # Create summary if not already exists
-                existing_summary = next((s for s in self.summaries if s["session_id"] == session_id), None)
-                if not existing_summary:
+                if session_id not in summarized:
                     summary = self.create_session_summary(session_id)
                     if summary:
                         self.summaries.append(summary)
+                        summarized.add(session_id)
+                        self._append_log("summary", summary=summary)
                         self.logger.info(f"Created summary for session {session_id}")
     
     def _cleanup_old_sessions(self) -> None:
@@ -372,6 +407,7 @@ class ConversationMemory:
         
         for session_id in sessions_to_remove:
             del self.sessions[session_id]
+            self._append_log("drop_session", session_id=session_id)
             self.logger.info(f"Cleaned up old session {session_id}")
         
         # Limit summaries to prevent unbounded growth
@@ -427,8 +463,7 @@ class ConversationMemory:
         session["agents_involved"] = list(session["agents_involved"])  # Convert set to list for JSON serialization
         
         # Add interaction details
-        session_interactions = [i for i in self.conversation_history if i.get("session_id") == session_id]
-        session["interactions"] = session_interactions
+        session["interactions"] = list(self._session_interactions.get(session_id, []))
         
         return session
     
@@ -488,11 +523,14 @@ class ConversationMemory:
         self.conversation_history = []
         self.sessions = {}
         self.agent_interactions = defaultdict(list)
+        self._session_interactions = defaultdict(list)
+        self._text_index.clear()
+        self._indexed.clear()
         
         if not preserve_summaries:
             self.summaries = []
         
-        self._save_memory()
+        self.compact()
     
     def export_memory(self, export_path: str) -> bool:
         """
@@ -521,43 +559,111 @@ class ConversationMemory:
             return False
     
     def _load_memory(self) -> None:
-        """Load enhanced conversation memory from disk."""
+        """Load the snapshot from disk and replay the log appended since."""
+        snapshot_seq = 0
         try:
-            if self.memory_file.exists():
+            if self.memory_file.exists() and self.memory_file.stat().st_size > 0:
                 with open(self.memory_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    
-                    # Load conversation history
-                    self.conversation_history = data.get("conversation_history", [])
-                    
-                    # Load sessions (convert agents_involved back to sets)
-                    sessions_data = data.get("sessions", {})
-                    for session_id, session_info in sessions_data.items():
-                        session_info["agents_involved"] = set(session_info.get("agents_involved", []))
-                        self.sessions[session_id] = session_info
-                    
-                    # Load summaries
-                    self.summaries = data.get("summaries", [])
-                    
-                    # Rebuild agent interactions index
-                    self.agent_interactions = defaultdict(list)
-                    for interaction in self.conversation_history:
-                        agent_name = interaction["agent_name"]
-                        self.agent_interactions[agent_name].append(interaction)
-                    
-                    # Ensure we don't exceed max_history
-                    if len(self.conversation_history) > self.max_history:
-                        self.conversation_history = self.conversation_history[-self.max_history:]
-                        
+                
+                # Load sessions (convert agents_involved back to sets)
+                for session_id, session_info in data.get("sessions", {}).items():
+                    session_info["agents_involved"] = set(session_info.get("agents_involved", []))
+                    self.sessions[session_id] = session_info
+                
+                # Load summaries
+                self.summaries = data.get("summaries", [])
+                
+                # Load conversation history; the sessions above already count it
+                self.conversation_history = data.get("conversation_history", [])
+                snapshot_seq = data.get("log_seq", 0)
+                
         except Exception as e:
             self.logger.error(f"Failed to load memory from {self.memory_file}: {e}")
             self.conversation_history = []
             self.sessions = {}
-            self.agent_interactions = defaultdict(list)
             self.summaries = []
+        
+        self._log_seq = snapshot_seq
+        for entry in self._read_log():
+            # Entries already folded into the snapshot are left from an interrupted compaction
+            if entry.get("seq", 0) <= snapshot_seq:
+                continue
+            self._replay(entry)
+            self._log_seq = max(self._log_seq, entry["seq"])
+            self._log_entries += 1
+        
+        # Ensure we don't exceed max_history, then rebuild the agent and session indexes
+        if len(self.conversation_history) > self.max_history:
+            self.conversation_history = self.conversation_history[-self.max_history:]
+        self.agent_interactions = defaultdict(list)
+        self._session_interactions = defaultdict(list)
+        self._text_index.clear()
+        self._indexed.clear()
+        for interaction in self.conversation_history:
+            self.agent_interactions[interaction["agent_name"]].append(interaction)
+            self._session_interactions[interaction.get("session_id")].append(interaction)
+            self._index_text(interaction)
+    
+    def _read_log(self) -> List[Dict[str, Any]]:
+        """Read the log entries, skipping a line torn by an interrupted write."""
+        entries = []
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        self.logger.warning(f"Skipping unreadable entry in {self.log_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.error(f"Failed to read memory log {self.log_file}: {e}")
+        return entries
+    
+    def _replay(self, entry: Dict[str, Any]) -> None:
+        """Apply one log entry to the state loaded so far."""
+        op = entry.get("op")
+        if op == "add":
+            interaction = entry["interaction"]
+            # The indexes are rebuilt once replay is done
+            self.conversation_history.append(interaction)
+            session = self.sessions.setdefault(interaction["session_id"], {
+                "created_at": interaction["timestamp"],
+                "agents_involved": set(),
+                "interaction_count": 0,
+                "total_context_length": 0
+            })
+            session["agents_involved"].add(interaction["agent_name"])
+            session["interaction_count"] += 1
+            session["total_context_length"] += interaction["context_length"]
+            session["last_activity"] = interaction["timestamp"]
+        elif op == "summary":
+            self.summaries.append(entry["summary"])
+            if len(self.summaries) > 50:
+                self.summaries = self.summaries[-50:]
+        elif op == "drop_session":
+            self.sessions.pop(entry["session_id"], None)
     
-    def _save_memory(self) -> None:
-        """Save enhanced conversation memory to disk."""
+    def _append_log(self, op: str, **fields: Any) -> None:
+        """Append one entry to the log, compacting once enough have accumulated."""
+        self._log_seq += 1
+        entry = {"seq": self._log_seq, "op": op}
+        entry.update(fields)
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str, separators=(',', ':')) + "\n")
+        except Exception as e:
+            self.logger.error(f"Failed to append to memory log {self.log_file}: {e}")
+            return
+        
+        self._log_entries += 1
+        if self._log_entries >= self.compact_every:
+            self.compact()
+    
+    def compact(self) -> None:
+        """Write the whole memory to the snapshot file and empty the log."""
         try:
             # Ensure directory exists
             self.memory_file.parent.mkdir(parents=True, exist_ok=True)
@@ -571,6 +677,7 @@ class ConversationMemory:
             
             data = {
                 "saved_at": datetime.now().isoformat(),
+                "log_seq": self._log_seq,
                 "total_interactions": len(self.conversation_history),
                 "total_sessions": len(self.sessions),
                 "total_summaries": len(self.summaries),
@@ -581,8 +688,22 @@ class ConversationMemory:
                 "summaries": self.summaries
             }
             
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            # Replace the snapshot atomically; log entries up to log_seq are then redundant
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.memory_file.parent),
+                                            prefix=f".{self.memory_file.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                os.replace(tmp_path, self.memory_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            
+            open(self.log_file, 'w', encoding='utf-8').close()
+            self._log_entries = 0
                 
         except Exception as e:
             self.logger.error(f"Failed to save memory to {self.memory_file}: {e}")
@@ -12,7 +12,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set, Tuple
 from collections import defaultdict, Counter
-import re
+
+from .knowledge_store import (DEFAULT_FLUSH_EVERY, DEFAULT_FLUSH_INTERVAL, JSONKnowledgeStore,
+                              KnowledgeStore, SQLiteKnowledgeStore)
+from .text_index import TextIndex
 
 
 class KnowledgeBase:
@@ -20,19 +23,29 @@ class KnowledgeBase:
     Structured knowledge storage system for coding insights and patterns.
     
     Features:
-    - JSON-based knowledge storage with semantic search
+    - JSON or SQLite storage, written behind in batches (see knowledge_store)
+    - Full-text pattern search
     - Pattern library for reusable coding patterns and best practices
     - Fix template storage with success rate tracking
     - Team insights aggregation and reporting
     - Cross-repository pattern sharing
     """
     
-    def __init__(self, knowledge_dir: Optional[str] = None):
+    def __init__(self, knowledge_dir: Optional[str] = None, backend: str = "json",
+                 flush_every: int = DEFAULT_FLUSH_EVERY,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL):
         """
         Initialize knowledge base.
         
+        Changes are kept in memory and written in batches: every ``flush_every``
+        mutations, ``flush_interval`` seconds after the first unwritten one,
+        and on ``flush()``/``close()``.
+        
         Args:
             knowledge_dir: Optional directory for knowledge storage
+            backend: 'json' (one file per collection) or 'sqlite' (one row per entry)
+            flush_every: Mutations buffered before they are written (1 writes through)
+            flush_interval: Seconds before buffered mutations are written; None disables the timer
         """
         if knowledge_dir:
             self.knowledge_dir = Path(knowledge_dir)
@@ -49,31 +62,53 @@ class KnowledgeBase:
         self.insights_file = self.knowledge_dir / "team_insights.json"
         self.best_practices_file = self.knowledge_dir / "best_practices.json"
         
-        # Load existing data
-        self.patterns = self._load_json_file(self.patterns_file, {})
-        self.fix_templates = self._load_json_file(self.templates_file, {})
-        self.team_insights = self._load_json_file(self.insights_file, {})
-        self.best_practices = self._load_json_file(self.best_practices_file, {})
+        if backend == "json":
+            self._store: KnowledgeStore = JSONKnowledgeStore(
+                self.knowledge_dir, flush_every=flush_every, flush_interval=flush_interval)
+        elif backend == "sqlite":
+            self._store = SQLiteKnowledgeStore(
+                self.knowledge_dir / "knowledge.db", flush_every=flush_every, flush_interval=flush_interval)
+        else:
+            raise ValueError(f"Unsupported knowledge base backend: {backend}")
+        
+        # Load existing data; the store persists these dictionaries, so they are never rebound
+        self.patterns = self._store.load("patterns")
+        self.fix_templates = self._store.load("fix_templates")
+        self.team_insights = self._store.load("team_insights")
+        self.best_practices = self._store.load("best_practices")
+        
+        # Full-text index over the patterns, kept in sync as they are stored
+        self._pattern_index = TextIndex()
+        self._reindex_patterns()
     
-    def _load_json_file(self, file_path: Path, default: Any) -> Any:
-        """Load JSON file with error handling."""
-        try:
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Failed to load {file_path}: {e}")
-        return default
+    def _reindex_patterns(self) -> None:
+        """Rebuild the pattern search index from scratch."""
+        self._pattern_index.clear()
+        for pattern_id in self.patterns:
+            self._index_pattern(pattern_id)
     
-    def _save_json_file(self, file_path: Path, data: Any) -> bool:
-        """Save data to JSON file with error handling."""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to save {file_path}: {e}")
-            return False
+    def _index_pattern(self, pattern_id: str) -> None:
+        """Index the searchable text of one pattern."""
+        pattern = self.patterns[pattern_id]
+        # ID, category and tags are counted twice so they outweigh matches in the data
+        labels = " ".join([pattern_id, pattern.get("category", "")] + list(pattern.get("tags", [])))
+        data = json.dumps(pattern.get("data", {}), ensure_ascii=False, default=str)
+        self._pattern_index.add(pattern_id, f"{labels} {labels} {data}")
+    
+    def flush(self) -> bool:
+        """Write all buffered changes now; return False if writing failed."""
+        return self._store.flush()
+    
+    def close(self) -> bool:
+        """Write buffered changes and release the storage backend."""
+        return self._store.close()
+    
+    def __enter__(self) -> 'KnowledgeBase':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
     
     def store_pattern(self, pattern_id: str, pattern_data: Dict[str, Any],
                      category: str = "general", tags: Optional[List[str]] = None) -> bool:
@@ -102,20 +137,18 @@ class KnowledgeBase:
             }
             
             # Update existing pattern or create new one
-            if pattern_id in self.patterns:
-                existing = self.patterns[pattern_id]
-                pattern_entry["created_at"] = existing.get("created_at", pattern_entry["created_at"])
-                pattern_entry["usage_count"] = existing.get("usage_count", 0) + 1  # Increment usage count
-                pattern_entry["success_rate"] = existing.get("success_rate", 0.0)
-            
-            self.patterns[pattern_id] = pattern_entry
-            
-            # Save to disk
-            if self._save_json_file(self.patterns_file, self.patterns):
-                self.logger.info(f"Stored pattern: {pattern_id}")
-                return True
+            with self._store.mutation("patterns", pattern_id):
+                if pattern_id in self.patterns:
+                    existing = self.patterns[pattern_id]
+                    pattern_entry["created_at"] = existing.get("created_at", pattern_entry["created_at"])
+                    pattern_entry["usage_count"] = existing.get("usage_count", 0) + 1  # Increment usage count
+                    pattern_entry["success_rate"] = existing.get("success_rate", 0.0)
+                
+                self.patterns[pattern_id] = pattern_entry
+            self._index_pattern(pattern_id)
             
-            return False
+            self.logger.info(f"Stored pattern: {pattern_id}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to store pattern {pattern_id}: {e}")
@@ -138,6 +171,9 @@ class KnowledgeBase:
         """
         Search patterns using semantic matching.
         
+        Patterns are ranked with BM25 over an inverted index of their ID,
+        category, tags and data, so a query only visits matching patterns.
+        
         Args:
             query: Search query
             category: Optional category filter
@@ -147,11 +183,11 @@ class KnowledgeBase:
         Returns:
             List of matching patterns with relevance scores
         """
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
         matches = []
         
-        for pattern_id, pattern in self.patterns.items():
+        for pattern_id, relevance_score in self._pattern_index.search(query).items():
+            pattern = self.patterns[pattern_id]
+            
             # Apply filters
             if category and pattern.get("category") != category:
                 continue
@@ -159,43 +195,13 @@ class KnowledgeBase:
             if tags and not any(tag in pattern.get("tags", []) for tag in tags):
                 continue
             
-            # Calculate relevance score
-            relevance_score = 0
-            
-            # Check pattern ID
-            if query_lower in pattern_id.lower():
-                relevance_score += 3
-            
-            # Check category
-            if query_lower in pattern.get("category", "").lower():
-                relevance_score += 2
-            
-            # Check tags
-            for tag in pattern.get("tags", []):
-                if query_lower in tag.lower():
-                    relevance_score += 2
-            
-            # Check pattern data (convert to string for searching)
-            pattern_text = json.dumps(pattern.get("data", {})).lower()
-            
-            # Exact phrase match
-            if query_lower in pattern_text:
-                relevance_score += 3
-            
-            # Word matches
-            pattern_words = set(re.findall(r'\w+', pattern_text))
-            common_words = query_words.intersection(pattern_words)
-            relevance_score += len(common_words)
-            
             # Boost score based on usage and success rate
             usage_boost = min(pattern.get("usage_count", 0) * 0.1, 2.0)
             success_boost = pattern.get("success_rate", 0.0) * 2.0
-            relevance_score += usage_boost + success_boost
             
-            if relevance_score > 0:
-                pattern_copy = pattern.copy()
-                pattern_copy["relevance_score"] = relevance_score
-                matches.append(pattern_copy)
+            pattern_copy = pattern.copy()
+            pattern_copy["relevance_score"] = relevance_score + usage_boost + success_boost
+            matches.append(pattern_copy)
         
         # Sort by relevance score
         matches.sort(key=lambda x: x["relevance_score"], reverse=True)
@@ -227,19 +233,16 @@ class KnowledgeBase:
             }
             
             # Update existing template or create new one
-            if template_id in self.fix_templates:
-                existing = self.fix_templates[template_id]
-                template_entry["created_at"] = existing.get("created_at", template_entry["created_at"])
-                template_entry["usage_count"] = existing.get("usage_count", 0)
-            
-            self.fix_templates[template_id] = template_entry
-            
-            # Save to disk
-            if self._save_json_file(self.templates_file, self.fix_templates):
-                self.logger.info(f"Stored fix template: {template_id}")
-                return True
+            with self._store.mutation("fix_templates", template_id):
+                if template_id in self.fix_templates:
+                    existing = self.fix_templates[template_id]
+                    template_entry["created_at"] = existing.get("created_at", template_entry["created_at"])
+                    template_entry["usage_count"] = existing.get("usage_count", 0)
+                
+                self.fix_templates[template_id] = template_entry
             
-            return False
+            self.logger.info(f"Stored fix template: {template_id}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to store fix template {template_id}: {e}")
@@ -291,24 +294,21 @@ class KnowledgeBase:
             
             template = self.fix_templates[template_id]
             
-            # Update usage count
-            usage_count = template.get("usage_count", 0) + 1
-            template["usage_count"] = usage_count
-            
-            # Update success rate using exponential moving average
-            current_rate = template.get("success_rate", 0.0)
-            alpha = 0.1  # Learning rate
-            new_rate = current_rate + alpha * (1.0 if success else 0.0 - current_rate)
-            template["success_rate"] = max(0.0, min(1.0, new_rate))
-            
-            template["updated_at"] = datetime.now().isoformat()
-            
-            # Save to disk
-            if self._save_json_file(self.templates_file, self.fix_templates):
-                self.logger.info(f"Updated success rate for template {template_id}: {template['success_rate']:.2f}")
-                return True
+            with self._store.mutation("fix_templates", template_id):
+                # Update usage count
+                usage_count = template.get("usage_count", 0) + 1
+                template["usage_count"] = usage_count
+                
+                # Update success rate using exponential moving average
+                current_rate = template.get("success_rate", 0.0)
+                alpha = 0.1  # Learning rate
+                new_rate = current_rate + alpha * (1.0 if success else 0.0 - current_rate)
+                template["success_rate"] = max(0.0, min(1.0, new_rate))
+                
+                template["updated_at"] = datetime.now().isoformat()
             
-            return False
+            self.logger.info(f"Updated success rate for template {template_id}: {template['success_rate']:.2f}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to update template success rate: {e}")
@@ -328,9 +328,6 @@ class KnowledgeBase:
             True if stored successfully
         """
         try:
-            if repo_path not in self.team_insights:
-                self.team_insights[repo_path] = {}
-            
             insight_id = hashlib.md5(f"{repo_path}_{insight_type}_{datetime.now().isoformat()}".encode()).hexdigest()[:12]
             
             insight_entry = {
@@ -340,20 +337,18 @@ class KnowledgeBase:
                 "data": insight_data
             }
             
-            if insight_type not in self.team_insights[repo_path]:
-                self.team_insights[repo_path][insight_type] = []
-            
-            self.team_insights[repo_path][insight_type].append(insight_entry)
-            
-            # Keep only recent insights (last 50 per type)
-            self.team_insights[repo_path][insight_type] = self.team_insights[repo_path][insight_type][-50:]
-            
-            # Save to disk
-            if self._save_json_file(self.insights_file, self.team_insights):
-                self.logger.info(f"Stored team insight for {repo_path}: {insight_type}")
-                return True
+            with self._store.mutation("team_insights", repo_path):
+                repo_insights = self.team_insights.setdefault(repo_path, {})
+                if insight_type not in repo_insights:
+                    repo_insights[insight_type] = []
+                
+                repo_insights[insight_type].append(insight_entry)
+                
+                # Keep only recent insights (last 50 per type)
+                repo_insights[insight_type] = repo_insights[insight_type][-50:]
             
-            return False
+            self.logger.info(f"Stored team insight for {repo_path}: {insight_type}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to store team insight: {e}")
@@ -417,17 +412,14 @@ class KnowledgeBase:
                 "data": practice_data
             }
             
-            if category not in self.best_practices:
-                self.best_practices[category] = {}
-            
-            self.best_practices[category][practice_id] = practice_entry
-            
-            # Save to disk
-            if self._save_json_file(self.best_practices_file, self.best_practices):
-                self.logger.info(f"Stored best practice: {practice_id}")
-                return True
+            with self._store.mutation("best_practices", category):
+                if category not in self.best_practices:
+                    self.best_practices[category] = {}
+                
+                self.best_practices[category][practice_id] = practice_entry
             
-            return False
+            self.logger.info(f"Stored best practice: {practice_id}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to store best practice {practice_id}: {e}")
@@ -523,70 +515,70 @@ class KnowledgeBase:
             with open(import_path, 'r', encoding='utf-8') as f:
                 import_data = json.load(f)
             
-            if merge:
-                # Merge patterns with deduplication
-                for pattern_id, pattern_data in import_data.get("patterns", {}).items():
-                    if pattern_id not in self.patterns:
-                        self.patterns[pattern_id] = pattern_data
-                    else:
-                        # Update usage count and timestamp for existing patterns
-                        existing = self.patterns[pattern_id]
-                        existing["usage_count"] = existing.get("usage_count", 0) + pattern_data.get("usage_count", 0)
-                        existing["updated_at"] = datetime.now().isoformat()
+            # Hold every collection for the whole import and write each file once
+            store = self._store
+            with store.mutation("patterns"), store.mutation("fix_templates"), \
+                    store.mutation("team_insights"), store.mutation("best_practices"):
+                if merge:
+                    # Merge patterns with deduplication
+                    for pattern_id, pattern_data in import_data.get("patterns", {}).items():
+                        if pattern_id not in self.patterns:
+                            self.patterns[pattern_id] = pattern_data
+                            self._index_pattern(pattern_id)
+                        else:
+                            # Update usage count and timestamp for existing patterns
+                            existing = self.patterns[pattern_id]
+                            existing["usage_count"] = existing.get("usage_count", 0) + pattern_data.get("usage_count", 0)
+                            existing["updated_at"] = datetime.now().isoformat()
                 
-                # Merge fix templates with deduplication
-                for template_id, template_data in import_data.get("fix_templates", {}).items():
-                    if template_id not in self.fix_templates:
-                        self.fix_templates[template_id] = template_data
-                    else:
-                        # Update success rate using weighted average
-                        existing = self.fix_templates[template_id]
-                        existing_count = existing.get("usage_count", 1)
-                        import_count = template_data.get("usage_count", 1)
-                        total_count = existing_count + import_count
+                    # Merge fix templates with deduplication
+                    for template_id, template_data in import_data.get("fix_templates", {}).items():
+                        if template_id not in self.fix_templates:
+                            self.fix_templates[template_id] = template_data
+                        else:
+                            # Update success rate using weighted average
+                            existing = self.fix_templates[template_id]
+                            existing_count = existing.get("usage_count", 1)
+                            import_count = template_data.get("usage_count", 1)
+                            total_count = existing_count + import_count
                         
-                        existing_rate = existing.get("success_rate", 0.0)
-                        import_rate = template_data.get("success_rate", 0.0)
+                            existing_rate = existing.get("success_rate", 0.0)
+                            import_rate = template_data.get("success_rate", 0.0)
                         
-                        weighted_rate = (existing_rate * existing_count + import_rate * import_count) / total_count
-                        existing["success_rate"] = weighted_rate
-                        existing["usage_count"] = total_count
-                        existing["updated_at"] = datetime.now().isoformat()
+                            weighted_rate = (existing_rate * existing_count + import_rate * import_count) / total_count
+                            existing["success_rate"] = weighted_rate
+                            existing["usage_count"] = total_count
+                            existing["updated_at"] = datetime.now().isoformat()
                 
-                # Merge team insights (avoid duplicates by checking timestamps)
-                for repo_path, insights in import_data.get("team_insights", {}).items():
-                    if repo_path not in self.team_insights:
-                        self.team_insights[repo_path] = {}
-                    for insight_type, insight_list in insights.items():
-                        if insight_type not in self.team_insights[repo_path]:
-                            self.team_insights[repo_path][insight_type] = []
+                    # Merge team insights (avoid duplicates by checking timestamps)
+                    for repo_path, insights in import_data.get("team_insights", {}).items():
+                        if repo_path not in self.team_insights:
+                            self.team_insights[repo_path] = {}
+                        for insight_type, insight_list in insights.items():
+                            if insight_type not in self.team_insights[repo_path]:
+                                self.team_insights[repo_path][insight_type] = []
                         
-                        # Deduplicate by checking existing insight IDs
-                        existing_ids = {insight.get("id") for insight in self.team_insights[repo_path][insight_type]}
-                        new_insights = [insight for insight in insight_list if insight.get("id") not in existing_ids]
-                        self.team_insights[repo_path][insight_type].extend(new_insights)
+                            # Deduplicate by checking existing insight IDs
+                            existing_ids = {insight.get("id") for insight in self.team_insights[repo_path][insight_type]}
+                            new_insights = [insight for insight in insight_list if insight.get("id") not in existing_ids]
+                            self.team_insights[repo_path][insight_type].extend(new_insights)
                 
-                # Merge best practices with deduplication
-                for category, practices in import_data.get("best_practices", {}).items():
-                    if category not in self.best_practices:
-                        self.best_practices[category] = {}
-                    for practice_id, practice_data in practices.items():
-                        if practice_id not in self.best_practices[category]:
-                            self.best_practices[category][practice_id] = practice_data
-            else:
-                # Replace existing data
-                self.patterns = import_data.get("patterns", {})
-                self.fix_templates = import_data.get("fix_templates", {})
-                self.team_insights = import_data.get("team_insights", {})
-                self.best_practices = import_data.get("best_practices", {})
-            
-            # Save all data
-            success = all([
-                self._save_json_file(self.patterns_file, self.patterns),
-                self._save_json_file(self.templates_file, self.fix_templates),
-                self._save_json_file(self.insights_file, self.team_insights),
-                self._save_json_file(self.best_practices_file, self.best_practices)
-            ])
+                    # Merge best practices with deduplication
+                    for category, practices in import_data.get("best_practices", {}).items():
+                        if category not in self.best_practices:
+                            self.best_practices[category] = {}
+                        for practice_id, practice_data in practices.items():
+                            if practice_id not in self.best_practices[category]:
+                                self.best_practices[category][practice_id] = practice_data
+                else:
+                    # Replace existing data
+                    for collection in ("patterns", "fix_templates", "team_insights", "best_practices"):
+                        data = getattr(self, collection)
+                        data.clear()
+                        data.update(import_data.get(collection, {}))
+                    self._reindex_patterns()
+            
+            success = self._store.flush()
             
             if success:
                 self.logger.info(f"Knowledge base imported from {import_path} with deduplication")
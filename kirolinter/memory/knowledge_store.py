@@ -0,0 +1,342 @@
+"""
+Write-behind storage engines for the KnowledgeBase.
+
+The knowledge base keeps its collections (patterns, fix templates, team
+insights, best practices) as dictionaries in memory. A store records which
+collections - or, for the SQLite backend, which top-level keys - changed,
+and writes them out in batches: when enough mutations are pending, when the
+flush interval has passed, on ``flush()``/``close()`` and at interpreter exit.
+
+``JSONKnowledgeStore`` replaces each dirty collection file atomically, so a
+crash mid-write leaves the previous version in place. ``SQLiteKnowledgeStore``
+keeps one row per top-level key and only writes the rows that changed.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Mutations buffered before a flush is forced
+DEFAULT_FLUSH_EVERY = 100
+
+# Seconds a mutation may stay unwritten before the background flush
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+# Stores with data that may still be unwritten, flushed at exit and before
+# another store opens the same location
+_live_stores: 'weakref.WeakSet[KnowledgeStore]' = weakref.WeakSet()
+
+
+def _flush_live_stores(location: Optional[str] = None) -> None:
+    """Flush every live store, or only those persisting to ``location``."""
+    for store in list(_live_stores):
+        if location is None or store.location == location:
+            store.flush()
+
+
+atexit.register(_flush_live_stores)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _read_json_file(file_path: Path, logger: logging.Logger) -> Dict[str, Any]:
+    try:
+        if file_path.exists():
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load {file_path}: {e}")
+    return {}
+
+
+class KnowledgeStore:
+    """
+    Base class for write-behind stores of named dictionary collections.
+
+    Callers mutate the dictionaries returned by ``load`` inside ``mutation``;
+    subclasses implement ``_read``, ``_snapshot`` and ``_write``.
+    """
+
+    def __init__(self, location: str, flush_every: int = DEFAULT_FLUSH_EVERY,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            location: Where the store persists; stores sharing it see each other's writes
+            flush_every: Pending mutations that force a flush (1 writes through)
+            flush_interval: Seconds before pending mutations are flushed in the
+                background; None or 0 disables the timer
+        """
+        self.location = location
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._data: Dict[str, Dict[str, Any]] = {}
+        # Collection -> changed keys, or None when the whole collection changed
+        self._dirty: Dict[str, Optional[Set[str]]] = {}
+        self._pending = 0
+        # Nesting level of mutation blocks in progress
+        self._depth = 0
+        self._timer: Optional[threading.Timer] = None
+        # Guards the collections and the dirty set; held while serializing
+        self._lock = threading.RLock()
+        # Serializes writes so an older snapshot never lands after a newer one
+        self._flush_lock = threading.Lock()
+        self._closed = False
+
+        # Another store on the same location may hold writes this one should read
+        _flush_live_stores(location)
+        _live_stores.add(self)
+
+    def __enter__(self) -> 'KnowledgeStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def pending(self) -> int:
+        """Number of mutations not yet written."""
+        return self._pending
+
+    def load(self, collection: str) -> Dict[str, Any]:
+        """Read ``collection`` and return the dictionary the store will persist."""
+        with self._lock:
+            if collection not in self._data:
+                self._data[collection] = self._read(collection)
+            return self._data[collection]
+
+    @contextmanager
+    def mutation(self, collection: str, *keys: str) -> Iterator[None]:
+        """
+        Hold the store while a collection is changed, then mark it dirty.
+
+        Args:
+            collection: Collection being changed
+            keys: Top-level keys that change; none means any key may
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                self._mark_dirty(collection, keys)
+                # Nested mutations leave the flush to the outermost one
+                flush_now = self._depth == 0 and self._pending >= self.flush_every
+                if not flush_now:
+                    self._schedule()
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write every pending change; return False if the write failed."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                dirty, self._dirty = self._dirty, {}
+                pending, self._pending = self._pending, 0
+                self._cancel_timer()
+                snapshot = self._snapshot(dirty)
+            try:
+                self._write(snapshot)
+                return True
+            except Exception as e:
+                self.logger.error(f"Failed to write knowledge store {self.location}: {e}")
+                # Keep the changes pending so the next flush retries them
+                with self._lock:
+                    for collection, keys in dirty.items():
+                        self._mark_dirty(collection, keys or (), count=False)
+                    self._pending += pending
+                return False
+
+    def close(self) -> bool:
+        """Flush pending changes and stop the background timer."""
+        if self._closed:
+            return True
+        success = self.flush()
+        with self._lock:
+            self._cancel_timer()
+            self._closed = True
+        _live_stores.discard(self)
+        self._close()
+        return success
+
+    def _mark_dirty(self, collection: str, keys, count: bool = True) -> None:
+        if keys and self._dirty.get(collection, set()) is not None:
+            self._dirty.setdefault(collection, set()).update(keys)
+        else:
+            self._dirty[collection] = None
+        if count:
+            self._pending += 1
+
+    def _schedule(self) -> None:
+        if self._timer is None and self.flush_interval and not self._closed:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timed_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def _read(self, collection: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _snapshot(self, dirty: Dict[str, Optional[Set[str]]]) -> Any:
+        """Serialize the dirty data; called with the store lock held."""
+        raise NotImplementedError
+
+    def _write(self, snapshot: Any) -> None:
+        """Persist a snapshot; called without the store lock."""
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+class JSONKnowledgeStore(KnowledgeStore):
+    """One JSON file per collection, each replaced atomically when it changes."""
+
+    def __init__(self, directory: Path, **kwargs):
+        self.directory = Path(directory)
+        super().__init__(str(self.directory.resolve()), **kwargs)
+
+    def path(self, collection: str) -> Path:
+        return self.directory / f"{collection}.json"
+
+    def _read(self, collection: str) -> Dict[str, Any]:
+        return _read_json_file(self.path(collection), self.logger)
+
+    def _snapshot(self, dirty: Dict[str, Optional[Set[str]]]) -> List[Tuple[Path, str]]:
+        return [(self.path(collection), _dumps(self._data.get(collection, {}))) for collection in dirty]
+
+    def _write(self, snapshot: List[Tuple[Path, str]]) -> None:
+        if not self.directory.is_dir():
+            # The knowledge base was deleted under us; there is nothing left to update
+            self.logger.debug(f"Knowledge directory {self.directory} is gone, dropping unwritten changes")
+            return
+        for file_path, text in snapshot:
+            fd, tmp_path = tempfile.mkstemp(dir=str(file_path.parent),
+                                            prefix=f".{file_path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+
+class SQLiteKnowledgeStore(KnowledgeStore):
+    """
+    One row per top-level key, so a change rewrites only the rows it touched.
+
+    A collection the database has never stored is seeded from the JSON file a
+    ``JSONKnowledgeStore`` would use, when one exists alongside the database.
+    Collections written once are recorded in ``knowledge_collections`` and are
+    never seeded again, even when they have since been emptied.
+    """
+
+    def __init__(self, db_path: Path, **kwargs):
+        self.db_path = Path(db_path)
+        # Guards the connection, which reads and background flushes share
+        self._conn_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS knowledge (
+                collection TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (collection, key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS knowledge_collections (
+                collection TEXT PRIMARY KEY
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+        super().__init__(str(self.db_path.resolve()), **kwargs)
+
+    def _read(self, collection: str) -> Dict[str, Any]:
+        with self._conn_lock:
+            stored = self._conn.execute(
+                "SELECT 1 FROM knowledge_collections WHERE collection = ?", (collection,)).fetchone()
+            rows = self._conn.execute(
+                "SELECT key, value FROM knowledge WHERE collection = ?", (collection,)).fetchall()
+            if rows and not stored:
+                # Written before collections were recorded
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO knowledge_collections (collection) VALUES (?)", (collection,))
+        if rows or stored:
+            return {key: json.loads(value) for key, value in rows}
+
+        legacy = _read_json_file(self.db_path.parent / f"{collection}.json", self.logger)
+        if legacy:
+            self._dirty[collection] = None
+            self._pending += 1
+        return legacy
+
+    def _snapshot(self, dirty: Dict[str, Optional[Set[str]]]) -> List[Tuple[str, bool, List, List]]:
+        snapshot = []
+        for collection, keys in dirty.items():
+            data = self._data.get(collection, {})
+            if keys is None:
+                snapshot.append((collection, True, [(collection, k, _dumps(v)) for k, v in data.items()], []))
+            else:
+                upserts = [(collection, k, _dumps(data[k])) for k in keys if k in data]
+                deletes = [(collection, k) for k in keys if k not in data]
+                snapshot.append((collection, False, upserts, deletes))
+        return snapshot
+
+    def _write(self, snapshot: List[Tuple[str, bool, List, List]]) -> None:
+        with self._conn_lock, self._conn:
+            for collection, replace, upserts, deletes in snapshot:
+                # Recorded with the data, so a seeded collection is only ever seeded once
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO knowledge_collections (collection) VALUES (?)", (collection,))
+                if replace:
+                    self._conn.execute("DELETE FROM knowledge WHERE collection = ?", (collection,))
+                if deletes:
+                    self._conn.executemany(
+                        "DELETE FROM knowledge WHERE collection = ? AND key = ?", deletes)
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO knowledge (collection, key, value) VALUES (?, ?, ?)",
+                        upserts)
+
+    def _close(self) -> None:
+        with self._conn_lock:
+            self._conn.close()
@@ -13,12 +13,14 @@ import sqlite3
 import re
 import hashlib
 import logging
+import threading
 import time
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from collections import Counter, defaultdict
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
 # Try to import Redis support
 try:
@@ -33,6 +35,49 @@ except ImportError:
 # Import DataAnonymizer from separate module to avoid circular imports
 from .anonymizer import DataAnonymizer
 
+
+# Prepared statements kept per connection; every query in this module fits
+_STATEMENT_CACHE_SIZE = 256
+
+# Indexes covering the lookups each method makes. The single-column repo_path
+# indexes of earlier versions are prefixes of these and are dropped.
+_INDEXES = """
+DROP INDEX IF EXISTS idx_team_patterns_repo;
+DROP INDEX IF EXISTS idx_issue_patterns_repo;
+DROP INDEX IF EXISTS idx_fix_outcomes_repo;
+CREATE INDEX IF NOT EXISTS idx_team_patterns_repo_type
+    ON team_patterns(repo_path, pattern_type, confidence);
+CREATE INDEX IF NOT EXISTS idx_issue_patterns_repo_seen
+    ON issue_patterns(repo_path, last_seen, trend_score);
+CREATE INDEX IF NOT EXISTS idx_fix_outcomes_repo_type
+    ON fix_outcomes(repo_path, fix_type, success, feedback_score);
+CREATE INDEX IF NOT EXISTS idx_learning_sessions_repo_created
+    ON learning_sessions(repo_path, created_at);
+CREATE INDEX IF NOT EXISTS idx_learning_history_repo_created
+    ON learning_history(repo_path, created_at);
+"""
+
+class _ThreadConnection:
+    """A thread's connection, held in thread-local storage until the thread ends."""
+    
+    __slots__ = ('conn', 'db_path', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection, db_path: str):
+        self.conn = conn
+        self.db_path = db_path
+
+
+def _release_connection(connections: Set[sqlite3.Connection], lock: threading.Lock,
+                        conn: sqlite3.Connection) -> None:
+    """Forget and close a connection whose thread has ended."""
+    with lock:
+        connections.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
 # Placeholder class to be removed
 class _DataAnonymizer_PLACEHOLDER:
     """Comprehensive data anonymization for pattern storage."""
@@ -160,6 +205,14 @@ class PatternMemory:
         
         self.anonymizer = DataAnonymizer()
         self.logger = logging.getLogger(__name__)
+        
+        # One connection per thread, opened on first use and reused by every
+        # call; an in-memory database is one connection shared under a lock
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._memory_lock = threading.RLock()
         self._init_database()
     
     def _init_database(self) -> None:
@@ -168,7 +221,7 @@ class PatternMemory:
             # Ensure directory exists
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.executescript("""
                 CREATE TABLE IF NOT EXISTS team_patterns (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -228,17 +281,15 @@ class PatternMemory:
                     created_at TEXT NOT NULL
                 );
                 
-                CREATE INDEX IF NOT EXISTS idx_team_patterns_repo ON team_patterns(repo_path);
-                CREATE INDEX IF NOT EXISTS idx_issue_patterns_repo ON issue_patterns(repo_path);
-                CREATE INDEX IF NOT EXISTS idx_fix_outcomes_repo ON fix_outcomes(repo_path);
                 """)
+                conn.executescript(_INDEXES)
         except Exception as e:
             self.logger.error(f"Failed to initialize database: {e}")
             # Create a fallback in-memory database for testing
             self.db_path = ":memory:"
             # Re-try initialization with in-memory database
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self._connection() as conn:
                     conn.executescript("""
                     CREATE TABLE IF NOT EXISTS team_patterns (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -294,7 +345,7 @@ class PatternMemory:
     def _ensure_tables_exist(self) -> None:
         """Ensure all required tables exist, create them if missing."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.executescript("""
                 CREATE TABLE IF NOT EXISTS team_patterns (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -348,28 +399,91 @@ class PatternMemory:
         except Exception as e:
             self.logger.error(f"Failed to ensure tables exist: {e}")
     
+    @contextmanager
+    def _connection(self):
+        """
+        Use this thread's connection, opening it on first use.
+        
+        Used as ``with self._connection() as conn:``, a block commits on
+        success and rolls back on error, as with a fresh connection, but
+        the connection and its statement cache stay open for the next call.
+        """
+        conn, lock = self._thread_connection()
+        with lock, conn:
+            yield conn
+    
+    def _thread_connection(self) -> Tuple[sqlite3.Connection, Any]:
+        """Return this thread's connection and the lock to hold while using it."""
+        db_path = str(self.db_path)
+        if db_path == ":memory:":
+            # Each connection to :memory: is a separate, empty database
+            with self._connections_lock:
+                if self._memory_conn is None:
+                    self._memory_conn = self._open(db_path)
+                    self._connections.add(self._memory_conn)
+                return self._memory_conn, self._memory_lock
+        
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None and holder.db_path == db_path:
+            return holder.conn, nullcontext()
+        
+        conn = self._open(db_path)
+        holder = _ThreadConnection(conn, db_path)
+        self._local.holder = holder
+        with self._connections_lock:
+            self._connections.add(conn)
+        # The holder is dropped with the thread's local storage, or replaced
+        # when the database moves; either way the connection is closed
+        weakref.finalize(holder, _release_connection, self._connections, self._connections_lock, conn)
+        return conn, nullcontext()
+    
+    @staticmethod
+    def _open(db_path: str) -> sqlite3.Connection:
+        # Not bound to the opening thread, so a finished thread's connection can be closed anywhere
+        conn = sqlite3.connect(db_path, timeout=30.0, cached_statements=_STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        # sqlite3.Row still unpacks and indexes like a tuple
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+        if db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; fsync on checkpoint only
+        return conn
+    
+    def close(self) -> None:
+        """Close the connections still open, including those of running threads."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._memory_conn = None
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+    
     @contextmanager
     def get_transaction(self, retries: int = 3):
         """Get database transaction with automatic rollback on error and retry logic."""
-        for attempt in range(retries):
-            try:
-                conn = sqlite3.connect(self.db_path, timeout=30.0)
-                conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for better concurrency
-                conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+        conn, lock = self._thread_connection()
+        with lock:
+            for attempt in range(retries):
+                try:
+                    # Take the write lock up front so a locked database fails here, where it can be retried
+                    conn.execute("BEGIN IMMEDIATE")
+                except sqlite3.OperationalError as e:
+                    if "database is locked" in str(e) and attempt < retries - 1:
+                        time.sleep(0.1 * (attempt + 1))  # Exponential backoff
+                        continue
+                    raise
                 try:
                     yield conn
                     conn.commit()
-                    return
                 except Exception:
                     conn.rollback()
                     raise
-                finally:
-                    conn.close()
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e) and attempt < retries - 1:
-                    time.sleep(0.1 * (attempt + 1))  # Exponential backoff
-                    continue
-                raise
+                return
     
     def store_pattern(self, repo_path: str, pattern_type: str, 
                      pattern_data: Dict[str, Any], confidence: float = 0.0) -> bool:
@@ -425,9 +539,9 @@ class PatternMemory:
                         WHERE repo_path = ? AND pattern_type = ?
                     """, (pattern_json, confidence, now, repo_path, pattern_type))
                     
-                    # Log the change
-                    self.record_learning_change(
-                        repo_path, pattern_type, existing[1], pattern_json, 
+                    # Log the change in the same transaction
+                    self._insert_learning_change(
+                        conn, repo_path, pattern_type, existing[1], pattern_json, 
                         f"Updated pattern confidence from {old_confidence} to {confidence}"
                     )
                 else:
@@ -438,9 +552,9 @@ class PatternMemory:
                         VALUES (?, ?, ?, ?, ?, ?, ?)
                     """, (repo_path, pattern_type, pattern_type, pattern_json, confidence, now, now))
                     
-                    # Log the creation
-                    self.record_learning_change(
-                        repo_path, pattern_type, None, pattern_json, 
+                    # Log the creation in the same transaction
+                    self._insert_learning_change(
+                        conn, repo_path, pattern_type, None, pattern_json, 
                         f"Created new pattern with confidence {confidence}"
                     )
                 
@@ -524,9 +638,7 @@ class PatternMemory:
             List of matching patterns
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
+            with self._connection() as conn:
                 query = """
                     SELECT * FROM team_patterns 
                     WHERE repo_path = ? AND confidence >= ?
@@ -568,7 +680,7 @@ class PatternMemory:
             True if tracked successfully
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 now = datetime.now().isoformat()
                 
                 # Try to update existing issue pattern
@@ -592,6 +704,55 @@ class PatternMemory:
             print(f"Failed to track issue pattern: {e}")
             return False
     
+    def track_issue_patterns(self, repo_path: str,
+                             patterns: Iterable[Tuple[str, str, str]]) -> bool:
+        """
+        Track many issue occurrences at once.
+        
+        Occurrences are counted per (issue_type, issue_rule) in memory and
+        written in one transaction with a single ``executemany`` UPSERT, so
+        the stored frequencies and trend scores match calling
+        ``track_issue_pattern`` once per occurrence.
+        
+        Args:
+            repo_path: Repository path
+            patterns: (issue_type, issue_rule, severity) for each occurrence
+            
+        Returns:
+            True if tracked successfully
+        """
+        counts: Dict[Tuple[str, str], List[Any]] = {}
+        for issue_type, issue_rule, severity in patterns:
+            entry = counts.get((issue_type, issue_rule))
+            if entry is None:
+                # A new row keeps the severity of its first occurrence
+                counts[(issue_type, issue_rule)] = [severity, 1]
+            else:
+                entry[1] += 1
+        if not counts:
+            return True
+        
+        now = datetime.now().isoformat()
+        # A new row starts like one insert followed by (count - 1) updates
+        rows = [(repo_path, issue_type, issue_rule, severity, count, 0.1 * (count - 1), now, now)
+                for (issue_type, issue_rule), (severity, count) in counts.items()]
+        try:
+            with self.get_transaction() as conn:
+                conn.executemany("""
+                    INSERT INTO issue_patterns
+                    (repo_path, issue_type, issue_rule, severity, frequency, trend_score, last_seen, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(repo_path, issue_type, issue_rule) DO UPDATE SET
+                        frequency = frequency + excluded.frequency,
+                        last_seen = excluded.last_seen,
+                        trend_score = trend_score + 0.1 * excluded.frequency
+                """, rows)
+            return True
+            
+        except Exception as e:
+            print(f"Failed to track issue patterns: {e}")
+            return False
+    
     def get_issue_trends(self, repo_path: str, days_back: int = 30) -> Dict[str, Any]:
         """
         Get trending issue patterns for a repository.
@@ -604,9 +765,7 @@ class PatternMemory:
             Dictionary with trending issues and statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
+            with self._connection() as conn:
                 cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
                 
                 cursor = conn.execute("""
@@ -655,7 +814,7 @@ class PatternMemory:
             True if recorded successfully
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 now = datetime.now().isoformat()
                 
                 conn.execute("""
@@ -682,7 +841,7 @@ class PatternMemory:
             Dictionary with success rates by fix type
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.execute("""
                     SELECT fix_type, 
                            COUNT(*) as total_attempts,
@@ -727,7 +886,7 @@ class PatternMemory:
             True if recorded successfully
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 now = datetime.now().isoformat()
                 
                 conn.execute("""
@@ -755,7 +914,7 @@ class PatternMemory:
             Dictionary with learning analytics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
                 
                 cursor = conn.execute("""
@@ -808,22 +967,26 @@ class PatternMemory:
             True if recorded successfully
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                change_id = hashlib.md5(f"{repo_path}_{pattern_type}_{datetime.now().isoformat()}".encode()).hexdigest()
-                now = datetime.now().isoformat()
-                
-                conn.execute("""
-                    INSERT INTO learning_history 
-                    (change_id, repo_path, before_data, after_data, reason, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (change_id, repo_path, before_data, after_data, reason, now))
-                
+            with self._connection() as conn:
+                self._insert_learning_change(conn, repo_path, pattern_type, before_data, after_data, reason)
                 return True
                 
         except Exception as e:
             self.logger.error(f"Failed to record learning change: {e}")
             return False
     
+    def _insert_learning_change(self, conn: sqlite3.Connection, repo_path: str, pattern_type: str,
+                                before_data: Optional[str], after_data: str, reason: str) -> None:
+        """Insert a learning_history row within the caller's transaction."""
+        change_id = hashlib.md5(f"{repo_path}_{pattern_type}_{datetime.now().isoformat()}".encode()).hexdigest()
+        now = datetime.now().isoformat()
+        
+        conn.execute("""
+            INSERT INTO learning_history 
+            (change_id, repo_path, before_data, after_data, reason, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (change_id, repo_path, before_data, after_data, reason, now))
+    
     def retrieve_patterns(self, repo_path: str, pattern_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Retrieve patterns for a repository (simplified method for compatibility).
@@ -854,7 +1017,7 @@ class PatternMemory:
                 self.logger.error(f"Invalid confidence score: {new_confidence}")
                 return False
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.execute("""
                     UPDATE team_patterns 
                     SET confidence = ?, updated_at = ?
@@ -895,7 +1058,7 @@ class PatternMemory:
             True if cleanup successful
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
                 
                 # Clean up old fix outcomes
@@ -934,8 +1097,7 @@ class PatternMemory:
             Dictionary with pattern evolution data
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._connection() as conn:
                 cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
                 
                 cursor = conn.execute("""
@@ -10,7 +10,7 @@ import logging
 import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from collections import Counter, defaultdict
 
 try:
@@ -278,6 +278,69 @@ class RedisPatternMemory:
             self.logger.error(f"Failed to track issue pattern: {e}")
             return False
     
+    def track_issue_patterns(self, repo_path: str,
+                             patterns: Iterable[Tuple[str, str, str]]) -> bool:
+        """
+        Track many issue occurrences at once.
+        
+        Occurrences are counted per (issue_type, issue_rule) in memory, the
+        existing entries are fetched with one HMGET and the merged entries
+        are written back in one pipeline.
+        
+        Args:
+            repo_path: Repository path
+            patterns: (issue_type, issue_rule, severity) for each occurrence
+            
+        Returns:
+            True if tracked successfully
+        """
+        counts: Dict[str, List[Any]] = {}
+        for issue_type, issue_rule, severity in patterns:
+            issue_id = f"{issue_type}:{issue_rule}"
+            entry = counts.get(issue_id)
+            if entry is None:
+                counts[issue_id] = [issue_type, issue_rule, severity, 1]
+            else:
+                entry[3] += 1
+        if not counts:
+            return True
+        
+        try:
+            issue_key = self._get_issue_key(repo_path)
+            now = datetime.now().isoformat()
+            issue_ids = list(counts)
+            
+            updates = {}
+            for issue_id, existing in zip(issue_ids, self.redis.hmget(issue_key, issue_ids)):
+                issue_type, issue_rule, severity, count = counts[issue_id]
+                if existing:
+                    issue_data = json.loads(existing)
+                    issue_data["frequency"] = issue_data.get("frequency", 0) + count
+                    issue_data["last_seen"] = now
+                    issue_data["trend_score"] = issue_data.get("trend_score", 0) + 0.1 * count
+                else:
+                    issue_data = {
+                        "issue_type": issue_type,
+                        "issue_rule": issue_rule,
+                        "severity": severity,
+                        "frequency": count,
+                        "last_seen": now,
+                        "trend_score": 0.1 * count,
+                        "created_at": now
+                    }
+                updates[issue_id] = json.dumps(issue_data)
+            
+            pipe = self.redis.pipeline()
+            pipe.hset(issue_key, mapping=updates)
+            pipe.expire(issue_key, self.default_ttl)
+            pipe.execute()
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to track issue patterns: {e}")
+            return False
+    
     def get_issue_trends(self, repo_path: str, days_back: int = 30) -> Dict[str, Any]:
         """
         Get trending issue patterns for a repository.
@@ -0,0 +1,107 @@
+"""
+Inverted text index with BM25 ranking for the in-memory stores.
+
+Documents are tokenized once when they are added; a query only touches the
+postings of its own terms, so search cost follows the number of matching
+documents rather than the size of the store.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# Runs of letters and digits; underscores split identifiers such as snake_case
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into index terms."""
+    return _TOKEN.findall(text.lower())
+
+
+class TextIndex:
+    """Token-to-postings index kept in sync by ``add`` and ``remove``."""
+
+    # Standard BM25 parameters: term frequency saturation and length normalization
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._lengths
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index ``text`` under ``key``, replacing what was indexed for it before."""
+        self.remove(key)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[key] = count
+        self._terms[key] = tuple(counts)
+        self._lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop ``key`` from the index, if present."""
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def search(self, query: str, keys: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, float]:
+        """
+        Score the documents matching any query term with BM25.
+
+        A query term with no exact match falls back to the indexed terms it
+        is a prefix of, so partial words still find their documents.
+
+        Args:
+            query: Free-text query
+            keys: Optional set of keys to restrict the search to
+
+        Returns:
+            Mapping of matching key to relevance score (always positive)
+        """
+        if not self._lengths:
+            return {}
+        allowed = set(keys) if keys is not None else None
+        doc_count = len(self._lengths)
+        avg_length = self._total_length / doc_count or 1.0
+
+        scores: Dict[Hashable, float] = {}
+        for term in set(tokenize(query)):
+            for indexed_term in self._expand(term):
+                postings = self._postings[indexed_term]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    if allowed is not None and key not in allowed:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[key] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+    def _expand(self, term: str) -> List[str]:
+        if term in self._postings:
+            return [term]
+        return [indexed for indexed in self._postings if indexed.startswith(term)]
@@ -2,7 +2,6 @@
 Configuration models for KiroLinter.
 """
 
-import yaml
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
 from pathlib import Path
@@ -24,9 +23,20 @@ class Config:
         'build', 'dist', '.pytest_cache', 'node_modules'
     ])
     
+    # List files from the git index when the target is a git checkout
+    git_file_discovery: bool = True
+    
     max_complexity: int = 10
     max_line_length: int = 88
     
+    # Number of worker processes for file scanning (1 = serial, 0 = one per CPU)
+    workers: int = 1
+    
+    # Persistent scan result cache (cache_dir defaults to .kiro/scan_cache in the analyzed project)
+    cache_enabled: bool = True
+    cache_dir: str = ''
+    cache_max_size_mb: int = 256
+    
     # GitHub integration settings
     github_token: str = ''
     github_repo: str = ''
@@ -35,6 +45,24 @@ class Config:
     openai_api_key: str = ''
     use_ai_suggestions: bool = True
     fallback_to_rules: bool = True
+    # LiteLLM model for suggestions (e.g. 'ollama/llama3'); empty uses the OpenAI client
+    ai_model: str = ''
+    # Concurrent, rate-limited AI suggestion requests, several issues per prompt
+    ai_max_concurrency: int = 4
+    ai_requests_per_minute: int = 60
+    ai_batch_size: int = 5
+    # Persistent AI response cache: 'sqlite' (llm_cache_dir defaults to .kiro/llm_cache), 'redis' or 'none'
+    llm_cache_backend: str = 'sqlite'
+    llm_cache_dir: str = ''
+    llm_cache_redis_url: str = ''
+    llm_cache_ttl_hours: int = 720
+    llm_cache_max_entries: int = 10000
+    
+    # CVE enrichment of security issues; cve_index_path points to an offline index
+    # built with 'kirolinter cve import', otherwise the NVD API is queried
+    enable_cve_integration: bool = False
+    nvd_api_key: str = ''
+    cve_index_path: str = ''
     
     # Team Style Preferences (learned from commit history)
     team_style: Dict[str, Any] = field(default_factory=lambda: {
@@ -94,13 +122,30 @@ class Config:
             'enabled_rules': self.enabled_rules,
             'min_severity': self.min_severity,
             'exclude_patterns': self.exclude_patterns,
+            'git_file_discovery': self.git_file_discovery,
             'max_complexity': self.max_complexity,
             'max_line_length': self.max_line_length,
+            'workers': self.workers,
+            'cache_enabled': self.cache_enabled,
+            'cache_dir': self.cache_dir,
+            'cache_max_size_mb': self.cache_max_size_mb,
             'github_token': self.github_token,
             'github_repo': self.github_repo,
             'openai_api_key': self.openai_api_key,
             'use_ai_suggestions': self.use_ai_suggestions,
             'fallback_to_rules': self.fallback_to_rules,
+            'ai_model': self.ai_model,
+            'ai_max_concurrency': self.ai_max_concurrency,
+            'ai_requests_per_minute': self.ai_requests_per_minute,
+            'ai_batch_size': self.ai_batch_size,
+            'llm_cache_backend': self.llm_cache_backend,
+            'llm_cache_dir': self.llm_cache_dir,
+            'llm_cache_redis_url': self.llm_cache_redis_url,
+            'llm_cache_ttl_hours': self.llm_cache_ttl_hours,
+            'llm_cache_max_entries': self.llm_cache_max_entries,
+            'enable_cve_integration': self.enable_cve_integration,
+            'nvd_api_key': self.nvd_api_key,
+            'cve_index_path': self.cve_index_path,
             'team_style': self.team_style,
             'github_integration': self.github_integration
         }
@@ -113,13 +158,30 @@ class Config:
             enabled_rules=data.get('enabled_rules', default_config.enabled_rules),
             min_severity=data.get('min_severity', 'low'),
             exclude_patterns=data.get('exclude_patterns', default_config.exclude_patterns),
+            git_file_discovery=data.get('git_file_discovery', True),
             max_complexity=data.get('max_complexity', 10),
             max_line_length=data.get('max_line_length', 88),
+            workers=data.get('workers', 1),
+            cache_enabled=data.get('cache_enabled', True),
+            cache_dir=data.get('cache_dir', ''),
+            cache_max_size_mb=data.get('cache_max_size_mb', 256),
             github_token=data.get('github_token', ''),
             github_repo=data.get('github_repo', ''),
             openai_api_key=data.get('openai_api_key', ''),
             use_ai_suggestions=data.get('use_ai_suggestions', True),
             fallback_to_rules=data.get('fallback_to_rules', True),
+            ai_model=data.get('ai_model', ''),
+            ai_max_concurrency=data.get('ai_max_concurrency', 4),
+            ai_requests_per_minute=data.get('ai_requests_per_minute', 60),
+            ai_batch_size=data.get('ai_batch_size', 5),
+            llm_cache_backend=data.get('llm_cache_backend', 'sqlite'),
+            llm_cache_dir=data.get('llm_cache_dir', ''),
+            llm_cache_redis_url=data.get('llm_cache_redis_url', ''),
+            llm_cache_ttl_hours=data.get('llm_cache_ttl_hours', 720),
+            llm_cache_max_entries=data.get('llm_cache_max_entries', 10000),
+            enable_cve_integration=data.get('enable_cve_integration', False),
+            nvd_api_key=data.get('nvd_api_key', ''),
+            cve_index_path=data.get('cve_index_path', ''),
             team_style=data.get('team_style', default_config.team_style),
             github_integration=data.get('github_integration', default_config.github_integration)
         )
@@ -131,6 +193,7 @@ class Config:
         if not path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
+        import yaml
         with open(path, 'r') as f:
             data = yaml.safe_load(f)
         
@@ -138,6 +201,7 @@ class Config:
     
     def save(self, config_path: Path):
         """Save configuration to YAML file."""
+        import yaml
         with open(config_path, 'w') as f:
             yaml.dump(self.to_dict(), f, default_flow_style=False, indent=2)
     
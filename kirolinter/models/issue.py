@@ -5,7 +5,7 @@ Represents code issues found during analysis with enhanced metadata
 for pattern-aware processing and risk assessment.
 """
 
-from dataclasses import dataclass, field
+import sys
 from enum import Enum
 from typing import Dict, Any, Optional
 
@@ -33,11 +33,19 @@ class IssueType(Enum):
 Severity = IssueSeverity
 
 
-@dataclass
+def _intern(value):
+    """Intern strings repeated across many issues (paths, rule ids, types)."""
+    return sys.intern(value) if type(value) is str else value
+
+
 class Issue:
     """
     Represents a code issue with enhanced metadata for Phase 4 processing.
     
+    Issues are created in large numbers, so the record uses ``__slots__``,
+    interns the strings shared by many issues, caches ``id`` and only
+    allocates ``context`` when it is first used.
+    
     Attributes:
         file_path: Path to the file containing the issue
         line_number: Line number where issue occurs
@@ -49,15 +57,26 @@ class Issue:
         priority_score: Calculated priority score (0.0-10.0)
         priority_rank: Rank in prioritized list
     """
-    file_path: str
-    line_number: int
-    rule_id: str
-    message: str
-    severity: IssueSeverity
-    issue_type: str = "code_quality"
-    context: Dict[str, Any] = field(default_factory=dict)
-    priority_score: float = 0.0
-    priority_rank: int = 0
+    
+    __slots__ = ('_file_path', '_line_number', '_rule_id', 'message', 'severity',
+                 'issue_type', '_context', 'priority_score', 'priority_rank', '_id',
+                 'suggestion', 'cve_info')
+    
+    def __init__(self, file_path: str, line_number: int, rule_id: str, message: str,
+                 severity: IssueSeverity, issue_type: str = "code_quality",
+                 context: Optional[Dict[str, Any]] = None, priority_score: float = 0.0,
+                 priority_rank: int = 0):
+        self._id = None
+        self._file_path = _intern(file_path)
+        self._line_number = line_number
+        self._rule_id = _intern(rule_id)
+        self.message = message
+        self.severity = severity
+        self.issue_type = _intern(issue_type)
+        self._context = context or None
+        self.priority_score = priority_score
+        self.priority_rank = priority_rank
+        self.__post_init__()
     
     def __post_init__(self):
         """Convert string severity to enum if needed."""
@@ -67,16 +86,74 @@ class Issue:
             except ValueError:
                 self.severity = IssueSeverity.LOW
     
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+    
+    @file_path.setter
+    def file_path(self, value: str):
+        self._file_path = _intern(value)
+        self._id = None
+    
+    @property
+    def line_number(self) -> int:
+        return self._line_number
+    
+    @line_number.setter
+    def line_number(self, value: int):
+        self._line_number = value
+        self._id = None
+    
+    @property
+    def rule_id(self) -> str:
+        return self._rule_id
+    
+    @rule_id.setter
+    def rule_id(self, value: str):
+        self._rule_id = _intern(value)
+        self._id = None
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Additional context, created on first access."""
+        if self._context is None:
+            self._context = {}
+        return self._context
+    
+    @context.setter
+    def context(self, value: Dict[str, Any]):
+        self._context = value
+    
     @property
     def id(self) -> str:
         """Generate unique identifier for the issue."""
-        return f"{self.rule_id}_{self.file_path}_{self.line_number}"
+        if self._id is None:
+            self._id = f"{self._rule_id}_{self._file_path}_{self._line_number}"
+        return self._id
     
     @property
     def type(self) -> str:
         """Alias for issue_type for backward compatibility."""
         return self.issue_type
     
+    def _astuple(self):
+        return (self._file_path, self._line_number, self._rule_id, self.message, self.severity,
+                self.issue_type, self._context or {}, self.priority_score, self.priority_rank)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None
+    
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if hasattr(self, slot)}
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert issue to dictionary representation."""
         return {
@@ -86,7 +163,7 @@ class Issue:
             "message": self.message,
             "severity": self.severity.value if hasattr(self.severity, 'value') else str(self.severity),
             "issue_type": self.issue_type,
-            "context": self.context,
+            "context": self._context if self._context is not None else {},
             "priority_score": self.priority_score,
             "priority_rank": self.priority_rank
         }
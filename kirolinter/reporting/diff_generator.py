@@ -7,6 +7,7 @@ from typing import Optional, List
 from pathlib import Path
 
 from kirolinter.models.issue import Issue
+from kirolinter.utils.source_cache import source_cache
 
 
 class DiffGenerator:
@@ -23,9 +24,11 @@ class DiffGenerator:
             Diff patch string or None if no fix available
         """
         try:
-            # Read the original file
-            with open(issue.file_path, 'r', encoding='utf-8') as f:
-                original_lines = f.readlines()
+            # Slice the original lines out of the shared source cache
+            source = source_cache.get(issue.file_path)
+            if source is None:
+                return None
+            original_lines = source.lines()
             
             # Generate fixed version based on issue type
             fixed_lines = self._apply_fix(original_lines, issue)
@@ -3,7 +3,7 @@ JSON report generation for KiroLinter analysis results.
 """
 
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, TextIO
 from datetime import datetime
 
 from kirolinter.core.scanner import ScanResult
@@ -20,7 +20,8 @@ class JSONReporter:
     
     def generate_report(self, target: str, scan_results: List[ScanResult], 
                        total_files: int, analysis_time: float, 
-                       errors: List[str] = None) -> str:
+                       errors: List[str] = None,
+                       cache_stats: Optional[Dict[str, int]] = None) -> str:
         """
         Generate a structured JSON report from scan results.
         
@@ -30,6 +31,7 @@ class JSONReporter:
             total_files: Total number of files analyzed
             analysis_time: Time taken for analysis in seconds
             errors: List of errors encountered during analysis
+            cache_stats: Optional result cache hit/miss counters
         
         Returns:
             JSON string containing the structured report
@@ -57,6 +59,9 @@ class JSONReporter:
             "files": []
         }
         
+        if cache_stats:
+            report["summary"]["cache"] = cache_stats
+        
         # Add file-level results
         for scan_result in scan_results:
             file_report = self._generate_file_report(scan_result)
@@ -76,6 +81,80 @@ class JSONReporter:
         
         return json.dumps(report, indent=2, ensure_ascii=False)
     
+    def write_report(self, out: TextIO, target: str, scan_results: Iterable[ScanResult],
+                     run_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stream a JSON report to ``out`` while scan results are still being produced.
+        
+        Each file is written as soon as it arrives and then dropped, so memory
+        does not grow with the size of the codebase. The summary is written
+        after the ``files`` array, once all counts are known.
+        
+        Args:
+            out: Text stream to write to
+            target: The analyzed target (repository URL or local path)
+            scan_results: Iterable of scan results, consumed once
+            run_info: Filled in by the producer of ``scan_results`` once it is
+                exhausted (total_files, analysis_time, errors, cache_stats)
+        
+        Returns:
+            The summary section of the report
+        """
+        out.write('{\n')
+        out.write(f'  "kirolinter_version": "0.1.0",\n')
+        out.write(f'  "timestamp": {json.dumps(datetime.utcnow().isoformat() + "Z")},\n')
+        out.write(f'  "target": {json.dumps(target, ensure_ascii=False)},\n')
+        out.write('  "files": [')
+        
+        counts = SummaryCounter()
+        first = True
+        for scan_result in scan_results:
+            counts.add(scan_result)
+            file_report = self._generate_file_report(scan_result)
+            if file_report["issues"] or file_report["parse_errors"]:
+                out.write('\n    ' if first else ',\n    ')
+                out.write(json.dumps(file_report, ensure_ascii=False))
+                first = False
+        out.write('\n  ],\n' if not first else '],\n')
+        
+        summary = counts.summary(run_info)
+        out.write(f'  "summary": {json.dumps(summary, ensure_ascii=False)},\n')
+        if run_info.get("errors"):
+            out.write(f'  "errors": {json.dumps(run_info["errors"], ensure_ascii=False)},\n')
+        metadata = {
+            "rules_applied": sorted(counts.rules),
+            "file_extensions_analyzed": [".py"],
+            "excluded_patterns": []
+        }
+        out.write(f'  "metadata": {json.dumps(metadata)}\n')
+        out.write('}\n')
+        return summary
+    
+    def write_ndjson(self, out: TextIO, target: str, scan_results: Iterable[ScanResult],
+                     run_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stream newline-delimited JSON: one ``file`` record per analyzed file
+        with issues, followed by a single ``summary`` record.
+        
+        Arguments and return value are as for ``write_report``.
+        """
+        counts = SummaryCounter()
+        for scan_result in scan_results:
+            counts.add(scan_result)
+            file_report = self._generate_file_report(scan_result)
+            if file_report["issues"] or file_report["parse_errors"]:
+                out.write(json.dumps({"type": "file", **file_report}, ensure_ascii=False))
+                out.write('\n')
+                out.flush()
+        
+        summary = counts.summary(run_info)
+        record = {"type": "summary", "target": target, **summary}
+        if run_info.get("errors"):
+            record["errors"] = run_info["errors"]
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write('\n')
+        return summary
+    
     def _generate_file_report(self, scan_result: ScanResult) -> Dict[str, Any]:
         """Generate report data for a single file."""
         file_report = {
@@ -201,6 +280,41 @@ class JSONReporter:
         }
 
 
+class SummaryCounter:
+    """Accumulate report summary statistics one scan result at a time."""
+    
+    def __init__(self):
+        self.total_issues = 0
+        self.files_seen = 0
+        self.severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+        self.type_counts = {"code_smell": 0, "code_quality": 0, "security": 0, "performance": 0}
+        self.rules = set()
+        self.has_critical = False
+    
+    def add(self, scan_result: ScanResult):
+        self.files_seen += 1
+        for issue in scan_result.issues:
+            self.total_issues += 1
+            self.severity_counts[issue.severity.value] += 1
+            self.type_counts[issue.issue_type] = self.type_counts.get(issue.issue_type, 0) + 1
+            self.rules.add(issue.rule_id)
+            if issue.severity == Severity.CRITICAL:
+                self.has_critical = True
+    
+    def summary(self, run_info: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {
+            "total_files_analyzed": run_info.get("total_files", self.files_seen),
+            "total_issues_found": self.total_issues,
+            "analysis_time_seconds": round(run_info.get("analysis_time", 0.0), 2),
+            "issues_by_severity": self.severity_counts,
+            "issues_by_type": self.type_counts,
+            "has_critical_issues": self.has_critical
+        }
+        if run_info.get("cache_stats"):
+            summary["cache"] = run_info["cache_stats"]
+        return summary
+
+
 class CompactJSONReporter(JSONReporter):
     """Generate compact JSON reports without detailed metadata."""
     
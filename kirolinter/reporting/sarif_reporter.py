@@ -0,0 +1,211 @@
+"""
+SARIF report generation for KiroLinter analysis results.
+
+Results are streamed as they arrive. Rule metadata is written once in the
+driver's ``rules`` table and referred to by index. Each result carries its
+file as a URI relative to the source root (``%SRCROOT%``), which is what
+code scanning services such as GitHub use to map findings to files, along
+with the file's index in the run's ``artifacts`` table.
+"""
+
+import io
+import json
+import os
+from urllib.parse import quote
+from typing import Dict, Any, Iterable, List, Optional, TextIO
+
+from kirolinter.core.scanner import ScanResult
+from kirolinter.models.issue import Issue
+from kirolinter.reporting.json_reporter import SummaryCounter
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# Base id that result URIs are relative to; consumers bind it to the checkout
+SRCROOT = "%SRCROOT%"
+
+# KiroLinter severities mapped onto SARIF result levels
+SEVERITY_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note"
+}
+
+# Short descriptions of the scanner's built-in rules
+RULE_DESCRIPTIONS = {
+    "unused_variable": "Variable is assigned but never used",
+    "unused_import": "Import is never used",
+    "dead_code": "Code is unreachable",
+    "complex_function": "Function has high cyclomatic complexity",
+    "sql_injection": "SQL query is built with string formatting",
+    "hardcoded_secret": "Secret is hardcoded in source",
+    "hardcoded_password": "Password is hardcoded in source",
+    "hardcoded_api_key": "API key is hardcoded in source",
+    "hardcoded_token": "Token is hardcoded in source",
+    "unsafe_eval": "Use of eval() on dynamic input",
+    "unsafe_exec": "Use of exec() on dynamic input",
+    "inefficient_loop_concat": "String concatenation inside a loop",
+    "redundant_len_in_loop": "len() recomputed on every loop iteration",
+    "analysis_fallback": "File could only be analyzed partially"
+}
+
+
+def relative_uri(file_path: str, source_root: Optional[str] = None) -> str:
+    """
+    Return ``file_path`` as a URI reference relative to ``source_root``.
+
+    Paths already relative, or outside the root, are kept as they are apart
+    from using forward slashes.
+    """
+    path = file_path
+    if source_root and os.path.isabs(file_path):
+        try:
+            relative = os.path.relpath(file_path, source_root)
+        except ValueError:
+            # Different drives on Windows
+            relative = None
+        if relative and relative != os.pardir and not relative.startswith(os.pardir + os.sep):
+            path = relative
+    return quote(path.replace('\\', '/'), safe="/")
+
+
+class SARIFReporter:
+    """Write SARIF 2.1.0 logs for code scanning uploads."""
+
+    def __init__(self, source_root: Optional[str] = None):
+        """
+        Args:
+            source_root: Directory that file URIs are made relative to; taken from
+                ``run_info['source_root']`` when streaming if not given
+        """
+        self.source_root = source_root
+
+    def generate_report(self, target: str, scan_results: List[ScanResult],
+                        total_files: int, analysis_time: float,
+                        errors: List[str] = None,
+                        cache_stats: Optional[Dict[str, int]] = None) -> str:
+        """
+        Generate a SARIF log from scan results.
+
+        Arguments are as for ``JSONReporter.generate_report``.
+
+        Returns:
+            SARIF JSON string
+        """
+        out = io.StringIO()
+        run_info = {
+            "total_files": total_files,
+            "analysis_time": analysis_time,
+            "errors": errors or [],
+            "cache_stats": cache_stats or {}
+        }
+        self.write_report(out, target, scan_results, run_info)
+        return out.getvalue()
+
+    def write_report(self, out: TextIO, target: str, scan_results: Iterable[ScanResult],
+                     run_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stream a SARIF log to ``out``, writing each result as its file arrives.
+
+        Rules and artifacts are only known once every result has been seen,
+        so the ``tool`` and ``artifacts`` members follow ``results`` in the run.
+
+        Args:
+            out: Text stream to write to
+            target: The analyzed target (repository URL or local path)
+            scan_results: Iterable of scan results, consumed once
+            run_info: Filled in by the producer of ``scan_results`` once it is exhausted;
+                ``source_root`` is read as results arrive
+
+        Returns:
+            Summary statistics, as in the JSON report
+        """
+        out.write('{\n')
+        out.write(f'  "$schema": "{SARIF_SCHEMA}",\n')
+        out.write(f'  "version": "{SARIF_VERSION}",\n')
+        out.write('  "runs": [\n    {\n')
+        out.write('      "results": [')
+
+        counts = SummaryCounter()
+        rules: Dict[str, int] = {}
+        rule_table: List[Dict[str, Any]] = []
+        artifacts: Dict[str, int] = {}
+        uris: Dict[str, str] = {}
+        first = True
+        for scan_result in scan_results:
+            counts.add(scan_result)
+            source_root = self.source_root or run_info.get("source_root")
+            for issue in scan_result.issues:
+                rule_index = rules.get(issue.rule_id)
+                if rule_index is None:
+                    rule_index = rules[issue.rule_id] = len(rule_table)
+                    rule_table.append(self._rule(issue))
+                uri = uris.get(issue.file_path)
+                if uri is None:
+                    uri = uris[issue.file_path] = relative_uri(issue.file_path, source_root)
+                artifact_index = artifacts.get(uri)
+                if artifact_index is None:
+                    artifact_index = artifacts[uri] = len(artifacts)
+
+                result = self._result(issue, rule_index, rule_table[rule_index], uri, artifact_index)
+                out.write('\n        ' if first else ',\n        ')
+                out.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+                first = False
+        out.write('\n      ],\n' if not first else '],\n')
+
+        driver = {
+            "name": "KiroLinter",
+            "version": "0.1.0",
+            "informationUri": "https://github.com/yourusername/kirolinter",
+            "rules": rule_table
+        }
+        out.write(f'      "tool": {{"driver": {json.dumps(driver, ensure_ascii=False)}}},\n')
+        artifact_table = [{"location": {"uri": uri, "uriBaseId": SRCROOT}} for uri in artifacts]
+        out.write(f'      "artifacts": {json.dumps(artifact_table, ensure_ascii=False)},\n')
+
+        summary = counts.summary(run_info)
+        properties = {"target": target, "summary": summary}
+        out.write(f'      "properties": {json.dumps(properties, ensure_ascii=False)}')
+        out.write('\n    }\n  ]\n}\n')
+        return summary
+
+    def _rule(self, issue: Issue) -> Dict[str, Any]:
+        """Build the rules-table entry for the first issue seen with a rule."""
+        return {
+            "id": issue.rule_id,
+            "name": issue.rule_id.replace('_', ' ').title().replace(' ', ''),
+            "shortDescription": {
+                "text": RULE_DESCRIPTIONS.get(issue.rule_id, issue.rule_id.replace('_', ' ').capitalize())
+            },
+            "defaultConfiguration": {"level": self._level(issue)},
+            "properties": {"tags": [issue.issue_type]}
+        }
+
+    def _result(self, issue: Issue, rule_index: int, rule: Dict[str, Any],
+                uri: str, artifact_index: int) -> Dict[str, Any]:
+        """Convert an issue into a SARIF result referring to its rule and artifact by index."""
+        artifact_location = {"uri": uri, "uriBaseId": SRCROOT, "index": artifact_index}
+        result = {
+            "ruleId": issue.rule_id,
+            "ruleIndex": rule_index,
+            "message": {"text": issue.message},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": artifact_location,
+                        "region": {"startLine": max(1, issue.line_number)}
+                    }
+                }
+            ]
+        }
+        # Only record the level where it differs from the rule default
+        level = self._level(issue)
+        if level != rule["defaultConfiguration"]["level"]:
+            result["level"] = level
+        return result
+
+    def _level(self, issue: Issue) -> str:
+        severity = issue.severity.value if hasattr(issue.severity, 'value') else str(issue.severity)
+        return SEVERITY_LEVELS.get(severity, "warning")
@@ -1,29 +1,47 @@
 """
 HTML web reporter for interactive KiroLinter analysis results.
+
+The report is written as a static page shell followed by the issue data as
+compact JSON chunks. The page renders one page of issues at a time, and
+only as the reader scrolls, so very large reports stay responsive in the
+browser and are never held in memory as a whole while being written.
 """
 
+import html
+import io
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, TextIO, Optional
 from datetime import datetime
-from pathlib import Path
 
 from kirolinter.core.scanner import ScanResult
-from kirolinter.models.issue import Issue, Severity, IssueType
+from kirolinter.models.issue import Issue
+from kirolinter.reporting.json_reporter import SummaryCounter
+from kirolinter.utils.source_cache import source_cache
+
+
+# Positional layout of one issue row in the embedded data, mirrored by the page script
+ISSUE_FIELDS = ['file', 'line', 'severity', 'type', 'rule', 'message', 'source', 'cve', 'suggestion']
+
+# Issues buffered before a data chunk is written out
+CHUNK_SIZE = 1000
 
 
 class WebReporter:
     """Generate interactive HTML reports with syntax highlighting and filtering."""
     
-    def __init__(self, include_source_code: bool = True, theme: str = 'light'):
+    def __init__(self, include_source_code: bool = True, theme: str = 'light',
+                 page_size: int = 100):
         """
         Initialize web reporter.
         
         Args:
             include_source_code: Whether to include source code snippets
             theme: UI theme ('light' or 'dark')
+            page_size: Number of issues shown per page in the browser
         """
         self.include_source_code = include_source_code
         self.theme = theme
+        self.page_size = page_size
     
     def generate_report(self, target: str, scan_results: List[ScanResult], 
                        total_files: int, analysis_time: float, 
@@ -41,39 +59,107 @@ class WebReporter:
         Returns:
             HTML string containing the interactive report
         """
-        # Calculate summary statistics
-        total_issues = sum(len(result.issues) for result in scan_results)
-        issues_by_severity = self._calculate_severity_counts(scan_results)
-        issues_by_type = self._calculate_type_counts(scan_results)
-        
-        # Generate HTML components
-        html_head = self._generate_html_head()
-        html_header = self._generate_header(target, total_files, total_issues, analysis_time)
-        html_summary = self._generate_summary_section(issues_by_severity, issues_by_type)
-        html_filters = self._generate_filter_controls()
-        html_export = self._generate_export_controls()
-        html_files = self._generate_files_section(scan_results)
-        html_scripts = self._generate_javascript()
-        
-        # Combine into complete HTML document
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-{html_head}
-<body class="{self.theme}-theme">
-    <div class="container">
-        {html_header}
-        {html_summary}
-        {html_filters}
-        {html_export}
-        {html_files}
-    </div>
-    {html_scripts}
-</body>
-</html>
-"""
+        out = io.StringIO()
+        run_info = {
+            "total_files": total_files,
+            "analysis_time": analysis_time,
+            "errors": errors or []
+        }
+        self.write_report(out, target, scan_results, run_info)
+        return out.getvalue()
+    
+    def write_report(self, out: TextIO, target: str, scan_results: Iterable[ScanResult],
+                     run_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stream an HTML report to ``out`` while scan results are still being produced.
+        
+        The page shell is written first. Issues follow as JSON data chunks of
+        up to ``CHUNK_SIZE`` rows, and the summary comes last, once all counts
+        are known. The page script fills in the header and summary from it.
+        
+        Args:
+            out: Text stream to write to
+            target: The analyzed target (repository URL or local path)
+            scan_results: Iterable of scan results, consumed once
+            run_info: Filled in by the producer of ``scan_results`` once it is
+                exhausted (total_files, analysis_time, errors, cache_stats)
         
-        return html_content
+        Returns:
+            Summary statistics, as in the JSON report
+        """
+        out.write('<!DOCTYPE html>\n<html lang="en">\n')
+        out.write(self._generate_html_head())
+        out.write(f'<body class="{self.theme}-theme">\n<div class="container">\n')
+        out.write(self._generate_header(target))
+        out.write(self._generate_summary_section())
+        out.write(self._generate_filter_controls())
+        out.write(self._generate_export_controls())
+        out.write(self._generate_files_section())
+        out.write('</div>\n')
+        
+        counts = SummaryCounter()
+        files: List[str] = []
+        rows: List[list] = []
+        file_index = 0
+        for scan_result in scan_results:
+            counts.add(scan_result)
+            if not scan_result.issues:
+                continue
+            files.append(scan_result.file_path)
+            for issue in scan_result.issues:
+                rows.append(self._issue_row(file_index, issue))
+            file_index += 1
+            if len(rows) >= CHUNK_SIZE:
+                self._write_chunk(out, files, rows)
+                files, rows = [], []
+        if rows:
+            self._write_chunk(out, files, rows)
+        
+        summary = counts.summary(run_info)
+        page_info = {
+            "target": target,
+            "generated": datetime.now().strftime('%Y-%m-%d %H:%M'),
+            "page_size": self.page_size,
+            "fields": ISSUE_FIELDS,
+            "summary": summary,
+            "errors": run_info.get("errors") or []
+        }
+        out.write(f'<script type="application/json" id="kl-report">{_script_json(page_info)}</script>\n')
+        out.write(self._generate_javascript())
+        out.write('</body>\n</html>\n')
+        return summary
+    
+    def _issue_row(self, file_index: int, issue: Issue) -> list:
+        """Flatten an issue into the positional row described by ``ISSUE_FIELDS``."""
+        source = None
+        if self.include_source_code:
+            # Sliced from the shared source cache instead of re-reading the file
+            source = source_cache.line(issue.file_path, issue.line_number).rstrip() or None
+        
+        cve = None
+        cve_info = getattr(issue, 'cve_info', None)
+        if cve_info:
+            cve = [cve_info.get('cve_id'), cve_info.get('score'), cve_info.get('description')]
+        
+        suggestion = None
+        fix = getattr(issue, 'suggestion', None)
+        if fix:
+            suggestion = [
+                round(fix.confidence, 2),
+                fix.explanation,
+                fix.suggested_code or None,
+                getattr(fix, 'diff_patch', None) or None
+            ]
+        
+        severity = issue.severity.value if hasattr(issue.severity, 'value') else str(issue.severity)
+        return [file_index, issue.line_number, severity, issue.issue_type, issue.rule_id,
+                issue.message, source, cve, suggestion]
+    
+    def _write_chunk(self, out: TextIO, files: List[str], rows: List[list]):
+        """Write one data chunk; file indices in ``rows`` continue across chunks."""
+        chunk = _script_json({"files": files, "issues": rows})
+        out.write(f'<script type="application/json" class="kl-data">{chunk}</script>\n')
+        out.flush()
     
     def _generate_html_head(self) -> str:
         """Generate HTML head section with styles."""
@@ -360,6 +446,17 @@ class WebReporter:
             overflow-x: auto;
         }}
         
+        .source-line {{
+            background: #f8f9fa;
+            border-left: 3px solid #dee2e6;
+            padding: 6px 10px;
+            font-family: 'Courier New', monospace;
+            font-size: 0.85em;
+            margin: 8px 0;
+            overflow-x: auto;
+            white-space: pre;
+        }}
+        
         .diff-patch {{
             background: #f8f9fa;
             border: 1px solid #dee2e6;
@@ -382,6 +479,41 @@ class WebReporter:
             color: #721c24;
         }}
         
+        /* Pagination */
+        .pager {{
+            display: flex;
+            gap: 15px;
+            align-items: center;
+            justify-content: center;
+            margin-bottom: 20px;
+        }}
+        
+        .pager button {{
+            padding: 8px 16px;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            background: white;
+            cursor: pointer;
+        }}
+        
+        .pager button:disabled {{
+            opacity: 0.5;
+            cursor: default;
+        }}
+        
+        .errors-card {{
+            background: #f8d7da;
+            color: #721c24;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 30px;
+        }}
+        
+        .error-item {{
+            font-family: 'Courier New', monospace;
+            font-size: 0.9em;
+        }}
+        
         /* Dark Theme */
         .dark-theme {{
             background-color: #1a1a1a;
@@ -510,71 +642,47 @@ class WebReporter:
 </head>
 """
     
-    def _generate_header(self, target: str, total_files: int, total_issues: int, analysis_time: float) -> str:
-        """Generate the header section."""
+    def _generate_header(self, target: str) -> str:
+        """Generate the header section; statistics are filled in by the page script."""
         return f"""
 <div class="header">
     <h1>🔍 KiroLinter Analysis Report</h1>
-    <div class="subtitle">Analysis of: {target}</div>
+    <div class="subtitle">Analysis of: {html.escape(target)}</div>
     <div class="stats">
         <div class="stat-item">
-            <span class="stat-value">{total_files}</span>
+            <span class="stat-value" id="stat-files">-</span>
             <span class="stat-label">Files Analyzed</span>
         </div>
         <div class="stat-item">
-            <span class="stat-value">{total_issues}</span>
+            <span class="stat-value" id="stat-issues">-</span>
             <span class="stat-label">Issues Found</span>
         </div>
         <div class="stat-item">
-            <span class="stat-value">{analysis_time:.2f}s</span>
+            <span class="stat-value" id="stat-time">-</span>
             <span class="stat-label">Analysis Time</span>
         </div>
         <div class="stat-item">
-            <span class="stat-value">{datetime.now().strftime('%Y-%m-%d %H:%M')}</span>
+            <span class="stat-value" id="stat-generated">-</span>
             <span class="stat-label">Generated</span>
         </div>
     </div>
 </div>
 """
     
-    def _generate_summary_section(self, issues_by_severity: Dict[str, int], issues_by_type: Dict[str, int]) -> str:
-        """Generate the summary section with charts."""
-        severity_items = ""
-        for severity, count in issues_by_severity.items():
-            if count > 0:
-                severity_items += f"""
-                <div class="severity-item">
-                    <span>
-                        <span class="severity-badge severity-{severity}">{severity.upper()}</span>
-                    </span>
-                    <span class="count">{count}</span>
-                </div>
-                """
-        
-        type_items = ""
-        for issue_type, count in issues_by_type.items():
-            if count > 0:
-                display_type = issue_type.replace('_', ' ').title()
-                type_items += f"""
-                <div class="type-item">
-                    <span>
-                        <span class="type-badge type-{issue_type}">{display_type}</span>
-                    </span>
-                    <span class="count">{count}</span>
-                </div>
-                """
-        
-        return f"""
+    def _generate_summary_section(self) -> str:
+        """Generate the summary section; counts are filled in by the page script."""
+        return """
 <div class="summary">
     <div class="summary-card">
         <h3>Issues by Severity</h3>
-        {severity_items}
+        <div id="severity-summary"></div>
     </div>
     <div class="summary-card">
         <h3>Issues by Type</h3>
-        {type_items}
+        <div id="type-summary"></div>
     </div>
 </div>
+<div id="errors-section" class="errors-card" hidden></div>
 """
     
     def _generate_filter_controls(self) -> str:
@@ -597,6 +705,7 @@ class WebReporter:
             <option value="security">Security</option>
             <option value="performance">Performance</option>
             <option value="code_smell">Code Smell</option>
+            <option value="code_quality">Code Quality</option>
         </select>
         
         <label for="search-filter">Search:</label>
@@ -629,80 +738,167 @@ class WebReporter:
 </div>
 """
     
-    def _generate_files_section(self, scan_results: List[ScanResult]) -> str:
-        """Generate the files section with issues."""
-        files_html = ""
-        
-        for scan_result in scan_results:
-            if not scan_result.issues:
-                continue
-            
-            issues_html = ""
-            for issue in scan_result.issues:
-                suggestion_html = ""
-                
-                # Add suggestion if available
-                if hasattr(issue, 'suggestion') and issue.suggestion:
-                    suggestion = issue.suggestion
-                    suggestion_html = f"""
-                    <div class="suggestion-box">
-                        <div class="suggestion-header">
-                            💡 Suggested Fix (Confidence: {suggestion.confidence:.0%})
-                        </div>
-                        <div>{suggestion.explanation}</div>
-                        {f'<div class="suggestion-code">{suggestion.suggested_code}</div>' if suggestion.suggested_code else ''}
-                        {f'<div class="diff-patch">{suggestion.diff_patch}</div>' if hasattr(suggestion, 'diff_patch') and suggestion.diff_patch else ''}
-                    </div>
-                    """
-                
-                # Add CVE information if available
-                cve_html = ""
-                if hasattr(issue, 'cve_info') and issue.cve_info:
-                    cve_info = issue.cve_info
-                    cve_html = f"""
-                    <div class="issue-details">
-                        <strong>CVE:</strong> {cve_info['cve_id']} (Score: {cve_info['score']}/10)<br>
-                        <strong>Description:</strong> {cve_info['description']}
-                    </div>
-                    """
-                
-                issues_html += f"""
-                <div class="issue-item severity-{issue.severity.value if hasattr(issue.severity, 'value') else str(issue.severity)} type-{issue.issue_type}" 
-                     data-severity="{issue.severity.value if hasattr(issue.severity, 'value') else str(issue.severity)}" 
-                     data-type="{issue.issue_type}"
-                     data-message="{issue.message.lower()}">
-                    <div class="issue-header">
-                        <div class="issue-message">{issue.message}</div>
-                        <div class="issue-location">Line {issue.line_number}</div>
-                    </div>
-                    <div class="issue-details">
-                        <strong>Rule:</strong> {issue.rule_id} | 
-                        <strong>Type:</strong> {issue.issue_type.replace('_', ' ').title()} | 
-                        <strong>Severity:</strong> {issue.severity.value.upper()}
-                    </div>
-                    {cve_html}
-                    {suggestion_html}
-                </div>
-                """
-            
-            files_html += f"""
-            <div class="file-card">
-                <div class="file-header" onclick="toggleFile(this)">
-                    <div class="file-path">{scan_result.file_path}</div>
-                    <div class="issue-count">{len(scan_result.issues)} issues</div>
-                </div>
-                <div class="file-content">
-                    {issues_html}
-                </div>
-            </div>
-            """
-        
-        return f'<div class="files-section">{files_html}</div>'
+    def _generate_files_section(self) -> str:
+        """Generate the (initially empty) issue list and its pager."""
+        return """
+<div class="files-section">
+    <div class="pager">
+        <button id="prev-page" onclick="showPage(currentPage - 1)">‹ Previous</button>
+        <span id="page-status"></span>
+        <button id="next-page" onclick="showPage(currentPage + 1)">Next ›</button>
+    </div>
+    <div id="issue-list"></div>
+    <div id="list-sentinel"></div>
+</div>
+"""
     
     def _generate_javascript(self) -> str:
-        """Generate JavaScript for interactivity."""
+        """Generate JavaScript that loads the embedded data and renders it page by page."""
         return """
 <script>
+    // Issues rendered per scroll step within a page
+    const RENDER_BATCH = 50;
+    
+    const report = JSON.parse(document.getElementById('kl-report').textContent);
+    const F = {};
+    report.fields.forEach((name, i) => { F[name] = i; });
+    
+    // Concatenate the data chunks; file indices continue across chunks
+    const files = [];
+    const issues = [];
+    document.querySelectorAll('script.kl-data').forEach(node => {
+        const chunk = JSON.parse(node.textContent);
+        chunk.files.forEach(path => files.push(path));
+        chunk.issues.forEach(row => issues.push(row));
+        node.remove();
+    });
+    
+    let filtered = issues;
+    let currentPage = 0;
+    let rendered = 0;
+    let lastFile = -1;
+    let searchCache = null;
+    
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined && text !== null) node.textContent = text;
+        return node;
+    }
+    
+    function titleCase(value) {
+        return value.replace(/_/g, ' ').replace(/\\b\\w/g, c => c.toUpperCase());
+    }
+    
+    // Header, summary and errors come from the summary written after the data
+    function renderSummary() {
+        const summary = report.summary;
+        document.getElementById('stat-files').textContent = summary.total_files_analyzed;
+        document.getElementById('stat-issues').textContent = summary.total_issues_found;
+        document.getElementById('stat-time').textContent = summary.analysis_time_seconds.toFixed(2) + 's';
+        document.getElementById('stat-generated').textContent = report.generated;
+        
+        const addCounts = (containerId, counts, itemClass, badgeClass, label) => {
+            const container = document.getElementById(containerId);
+            Object.entries(counts).forEach(([key, count]) => {
+                if (count <= 0) return;
+                const item = el('div', itemClass);
+                const badge = el('span', badgeClass + ' ' + badgeClass.split('-')[0] + '-' + key, label(key));
+                item.appendChild(el('span')).appendChild(badge);
+                item.appendChild(el('span', 'count', count));
+                container.appendChild(item);
+            });
+        };
+        addCounts('severity-summary', summary.issues_by_severity, 'severity-item', 'severity-badge', k => k.toUpperCase());
+        addCounts('type-summary', summary.issues_by_type, 'type-item', 'type-badge', titleCase);
+        
+        if (report.errors.length) {
+            const section = document.getElementById('errors-section');
+            section.appendChild(el('h3', null, '❌ Errors'));
+            report.errors.forEach(error => section.appendChild(el('div', 'error-item', error)));
+            section.hidden = false;
+        }
+    }
+    
+    function renderIssue(row) {
+        const item = el('div', 'issue-item severity-' + row[F.severity] + ' type-' + row[F.type]);
+        const header = el('div', 'issue-header');
+        header.appendChild(el('div', 'issue-message', row[F.message]));
+        header.appendChild(el('div', 'issue-location', 'Line ' + row[F.line]));
+        item.appendChild(header);
+        
+        const details = el('div', 'issue-details');
+        details.textContent = 'Rule: ' + row[F.rule] + ' | Type: ' + titleCase(row[F.type]) +
+            ' | Severity: ' + row[F.severity].toUpperCase();
+        item.appendChild(details);
+        
+        if (row[F.source]) {
+            item.appendChild(el('div', 'source-line', row[F.source]));
+        }
+        
+        const cve = row[F.cve];
+        if (cve) {
+            item.appendChild(el('div', 'issue-details',
+                'CVE: ' + cve[0] + ' (Score: ' + cve[1] + '/10) - ' + cve[2]));
+        }
+        
+        const suggestion = row[F.suggestion];
+        if (suggestion) {
+            const box = el('div', 'suggestion-box');
+            box.appendChild(el('div', 'suggestion-header',
+                '💡 Suggested Fix (Confidence: ' + Math.round(suggestion[0] * 100) + '%)'));
+            box.appendChild(el('div', null, suggestion[1]));
+            if (suggestion[2]) box.appendChild(el('div', 'suggestion-code', suggestion[2]));
+            if (suggestion[3]) box.appendChild(el('div', 'diff-patch diff-clickable', suggestion[3]));
+            item.appendChild(box);
+        }
+        return item;
+    }
+    
+    // Render the next batch of the current page, starting a new file card when the file changes
+    function renderMore() {
+        const list = document.getElementById('issue-list');
+        const start = currentPage * report.page_size;
+        const end = Math.min(start + report.page_size, filtered.length);
+        const stop = Math.min(start + rendered + RENDER_BATCH, end);
+        
+        let content = list.lastElementChild ? list.lastElementChild.querySelector('.file-content') : null;
+        for (let i = start + rendered; i < stop; i++) {
+            const row = filtered[i];
+            if (row[F.file] !== lastFile || !content) {
+                lastFile = row[F.file];
+                const card = el('div', 'file-card');
+                const header = el('div', 'file-header');
+                header.appendChild(el('div', 'file-path', files[lastFile]));
+                header.onclick = () => toggleFile(header);
+                card.appendChild(header);
+                content = el('div', 'file-content expanded');
+                card.appendChild(content);
+                list.appendChild(card);
+            }
+            content.appendChild(renderIssue(row));
+        }
+        rendered = stop - start;
+    }
+    
+    function pageCount() {
+        return Math.max(1, Math.ceil(filtered.length / report.page_size));
+    }
+    
+    function showPage(page) {
+        currentPage = Math.max(0, Math.min(page, pageCount() - 1));
+        rendered = 0;
+        lastFile = -1;
+        document.getElementById('issue-list').replaceChildren();
+        renderMore();
+        
+        document.getElementById('page-status').textContent = filtered.length
+            ? 'Page ' + (currentPage + 1) + ' of ' + pageCount() + ' (' + filtered.length + ' issues)'
+            : 'No matching issues';
+        document.getElementById('prev-page').disabled = currentPage === 0;
+        document.getElementById('next-page').disabled = currentPage >= pageCount() - 1;
+    }
+    
     // Toggle file content visibility
     function toggleFile(header) {
         const content = header.nextElementSibling;
@@ -715,37 +911,20 @@ class WebReporter:
         const typeFilter = document.getElementById('type-filter').value;
         const searchFilter = document.getElementById('search-filter').value.toLowerCase();
         
-        const issues = document.querySelectorAll('.issue-item');
-        
-        issues.forEach(issue => {
-            let show = true;
-            
-            // Severity filter
-            if (severityFilter && !issue.classList.contains('severity-' + severityFilter)) {
-                show = false;
-            }
-            
-            // Type filter
-            if (typeFilter && !issue.classList.contains('type-' + typeFilter)) {
-                show = false;
-            }
-            
-            // Search filter
-            if (searchFilter && !issue.dataset.message.includes(searchFilter)) {
-                show = false;
-            }
-            
-            issue.style.display = show ? 'block' : 'none';
-        });
+        if (searchFilter && !searchCache) {
+            searchCache = issues.map(row => row[F.message].toLowerCase());
+        }
         
-        // Update file visibility based on visible issues
-        document.querySelectorAll('.file-card').forEach(fileCard => {
-            const visibleIssues = fileCard.querySelectorAll('.issue-item[style="display: block"], .issue-item:not([style])');
-            const hasVisibleIssues = Array.from(visibleIssues).some(issue => 
-                issue.style.display !== 'none'
+        if (!severityFilter && !typeFilter && !searchFilter) {
+            filtered = issues;
+        } else {
+            filtered = issues.filter((row, i) =>
+                (!severityFilter || row[F.severity] === severityFilter) &&
+                (!typeFilter || row[F.type] === typeFilter) &&
+                (!searchFilter || searchCache[i].includes(searchFilter))
             );
-            fileCard.style.display = hasVisibleIssues ? 'block' : 'none';
-        });
+        }
+        showPage(0);
     }
     
     // Clear all filters
@@ -756,24 +935,25 @@ class WebReporter:
         applyFilters();
     }
     
-    // Add event listeners
     document.addEventListener('DOMContentLoaded', function() {
         document.getElementById('severity-filter').addEventListener('change', applyFilters);
         document.getElementById('type-filter').addEventListener('change', applyFilters);
         document.getElementById('search-filter').addEventListener('input', applyFilters);
         
-        // Expand first file by default
-        const firstFile = document.querySelector('.file-header');
-        if (firstFile) {
-            toggleFile(firstFile);
-        }
+        // Render further issues of the page as the end of the list scrolls into view
+        new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) renderMore();
+        }, { rootMargin: '400px' }).observe(document.getElementById('list-sentinel'));
         
         // Add click handlers for diffs
-        document.querySelectorAll('.diff-clickable').forEach(diff => {
-            diff.addEventListener('click', function() {
-                this.classList.toggle('diff-expanded');
-            });
+        document.getElementById('issue-list').addEventListener('click', function(event) {
+            if (event.target.classList.contains('diff-clickable')) {
+                event.target.classList.toggle('diff-expanded');
+            }
         });
+        
+        renderSummary();
+        showPage(0);
     });
     
     // Export functionality
@@ -817,27 +997,21 @@ class WebReporter:
         });
     }
     
+    // Every issue matching the current filters, across all pages
     function collectVisibleIssues() {
-        const issues = [];
-        document.querySelectorAll('.issue-item').forEach(item => {
-            if (item.style.display !== 'none') {
-                const fileCard = item.closest('.file-card');
-                const filePath = fileCard.querySelector('.file-path').textContent;
-                const message = item.querySelector('.issue-message').textContent;
-                const location = item.querySelector('.issue-location').textContent;
-                const severity = item.dataset.severity;
-                const type = item.dataset.type;
-                
-                issues.push({
-                    file: filePath,
-                    location: location,
-                    severity: severity,
-                    type: type,
-                    message: message
-                });
-            }
-        });
-        return issues;
+        return filtered.map(row => ({
+            file: files[row[F.file]],
+            location: 'Line ' + row[F.line],
+            severity: row[F.severity],
+            type: row[F.type],
+            message: row[F.message]
+        }));
+    }
+    
+    function escapeHTML(value) {
+        return String(value).replace(/[&<>"']/g, c => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[c]);
     }
     
     function generateCSV(issues) {
@@ -915,12 +1089,12 @@ class WebReporter:
         });
         
         Object.entries(byFile).forEach(([file, fileIssues]) => {
-            html += `<div class="file-header">${file}</div>`;
+            html += `<div class="file-header">${escapeHTML(file)}</div>`;
             fileIssues.forEach(issue => {
                 html += `
                 <div class="issue ${issue.severity}">
                     <strong>${issue.location}</strong> - ${issue.severity.toUpperCase()}<br>
-                    ${issue.message}
+                    ${escapeHTML(issue.message)}
                 </div>`;
             });
         });
@@ -942,33 +1116,9 @@ class WebReporter:
     }
 </script>
 """
-    
-    def _calculate_severity_counts(self, scan_results: List[ScanResult]) -> Dict[str, int]:
-        """Calculate count of issues by severity level."""
-        severity_counts = {
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0
-        }
-        
-        for result in scan_results:
-            for issue in result.issues:
-                severity_counts[issue.severity.value] += 1
-        
-        return severity_counts
-    
-    def _calculate_type_counts(self, scan_results: List[ScanResult]) -> Dict[str, int]:
-        """Calculate count of issues by type."""
-        type_counts = {
-            "code_smell": 0,
-            "code_quality": 0,
-            "security": 0,
-            "performance": 0
-        }
-        
-        for result in scan_results:
-            for issue in result.issues:
-                type_counts[issue.issue_type] += 1
-        
-        return type_counts
\ No newline at end of file
+
+
+def _script_json(value: Any) -> str:
+    """Serialize ``value`` as JSON that is safe to embed in a <script> element."""
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
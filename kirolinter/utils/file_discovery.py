@@ -0,0 +1,192 @@
+"""
+Python file discovery for analysis targets.
+
+Exclusion patterns are compiled once into two regular expressions, one for
+path component names and one for relative paths. Excluded directories are
+pruned while walking, so large virtualenvs or ``node_modules`` trees are
+never entered. Inside a git checkout the file list comes straight from the
+index via ``git ls-files``.
+"""
+
+import fnmatch
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+# Directories that are never analysed, in addition to configured patterns
+DEFAULT_EXCLUSIONS = [
+    '__pycache__',
+    '.git',
+    '.venv',
+    'venv',
+    'env',
+    '.tox',
+    'build',
+    'dist',
+    '.pytest_cache'
+]
+
+
+class ExclusionMatcher:
+    """
+    Match relative paths against a set of exclusion patterns.
+
+    Patterns without a ``/`` (``venv``, ``*_test.py``, ``test_*``) match any
+    single path component. Patterns containing a ``/`` (``tests/*``,
+    ``docs/build``) match the relative path at any depth.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        name_patterns = []
+        path_patterns = []
+        for pattern in patterns:
+            pattern = pattern.strip().replace('\\', '/')
+            if not pattern:
+                continue
+            if pattern.startswith('./'):
+                pattern = pattern[2:]
+            if '/' in pattern.rstrip('/'):
+                path_patterns.append(pattern.rstrip('/'))
+            else:
+                name_patterns.append(pattern.rstrip('/'))
+
+        self._name_regex = self._compile(name_patterns, anywhere=False)
+        self._path_regex = self._compile(path_patterns, anywhere=True)
+
+    @staticmethod
+    def _compile(patterns: List[str], anywhere: bool) -> Optional['re.Pattern']:
+        if not patterns:
+            return None
+        translated = [fnmatch.translate(pattern) for pattern in patterns]
+        prefix = r'(?:.*/)?' if anywhere else ''
+        return re.compile(prefix + '(?:' + '|'.join(translated) + ')')
+
+    def matches_name(self, name: str) -> bool:
+        """Check a single path component."""
+        return bool(self._name_regex and self._name_regex.match(name))
+
+    def matches_path(self, rel_path: str) -> bool:
+        """Check a relative path (``/`` separated) against path patterns only."""
+        return bool(self._path_regex and self._path_regex.match(rel_path))
+
+    def matches_dir(self, rel_dir: str) -> bool:
+        """Check a relative directory path, so ``tests/*`` prunes ``tests`` itself."""
+        return bool(self._path_regex and (self._path_regex.match(rel_dir) or
+                                          self._path_regex.match(rel_dir + '/')))
+
+    def is_excluded(self, rel_path: str) -> bool:
+        """Check every component and every directory prefix of a relative path."""
+        parts = rel_path.split('/')
+        if any(self.matches_name(part) for part in parts):
+            return True
+        if self._path_regex:
+            for i in range(1, len(parts)):
+                if self.matches_dir('/'.join(parts[:i])):
+                    return True
+            return self.matches_path(rel_path)
+        return False
+
+
+class FileDiscovery:
+    """Find the Python files to analyse below a root directory."""
+
+    def __init__(self, exclude_patterns: Iterable[str], use_git: bool = True):
+        """
+        Args:
+            exclude_patterns: Glob or name patterns to exclude
+            use_git: List files from the git index when the root is a checkout
+        """
+        self.matcher = ExclusionMatcher(exclude_patterns)
+        self.use_git = use_git
+
+    def discover(self, root: Path) -> List[Path]:
+        """Return the non-excluded Python files below ``root``, sorted by path."""
+        root = Path(root)
+        files = self._git_files(root) if self.use_git else None
+        if files is None:
+            files = self._walk_files(root)
+        return files
+
+    def is_excluded(self, file_path: Path, root: Optional[Path] = None) -> bool:
+        """Check a file against the exclusion patterns, relative to ``root`` if given."""
+        file_path = Path(file_path)
+        if root is not None:
+            try:
+                file_path = file_path.relative_to(root)
+            except ValueError:
+                pass
+        return self.matcher.is_excluded(file_path.as_posix())
+
+    def _walk_files(self, root: Path) -> List[Path]:
+        """Walk the tree, pruning excluded directories before descending."""
+        matcher = self.matcher
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+            rel_prefix = '' if rel_dir == '.' else rel_dir + '/'
+
+            dirnames[:] = sorted(
+                d for d in dirnames
+                if not matcher.matches_name(d) and not matcher.matches_dir(rel_prefix + d)
+            )
+
+            for name in sorted(filenames):
+                if (name.endswith('.py') and
+                    not matcher.matches_name(name) and
+                    not matcher.matches_path(rel_prefix + name)):
+                    files.append(Path(dirpath) / name)
+        files.sort()
+        return files
+
+    def _git_files(self, root: Path) -> Optional[List[Path]]:
+        """
+        List tracked and untracked-but-not-ignored Python files from git.
+
+        Returns None when ``root`` is not inside a git checkout, is ignored by
+        it (``build/`` and the like, which git lists nothing for), or git is
+        unavailable.
+        """
+        # Avoid spawning git at all for plain directories
+        if not any((parent / '.git').exists() for parent in (root.resolve(), *root.resolve().parents)):
+            return None
+
+        try:
+            result = subprocess.run(
+                ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', '*.py'],
+                cwd=root, capture_output=True, timeout=60
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+        if result.returncode != 0:
+            return None
+
+        rel_paths = [p for p in result.stdout.decode('utf-8', 'surrogateescape').split('\0') if p]
+        if not rel_paths and self._git_ignored(root):
+            return None
+
+        files = []
+        seen = set()
+        for rel_path in rel_paths:
+            if rel_path in seen or self.matcher.is_excluded(rel_path):
+                continue
+            seen.add(rel_path)
+            file_path = root / rel_path
+            # Tracked files deleted from the working tree are still in the index
+            if file_path.is_file():
+                files.append(file_path)
+        files.sort()
+        return files
+
+    @staticmethod
+    def _git_ignored(root: Path) -> bool:
+        """Check whether git ignores ``root`` itself."""
+        try:
+            result = subprocess.run(['git', 'check-ignore', '-q', '.'], cwd=root,
+                                    capture_output=True, timeout=60)
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return result.returncode == 0
@@ -0,0 +1,142 @@
+"""
+Changed line ranges from ``git diff``, for analysing only what a branch touched.
+
+``changed_python_lines`` diffs the working tree against the merge base of
+a base ref and HEAD, so committed and uncommitted changes on a branch are
+both included, and turns the zero-context hunks into per-file line ranges.
+"""
+
+import bisect
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+class GitDiffError(Exception):
+    """Raised when the changed lines cannot be determined from git."""
+
+
+class ChangedLines:
+    """Sorted, merged, inclusive line ranges of one file."""
+
+    __slots__ = ('ranges', '_starts')
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]]):
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.ranges = merged
+        self._starts = [start for start, _ in merged]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check whether any changed line falls within ``start..end``."""
+        i = bisect.bisect_right(self._starts, end) - 1
+        return i >= 0 and self.ranges[i][1] >= start
+
+    def __contains__(self, line_number: int) -> bool:
+        return self.overlaps(line_number, line_number)
+
+    def key(self) -> str:
+        """Stable text form, used to key cached results of scoped scans."""
+        return ','.join(f'{start}-{end}' for start, end in self.ranges)
+
+    def __getstate__(self):
+        return self.ranges
+
+    def __setstate__(self, ranges):
+        self.ranges = ranges
+        self._starts = [start for start, _ in ranges]
+
+    def __eq__(self, other):
+        return isinstance(other, ChangedLines) and self.ranges == other.ranges
+
+    def __repr__(self) -> str:
+        return f"ChangedLines({self.ranges})"
+
+
+def parse_unified_diff(diff_text: str) -> Dict[str, ChangedLines]:
+    """
+    Parse ``git diff -U0`` output into changed line ranges of the new files.
+
+    Pure deletions mark the lines on either side of the removed block, so the
+    surrounding code is still analysed. Deleted files are skipped.
+    """
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    current: Optional[List[Tuple[int, int]]] = None
+
+    for line in diff_text.splitlines():
+        if line.startswith('+++ '):
+            path = line[4:]
+            if path == '/dev/null':
+                current = None
+            else:
+                current = ranges.setdefault(path[2:] if path.startswith('b/') else path, [])
+        elif line.startswith('@@') and current is not None:
+            match = _HUNK_HEADER.match(line)
+            if not match:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count:
+                current.append((start, start + count - 1))
+            else:
+                current.append((max(start, 1), start + 1))
+
+    return {path: ChangedLines(line_ranges) for path, line_ranges in ranges.items()}
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, timeout=120)
+    except (OSError, subprocess.SubprocessError) as e:
+        raise GitDiffError(f"git {args[0]} failed: {e}")
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', 'replace').strip()
+        raise GitDiffError(f"git {args[0]} failed: {message}")
+    return result.stdout.decode('utf-8', 'surrogateescape')
+
+
+def git_toplevel(path: Path) -> Optional[Path]:
+    """Root of the git checkout containing the directory ``path``, or None outside one."""
+    try:
+        return Path(_git(['rev-parse', '--show-toplevel'], Path(path)).strip())
+    except GitDiffError:
+        return None
+
+
+def changed_python_lines(root: Path, base_ref: str) -> Dict[Path, Optional[ChangedLines]]:
+    """
+    Map every Python file changed since ``base_ref`` to its changed lines.
+
+    Untracked files map to None, meaning the whole file is new.
+
+    Raises:
+        GitDiffError: If ``root`` is not in a git checkout or ``base_ref`` is unknown
+    """
+    root = Path(root)
+    toplevel = Path(_git(['rev-parse', '--show-toplevel'], root).strip())
+
+    try:
+        base = _git(['merge-base', base_ref, 'HEAD'], root).strip()
+    except GitDiffError:
+        # Unrelated histories or a tree-ish rather than a branch: diff against it directly
+        base = _git(['rev-parse', '--verify', base_ref + '^{commit}'], root).strip()
+
+    diff_text = _git(['diff', '--no-color', '--no-ext-diff', '--unified=0', base, '--', '*.py'], root)
+    changed: Dict[Path, Optional[ChangedLines]] = {
+        toplevel / path: lines for path, lines in parse_unified_diff(diff_text).items()
+    }
+
+    untracked = _git(['ls-files', '-z', '--others', '--exclude-standard', '--', '*.py'], root)
+    for rel_path in untracked.split('\0'):
+        if rel_path:
+            changed[root / rel_path] = None
+
+    return changed
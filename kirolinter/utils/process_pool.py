@@ -0,0 +1,55 @@
+"""
+Process pools for spreading per-file work over CPUs.
+
+Shared by the analysis engine and the fix validator: both hand workers
+chunks of files, sized so every worker gets several chunks.
+"""
+
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+# Chunks handed to each worker; several per worker keeps the pool balanced
+# without paying inter-process overhead per file
+CHUNKS_PER_WORKER = 4
+
+# Upper bound on files per chunk, so results keep flowing on large runs
+MAX_CHUNK_SIZE = 64
+
+
+def chunk_size(total: int, workers: int) -> int:
+    """Number of items per task when ``total`` items are shared by ``workers`` processes."""
+    return max(1, min(MAX_CHUNK_SIZE, -(-total // (workers * CHUNKS_PER_WORKER))))
+
+
+def start_pool(workers: int, tasks: int, initializer: Callable[..., None],
+               initargs: Tuple[Any, ...] = (), label: str = 'processing',
+               verbose: bool = False) -> Optional['ProcessPoolExecutor']:
+    """
+    Create a process pool, or return None when the work should run serially.
+
+    Args:
+        workers: Maximum worker processes
+        tasks: Number of independent tasks; no more workers than this are started
+        initializer: Run once in every worker, e.g. to build its scanner
+        initargs: Arguments for ``initializer``
+        label: What the pool is for, used in the fallback message
+        verbose: Report to stderr when process pools are unavailable
+
+    Returns:
+        The pool, or None for a single worker or task, or if pools cannot be created
+    """
+    if workers <= 1 or tasks <= 1:
+        return None
+
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        return ProcessPoolExecutor(max_workers=min(workers, tasks), initializer=initializer,
+                                   initargs=initargs)
+    except (OSError, ValueError) as e:
+        if verbose:
+            print(f"⚠️  Parallel {label} unavailable ({e}), running serially", file=sys.stderr)
+        return None
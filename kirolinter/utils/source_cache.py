@@ -0,0 +1,132 @@
+"""
+Shared cache of source files for the duration of an analysis run.
+
+The scanner reads every file once; suggesters, the diff generator and the
+HTML reporter then slice lines out of the cached text through a line-offset
+index instead of reopening the file for every issue. Entries are keyed by
+path and validated against the file's mtime and size, so edits made during
+the run (for example by the fixer) are picked up.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Union
+
+
+PathLike = Union[str, Path]
+
+
+class SourceFile:
+    """Decoded text of one source file with a lazily built line-offset index."""
+
+    __slots__ = ('path', 'mtime_ns', 'size', 'text', '_offsets')
+
+    def __init__(self, path: str, mtime_ns: int, size: int, text: str):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.text = text
+        self._offsets = None
+
+    @property
+    def offsets(self) -> List[int]:
+        """Start offset of every line, plus the end of the text."""
+        if self._offsets is None:
+            text = self.text
+            offsets = [0]
+            find = text.find
+            pos = find('\n')
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = find('\n', pos + 1)
+            if offsets[-1] != len(text):
+                offsets.append(len(text))
+            self._offsets = offsets
+        return self._offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def line(self, line_number: int) -> str:
+        """Return a 1-based line including its newline, or '' if out of range."""
+        offsets = self.offsets
+        if 1 <= line_number < len(offsets):
+            return self.text[offsets[line_number - 1]:offsets[line_number]]
+        return ''
+
+    def lines(self) -> List[str]:
+        """Return all lines with their newlines, like ``readlines()``."""
+        offsets = self.offsets
+        text = self.text
+        return [text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+class SourceCache:
+    """Thread-safe LRU cache of SourceFiles keyed by path, mtime and size."""
+
+    def __init__(self, max_files: int = 512):
+        """
+        Args:
+            max_files: Number of files kept in memory before the least recently used is dropped
+        """
+        self.max_files = max_files
+        self._files: 'OrderedDict[str, SourceFile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: PathLike) -> SourceFile:
+        """
+        Return the cached source of ``path``, reading it if missing or stale.
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        key = str(path)
+        stat = os.stat(key)
+        with self._lock:
+            source = self._files.get(key)
+            if source is not None and source.mtime_ns == stat.st_mtime_ns and source.size == stat.st_size:
+                self._files.move_to_end(key)
+                return source
+
+        # Text mode for universal newlines, matching what the scanner parses
+        with open(key, 'r', encoding='utf-8') as f:
+            text = f.read()
+        source = SourceFile(key, stat.st_mtime_ns, stat.st_size, text)
+
+        with self._lock:
+            self._files[key] = source
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return source
+
+    def get(self, path: PathLike) -> Optional[SourceFile]:
+        """Like ``load`` but return None if the file cannot be read."""
+        try:
+            return self.load(path)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def line(self, path: PathLike, line_number: int) -> str:
+        """Return a 1-based line of ``path``, or '' if unavailable."""
+        source = self.get(path)
+        return source.line(line_number) if source else ''
+
+    def invalidate(self, path: Optional[PathLike] = None):
+        """Drop one file, or every file when ``path`` is None."""
+        with self._lock:
+            if path is None:
+                self._files.clear()
+            else:
+                self._files.pop(str(path), None)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+# Cache shared by every phase of a run within this process
+source_cache = SourceCache()
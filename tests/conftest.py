@@ -4,6 +4,7 @@ Pytest configuration and fixtures for KiroLinter tests.
 Provides both real and mocked Redis for comprehensive testing.
 """
 
+import os
 import pytest
 import redis
 import json
@@ -171,6 +172,18 @@ def cleanup_redis(redis_server):
         pass
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_llm_cache(tmp_path_factory):
+    """Keep the default AI response cache out of the working tree."""
+    previous = os.environ.get('KIROLINTER_LLM_CACHE_DIR')
+    os.environ['KIROLINTER_LLM_CACHE_DIR'] = str(tmp_path_factory.mktemp('llm_cache'))
+    yield
+    if previous is None:
+        os.environ.pop('KIROLINTER_LLM_CACHE_DIR', None)
+    else:
+        os.environ['KIROLINTER_LLM_CACHE_DIR'] = previous
+
+
 @pytest.fixture
 def pattern_memory_redis_only():
     """Create a Redis-only pattern memory for testing."""
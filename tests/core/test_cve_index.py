@@ -0,0 +1,109 @@
+"""
+Unit tests for the offline CVE index and batched enrichment.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from kirolinter.integrations.cve_database import CVEDatabase
+from kirolinter.integrations.cve_index import OfflineCVEIndex
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+API_FEED = {
+    'vulnerabilities': [
+        {'cve': {
+            'id': 'CVE-2023-0001',
+            'descriptions': [{'lang': 'en', 'value': 'Eval injection in a Python templating library.'}],
+            'metrics': {'cvssMetricV31': [{'cvssData': {'baseScore': 9.8, 'baseSeverity': 'CRITICAL'}}]},
+            'published': '2023-01-01T00:00:00.000',
+            'lastModified': '2023-01-02T00:00:00.000',
+            'references': [{'url': 'https://example.com/1'}],
+        }},
+        {'cve': {
+            'id': 'CVE-2023-0002',
+            'vulnStatus': 'Rejected',
+            'descriptions': [{'lang': 'en', 'value': 'Python eval injection duplicate.'}],
+        }},
+        {'cve': {
+            'id': 'CVE-2023-0003',
+            'descriptions': [{'lang': 'en', 'value': 'Buffer overflow in a C image decoder.'}],
+            'metrics': {'cvssMetricV31': [{'cvssData': {'baseScore': 7.5, 'baseSeverity': 'HIGH'}}]},
+        }},
+    ]
+}
+
+LEGACY_FEED = {
+    'CVE_Items': [
+        {
+            'cve': {
+                'CVE_data_meta': {'ID': 'CVE-2019-0004'},
+                'description': {'description_data': [
+                    {'value': 'Unsafe pickle deserialization in Python RPC server.'}]},
+                'references': {'reference_data': [{'url': 'https://example.com/4'}]},
+            },
+            'impact': {'baseMetricV2': {'severity': 'HIGH', 'cvssV2': {'baseScore': 7.5}}},
+            'publishedDate': '2019-03-01T00:00Z',
+            'lastModifiedDate': '2019-03-02T00:00Z',
+        }
+    ]
+}
+
+
+class TestOfflineCVEIndex:
+    """Test cases for building and querying the offline CVE index."""
+
+    def setup_method(self):
+        """Write feed dumps and import them."""
+        self.temp_dir = TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        (root / 'nvdcve-2.0-2023.json').write_text(json.dumps(API_FEED))
+        with gzip.open(root / 'nvdcve-1.1-2019.json.gz', 'wt') as f:
+            json.dump(LEGACY_FEED, f)
+
+        self.index_path = root / 'index' / 'cves.db'
+        self.index = OfflineCVEIndex(str(self.index_path))
+        self.imported = self.index.import_feeds(sorted(str(p) for p in root.glob('nvdcve-*')))
+
+    def teardown_method(self):
+        """Clean up."""
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_import_both_feed_formats(self):
+        """Test that API 2.0 and legacy feeds are imported and rejected CVEs skipped."""
+        assert self.imported == 3
+        assert self.index.stats()['cves'] == 3
+
+    def test_search_requires_every_keyword(self):
+        """Test keyword matching, including stemming and case."""
+        assert [c.cve_id for c in self.index.search('python eval injection')] == ['CVE-2023-0001']
+        assert [c.cve_id for c in self.index.search('Python pickle deserialization')] == ['CVE-2019-0004']
+        assert self.index.search('python xml external entity') == []
+
+        cve = self.index.search('python eval injection')[0]
+        assert cve.score == 9.8 and cve.severity == 'CRITICAL'
+
+    def test_offline_enrichment_groups_patterns(self):
+        """Test that each distinct pattern is looked up once and fanned out to its issues."""
+        cve_db = CVEDatabase(cache_dir=self.temp_dir.name, offline_index=str(self.index_path))
+        issues = [Issue(file_path=f'module_{i}.py', line_number=i + 1, rule_id='unsafe_eval',
+                        message='Use of eval() is dangerous', severity=IssueSeverity.HIGH,
+                        issue_type='security') for i in range(50)]
+        issues.append(Issue(file_path='style.py', line_number=1, rule_id='unused_import',
+                            message='Unused import', severity=IssueSeverity.LOW))
+
+        with patch('kirolinter.integrations.cve_database.requests.get',
+                   side_effect=AssertionError("network used")), \
+             patch.object(cve_db.offline_index, 'search', wraps=cve_db.offline_index.search) as search:
+            enhanced = cve_db.enhance_security_issues(issues)
+            cve_db.enhance_security_issues(issues[:5])
+
+        assert search.call_count == 1
+        assert all(issue.cve_info['cve_id'] == 'CVE-2023-0001' for issue in enhanced[:50])
+        assert enhanced[0].severity == IssueSeverity.CRITICAL
+        assert enhanced[0].id == issues[0].id
+        assert enhanced[50] is issues[50]
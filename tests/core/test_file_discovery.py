@@ -0,0 +1,107 @@
+"""
+Unit tests for Python file discovery and exclusion matching.
+"""
+
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from kirolinter.utils.file_discovery import ExclusionMatcher, FileDiscovery, DEFAULT_EXCLUSIONS
+
+
+class TestExclusionMatcher:
+    """Test cases for ExclusionMatcher."""
+
+    def test_plain_names_match_whole_components(self):
+        """Test that plain patterns match path components, not substrings."""
+        matcher = ExclusionMatcher(['env', 'build'])
+
+        assert matcher.is_excluded('env/lib/site.py')
+        assert matcher.is_excluded('src/build/gen.py')
+        assert not matcher.is_excluded('src/environment.py')
+        assert not matcher.is_excluded('src/rebuild_index.py')
+
+    def test_glob_patterns(self):
+        """Test name globs and path globs from typical configuration files."""
+        matcher = ExclusionMatcher(['tests/*', 'test_*', '*_test.py', 'docs/build/'])
+
+        assert matcher.is_excluded('tests/test_app.py')
+        assert matcher.is_excluded('pkg/tests/conftest.py')
+        assert matcher.is_excluded('pkg/test_models.py')
+        assert matcher.is_excluded('pkg/models_test.py')
+        assert matcher.is_excluded('docs/build/conf.py')
+        assert not matcher.is_excluded('pkg/models.py')
+        assert not matcher.is_excluded('docs/conf.py')
+
+    def test_directory_prefix_matching(self):
+        """Test that directory-level path patterns prune the directory itself."""
+        matcher = ExclusionMatcher(['tests/*'])
+
+        assert matcher.matches_dir('tests')
+        assert matcher.matches_dir('pkg/tests')
+        assert not matcher.matches_dir('pkg')
+
+
+class TestFileDiscovery:
+    """Test cases for FileDiscovery."""
+
+    def setup_method(self):
+        """Set up a project tree with excluded directories."""
+        self.root = Path(tempfile.mkdtemp(prefix='kirolinter_discovery_test_'))
+        for rel_path in ['app/main.py', 'app/util.py', 'app/notes.txt',
+                         '.venv/lib/site.py', 'node_modules/pkg/x.py',
+                         'build/lib/app.py', 'tests/test_main.py', 'setup.py']:
+            path = self.root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('x = 1\n')
+
+    def teardown_method(self):
+        """Clean up the project tree."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _relative(self, files):
+        return [f.relative_to(self.root).as_posix() for f in files]
+
+    def test_walk_prunes_excluded_directories(self):
+        """Test discovery without git, including configured glob patterns."""
+        discovery = FileDiscovery(DEFAULT_EXCLUSIONS + ['node_modules', 'tests/*'], use_git=False)
+
+        assert self._relative(discovery.discover(self.root)) == ['app/main.py', 'app/util.py', 'setup.py']
+
+    def test_git_index_discovery(self):
+        """Test that inside a git checkout files come from the index and honour .gitignore."""
+        if shutil.which('git') is None:
+            pytest.skip("git is not available")
+
+        (self.root / '.gitignore').write_text('app/util.py\n')
+        subprocess.run(['git', 'init', '-q'], cwd=self.root, check=True)
+        subprocess.run(['git', 'add', 'app/main.py', 'setup.py'], cwd=self.root, check=True)
+        (self.root / 'app' / 'new.py').write_text('y = 2\n')
+
+        discovery = FileDiscovery(DEFAULT_EXCLUSIONS + ['node_modules', 'tests/*'])
+        files = self._relative(discovery.discover(self.root))
+
+        # Tracked and untracked-but-not-ignored files; ignored and excluded files are skipped
+        assert files == ['app/main.py', 'app/new.py', 'setup.py']
+
+    def test_git_ignored_directory_falls_back_to_walk(self):
+        """Test that analysing a directory git ignores still finds its files."""
+        if shutil.which('git') is None:
+            pytest.skip("git is not available")
+
+        (self.root / '.gitignore').write_text('build/\n')
+        subprocess.run(['git', 'init', '-q'], cwd=self.root, check=True)
+
+        discovery = FileDiscovery(DEFAULT_EXCLUSIONS)
+        build = self.root / 'build'
+        assert discovery._git_files(build) is None
+        assert [f.relative_to(build).as_posix() for f in discovery.discover(build)] == ['lib/app.py']
+
+    def test_non_git_directory_falls_back_to_walk(self):
+        """Test that git discovery falls back to walking outside a checkout."""
+        discovery = FileDiscovery(DEFAULT_EXCLUSIONS + ['node_modules', 'tests/*'])
+        assert discovery._git_files(self.root) is None
+        assert 'app/main.py' in self._relative(discovery.discover(self.root))
@@ -0,0 +1,131 @@
+"""
+Unit tests for batched, transactional fix application.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from kirolinter.core.fix_transaction import FixTransaction, LineEdit, sibling_backup
+from kirolinter.core.interactive_fixer import InteractiveFixer
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+SOURCE = '''import os
+import sys
+
+def run(items):
+    unused = 1
+    result = []
+    for item in items:
+        result = result + [item]
+    return result
+'''
+
+
+class TestFixTransaction:
+    """Test cases for FixTransaction."""
+
+    def setup_method(self):
+        """Set up a source file."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_fix_test_'))
+        self.file_path = self.temp_dir / 'module.py'
+        self.file_path.write_text(SOURCE)
+        self.path = str(self.file_path)
+
+    def teardown_method(self):
+        """Clean up the source file."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_edits_use_original_line_numbers(self):
+        """Test that edits applied together do not shift each other."""
+        with FixTransaction(backup=None) as transaction:
+            assert transaction.stage(self.path, LineEdit.delete(1, 'a'))
+            assert transaction.stage(self.path, LineEdit.insert(3, '# before run', 'b'))
+            assert transaction.stage(self.path, LineEdit.replace(5, '    pass', 'c'))
+            assert transaction.stage(self.path, LineEdit.replace(8, '        result.append(item)', 'd'))
+
+        lines = self.file_path.read_text().splitlines()
+        assert lines[:5] == ['import sys', '', '# before run', 'def run(items):', '    pass']
+        assert lines[7] == '        result.append(item)'
+        assert transaction.results[self.path].applied == ['a', 'b', 'c', 'd']
+
+    def test_single_write_and_backup_per_file(self):
+        """Test that many fixes to one file back it up and write it once."""
+        backups = []
+        transaction = FixTransaction(backup=lambda path: backups.append(path) or True)
+        for line in (1, 2):
+            transaction.stage(self.path, LineEdit.replace(line, '# removed', line))
+
+        with patch('kirolinter.core.fix_transaction._atomic_write') as write:
+            transaction.commit()
+
+        assert backups == [self.path]
+        write.assert_called_once()
+
+    def test_syntax_error_leaves_file_untouched(self):
+        """Test that a batch which breaks parsing is rejected as a whole."""
+        with FixTransaction() as transaction:
+            transaction.stage(self.path, LineEdit.replace(2, '# removed', 'ok'))
+            transaction.stage(self.path, LineEdit.replace(4, 'def run(items:', 'bad'))
+
+        result = transaction.results[self.path]
+        assert self.file_path.read_text() == SOURCE
+        assert not Path(self.path + '.kirolinter-backup').exists()
+        assert result.rejected == ['ok', 'bad']
+        assert 'syntax error' in result.error
+
+    def test_conflicting_and_out_of_range_edits(self):
+        """Test that a line can only be replaced once and must exist."""
+        transaction = FixTransaction(backup=None)
+        assert transaction.stage(self.path, LineEdit.replace(1, '# one'))
+        assert not transaction.stage(self.path, LineEdit.delete(1))
+        assert not transaction.stage(self.path, LineEdit.replace(99, 'x = 1'))
+        assert not transaction.stage(str(self.temp_dir / 'missing.py'), LineEdit.delete(1))
+
+    def test_line_endings_preserved(self):
+        """Test that CRLF files keep their line endings."""
+        self.file_path.write_bytes(b'a = 1\r\nb = 2\r\n')
+        with FixTransaction() as transaction:
+            transaction.stage(self.path, LineEdit.replace(1, 'a = 3'))
+            transaction.stage(self.path, LineEdit.insert(2, 'c = 4'))
+
+        assert self.file_path.read_bytes() == b'a = 3\r\nb = 2\r\nc = 4\r\n'
+        assert Path(self.path + '.kirolinter-backup').read_bytes() == b'a = 1\r\nb = 2\r\n'
+
+    def test_exception_discards_edits(self):
+        """Test that leaving the block with an exception writes nothing."""
+        try:
+            with FixTransaction() as transaction:
+                transaction.stage(self.path, LineEdit.delete(1))
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        assert self.file_path.read_text() == SOURCE
+        assert transaction.results == {}
+
+    def test_interactive_fixer_batches_rules(self):
+        """Test that fixes for several rules land in one write with one backup."""
+        def issue(line, rule_id, message):
+            return Issue(file_path=self.path, line_number=line, rule_id=rule_id,
+                         message=message, severity=IssueSeverity.LOW)
+
+        fixer = InteractiveFixer()
+        transaction = FixTransaction(backup=sibling_backup)
+        fixer._stage_fixes_for_rule(transaction, 'unused_import', [
+            issue(1, 'unused_import', "Unused import 'os'"),
+            issue(2, 'unused_import', "Unused import 'sys'")])
+        fixer._stage_fixes_for_rule(transaction, 'unused_variable', [
+            issue(5, 'unused_variable', "Unused variable 'unused'")])
+        fixer._stage_fixes_for_rule(transaction, 'inefficient_loop_concat', [
+            issue(8, 'inefficient_loop_concat', "Inefficient concatenation")])
+
+        assert fixer._commit_fixes(transaction) == {
+            'unused_import': 2, 'unused_variable': 1, 'inefficient_loop_concat': 1}
+        lines = self.file_path.read_text().splitlines()
+        assert lines[0] == '# import os  # Removed unused import'
+        assert lines[4] == '#     unused = 1  # Removed unused variable'
+        assert lines[7] == '        result.append(item)  # Fixed inefficient concatenation'
+        assert Path(self.path + '.kirolinter-backup').read_text() == SOURCE
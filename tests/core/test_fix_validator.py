@@ -0,0 +1,112 @@
+"""
+Unit tests for batch fix validation.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from kirolinter.core import fix_validator
+from kirolinter.core.fix_validator import FixValidator
+from kirolinter.models.suggestion import Suggestion
+
+
+SOURCE = '''import os
+import sys
+
+def run(value):
+    return sys.argv + [value]
+'''
+
+
+class TestFixValidator:
+    """Test cases for FixValidator."""
+
+    def setup_method(self):
+        """Set up a source file."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_validate_test_'))
+        self.file_path = self.temp_dir / 'module.py'
+        self.file_path.write_text(SOURCE)
+        self.path = str(self.file_path)
+
+    def teardown_method(self):
+        """Clean up the source file."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _suggestion(self, line, fix_type, code='', issue_id='unused_import', path=None):
+        return Suggestion(issue_id=issue_id, file_path=path or self.path, line_number=line,
+                          fix_type=fix_type, suggested_code=code, confidence=0.95)
+
+    def test_prechecks_reject_without_parsing(self):
+        """Test that dangerous or oversized fixes are rejected up front."""
+        checks = FixValidator(workers=1).validate([
+            self._suggestion(1, 'replace', "eval('1')"),
+            self._suggestion(1, 'replace', 'x' * 2000),
+        ])
+
+        assert [c.valid for c in checks] == [False, False]
+        assert 'eval(' in checks[0].reason
+
+    def test_patched_file_must_parse(self):
+        """Test that a fix is checked in the context of the whole file."""
+        checks = FixValidator(workers=1).validate([
+            self._suggestion(1, 'delete'),
+            self._suggestion(4, 'delete', issue_id='broken'),
+            self._suggestion(5, 'replace', 'return ('),
+            self._suggestion(9, 'delete'),
+        ])
+
+        assert [c.valid for c in checks] == [True, False, False, False]
+        assert 'does not parse' in checks[1].reason
+        assert 'not valid Python' in checks[2].reason
+        assert 'out of range' in checks[3].reason
+
+    def test_missing_file_checks_snippet_only(self):
+        """Test that fixes for unreadable files are only checked as snippets."""
+        missing = str(self.temp_dir / 'missing.py')
+        checks = FixValidator(workers=1).validate([
+            self._suggestion(1, 'replace', 'x = 1', path=missing),
+            self._suggestion(1, 'replace', 'def (', path=missing),
+        ])
+
+        assert [c.valid for c in checks] == [True, False]
+
+    def test_rescan_confirms_issue_is_gone(self):
+        """Test that the patched region is rescanned for the suggestion's rule."""
+        validator = FixValidator(workers=1, rescan=True)
+        checks = validator.validate([
+            self._suggestion(1, 'delete'),
+            self._suggestion(1, 'replace', 'import os  # still unused'),
+        ])
+
+        assert (checks[0].valid, checks[0].issue_resolved) == (True, True)
+        assert (checks[1].valid, checks[1].issue_resolved) == (False, False)
+        assert FixValidator(workers=1).validate([self._suggestion(1, 'delete')])[0].issue_resolved is None
+
+    def test_parallel_matches_serial(self):
+        """Test that pooled validation returns the same checks in input order."""
+        suggestions = []
+        for i in range(4):
+            path = self.temp_dir / f'module_{i}.py'
+            path.write_text(SOURCE)
+            suggestions += [self._suggestion(1, 'delete', path=str(path)),
+                            self._suggestion(4, 'delete', path=str(path))]
+
+        serial = FixValidator(workers=1, rescan=True).validate(suggestions)
+        with patch.object(fix_validator, 'MIN_PARALLEL_FIXES', 1):
+            parallel = FixValidator(workers=2, rescan=True).validate(suggestions)
+
+        assert parallel == serial
+        assert [c.valid for c in parallel] == [True, False] * 4
+
+    def test_validate_one_reuses_scanner(self):
+        """Test that in-process rescans build the validator's scanner once."""
+        validator = FixValidator(workers=1, rescan=True)
+        with patch.object(fix_validator, '_build_scanner', wraps=fix_validator._build_scanner) as build:
+            first = validator.validate_one(self._suggestion(1, 'delete'))
+            second = validator.validate_one(self._suggestion(1, 'delete'))
+
+        assert first.issue_resolved and second.issue_resolved
+        assert build.call_count == 1
+        assert fix_validator._worker_scanner is None
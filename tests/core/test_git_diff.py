@@ -0,0 +1,132 @@
+"""
+Unit tests for diff-scoped analysis against a base ref.
+"""
+
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from kirolinter.core.engine import AnalysisEngine
+from kirolinter.core.scanner import CodeScanner
+from kirolinter.models.config import Config
+from kirolinter.utils.git_diff import ChangedLines, parse_unified_diff
+
+
+SAMPLE_DIFF = '''diff --git a/pkg/mod.py b/pkg/mod.py
+index 1111111..2222222 100644
+--- a/pkg/mod.py
++++ b/pkg/mod.py
+@@ -3 +3 @@ def a():
+-    return 1
++    return 2
+@@ -10,0 +11,3 @@ def b():
++    x = 1
++    y = 2
++    return x + y
+@@ -20,2 +23,0 @@ def c():
+-    pass
+-    pass
+diff --git a/old.py b/old.py
+deleted file mode 100644
+--- a/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+'''
+
+MODULE = '''import os
+import sys
+
+
+def a(x):
+    return eval(x)
+
+
+class K:
+    def m1(self, y):
+        return eval(y)
+
+    def m2(self, y):
+        return y
+'''
+
+
+class TestChangedLines:
+    """Test cases for diff parsing and changed line ranges."""
+
+    def test_parse_unified_diff(self):
+        """Test hunk parsing, including additions, edits, deletions and removed files."""
+        changed = parse_unified_diff(SAMPLE_DIFF)
+
+        assert list(changed) == ['pkg/mod.py']
+        assert changed['pkg/mod.py'].ranges == [(3, 3), (11, 13), (23, 24)]
+
+    def test_overlaps(self):
+        """Test range queries used to decide which code to analyse."""
+        lines = ChangedLines([(11, 13), (3, 3), (14, 15)])
+
+        assert lines.ranges == [(3, 3), (11, 15)]
+        assert lines.overlaps(1, 3)
+        assert lines.overlaps(15, 40)
+        assert not lines.overlaps(4, 10)
+        assert 12 in lines and 16 not in lines
+
+
+class TestScopedScanning:
+    """Test cases for scanning only the changed parts of files."""
+
+    def setup_method(self):
+        """Set up a module to scan."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_diff_test_'))
+        self.file_path = self.temp_dir / 'mod.py'
+        self.file_path.write_text(MODULE)
+
+    def teardown_method(self):
+        """Clean up."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _issues(self, changed_lines=None):
+        result = CodeScanner({}).scan_file(self.file_path, changed_lines)
+        return [(issue.rule_id, issue.line_number) for issue in result.issues]
+
+    def test_line_rules_limited_to_changed_members(self):
+        """Test that only the changed method is analysed while imports see the whole file."""
+        issues = self._issues(ChangedLines([(11, 11)]))
+
+        assert issues == [('unused_import', 1), ('unused_import', 2), ('unsafe_eval', 11)]
+
+    def test_unchanged_scope_matches_full_scan_for_whole_file(self):
+        """Test that a change covering the whole file equals a full scan."""
+        assert self._issues(ChangedLines([(1, 100)])) == self._issues()
+
+    def test_engine_base_ref(self):
+        """Test analyze_codebase with a base ref in a git checkout."""
+        if shutil.which('git') is None:
+            pytest.skip("git is not available")
+
+        def git(*args):
+            subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                           cwd=self.temp_dir, check=True, capture_output=True)
+
+        git('init', '-q')
+        git('add', 'mod.py')
+        git('commit', '-q', '-m', 'initial')
+        self.file_path.write_text(MODULE.replace('        return y\n', '        return eval(y)\n'))
+        (self.temp_dir / 'new.py').write_text('value = eval("1")\n')
+
+        config = Config()
+        config.use_ai_suggestions = False
+        config.cache_enabled = False
+        results = AnalysisEngine(config).analyze_codebase(str(self.temp_dir), base_ref='HEAD')
+
+        found = {(Path(r.file_path).name, i.rule_id, i.line_number)
+                 for r in results.scan_results for i in r.issues}
+        assert results.total_files == 2
+        assert ('mod.py', 'unsafe_eval', 14) in found
+        assert ('mod.py', 'unsafe_eval', 11) not in found
+        assert ('new.py', 'unsafe_eval', 1) in found
+        # Reports name files relative to the checkout root
+        assert Path(results.source_root).resolve() == self.temp_dir.resolve()
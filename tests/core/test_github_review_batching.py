@@ -0,0 +1,165 @@
+"""
+Tests for batched GitHub PR review posting against a local mock API server.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from kirolinter.core.scanner import ScanResult
+from kirolinter.integrations.github_client import GitHubClient, PRComment
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+REPO = 'owner/repo'
+PAGE_SIZE = 25
+# app.py: lines 1-80 in the diff; util.py: lines 10-12 plus a deleted line
+PR_FILES = [
+    {'filename': 'src/app.py', 'patch': '@@ -0,0 +1,80 @@\n' + '+x = 1\n' * 80},
+    {'filename': 'src/util.py', 'patch': '@@ -10,3 +10,3 @@ def f():\n a\n-b\n+c\n d'},
+]
+
+
+class MockGitHub:
+    """State of the mock GitHub API."""
+
+    def __init__(self):
+        self.requests = []
+        self.reviews = []
+        self.comments = []
+        self.rate_limited_posts = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('X-RateLimit-Remaining', '4999')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _page(self, items, path, query):
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * PAGE_SIZE
+            headers = {}
+            if start + PAGE_SIZE < len(items):
+                port = self.server.server_address[1]
+                headers['Link'] = f'<http://127.0.0.1:{port}{path}?per_page=100&page={page + 1}>; rel="next"'
+            self._send(200, items[start:start + PAGE_SIZE], headers)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            state.requests.append(('GET', url.path))
+            query = parse_qs(url.query)
+            if url.path == f'/repos/{REPO}/pulls/7':
+                self._send(200, {'number': 7, 'head': {'sha': 'abc123'}})
+            elif url.path == f'/repos/{REPO}/pulls/7/files':
+                self._page(PR_FILES, url.path, query)
+            elif url.path == f'/repos/{REPO}/pulls/7/comments':
+                self._page(state.comments, url.path, query)
+            else:
+                self._send(404, {'message': 'Not Found'})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            state.requests.append(('POST', url.path))
+            if state.rate_limited_posts:
+                state.rate_limited_posts -= 1
+                self._send(403, {'message': 'secondary rate limit'}, {'Retry-After': '0'})
+                return
+            if any('REJECT' in c['body'] for c in data.get('comments', [])):
+                self._send(422, {'message': 'Unprocessable Entity'})
+                return
+            state.reviews.append(data)
+            state.comments.extend(data['comments'])
+            self._send(200, {'id': len(state.reviews)})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class TestReviewBatching:
+    """Test cases for GitHubClient.post_review_comments."""
+
+    def setup_method(self):
+        """Start the mock API server."""
+        self.state = MockGitHub()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(self.state))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = GitHubClient('token', REPO, base_url=f'http://127.0.0.1:{self.server.server_port}')
+        self.client.min_post_interval = 0
+
+    def teardown_method(self):
+        """Stop the server."""
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _scan_results(self):
+        issues = [Issue(file_path='/work/checkout/src/app.py', line_number=n, rule_id='unsafe_eval',
+                        message='Use of eval()', severity=IssueSeverity.HIGH, issue_type='security')
+                  for n in range(1, 81)]
+        issues.append(Issue(file_path='/work/checkout/src/util.py', line_number=11, rule_id='unused_import',
+                            message='Unused import', severity=IssueSeverity.LOW))
+        issues.append(Issue(file_path='/work/checkout/src/util.py', line_number=40, rule_id='unused_import',
+                            message='Unused import', severity=IssueSeverity.LOW))
+        return [ScanResult('/work/checkout/src/app.py', issues[:80], [], {}),
+                ScanResult('/work/checkout/src/util.py', issues[80:], [], {})]
+
+    def test_comments_packed_into_reviews(self):
+        """Test that comments are batched, mapped to PR paths and limited to the diff."""
+        assert self.client.post_line_comments(7, self._scan_results())
+
+        posts = [r for r in self.state.requests if r[0] == 'POST']
+        assert len(posts) == 2
+        assert [len(review['comments']) for review in self.state.reviews] == [50, 31]
+        assert self.state.reviews[0]['commit_id'] == 'abc123'
+        assert {c['path'] for c in self.state.comments} == {'src/app.py', 'src/util.py'}
+        assert not any(c['path'] == 'src/util.py' and c['line'] == 40 for c in self.state.comments)
+
+    def test_rerun_posts_no_duplicates(self):
+        """Test that a second run skips comments already on the PR."""
+        self.client.post_line_comments(7, self._scan_results())
+        posted = len(self.state.comments)
+
+        assert self.client.post_line_comments(7, self._scan_results())
+        assert len(self.state.comments) == posted
+        assert len(self.state.reviews) == 2
+
+    def test_rate_limited_review_retried(self):
+        """Test that a rate-limited review is retried after Retry-After."""
+        self.state.rate_limited_posts = 1
+        comments = [PRComment('src/util.py', 10, 'message', rule_id='r1')]
+
+        stats = self.client.post_review_comments(7, comments, summary='Summary')
+
+        assert stats['posted'] == 1 and stats['failed'] == 0
+        assert len([r for r in self.state.requests if r[0] == 'POST']) == 2
+        assert self.state.reviews[0]['body'] == 'Summary'
+
+    def test_rejected_comment_isolated(self):
+        """Test that an invalid comment only fails itself, not the whole batch."""
+        comments = [PRComment('src/app.py', n, 'REJECT' if n == 3 else f'ok {n}', rule_id=f'r{n}')
+                    for n in range(1, 9)]
+
+        stats = self.client.post_review_comments(7, comments)
+
+        assert stats['posted'] == 7
+        assert stats['failed'] == 1
+
+    def test_extract_changed_lines(self):
+        """Test that context and added lines are commentable, removed lines are not."""
+        assert self.client._extract_changed_lines(PR_FILES[1]['patch']) == {10, 11, 12}
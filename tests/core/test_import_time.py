@@ -0,0 +1,70 @@
+"""
+Tests that importing the CLI stays cheap by deferring heavy dependencies.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that only specific commands need; none may load on `import kirolinter.cli`
+DEFERRED_MODULES = [
+    'asyncio',
+    'requests',
+    'yaml',
+    'langchain',
+    'concurrent.futures.process',
+    'kirolinter.core.engine',
+    'kirolinter.integrations.github_client',
+    'kirolinter.integrations.cve_database',
+    'kirolinter.reporting.json_reporter',
+    'kirolinter.reporting.sarif_reporter',
+    'kirolinter.reporting.web_reporter',
+]
+
+# Generous budget for the CLI's own import cost (microseconds), excluding interpreter startup
+IMPORT_BUDGET_US = 250_000
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60)
+
+
+class TestImportTime:
+    """Test cases for CLI import cost."""
+
+    def test_cli_import_defers_heavy_modules(self):
+        """Test that importing the CLI does not load command-specific dependencies."""
+        code = ('import json, sys, kirolinter.cli; '
+                f'print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))')
+        result = _run(code)
+
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout) == []
+
+    def test_engine_import_defers_integrations(self):
+        """Test that the engine loads reporters and integrations only when used."""
+        deferred = [m for m in DEFERRED_MODULES if m != 'kirolinter.core.engine']
+        code = ('import json, sys, kirolinter.core.engine; '
+                f'print(json.dumps([m for m in {deferred!r} if m in sys.modules]))')
+        result = _run(code)
+
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout) == []
+
+    def test_cli_import_within_budget(self):
+        """Test that the cumulative import time of kirolinter.cli stays within budget."""
+        result = _run('import kirolinter.cli')
+        assert result.returncode == 0, result.stderr
+
+        cumulative = None
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == 'kirolinter.cli':
+                cumulative = int(parts[1])
+        assert cumulative is not None
+        assert cumulative < IMPORT_BUDGET_US
@@ -0,0 +1,61 @@
+"""
+Unit tests for the Issue model.
+"""
+
+import pickle
+
+import pytest
+
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+class TestIssue:
+    """Test cases for the slotted Issue record."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.issue = Issue(
+            file_path="src/app.py",
+            line_number=12,
+            rule_id="unused_import",
+            message="Unused import 'os'",
+            severity="medium",
+            issue_type="code_quality"
+        )
+
+    def test_id_is_cached_and_invalidated(self):
+        """Test that id is reused and recomputed when its fields change."""
+        assert self.issue.id == "unused_import_src/app.py_12"
+        assert self.issue.id is self.issue.id
+
+        self.issue.line_number = 13
+        assert self.issue.id == "unused_import_src/app.py_13"
+
+    def test_shared_strings_are_interned(self):
+        """Test that file paths and rule ids are shared between issues."""
+        other = Issue(''.join(["src/", "app.py"]), 1, ''.join(["unused_", "import"]), "m", IssueSeverity.LOW)
+
+        assert other.file_path is self.issue.file_path
+        assert other.rule_id is self.issue.rule_id
+
+    def test_optional_attributes(self):
+        """Test lazy context and unset suggestion/cve_info attributes."""
+        assert not hasattr(self.issue, 'suggestion')
+        assert not hasattr(self.issue, 'cve_info')
+        assert self.issue.context == {}
+
+        self.issue.suggestion = "fix"
+        assert self.issue.suggestion == "fix"
+        with pytest.raises(AttributeError):
+            self.issue.unknown_attribute = 1
+
+    def test_round_trips(self):
+        """Test to_dict/from_dict and pickling preserve the issue."""
+        self.issue.context["pattern"] = "import"
+        self.issue.suggestion = "fix"
+
+        assert Issue.from_dict(self.issue.to_dict()) == self.issue
+        restored = pickle.loads(pickle.dumps(self.issue))
+        assert restored == self.issue
+        assert restored.suggestion == "fix"
+        assert restored.severity is IssueSeverity.MEDIUM
@@ -0,0 +1,183 @@
+"""
+Unit tests for the persistent LLM response cache.
+"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from kirolinter.core.llm_cache import (
+    RedisLLMCache, SQLiteLLMCache, create_llm_cache, make_cache_key, normalize_prompt
+)
+from kirolinter.core.suggester import OpenAISuggester, SuggestionEngine
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+class FakeLLM:
+    """LangChain-style LLM counting provider calls."""
+
+    model = 'ollama/test'
+    temperature = 0.1
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        return "SUGGESTED_CODE: safe()\nEXPLANATION: ok\nCONFIDENCE: 0.9"
+
+
+class FailingLLM(FakeLLM):
+    """LLM whose provider is unreachable."""
+
+    def invoke(self, prompt, **kwargs):
+        raise RuntimeError('model down')
+
+
+class TestLLMResponseCache:
+    """Test cases for SQLiteLLMCache and prompt normalization."""
+
+    def setup_method(self):
+        """Set up a cache directory."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_llm_cache_test_'))
+        self.cache = SQLiteLLMCache(self.temp_dir)
+
+    def teardown_method(self):
+        """Clean up."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_normalized_prompts_share_keys(self):
+        """Test that location lines and whitespace noise do not change the key."""
+        first = "Issue:\n- File: a.py\n- Line: 3\n\n\n\nOriginal Code:\n    eval(x)   \n"
+        second = "Issue:\r\n- File: pkg/b.py\r\n- Line: 40\r\n\r\nOriginal Code:\r\n    eval(x)"
+
+        assert normalize_prompt(first) == normalize_prompt(second)
+        assert make_cache_key('m', 0.3, first) == make_cache_key('m', 0.3, second)
+        assert make_cache_key('m', 0.3, first) != make_cache_key('m', 0.7, first)
+        assert make_cache_key('m', 0.3, first) != make_cache_key('other', 0.3, first)
+        assert normalize_prompt("if x:\n    y") != normalize_prompt("if x:\ny")
+
+    def test_hits_misses_and_persistence(self):
+        """Test that responses survive reopening and hit rates are tracked."""
+        calls = []
+
+        def complete():
+            calls.append(1)
+            return "answer"
+
+        assert self.cache.get_or_complete('m', 0.3, 'prompt', complete) == "answer"
+        assert self.cache.get_or_complete('m', 0.3, 'prompt', complete) == "answer"
+        assert len(calls) == 1
+        assert self.cache.stats['hits'] == 1 and self.cache.stats['misses'] == 1
+        assert self.cache.hit_rate == 0.5
+
+        self.cache.close()
+        self.cache = SQLiteLLMCache(self.temp_dir)
+        assert self.cache.get('m', 0.3, 'prompt') == "answer"
+
+    def test_ttl_expiry(self):
+        """Test that responses older than the TTL are not served."""
+        self.cache.ttl_seconds = 60
+        self.cache.put('m', 0.3, 'prompt', 'answer')
+
+        with patch('kirolinter.core.llm_cache.time.time', return_value=time.time() + 120):
+            assert self.cache.get('m', 0.3, 'prompt') is None
+
+        assert self.cache.stats['expired'] == 1
+        assert self.cache.entries == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used responses are evicted beyond the limit."""
+        self.cache.max_entries = 10
+        for i in range(10):
+            self.cache.put('m', 0.3, f'prompt {i}', f'answer {i}')
+            time.sleep(0.001)
+        self.cache.get('m', 0.3, 'prompt 0')
+        self.cache.put('m', 0.3, 'prompt 10', 'answer 10')
+
+        assert self.cache.entries == 9
+        assert self.cache.get('m', 0.3, 'prompt 0') == 'answer 0'
+        assert self.cache.get('m', 0.3, 'prompt 1') is None
+        assert self.cache.get('m', 0.3, 'prompt 10') == 'answer 10'
+
+    def test_suggester_reuses_responses_across_files(self):
+        """Test that the same rule on identical code in two files calls the model once."""
+        llm = FakeLLM()
+        suggester = OpenAISuggester('', llm=llm, cache=self.cache)
+        issues = []
+        for name in ('a.py', 'b.py'):
+            path = self.temp_dir / name
+            path.write_text("value = eval(data)\n")
+            issues.append(Issue(file_path=str(path), line_number=1, rule_id='unsafe_eval',
+                                message="Use of eval()", severity=IssueSeverity.HIGH))
+
+        suggestions = [suggester.generate_suggestion(issue) for issue in issues]
+
+        assert llm.calls == 1
+        assert [s.suggested_code for s in suggestions] == ['safe()', 'safe()']
+        assert suggestions[1].issue_id == issues[1].id
+
+    def test_failed_suggestion_stays_off_stdout(self, capsys):
+        """Test that a failed model call during a streamed report warns on stderr only."""
+        suggester = OpenAISuggester('', llm=FailingLLM())
+        path = self.temp_dir / 'a.py'
+        path.write_text("value = eval(data)\n")
+        issue = Issue(file_path=str(path), line_number=1, rule_id='unsafe_eval',
+                      message="Use of eval()", severity=IssueSeverity.HIGH)
+
+        assert suggester.generate_suggestion(issue) is None
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert 'model down' in captured.err
+
+    def test_litellm_init_failure_stays_off_stdout(self, capsys):
+        """Test that a model that fails to initialize warns on stderr, not in a streamed report."""
+        with patch('kirolinter.agents.llm_provider.create_llm_provider',
+                   side_effect=RuntimeError('no provider')):
+            engine = SuggestionEngine({'ai_model': 'ollama/test'})
+
+        captured = capsys.readouterr()
+        assert engine.openai_suggester is None
+        assert captured.out == ''
+        assert 'no provider' in captured.err
+
+    def test_factory(self):
+        """Test backend selection, including falling back from an unreachable Redis."""
+        assert create_llm_cache('none') is None
+
+        cache = create_llm_cache('redis', cache_dir=str(self.temp_dir / 'fallback'),
+                                 redis_url='redis://127.0.0.1:1')
+        assert isinstance(cache, SQLiteLLMCache)
+        cache.close()
+
+
+class TestRedisLLMCache:
+    """Test cases for RedisLLMCache against a local Redis server."""
+
+    def setup_method(self):
+        """Connect to Redis or skip."""
+        try:
+            self.cache = RedisLLMCache.from_url('redis://localhost:6379', max_entries=10,
+                                                prefix='kirolinter:test:llm:')
+        except Exception:
+            pytest.skip("Redis server not available")
+        self.cache.clear()
+
+    def teardown_method(self):
+        """Remove test keys."""
+        self.cache.clear()
+
+    def test_round_trip_and_eviction(self):
+        """Test storage, lookup and LRU eviction in Redis."""
+        for i in range(11):
+            self.cache.put('m', 0.3, f'prompt {i}', f'answer {i}')
+            time.sleep(0.001)
+
+        assert self.cache.get('m', 0.3, 'prompt 10') == 'answer 10'
+        assert self.cache.get('m', 0.3, 'prompt 0') is None
+        assert self.cache.stats['evictions'] == 2
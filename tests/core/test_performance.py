@@ -19,6 +19,8 @@ class TestPerformanceConstraints:
     def setup_method(self):
         """Set up test fixtures."""
         self.config = Config()
+        # Measure scanning, not cache hits, and keep .kiro/ out of the working tree
+        self.config.cache_enabled = False
         self.config.rules = {
             'unused_variable': {'enabled': True, 'severity': 'low'},
             'sql_injection': {'enabled': True, 'severity': 'critical'},
@@ -321,6 +323,7 @@ class TestPerformanceConstraints:
         try:
             # Test sequential processing
             config_sequential = Config()
+            config_sequential.cache_enabled = False
             config_sequential.rules = self.config.rules
             engine_sequential = AnalysisEngine(config_sequential, verbose=False)
             
@@ -338,6 +341,38 @@ class TestPerformanceConstraints:
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
     
+    def test_parallel_processing_matches_sequential(self):
+        """Test that the process-pool mode returns the same results in the same order."""
+        temp_dir = self._create_large_test_project(num_files=24, lines_per_file=60)
+        
+        try:
+            # Without the result cache the parallel run cannot reuse the sequential one's results
+            sequential_config = Config()
+            sequential_config.cache_enabled = False
+            sequential = AnalysisEngine(sequential_config, verbose=False).analyze_codebase(temp_dir)
+            
+            parallel_config = Config()
+            parallel_config.cache_enabled = False
+            parallel_config.workers = 3
+            progress_updates = []
+            parallel = AnalysisEngine(parallel_config, verbose=False).analyze_codebase(
+                temp_dir, progress_callback=progress_updates.append
+            )
+            
+            assert parallel.total_files == sequential.total_files == 24
+            assert parallel.cache_stats.get('hits', 0) == 0
+            assert parallel.total_issues == sequential.total_issues
+            assert [r.file_path for r in parallel.scan_results] == \
+                [r.file_path for r in sequential.scan_results]
+            assert [[i.id for i in r.issues] for r in parallel.scan_results] == \
+                [[i.id for i in r.issues] for r in sequential.scan_results]
+            
+            assert progress_updates[-1] == 100
+            assert progress_updates == sorted(progress_updates)
+            
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
     def test_progress_tracking(self):
         """Test progress tracking during analysis."""
         temp_dir = self._create_large_test_project(num_files=20, lines_per_file=50)
@@ -539,6 +574,7 @@ def complex_calculation(a, b, c, d, e, f):
             
             # Run analysis
             config = Config()
+            config.cache_enabled = False
             engine = AnalysisEngine(config, verbose=False)
             
             start_time = time.time()
@@ -0,0 +1,166 @@
+"""
+Unit tests for the persistent scan result cache.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from kirolinter.core.engine import AnalysisEngine
+from kirolinter.core.result_cache import ResultCache
+from kirolinter.core.scanner import CodeScanner
+from kirolinter.models.config import Config
+
+
+SAMPLE_CODE = '''
+import os
+import sys
+
+def handler(user_input):
+    unused = 1
+    return eval(user_input)
+'''
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_cache_test_'))
+        self.scanner = CodeScanner({})
+        self.fingerprint = ResultCache.compute_fingerprint({}, self.scanner.scanners)
+        self.file_path = self.temp_dir / 'sample.py'
+        self.file_path.write_text(SAMPLE_CODE)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _open(self, **kwargs) -> ResultCache:
+        return ResultCache(self.temp_dir / 'cache', self.fingerprint, **kwargs)
+
+    def test_miss_then_hit(self):
+        """Test that a stored result is returned for unchanged content."""
+        cache = self._open()
+        result, key = cache.get(self.file_path)
+        assert result is None
+
+        scanned = self.scanner.scan_file(self.file_path)
+        cache.put(key, scanned)
+        cache.close()
+
+        cache = self._open()
+        cached, _ = cache.get(self.file_path)
+        cache.close()
+
+        assert cached is not None
+        assert [i.id for i in cached.issues] == [i.id for i in scanned.issues]
+        assert cached.metrics == scanned.metrics
+        assert cache.stats == {'hits': 1, 'misses': 0, 'evictions': 0}
+
+    def test_content_change_invalidates(self):
+        """Test that editing a file produces a miss."""
+        cache = self._open()
+        _, key = cache.get(self.file_path)
+        cache.put(key, self.scanner.scan_file(self.file_path))
+
+        self.file_path.write_text(SAMPLE_CODE + "\nx = 2\n")
+        result, _ = cache.get(self.file_path)
+        cache.close()
+
+        assert result is None
+
+    def test_config_change_invalidates(self):
+        """Test that a different configuration fingerprint produces a miss."""
+        cache = self._open()
+        _, key = cache.get(self.file_path)
+        cache.put(key, self.scanner.scan_file(self.file_path))
+        cache.close()
+
+        other = ResultCache.compute_fingerprint({'max_complexity': 3}, self.scanner.scanners)
+        assert other != self.fingerprint
+        for unrelated in ({'workers': 8}, {'github_token': 'x'}, {'use_ai_suggestions': False},
+                          {'team_style': {'naming': 'camel'}}, {'min_severity': 'high'}):
+            assert ResultCache.compute_fingerprint(unrelated, self.scanner.scanners) == self.fingerprint
+
+        cache = ResultCache(self.temp_dir / 'cache', other)
+        result, _ = cache.get(self.file_path)
+        cache.close()
+
+        assert result is None
+
+    def test_identical_content_at_other_path(self):
+        """Test that cached results are rewritten to the requested path."""
+        cache = self._open()
+        _, key = cache.get(self.file_path)
+        cache.put(key, self.scanner.scan_file(self.file_path))
+
+        copy_path = self.temp_dir / 'copy.py'
+        copy_path.write_text(SAMPLE_CODE)
+        result, _ = cache.get(copy_path)
+        cache.close()
+
+        assert result.file_path == str(copy_path)
+        assert all(issue.file_path == str(copy_path) for issue in result.issues)
+
+    def test_size_based_eviction(self):
+        """Test that least recently used entries are evicted over the size limit."""
+        cache = self._open(max_size_bytes=1)
+        for i in range(3):
+            path = self.temp_dir / f'file_{i}.py'
+            path.write_text(SAMPLE_CODE + f"\nvalue_{i} = {i}\n")
+            _, key = cache.get(path)
+            cache.put(key, self.scanner.scan_file(path))
+        cache.close()
+
+        assert cache.stats['evictions'] == 3
+        assert cache.total_size == 0
+
+
+class TestEngineResultCache:
+    """Test cases for result caching in AnalysisEngine."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_cache_test_'))
+        self.project = self.temp_dir / 'project'
+        self.project.mkdir()
+        for i in range(3):
+            (self.project / f'module_{i}.py').write_text(SAMPLE_CODE + f"\nvalue_{i} = {i}\n")
+        self.config = Config()
+        self.config.cache_dir = str(self.temp_dir / 'cache')
+        self.config.use_ai_suggestions = False
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_second_run_served_from_cache(self):
+        """Test that a repeated analysis hits the cache and reports counters."""
+        first = AnalysisEngine(self.config).analyze_codebase(str(self.project))
+        second = AnalysisEngine(self.config).analyze_codebase(str(self.project))
+
+        assert first.cache_stats['misses'] == 3
+        assert second.cache_stats == {'hits': 3, 'misses': 0, 'evictions': 0}
+        assert second.total_issues == first.total_issues
+        assert [r.file_path for r in second.scan_results] == [r.file_path for r in first.scan_results]
+
+        report = AnalysisEngine(self.config).generate_report(second, format='summary')
+        assert 'Cache: 3 hits, 0 misses' in report
+
+    def test_cache_disabled(self):
+        """Test that disabling the cache skips it entirely."""
+        self.config.cache_enabled = False
+        results = AnalysisEngine(self.config).analyze_codebase(str(self.project))
+
+        assert results.cache_stats == {}
+        assert not (self.temp_dir / 'cache').exists()
+
+    def test_default_cache_dir_is_in_project(self):
+        """Test that without cache_dir the cache lives in the analyzed project, not the cwd."""
+        self.config.cache_dir = ''
+        AnalysisEngine(self.config).analyze_codebase(str(self.project))
+
+        assert (self.project / '.kiro' / 'scan_cache').is_dir()
+        assert not (self.temp_dir / 'cache').exists()
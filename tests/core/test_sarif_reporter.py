@@ -0,0 +1,93 @@
+"""
+Unit tests for the SARIF reporter.
+"""
+
+import io
+import json
+import os
+
+from kirolinter.core.scanner import ScanResult
+from kirolinter.models.issue import Issue, IssueSeverity
+from kirolinter.reporting.sarif_reporter import SARIFReporter, relative_uri
+
+
+def _issue(file_path: str, line: int, rule_id: str, severity: IssueSeverity) -> Issue:
+    return Issue(file_path=file_path, line_number=line, rule_id=rule_id,
+                 message=f"{rule_id} at line {line}", severity=severity, issue_type="security")
+
+
+def _results():
+    return [
+        ScanResult(file_path="a.py", parse_errors=[], metrics={}, issues=[
+            _issue("a.py", 1, "unsafe_eval", IssueSeverity.CRITICAL),
+            _issue("a.py", 4, "unsafe_eval", IssueSeverity.CRITICAL),
+            _issue("a.py", 9, "sql_injection", IssueSeverity.HIGH),
+        ]),
+        ScanResult(file_path="b.py", parse_errors=[], metrics={}, issues=[]),
+        ScanResult(file_path="pkg\\c.py", parse_errors=[], metrics={}, issues=[
+            _issue("pkg\\c.py", 2, "sql_injection", IssueSeverity.MEDIUM),
+        ]),
+    ]
+
+
+class TestSARIFReporter:
+    """Test cases for SARIFReporter."""
+
+    def test_rules_and_artifacts_written_once(self):
+        """Test that rules and file paths are tabled once and referenced by index."""
+        sarif = json.loads(SARIFReporter().generate_report("repo", _results(), 3, 1.0))
+        run = sarif["runs"][0]
+
+        rules = run["tool"]["driver"]["rules"]
+        assert [rule["id"] for rule in rules] == ["unsafe_eval", "sql_injection"]
+        assert [a["location"]["uri"] for a in run["artifacts"]] == ["a.py", "pkg/c.py"]
+        for result in run["results"]:
+            assert rules[result["ruleIndex"]]["id"] == result["ruleId"]
+        locations = [r["locations"][0]["physicalLocation"]["artifactLocation"] for r in run["results"]]
+        assert [location["index"] for location in locations] == [0, 0, 0, 1]
+
+    def test_level_only_when_different_from_rule_default(self):
+        """Test that results inherit the rule level unless their severity differs."""
+        run = json.loads(SARIFReporter().generate_report("repo", _results(), 3, 1.0))["runs"][0]
+
+        assert run["tool"]["driver"]["rules"][1]["defaultConfiguration"] == {"level": "error"}
+        assert [r.get("level") for r in run["results"]] == [None, None, None, "warning"]
+
+    def test_result_uris_relative_to_source_root(self):
+        """Test that every result names its file relative to %SRCROOT%, as code scanning requires."""
+        root = os.path.abspath("checkout")
+        results = [ScanResult(file_path=os.path.join(root, "pkg", "my mod.py"), parse_errors=[], metrics={},
+                              issues=[_issue(os.path.join(root, "pkg", "my mod.py"), 3, "unsafe_eval",
+                                             IssueSeverity.HIGH)])]
+        out = io.StringIO()
+        SARIFReporter().write_report(out, "repo", iter(results), {"source_root": root})
+        run = json.loads(out.getvalue())["runs"][0]
+
+        location = run["results"][0]["locations"][0]["physicalLocation"]["artifactLocation"]
+        assert location == {"uri": "pkg/my%20mod.py", "uriBaseId": "%SRCROOT%", "index": 0}
+        assert run["artifacts"][0]["location"] == {"uri": "pkg/my%20mod.py", "uriBaseId": "%SRCROOT%"}
+
+    def test_relative_uri(self):
+        """Test relativizing paths inside and outside the source root."""
+        root = os.path.abspath("checkout")
+        assert relative_uri(os.path.join(root, "a.py"), root) == "a.py"
+        assert relative_uri("pkg\\c.py", root) == "pkg/c.py"
+        outside = os.path.abspath("elsewhere.py")
+        assert relative_uri(outside, root) == outside.replace("\\", "/")
+
+    def test_stream_summary(self):
+        """Test that streaming returns the summary also stored in the run properties."""
+        out = io.StringIO()
+        summary = SARIFReporter().write_report(out, "repo", iter(_results()), {"total_files": 3})
+
+        run = json.loads(out.getvalue())["runs"][0]
+        assert summary["total_issues_found"] == 4
+        assert run["properties"]["summary"] == summary
+
+    def test_empty_run(self):
+        """Test a run without results."""
+        run = json.loads(SARIFReporter().generate_report("repo", [], 0, 0.0))["runs"][0]
+
+        assert run["results"] == []
+        assert run["tool"]["driver"]["rules"] == []
+        assert run["artifacts"] == []
@@ -6,8 +6,9 @@ import ast
 import pytest
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from unittest.mock import patch
 
-from kirolinter.core.scanner import CodeSmellScanner, SecurityScanner, CodeScanner
+from kirolinter.core.scanner import CodeSmellScanner, SecurityScanner, PerformanceScanner, CodeScanner, ASTIndex
 from kirolinter.models.issue import IssueType, Severity
 
 
@@ -184,6 +185,28 @@ def connect_to_api():
                 assert issue.type == IssueType.SECURITY
                 assert 'secret' in issue.message.lower()
     
+    def test_secret_regex_fallback(self):
+        """Test line-level secret patterns, including several hits on one line."""
+        code = '''
+config = {"x": 1}; token = "AAAAAAAAAAAAAAAAAAAAAAAA"; password = "bbbbbbbbbbbb"
+label = "PASSWORD = 'abcdefghijkl'"
+password = "short"
+'''
+
+        with NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            f.flush()
+
+            result = self.scanner.scan_file(Path(f.name))
+
+            found = [(issue.rule_id, issue.line_number) for issue in result.issues
+                     if 'regex fallback' in issue.message]
+            assert found == [
+                ('hardcoded_password', 2),
+                ('hardcoded_token', 2),
+                ('hardcoded_password', 3),
+            ]
+
     def test_sql_injection_detection(self):
         """Test detection of SQL injection vulnerabilities."""
         code = '''
@@ -363,6 +386,116 @@ if __name__ == "__main__":
             assert result.metrics['imports'] >= 1
 
 
+class TestSinglePassScanning:
+    """Test cases for the shared single-parse scanning pipeline."""
+    
+    def test_file_parsed_once_for_all_scanners(self):
+        """Test that CodeScanner reads and parses each file only once."""
+        code = '''
+import os
+
+def f(x):
+    total = 0
+    for i in x:
+        total += i
+    return total
+'''
+        
+        with NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            f.flush()
+            
+            with patch('kirolinter.core.scanner.ast.parse', wraps=ast.parse) as parse:
+                result = CodeScanner({}).scan_file(Path(f.name))
+            
+            assert parse.call_count == 1
+            rule_ids = {issue.rule_id for issue in result.issues}
+            assert 'unused_import' in rule_ids
+            assert 'inefficient_loop_concat' in rule_ids
+            assert result.metrics['functions'] == 1
+            assert result.metrics['imports'] == 1
+    
+    def test_nested_function_complexity_counts_towards_parent(self):
+        """Test that nested function branches contribute to the outer function."""
+        code = '''
+def outer(a):
+    def inner(b):
+        if b:
+            return 1
+        if b > 1:
+            return 2
+        return 3
+    if a:
+        return inner(a)
+    return 0
+'''
+        
+        with NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            f.flush()
+            
+            result = CodeSmellScanner({'max_complexity': 2}).scan_file(Path(f.name))
+            
+            messages = {issue.message for issue in result.issues if issue.rule_id == 'complex_function'}
+            assert "Function 'outer' has high cyclomatic complexity (4)" in messages
+            assert "Function 'inner' has high cyclomatic complexity (3)" in messages
+    
+    def test_ast_index_loop_and_function_context(self):
+        """Test parent, loop header and scope information recorded by the index."""
+        tree = ast.parse('''
+def f(items):
+    while len(items) > 1:
+        items.pop(len(items) - 1)
+        def g():
+            return len(items)
+''')
+        index = ASTIndex.build(tree)
+        func = tree.body[0]
+        loop = func.body[0]
+        header_call, body_call, nested_call = [
+            node for node in index.nodes_of_type(ast.Call) if getattr(node.func, 'id', None) == 'len'
+        ]
+        
+        assert index.parent(loop) is func
+        assert index.loop_header(header_call) is loop
+        assert index.loop_header(body_call) is None
+        assert index.enclosing_loop(body_call) is loop
+        assert index.enclosing_loop(nested_call) is None
+        assert index.enclosing_function(nested_call).name == 'g'
+        assert list(index.ancestors(loop)) == [func, tree]
+    
+    def test_redundant_len_in_loop_header(self):
+        """Test that len() is reported in loop headers but not loop bodies."""
+        code = '''
+def f(data):
+    for i in range(len(data)):
+        print(len(data))
+    while len(data) > 2:
+        data.pop()
+'''
+        
+        with NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            f.flush()
+            
+            result = PerformanceScanner({}).scan_file(Path(f.name))
+            
+            lines = [issue.line_number for issue in result.issues if issue.rule_id == 'redundant_len_in_loop']
+            assert lines == [3, 5]
+    
+    def test_syntax_error_reported_once(self):
+        """Test that a syntax error yields a single parse error."""
+        with NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write("def broken(:\n    pass\n")
+            f.flush()
+            
+            result = CodeScanner({}).scan_file(Path(f.name))
+            
+            assert result.issues == []
+            assert len(result.parse_errors) == 1
+            assert result.parse_errors[0].startswith('Syntax error')
+
+
 # Inline AI Coding Prompts for Test Generation:
 
 """
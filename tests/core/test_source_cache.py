@@ -0,0 +1,75 @@
+"""
+Unit tests for the shared source cache.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from kirolinter.core.scanner import CodeScanner
+from kirolinter.core.suggester import RuleBasedSuggester
+from kirolinter.reporting.diff_generator import DiffGenerator
+from kirolinter.utils.source_cache import SourceCache, source_cache
+
+
+class TestSourceCache:
+    """Test cases for SourceCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_source_test_'))
+        self.file_path = self.temp_dir / 'sample.py'
+        self.file_path.write_text('import os\nx = 1\r\ny = 2')
+        self.cache = SourceCache(max_files=2)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        source_cache.invalidate()
+
+    def test_lines_match_readlines(self):
+        """Test that line slicing matches reading the file in text mode."""
+        source = self.cache.load(self.file_path)
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            expected = f.readlines()
+
+        assert source.lines() == expected
+        assert source.line(2) == 'x = 1\n'
+        assert source.line(3) == 'y = 2'
+        assert source.line(0) == '' and source.line(4) == ''
+        assert source.line_count == 3
+
+    def test_file_read_once_until_modified(self):
+        """Test that repeated lookups reuse the cached text until the file changes."""
+        first = self.cache.load(self.file_path)
+        assert self.cache.load(self.file_path) is first
+
+        self.file_path.write_text('changed = True\n')
+        stat = self.file_path.stat()
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert self.cache.line(self.file_path, 1) == 'changed = True\n'
+
+    def test_lru_bound_and_missing_files(self):
+        """Test that the cache stays bounded and tolerates unreadable files."""
+        for i in range(3):
+            path = self.temp_dir / f'file_{i}.py'
+            path.write_text(f'value = {i}\n')
+            self.cache.load(path)
+
+        assert len(self.cache) == 2
+        assert self.cache.get(self.temp_dir / 'missing.py') is None
+        assert self.cache.line(self.temp_dir / 'missing.py', 1) == ''
+
+    def test_scan_fills_cache_for_later_phases(self):
+        """Test that suggestions and diffs reuse the source read by the scanner."""
+        path = self.temp_dir / 'module.py'
+        path.write_text('import os\nimport sys\n\nprint(sys.argv)\n')
+        result = CodeScanner({}).scan_file(path)
+        issue = next(i for i in result.issues if i.rule_id == 'unused_import')
+
+        with patch('builtins.open', side_effect=AssertionError("file reopened")):
+            assert RuleBasedSuggester()._get_original_code(issue) == 'import os'
+            assert DiffGenerator().generate_patch(issue) is not None
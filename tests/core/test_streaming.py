@@ -0,0 +1,114 @@
+"""
+Unit tests for streaming analysis and incremental report writers.
+"""
+
+import io
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from kirolinter.core.engine import AnalysisEngine
+from kirolinter.models.config import Config
+
+
+SAMPLE_CODE = '''
+import os
+
+def handler(user_input):
+    unused = 1
+    return eval(user_input)
+'''
+
+
+class TestStreamingAnalysis:
+    """Test cases for AnalysisEngine.iter_analysis and stream_report."""
+
+    def setup_method(self):
+        """Set up a small project."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_stream_test_'))
+        for i in range(3):
+            (self.temp_dir / f'module_{i}.py').write_text(SAMPLE_CODE + f"\nvalue_{i} = {i}\n")
+        (self.temp_dir / 'clean.py').write_text('def ok():\n    return 1\n')
+        self.config = Config()
+        self.config.use_ai_suggestions = False
+        self.config.cache_enabled = False
+
+    def teardown_method(self):
+        """Clean up the project."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_iter_analysis_matches_batch_analysis(self):
+        """Test that streamed results equal analyze_codebase results, in order."""
+        batch = AnalysisEngine(self.config).analyze_codebase(str(self.temp_dir))
+
+        run_info = {}
+        streamed = list(AnalysisEngine(self.config).iter_analysis(str(self.temp_dir), run_info=run_info))
+
+        assert [r.file_path for r in streamed] == [r.file_path for r in batch.scan_results]
+        assert [i.id for r in streamed for i in r.issues] == [i.id for r in batch.scan_results for i in r.issues]
+        assert all(hasattr(i, 'suggestion') for r in streamed for i in r.issues)
+        assert run_info['total_files'] == 4
+        assert run_info['errors'] == []
+
+    def test_stream_json_report(self):
+        """Test that the streamed JSON report is valid and summarised after the files."""
+        out = io.StringIO()
+        summary = AnalysisEngine(self.config).stream_report(str(self.temp_dir), out, format='json')
+
+        report = json.loads(out.getvalue())
+        assert report['summary']['total_files_analyzed'] == 4
+        assert report['summary']['total_issues_found'] == summary['total_issues_found']
+        assert report['summary']['has_critical_issues'] is True
+        assert len(report['files']) == 3
+        assert 'unsafe_eval' in report['metadata']['rules_applied']
+
+    def test_stream_ndjson_report(self):
+        """Test that NDJSON output has one record per file followed by a summary."""
+        out = io.StringIO()
+        AnalysisEngine(self.config).stream_report(str(self.temp_dir), out, format='ndjson')
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r['type'] for r in records] == ['file', 'file', 'file', 'summary']
+        assert records[-1]['total_issues_found'] == sum(len(r['issues']) for r in records[:-1])
+
+    def test_verbose_status_stays_off_stdout(self, capsys):
+        """Test that verbose progress goes to stderr when the report is streamed to stdout."""
+        AnalysisEngine(self.config, verbose=True).stream_report(str(self.temp_dir), sys.stdout,
+                                                                format='ndjson')
+
+        captured = capsys.readouterr()
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert records[-1]['type'] == 'summary'
+        assert 'Analyzing' in captured.err
+
+    def test_stream_sarif_report(self):
+        """Test that the streamed SARIF log is valid and maps severities to levels."""
+        out = io.StringIO()
+        summary = AnalysisEngine(self.config).stream_report(str(self.temp_dir), out, format='sarif')
+
+        sarif = json.loads(out.getvalue())
+        run = sarif['runs'][0]
+        results = run['results']
+        rules = run['tool']['driver']['rules']
+        assert sarif['version'] == '2.1.0'
+        assert len(results) == summary['total_issues_found']
+        result = next(r for r in results if r['ruleId'] == 'unsafe_eval')
+        rule = rules[result['ruleIndex']]
+        assert rule['id'] == 'unsafe_eval'
+        assert result.get('level', rule['defaultConfiguration']['level']) == 'error'
+        # Files are named relative to the analyzed directory, as code scanning uploads need
+        location = result['locations'][0]['physicalLocation']['artifactLocation']
+        assert location['uriBaseId'] == '%SRCROOT%'
+        assert location['uri'].startswith('module_')
+
+    def test_empty_target(self):
+        """Test streaming a directory without Python files."""
+        empty = self.temp_dir / 'empty'
+        empty.mkdir()
+        out = io.StringIO()
+        summary = AnalysisEngine(self.config).stream_report(str(empty), out, format='json')
+
+        assert json.loads(out.getvalue())['files'] == []
+        assert summary['errors'] == ["No Python files found to analyze"]
@@ -2,12 +2,13 @@
 Unit tests for the suggestion engine.
 """
 
+import os
 import pytest
 from tempfile import NamedTemporaryFile
 from pathlib import Path
 
-from kirolinter.core.suggester import RuleBasedSuggester, SuggestionEngine
-from kirolinter.models.issue import Issue, IssueType, Severity
+from kirolinter.core.suggester import RuleBasedSuggester, SuggestionEngine, TeamStyleAnalyzer
+from kirolinter.models.issue import Issue, IssueSeverity, IssueType, Severity
 from kirolinter.models.suggestion import FixType
 
 
@@ -445,6 +446,76 @@ unused_var = "not used"
             assert code_smell_suggestion.confidence >= 0.9
 
 
+class TestCompiledTemplates:
+    """Test cases for the compiled suggestion table and per-repo team style cache."""
+    
+    def _issue(self, rule_id, message="Hardcoded secret 'api token'", line=1):
+        return Issue(file_path="/tmp/compiled.py", line_number=line, rule_id=rule_id,
+                          message=message, severity=IssueSeverity.HIGH, issue_type="security")
+    
+    def test_templates_compiled_once_per_directory(self, tmp_path):
+        """Test that suggesters share a compiled table until the template files change."""
+        (tmp_path / "extra.json").write_text(
+            '{"custom_rule": {"fix_type": "REPLACE", "confidence": 0.5, "template": "t", "code_template": "fixed()"},'
+            ' "broken_rule": {"fix_type": "NOT_A_TYPE", "confidence": 0.5, "template": "t"}}')
+        first = RuleBasedSuggester(str(tmp_path))
+        second = RuleBasedSuggester(str(tmp_path))
+        
+        assert first.compiled is second.compiled
+        assert "broken_rule" not in first.compiled
+        assert first.generate_suggestion(self._issue("custom_rule")).suggested_code == "fixed()"
+        
+        (tmp_path / "more.json").write_text('{"other_rule": {"fix_type": "DELETE", "confidence": 0.9, "template": "t"}}')
+        assert "other_rule" in RuleBasedSuggester(str(tmp_path)).compiled
+    
+    def test_generators_use_issue_details(self):
+        """Test that bound generators still format per-issue values."""
+        suggester = RuleBasedSuggester()
+        
+        secret = suggester.generate_suggestion(self._issue("hardcoded_secret"))
+        removal = suggester.generate_suggestion(self._issue("unused_import", "Unused import 'os'"))
+        
+        assert secret.suggested_code == "os.environ.get('API_TOKEN', 'default_value')"
+        assert secret.confidence == 0.85
+        assert removal.suggested_code == ""
+        assert suggester.generate_suggestion(self._issue("unknown_rule")) is None
+    
+    def test_team_style_cached_per_repository(self, tmp_path):
+        """Test that each repository's team style is analyzed once."""
+        engine = SuggestionEngine({'use_ai_suggestions': False, 'fallback_to_rules': True})
+        
+        engine.generate_suggestions([self._issue("hardcoded_secret")], repo_path=str(tmp_path / "a"))
+        first = engine.team_analyzer
+        engine.generate_suggestions([self._issue("hardcoded_secret")], repo_path=str(tmp_path / "b"))
+        
+        assert engine.team_analyzer is not first
+        assert TeamStyleAnalyzer.for_repo(str(tmp_path / "a")) is first
+    
+    def test_team_style_cache_bounded_and_resettable(self, tmp_path):
+        """Test that the analyzer cache evicts old repositories, follows new commits and can be cleared."""
+        repo = tmp_path / "repo"
+        (repo / ".git" / "logs").mkdir(parents=True)
+        reflog = repo / ".git" / "logs" / "HEAD"
+        reflog.write_text("one\n")
+        
+        first = TeamStyleAnalyzer.for_repo(str(repo))
+        assert TeamStyleAnalyzer.for_repo(str(repo / "pkg")) is not first
+        assert TeamStyleAnalyzer.for_repo(str(repo)) is first
+        
+        # A new commit touches the reflog
+        os.utime(reflog, ns=(0, reflog.stat().st_mtime_ns + 1_000_000_000))
+        second = TeamStyleAnalyzer.for_repo(str(repo))
+        assert second is not first
+        
+        for i in range(TeamStyleAnalyzer.CACHE_SIZE):
+            TeamStyleAnalyzer.for_repo(str(tmp_path / f"other_{i}"))
+        assert len(TeamStyleAnalyzer._by_repo) == TeamStyleAnalyzer.CACHE_SIZE
+        assert TeamStyleAnalyzer.for_repo(str(repo)) is not second
+        
+        TeamStyleAnalyzer.clear_cache()
+        assert not TeamStyleAnalyzer._by_repo
+
+
 # Inline AI Coding Prompts for Suggester Templates:
 
 """
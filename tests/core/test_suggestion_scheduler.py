@@ -0,0 +1,196 @@
+"""
+Unit tests for concurrent, rate-limited AI suggestion scheduling.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from kirolinter.core.suggester import OpenAISuggester, SuggestionEngine
+from kirolinter.core.suggestion_scheduler import SuggestionScheduler, TokenBucket, is_rate_limit_error
+from kirolinter.models.issue import Issue, IssueSeverity
+
+
+def make_issue(file_path='app.py', line_number=1, rule_id='unsafe_eval'):
+    return Issue(file_path=file_path, line_number=line_number, rule_id=rule_id,
+                 message=f"{rule_id} found", severity=IssueSeverity.HIGH, issue_type='security')
+
+
+def batch_answer(prompt):
+    """Answer every ISSUE section of a prompt like a well-behaved model."""
+    count = max(1, prompt.count('ISSUE '))
+    return '\n'.join(f"ISSUE {n}:\nSUGGESTED_CODE: fix_{n}()\nEXPLANATION: ok\nCONFIDENCE: 0.9"
+                     for n in range(1, count + 1))
+
+
+class FakeSuggester(OpenAISuggester):
+    """OpenAISuggester whose completions come from a local function."""
+
+    def __init__(self, respond, delay=0.0):
+        super().__init__('')
+        self.respond = respond
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return True
+
+    def complete(self, prompt, max_tokens=200):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return self.respond(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class TestSuggestionScheduler:
+    """Test cases for SuggestionScheduler."""
+
+    def test_batches_group_issues_by_file(self):
+        """Test that batches never mix files and respect the batch size."""
+        issues = [make_issue('a.py', n) for n in range(1, 4)] + [make_issue('b.py', 1), make_issue('a.py', 9)]
+        scheduler = SuggestionScheduler(FakeSuggester(batch_answer), batch_size=2)
+
+        batches = scheduler.make_batches(issues)
+
+        assert [[(i.file_path, i.line_number) for i in batch] for batch in batches] == [
+            [('a.py', 1), ('a.py', 2)], [('a.py', 3), ('a.py', 9)], [('b.py', 1)]]
+
+    def test_concurrent_batched_suggestions(self):
+        """Test that every issue gets its own suggestion with bounded concurrency."""
+        issues = [make_issue(f'file_{f}.py', n) for f in range(6) for n in range(1, 4)]
+        suggester = FakeSuggester(batch_answer, delay=0.05)
+        scheduler = SuggestionScheduler(suggester, max_concurrency=3, requests_per_minute=0, batch_size=5)
+
+        suggestions = scheduler.run(issues)
+
+        assert len(suggester.prompts) == 6
+        assert 1 < suggester.max_in_flight <= 3
+        assert set(suggestions) == {issue.id for issue in issues}
+        assert suggestions[issues[1].id].suggested_code == 'fix_2()'
+        assert suggestions[issues[1].id].confidence == 0.9
+
+    def test_rate_limit_retried_with_backoff(self):
+        """Test that 429 errors are retried with exponential backoff."""
+        calls = []
+
+        def flaky(prompt):
+            calls.append(prompt)
+            if len(calls) < 3:
+                raise RateLimitError("Error code: 429 - rate limit reached")
+            return batch_answer(prompt)
+
+        sleeps = []
+        scheduler = SuggestionScheduler(FakeSuggester(flaky), requests_per_minute=0, sleep=sleeps.append)
+        issue = make_issue()
+
+        assert issue.id in scheduler.run([issue])
+        assert sleeps == [1, 2]
+        assert scheduler.stats == {'requests': 3, 'retries': 2, 'failures': 0}
+
+    def test_other_errors_are_not_retried(self):
+        """Test that non rate-limit errors fail the batch without retrying."""
+        def broken(prompt):
+            raise ValueError("bad request")
+
+        scheduler = SuggestionScheduler(FakeSuggester(broken), requests_per_minute=0, sleep=lambda s: None)
+
+        assert scheduler.run([make_issue()]) == {}
+        assert scheduler.stats['failures'] == 1
+        assert not is_rate_limit_error(ValueError("bad request"))
+
+    def test_token_bucket_limits_rate(self):
+        """Test that the token bucket spaces acquisitions once the burst is spent."""
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(6):
+            bucket.acquire()
+
+        assert now[0] == pytest.approx(2.0)
+
+    def test_partial_batch_response(self):
+        """Test that unanswered issues in a batch are left out for rule-based fallback."""
+        issues = [make_issue(line_number=n) for n in (1, 2, 3)]
+        suggester = FakeSuggester(lambda p: "ISSUE 2:\nSUGGESTED_CODE: only_two()\nCONFIDENCE: 0.5")
+
+        suggestions = SuggestionScheduler(suggester, requests_per_minute=0).run(issues)
+
+        assert list(suggestions) == [issues[1].id]
+
+    def test_engine_falls_back_to_rules(self):
+        """Test that SuggestionEngine uses scheduled AI suggestions and rule-based fallback."""
+        engine = SuggestionEngine({'use_ai_suggestions': True, 'ai_requests_per_minute': 0})
+        engine.openai_suggester = FakeSuggester(lambda p: "ISSUE 1:\nSUGGESTED_CODE: safe()\nCONFIDENCE: 0.8")
+        issues = [make_issue(line_number=1), make_issue(line_number=2)]
+
+        suggestions = engine.generate_suggestions(issues)
+
+        assert suggestions[issues[0].id].suggested_code == 'safe()'
+        assert suggestions[issues[1].id].suggested_code != 'safe()'
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        content = batch_answer(body['messages'][-1]['content'])
+        payload = json.dumps({
+            'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenAICompatibleEndpoint:
+    """Test scheduling against a local OpenAI-compatible server."""
+
+    def setup_method(self):
+        """Start the fake server."""
+        pytest.importorskip('openai')
+        self.server = HTTPServer(('127.0.0.1', 0), _FakeOpenAIHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def teardown_method(self):
+        """Stop the fake server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_batched_requests(self):
+        """Test that batched prompts round-trip through the OpenAI client."""
+        suggester = OpenAISuggester('test-key', api_base=f'http://127.0.0.1:{self.server.server_port}/v1')
+        issues = [make_issue(f'file_{f}.py', n) for f in range(3) for n in (1, 2)]
+
+        suggestions = SuggestionScheduler(suggester, max_concurrency=2, requests_per_minute=0).run(issues)
+
+        assert set(suggestions) == {issue.id for issue in issues}
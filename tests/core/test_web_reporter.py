@@ -0,0 +1,111 @@
+"""
+Unit tests for the streaming HTML web reporter.
+"""
+
+import io
+import json
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from kirolinter.core.engine import AnalysisEngine
+from kirolinter.core.scanner import ScanResult
+from kirolinter.models.config import Config
+from kirolinter.models.issue import Issue, IssueSeverity
+from kirolinter.reporting import web_reporter
+from kirolinter.reporting.web_reporter import ISSUE_FIELDS, WebReporter
+
+
+def _data_chunks(page: str):
+    """Return the embedded issue data chunks of a report page."""
+    return [json.loads(chunk) for chunk in
+            re.findall(r'<script type="application/json" class="kl-data">(.*?)</script>', page)]
+
+
+def _report_info(page: str):
+    """Return the embedded summary block of a report page."""
+    match = re.search(r'<script type="application/json" id="kl-report">(.*?)</script>', page)
+    return json.loads(match.group(1))
+
+
+class TestWebReporter:
+    """Test cases for WebReporter."""
+
+    def setup_method(self):
+        """Set up a source file with an issue on each line."""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='kirolinter_web_test_'))
+        self.source = self.temp_dir / 'module.py'
+        self.source.write_text(''.join(f'value_{i} = eval(data)\n' for i in range(1, 6)))
+
+    def teardown_method(self):
+        """Clean up the source file."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _result(self, count: int, message: str = 'Use of eval') -> ScanResult:
+        issues = [
+            Issue(file_path=str(self.source), line_number=i, rule_id='unsafe_eval',
+                  message=message, severity=IssueSeverity.CRITICAL, issue_type='security')
+            for i in range(1, count + 1)
+        ]
+        return ScanResult(file_path=str(self.source), issues=issues, metrics={}, parse_errors=[])
+
+    def test_issues_embedded_as_data_not_markup(self):
+        """Test that issues are written as JSON rows with their source line."""
+        page = WebReporter().generate_report(str(self.temp_dir), [self._result(3)], 1, 0.5)
+
+        chunks = _data_chunks(page)
+        assert len(chunks) == 1
+        assert chunks[0]['files'] == [str(self.source)]
+        row = dict(zip(ISSUE_FIELDS, chunks[0]['issues'][1]))
+        assert row['file'] == 0
+        assert row['line'] == 2
+        assert row['severity'] == 'critical'
+        assert row['source'] == 'value_2 = eval(data)'
+        assert 'class="issue-item' not in page.split('<script')[0]
+
+    def test_summary_written_after_data(self):
+        """Test that the summary block follows the data and carries the counts."""
+        page = WebReporter().generate_report(str(self.temp_dir), [self._result(3)], 1, 0.5,
+                                             errors=['boom'])
+
+        info = _report_info(page)
+        assert page.index('id="kl-report"') > page.index('class="kl-data"')
+        assert info['summary']['total_issues_found'] == 3
+        assert info['summary']['issues_by_severity']['critical'] == 3
+        assert info['fields'] == ISSUE_FIELDS
+        assert info['errors'] == ['boom']
+
+    def test_chunks_keep_global_file_indices(self, monkeypatch):
+        """Test that rows reference files across chunk boundaries."""
+        monkeypatch.setattr(web_reporter, 'CHUNK_SIZE', 2)
+        page = WebReporter().generate_report(str(self.temp_dir),
+                                             [self._result(2), self._result(2), self._result(1)], 3, 0.1)
+
+        chunks = _data_chunks(page)
+        assert [len(c['files']) for c in chunks] == [1, 1, 1]
+        assert [row[0] for c in chunks for row in c['issues']] == [0, 0, 1, 1, 2]
+
+    def test_script_breakout_is_escaped(self):
+        """Test that issue text cannot close the embedding script element."""
+        page = WebReporter(include_source_code=False).generate_report(
+            str(self.temp_dir), [self._result(1, message='</script><b>x</b>')], 1, 0.1)
+
+        assert '</script><b>' not in page
+        row = dict(zip(ISSUE_FIELDS, _data_chunks(page)[0]['issues'][0]))
+        assert row['message'] == '</script><b>x</b>'
+        assert row['source'] is None
+
+    def test_stream_html_report(self):
+        """Test streaming an HTML report through the engine."""
+        config = Config()
+        config.use_ai_suggestions = False
+        config.cache_enabled = False
+        out = io.StringIO()
+        summary = AnalysisEngine(config).stream_report(str(self.temp_dir), out, format='html')
+
+        page = out.getvalue()
+        assert page.startswith('<!DOCTYPE html>')
+        assert page.rstrip().endswith('</html>')
+        rows = [row for chunk in _data_chunks(page) for row in chunk['issues']]
+        assert len(rows) == summary['total_issues_found'] > 0
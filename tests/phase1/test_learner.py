@@ -227,7 +227,7 @@ from pathlib import Path
         }
         
         # Mock pattern memory methods
-        with patch.object(self.learner.pattern_memory, 'track_issue_pattern') as mock_track:
+        with patch.object(self.learner.pattern_memory, 'track_issue_patterns') as mock_track:
             mock_track.return_value = True
             
             with patch.object(self.learner.pattern_memory, 'record_learning_session') as mock_record:
@@ -240,8 +240,12 @@ from pathlib import Path
                 assert result["patterns_learned"] == 3  # Three issue types
                 assert len(result["insights"]) >= 0
                 
-                # Verify pattern tracking was called
-                assert mock_track.call_count == 3
+                # Verify the issue types were tracked in one batch
+                mock_track.assert_called_once_with('/test/repo', [
+                    ('style', 'general', 'medium'),
+                    ('security', 'general', 'medium'),
+                    ('performance', 'general', 'medium')
+                ])
     
     def test_extract_team_patterns(self):
         """Test team pattern extraction from history results."""
@@ -117,8 +117,84 @@ class TestPatternMemory:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        self.memory.close()
         Path(self.temp_db.name).unlink(missing_ok=True)
     
+    def test_connection_reused_per_thread(self):
+        """Test each thread opens one tuned connection and keeps it."""
+        import threading
+        
+        conn, _ = self.memory._thread_connection()
+        self.memory.store_pattern("/test/repo", "naming", {"style": "snake_case"}, 0.8)
+        self.memory.get_team_patterns("/test/repo")
+        assert self.memory._thread_connection()[0] is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.memory._thread_connection()[0]))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_team_patterns_repo_type", "idx_issue_patterns_repo_seen"} <= indexes
+        assert "idx_team_patterns_repo" not in indexes
+    
+    def test_thread_connection_closed_when_thread_ends(self):
+        """Test short-lived threads do not leave their connections open."""
+        import gc
+        import threading
+        
+        def work():
+            self.memory.track_issue_pattern("/test/repo", "style", "E501", "low")
+        
+        for _ in range(5):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        gc.collect()
+        
+        # Only the connection of the thread that created the memory remains
+        assert len(self.memory._connections) == 1
+        assert self.memory.get_issue_trends("/test/repo")["trending_issues"][0]["frequency"] == 5
+    
+    def test_in_memory_database_shared_across_threads(self):
+        """Test every thread sees the tables and rows of an in-memory database."""
+        import threading
+        
+        memory = PatternMemory(db_path=":memory:")
+        errors = []
+        
+        def work():
+            try:
+                assert memory.track_issue_pattern("/test/repo", "style", "E501", "low")
+            except AssertionError as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert not errors
+        assert memory.get_issue_trends("/test/repo")["trending_issues"][0]["frequency"] == 4
+        memory.close()
+    
+    def test_store_pattern_logs_change_in_same_transaction(self):
+        """Test the learning history row is written with the pattern it describes."""
+        self.memory.store_pattern("/test/repo", "naming", {"style": "snake_case"}, 0.5)
+        self.memory.store_pattern("/test/repo", "naming", {"style": "camelCase"}, 0.7)
+        
+        with self.memory._connection() as conn:
+            rows = conn.execute(
+                "SELECT reason FROM learning_history WHERE repo_path = ? ORDER BY id", ("/test/repo",)).fetchall()
+        assert [row["reason"] for row in rows] == [
+            "Created new pattern with confidence 0.5",
+            "Updated pattern confidence from 0.5 to 0.7"
+        ]
+    
     def test_store_and_retrieve_pattern(self):
         """Test basic pattern storage and retrieval."""
         repo_path = "/test/repo"
@@ -192,6 +268,24 @@ class TestPatternMemory:
         assert trends["total_patterns"] > 0
         assert len(trends["trending_issues"]) > 0
     
+    def test_track_issue_patterns_matches_single_calls(self):
+        """Test batched issue tracking stores what one call per issue would."""
+        occurrences = [("style", "E501", "low")] * 3 + [("security", "B101", "high")]
+        self.memory.track_issue_pattern("/single", "style", "E501", "low")
+        for issue_type, issue_rule, severity in occurrences:
+            self.memory.track_issue_pattern("/single", issue_type, issue_rule, severity)
+        
+        self.memory.track_issue_pattern("/batch", "style", "E501", "low")
+        assert self.memory.track_issue_patterns("/batch", iter(occurrences)) is True
+        assert self.memory.track_issue_patterns("/batch", []) is True
+        
+        def stored(repo_path):
+            return {(t["issue_type"], t["issue_rule"]): (t["frequency"], round(t["trend_score"], 6), t["severity"])
+                    for t in self.memory.get_issue_trends(repo_path)["trending_issues"]}
+        
+        assert stored("/batch") == stored("/single")
+        assert stored("/batch")[("style", "E501")][0] == 4
+    
     def test_record_fix_outcome(self):
         """Test fix outcome recording."""
         repo_path = "/test/repo"
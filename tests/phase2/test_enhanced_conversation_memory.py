@@ -318,5 +318,73 @@ class TestEnhancedConversationMemory:
         assert session_info["total_context_length"] == expected_length
 
 
+
+class TestConversationMemoryLog:
+    """Test the append-only log behind ConversationMemory persistence."""
+    
+    def _memory(self, tmp_path, **kwargs):
+        return ConversationMemory(str(tmp_path / "memory.json"), **kwargs)
+    
+    def test_interactions_appended_not_rewritten(self, tmp_path):
+        """Test that each interaction appends one log line and leaves the snapshot alone."""
+        memory = self._memory(tmp_path, compact_every=100)
+        for i in range(3):
+            memory.add_interaction(f"Q{i}", f"A{i}", "agent", "session1")
+        
+        assert not memory.memory_file.exists()
+        lines = memory.log_file.read_text().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["add"] * 3
+        
+        reloaded = self._memory(tmp_path)
+        assert [i["user_input"] for i in reloaded.get_conversation_history()] == ["Q0", "Q1", "Q2"]
+        assert reloaded.get_session_info("session1")["interaction_count"] == 3
+    
+    def test_compaction_and_replay(self, tmp_path):
+        """Test that compaction folds the log into the snapshot and later entries replay on top."""
+        memory = self._memory(tmp_path, max_history=4, compact_every=5)
+        for i in range(7):
+            memory.add_interaction(f"Q{i}", f"A{i}", f"agent{i % 2}", f"session{i % 3}")
+        
+        snapshot = json.loads(memory.memory_file.read_text())
+        assert snapshot["log_seq"] == 5
+        assert len(memory.log_file.read_text().splitlines()) == 2
+        
+        reloaded = self._memory(tmp_path, max_history=4)
+        assert reloaded.get_conversation_history() == memory.get_conversation_history()
+        assert reloaded.get_session_info("session0")["interaction_count"] == 3
+        assert reloaded.get_agent_statistics("agent0")["total_interactions"] == 2
+        assert [i["user_input"] for i in reloaded.get_session_info("session0")["interactions"]] == ["Q3", "Q6"]
+    
+    def test_search_index_follows_history(self, tmp_path):
+        """Test that trimmed and cleared interactions leave the search index."""
+        memory = self._memory(tmp_path, max_history=2)
+        memory.add_interaction("security audit", "found eval", "reviewer", "s1")
+        memory.add_interaction("performance", "loops", "fixer", "s1")
+        memory.add_interaction("security again", "all clear", "reviewer", "s2")
+        
+        results = memory.search_history("security")
+        assert [r["user_input"] for r in results] == ["security again"]
+        assert memory.search_history("security", session_id="s1") == []
+        assert len(self._memory(tmp_path, max_history=2).search_history("security")) == 1
+        
+        memory.clear_memory()
+        assert memory.search_history("security") == []
+    
+    def test_interrupted_writes_are_tolerated(self, tmp_path):
+        """Test that a torn last line and entries left by an unfinished compaction are skipped."""
+        memory = self._memory(tmp_path, compact_every=100)
+        memory.add_interaction("Q0", "A0", "agent", "session1")
+        memory.compact()
+        memory.add_interaction("Q1", "A1", "agent", "session1")
+        
+        # Compaction replaced the snapshot but stopped before emptying the log
+        stale = json.dumps({"seq": 1, "op": "add", "interaction": memory.get_conversation_history()[0]})
+        with open(memory.log_file, "a") as f:
+            f.write(stale + "\n" + '{"seq": 3, "op": "ad')
+        
+        reloaded = self._memory(tmp_path)
+        assert [i["user_input"] for i in reloaded.get_conversation_history()] == ["Q0", "Q1"]
+        assert reloaded.get_session_info("session1")["interaction_count"] == 2
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
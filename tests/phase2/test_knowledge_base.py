@@ -329,6 +329,77 @@ class TestKnowledgeBase:
         assert pattern is not None
         assert pattern["data"]["data"] == "persistent"
 
+    
+    def test_writes_are_batched(self, temp_knowledge_dir):
+        """Test that mutations are buffered until the flush threshold."""
+        kb = KnowledgeBase(temp_knowledge_dir, flush_every=3, flush_interval=None)
+        patterns_file = Path(temp_knowledge_dir) / "patterns.json"
+        
+        kb.store_pattern("p1", {"data": 1})
+        kb.store_pattern("p2", {"data": 2})
+        assert not patterns_file.exists()
+        
+        kb.store_fix_template("t1", {"data": 1}, "style")
+        assert set(json.loads(patterns_file.read_text())) == {"p1", "p2"}
+        assert "t1" in json.loads((Path(temp_knowledge_dir) / "fix_templates.json").read_text())
+        
+        kb.store_best_practice("bp1", {"data": 1})
+        assert kb.close()
+        assert "general" in json.loads((Path(temp_knowledge_dir) / "best_practices.json").read_text())
+        # Files are replaced through temporary files that never outlive the write
+        assert not [name for name in os.listdir(temp_knowledge_dir) if name.endswith(".tmp")]
+    
+    def test_replace_import_stays_persisted(self, knowledge_base, temp_knowledge_dir):
+        """Test that a replacing import is what gets written."""
+        knowledge_base.store_pattern("old", {"data": "old"})
+        export_file = os.path.join(temp_knowledge_dir, "export.json")
+        with open(export_file, "w") as f:
+            json.dump({"patterns": {"new": {"id": "new", "data": {"data": "new"}}}}, f)
+        
+        assert knowledge_base.import_knowledge(export_file, merge=False)
+        knowledge_base.store_fix_template("t1", {"data": 1}, "style")
+        knowledge_base.close()
+        
+        reloaded = KnowledgeBase(temp_knowledge_dir)
+        assert list(reloaded.patterns) == ["new"]
+        assert reloaded.search_patterns("new")[0]["id"] == "new"
+        assert "t1" in reloaded.fix_templates
+    
+    def test_sqlite_backend(self, temp_knowledge_dir):
+        """Test the SQLite backend round trip and seeding from JSON files."""
+        with KnowledgeBase(temp_knowledge_dir) as kb:
+            kb.store_pattern("from_json", {"data": "json"})
+        
+        with KnowledgeBase(temp_knowledge_dir, backend="sqlite", flush_every=1) as kb:
+            assert kb.get_pattern("from_json") is not None
+            kb.store_pattern("from_sqlite", {"data": "sqlite"})
+            kb.store_fix_template("t1", {"data": 1}, "style", 0.5)
+            kb.update_template_success_rate("t1", True)
+            kb.store_team_insight("/repo", {"data": "insight"})
+        
+        with KnowledgeBase(temp_knowledge_dir, backend="sqlite") as kb:
+            assert set(kb.patterns) == {"from_json", "from_sqlite"}
+            assert kb.fix_templates["t1"]["usage_count"] == 1
+            assert len(kb.get_team_insights("/repo")) == 1
+        
+        with pytest.raises(ValueError):
+            KnowledgeBase(temp_knowledge_dir, backend="yaml")
+    
+    def test_sqlite_backend_seeds_from_json_once(self, temp_knowledge_dir):
+        """Test that an emptied SQLite collection is not seeded from JSON again."""
+        with KnowledgeBase(temp_knowledge_dir) as kb:
+            kb.store_pattern("legacy", {"data": "json"})
+        export_file = os.path.join(temp_knowledge_dir, "empty.json")
+        with open(export_file, "w") as f:
+            json.dump({"patterns": {}}, f)
+        
+        with KnowledgeBase(temp_knowledge_dir, backend="sqlite") as kb:
+            assert "legacy" in kb.patterns
+            assert kb.import_knowledge(export_file, merge=False)
+        
+        with KnowledgeBase(temp_knowledge_dir, backend="sqlite") as kb:
+            assert kb.patterns == {}
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Tests for the inverted text index used by the memory stores.
+"""
+
+import pytest
+
+from kirolinter.memory.text_index import TextIndex, tokenize
+
+
+class TestTextIndex:
+    """Test TextIndex maintenance and BM25 ranking."""
+    
+    def test_tokenize_splits_identifiers(self):
+        """Test that tokens are lowercased and snake_case is split."""
+        assert tokenize("Use snake_case, not camelCase!") == ["use", "snake", "case", "not", "camelcase"]
+    
+    def test_ranking_prefers_rarer_and_denser_matches(self):
+        """Test BM25 weighting of term rarity and frequency."""
+        index = TextIndex()
+        index.add("a", "sql injection in the login query")
+        index.add("b", "query builder query cache")
+        index.add("c", "unused import in the module")
+        
+        scores = index.search("sql query")
+        assert set(scores) == {"a", "b"}
+        assert scores["a"] > scores["b"]
+        assert index.search("query", keys=["b", "c"]).keys() == {"b"}
+    
+    def test_update_and_remove_keep_postings_in_sync(self):
+        """Test that re-adding replaces a document and removing drops it."""
+        index = TextIndex()
+        index.add("a", "security review")
+        index.add("a", "performance review")
+        
+        assert index.search("security") == {}
+        assert set(index.search("performance")) == {"a"}
+        
+        index.remove("a")
+        assert len(index) == 0
+        assert index.search("review") == {}
+    
+    def test_prefix_fallback(self):
+        """Test that a partial word matches the terms it starts."""
+        index = TextIndex()
+        index.add("a", "security issues found")
+        
+        assert set(index.search("secur")) == {"a"}
+        assert index.search("insecure") == {}
@@ -151,6 +151,32 @@ class TestRedisPatternMemory:
             mock_redis.hset.assert_called()
             mock_redis.expire.assert_called()
     
+    @pytest.mark.skipif(not REDIS_TESTS_ENABLED, reason="Redis not available")
+    def test_batch_issue_tracking_redis(self, mock_redis, temp_db_path):
+        """Test batched issue tracking reads once and writes one pipeline."""
+        mock_redis.hmget.return_value = [
+            json.dumps({"issue_type": "style", "issue_rule": "E501", "severity": "medium",
+                        "frequency": 5, "trend_score": 0.5}),
+            None
+        ]
+        
+        with patch('redis.Redis.from_url', return_value=mock_redis):
+            memory = create_pattern_memory(redis_only=True)
+            
+            occurrences = [("style", "E501", "medium")] * 3 + [("security", "B101", "high")]
+            success = memory.track_issue_patterns("/test/repo", occurrences)
+            assert success
+            
+            mock_redis.hmget.assert_called_once()
+            mock_redis.hget.assert_not_called()
+            pipe = mock_redis.pipeline.return_value
+            pipe.execute.assert_called_once()
+            written = {k: json.loads(v) for k, v in pipe.hset.call_args.kwargs["mapping"].items()}
+            assert written["style:E501"]["frequency"] == 8
+            assert written["style:E501"]["trend_score"] == pytest.approx(0.8)
+            assert written["security:B101"]["frequency"] == 1
+            assert written["security:B101"]["severity"] == "high"
+    
     @pytest.mark.skipif(not REDIS_TESTS_ENABLED, reason="Redis not available")
     def test_fix_outcome_recording_redis(self, mock_redis, temp_db_path):
         """Test fix outcome recording using Redis lists in Redis-only mode."""
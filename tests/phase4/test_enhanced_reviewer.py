@@ -93,7 +93,7 @@ class TestEnhancedReviewer:
             
             # Verify memory interactions
             mock_memory.get_team_patterns.assert_called_with(temp_repo_dir, "issue_frequency")
-            mock_memory.track_issue_pattern.assert_called()
+            mock_memory.track_issue_patterns.assert_called()
     
     def test_risk_assessment(self, temp_repo_dir, mock_memory):
         """Test risk assessment using patterns and severity."""
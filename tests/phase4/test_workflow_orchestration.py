@@ -133,7 +133,7 @@ class TestWorkflowOrchestration:
                 
                 # Verify pattern memory interactions
                 mock_memory.get_team_patterns.assert_called()
-                mock_memory.track_issue_pattern.assert_called()
+                mock_memory.track_issue_patterns.assert_called()
     
     def test_risk_assessment(self, temp_repo_dir, mock_memory):
         """Test risk assessment functionality."""